@@ -448,9 +448,12 @@ def gmail_disconnect():
 
 @app.route('/api/connectors/gmail/sync', methods=['POST'])
 def gmail_sync():
-    """Sync emails from connected Gmail account"""
-    import asyncio
+    """
+    Sync emails from connected Gmail account
 
+    Incremental after the first sync (the account's saved historyId); pass
+    {"full_sync": true} to re-list every label.
+    """
     if 'default' not in gmail_connected_accounts:
         return jsonify({
             'success': False,
@@ -462,6 +465,8 @@ def gmail_sync():
         from connectors.base_connector import ConnectorConfig
 
         account = gmail_connected_accounts['default']
+        body = request.get_json(silent=True) or {}
+        history_id = None if body.get('full_sync') else account.get('history_id')
 
         # Create connector config
         config = ConnectorConfig(
@@ -473,20 +478,26 @@ def gmail_sync():
             },
             settings={
                 'max_results': 50,
-                'labels': ['INBOX', 'SENT']
+                'labels': ['INBOX', 'SENT'],
+                'history_id': history_id,
+                # Messages that failed last sync; the historyId has moved past them
+                'pending_messages': account.get('pending_messages')
             }
         )
 
-        # Create connector and sync
+        # Create connector and sync (blocking; no event loop needed)
         connector = GmailConnector(config)
+        documents = connector.sync_blocking()
+        if connector.last_error:
+            raise RuntimeError(connector.last_error)
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        documents = loop.run_until_complete(connector.sync())
-        loop.close()
+        # Next sync continues from here (and retries what failed); keep a refreshed token
+        account['history_id'] = config.settings.get('history_id')
+        account['pending_messages'] = config.settings.get('pending_messages')
+        account['access_token'] = config.credentials.get('access_token', account['access_token'])
 
         # Check if we should cluster the emails into projects
-        cluster_emails = request.json.get('cluster_into_projects', True) if request.is_json else True
+        cluster_emails = body.get('cluster_into_projects', True)
         projects_created = 0
 
         if cluster_emails and documents:
@@ -502,14 +513,15 @@ def gmail_sync():
                         'content': doc.content  # Content only, no metadata
                     })
 
-                # Run LLM-first high-accuracy clustering
-                clusterer = LLMFirstClusterer(
-                    openai_api_key=OPENAI_API_KEY,
-                    cache_dir=str(DATA_DIR / "llm_cluster_cache")
-                )
+                clusterer = LLMFirstClusterer(openai_api_key=OPENAI_API_KEY)
 
-                projects = clusterer.process_documents(
+                # Incremental: assign new emails to existing projects and
+                # only cluster the outliers. Full run if nothing saved yet.
+                clusterer.load_state(str(DATA_DIR))
+                projects = clusterer.process_new_documents(
                     docs_for_clustering,
+                    auto_assign_threshold=0.8,  # Assign without LLM
+                    confirm_threshold=0.6,  # Confirm with LLM above this
                     embedding_threshold=0.6,  # Pre-filter threshold
                     llm_threshold=0.5,  # Min LLM confidence to connect docs
                     merge_threshold=0.85  # Min confidence to merge clusters
@@ -533,8 +545,8 @@ def gmail_sync():
                     for pid, p in projects.items()
                 }
 
-                projects_created = len(projects)
-                print(f"✓ Clustered {len(documents)} emails into {projects_created} projects")
+                projects_created = clusterer.incremental_report.get('new_clusters', len(projects))
+                print(f"✓ Clustered {len(documents)} emails ({projects_created} new projects, {len(projects)} total)")
 
             except Exception as cluster_error:
                 print(f"⚠ Email clustering failed: {cluster_error}")
@@ -545,6 +557,7 @@ def gmail_sync():
             'success': True,
             'documents_synced': len(documents),
             'projects_created': projects_created,
+            'sync_stats': connector.sync_stats,
             'documents': [
                 {
                     'doc_id': doc.doc_id,
@@ -1529,10 +1542,7 @@ def api_reprocess_projects():
         print(f"{'='*70}")
 
         # Initialize LLM-first clusterer
-        clusterer = LLMFirstClusterer(
-            openai_api_key=OPENAI_API_KEY,
-            cache_dir=str(DATA_DIR / "llm_cluster_cache")
-        )
+        clusterer = LLMFirstClusterer(openai_api_key=OPENAI_API_KEY)
 
         # Process documents with high-accuracy settings
         projects = clusterer.process_documents(
@@ -2340,7 +2350,11 @@ def api_gamma_preview_structure():
 
 @app.route('/api/documents/upload', methods=['POST'])
 def upload_document():
-    """Upload and process a document"""
+    """
+    Upload a document; parsing and classification run in the background.
+    Returns 202 with a job id (poll /api/documents/jobs/<job_id>), or the
+    finished result with form field wait=true.
+    """
     global document_manager
 
     if not document_manager:
@@ -2352,13 +2366,39 @@ def upload_document():
     file = request.files['file']
     user_id = request.form.get('user_id', 'default')
 
-    result = document_manager.upload_file(file, user_id)
+    if request.form.get('wait', '').lower() in ('1', 'true', 'yes'):
+        result = document_manager.upload_file(file, user_id)
+        return jsonify(result), 200 if result['success'] else 400
 
-    if result['success']:
-        return jsonify(result), 200
-    else:
+    from utils.job_queue import JobQueueFull
+    try:
+        result = document_manager.submit_upload(file, user_id)
+    except JobQueueFull as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+
+    if not result['success']:
         return jsonify(result), 400
 
+    job = result['job']
+    result['status_url'] = f"/api/documents/jobs/{job['job_id']}?user_id={user_id}"
+    return jsonify(result), 200 if job['status'] == 'completed' else 202
+
+
+@app.route('/api/documents/jobs/<job_id>')
+def get_upload_job(job_id):
+    """Get the status (and, once completed, the result) of an upload job"""
+    global document_manager
+
+    if not document_manager:
+        return jsonify({'success': False, 'error': 'Document manager not initialized'}), 500
+
+    user_id = request.args.get('user_id', 'default')
+    job = document_manager.get_upload_job(job_id, user_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    return jsonify({'success': True, 'job': job})
+
 
 @app.route('/api/documents/review')
 def get_documents_for_review():
@@ -2369,13 +2409,35 @@ def get_documents_for_review():
         return jsonify({'success': False, 'error': 'Document manager not initialized'}), 500
 
     user_id = request.args.get('user_id', 'default')
-    review_docs = document_manager.get_documents_for_review(user_id)
+    page, per_page = _document_page_args()
+    offset = (page - 1) * per_page if per_page else 0
+    review_docs = document_manager.get_documents_for_review(user_id, limit=per_page, offset=offset)
 
-    return jsonify({
+    response = {
         'success': True,
         'count': len(review_docs),
         'documents': review_docs
-    })
+    }
+    if per_page:
+        total = document_manager.count_documents_for_review(user_id)
+        response.update(_page_info(total, page, per_page))
+    return jsonify(response)
+
+
+def _document_page_args():
+    """Optional ?page=&per_page= for document listings (no per_page: everything)"""
+    page = max(1, int(request.args.get('page', 1)))
+    per_page = request.args.get('per_page')
+    return page, (max(1, int(per_page)) if per_page else None)
+
+
+def _page_info(total, page, per_page):
+    return {
+        'total': total,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': (total + per_page - 1) // per_page
+    }
 
 
 @app.route('/api/documents/<doc_id>/decision', methods=['POST'])
@@ -2406,13 +2468,19 @@ def get_documents_ready_for_rag():
         return jsonify({'success': False, 'error': 'Document manager not initialized'}), 500
 
     user_id = request.args.get('user_id', 'default')
-    work_docs = document_manager.get_documents_ready_for_rag(user_id)
+    page, per_page = _document_page_args()
+    offset = (page - 1) * per_page if per_page else 0
+    work_docs = document_manager.get_documents_ready_for_rag(user_id, limit=per_page, offset=offset)
 
-    return jsonify({
+    response = {
         'success': True,
         'count': len(work_docs),
         'documents': work_docs
-    })
+    }
+    if per_page:
+        total = document_manager.count_documents_ready_for_rag(user_id)
+        response.update(_page_info(total, page, per_page))
+    return jsonify(response)
 
 
 @app.route('/api/documents/stats')
@@ -28,6 +28,9 @@ except ImportError:
 
 from flask import request, jsonify, g
 
+from security.expiring_counter_store import ExpiringCounterStore
+from security.verified_token_cache import get_verified_token_cache
+
 
 @dataclass
 class Auth0Config:
@@ -111,6 +114,12 @@ class Auth0Handler:
         self._jwks_cache_time = 0
         self._api_keys: Dict[str, User] = {}  # API key -> User mapping
 
+        # Verified claims for repeat bearer tokens (invalidated by blacklist events)
+        self.token_cache = get_verified_token_cache()
+        self._cache_namespace = "|".join([
+            "auth0", config.domain, config.api_audience, ",".join(config.algorithms or [])
+        ])
+
     def _get_jwks(self) -> Dict:
         """Get JSON Web Key Set from Auth0 (cached)"""
         # Cache JWKS for 1 hour
@@ -149,7 +158,34 @@ class Auth0Handler:
         - CC6.1: Validates token expiration
         - CC6.2: Validates MFA completion
         - CC6.3: Validates token age limits
+
+        Verified tokens are cached until the earliest of the cache TTL, exp
+        and the max-age deadline; policy env vars are part of the cache key.
         """
+        namespace = "|".join([
+            self._cache_namespace,
+            os.getenv('MAX_JWT_LIFETIME_SECONDS', '86400'),
+            os.getenv('MAX_JWT_AGE_SECONDS', '86400'),
+            os.getenv('REQUIRE_MFA', 'false').lower()
+        ])
+        generation = self.token_cache.generation
+        cached = self.token_cache.get(namespace, token)
+        if cached is not None:
+            return cached
+
+        payload = self._verify_token(token)
+
+        if payload:
+            not_after = min(
+                payload.get('exp', 0),
+                payload.get('iat', 0) + int(os.getenv('MAX_JWT_AGE_SECONDS', '86400'))
+            )
+            self.token_cache.put(namespace, token, payload, not_after, generation=generation)
+
+        return payload
+
+    def _verify_token(self, token: str) -> Optional[Dict]:
+        """Full verification (JWKS key, signature, claims); see _validate_token"""
         try:
             jwks = self._get_jwks()
 
@@ -349,32 +385,21 @@ class RateLimiter:
     """
     Simple in-memory rate limiter for API endpoints.
     For production, use Redis-based rate limiting.
+
+    Requests are counted in a sliding one-minute window (12 buckets of 5s)
+    in a bounded store, so each check is O(1) and tracked keys are capped.
     """
 
-    def __init__(self, requests_per_minute: int = 60):
+    def __init__(self, requests_per_minute: int = 60, max_keys: int = 100_000):
         self.rpm = requests_per_minute
-        self._requests: Dict[str, List[float]] = {}
-
-    def _clean_old_requests(self, key: str) -> None:
-        """Remove requests older than 1 minute"""
-        now = time.time()
-        if key in self._requests:
-            self._requests[key] = [
-                t for t in self._requests[key]
-                if now - t < 60
-            ]
+        self._requests = ExpiringCounterStore(max_keys=max_keys, name="api rate limiter")
 
     def check_rate_limit(self, key: str) -> bool:
         """Check if request is within rate limit"""
-        self._clean_old_requests(key)
-
-        if key not in self._requests:
-            self._requests[key] = []
-
-        if len(self._requests[key]) >= self.rpm:
+        if self._requests.window_total(key, window=60) >= self.rpm:
             return False
 
-        self._requests[key].append(time.time())
+        self._requests.window_add(key, window=60)
         return True
 
     def rate_limit(self, key_func: Callable = None) -> Callable:
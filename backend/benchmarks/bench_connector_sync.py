@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Slack connector sync scheduler benchmark.
+
+Syncs an in-memory Slack workspace with simulated per-call latency one
+channel at a time (the original loop), then with the channel fan-out, then
+incrementally from the saved cursors after a few new posts. Reports
+seconds, messages/s and API calls.
+
+Run: python3 benchmarks/bench_connector_sync.py [--channels 60] [--latency-ms 30]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.test_connector_sync import FakeSlackClient, slack_connector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--channels', type=int, default=60)
+    parser.add_argument('--messages', type=int, default=20, help='Messages per channel')
+    parser.add_argument('--latency-ms', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'case':<28} {'docs':>6} {'seconds':>8} {'msg/s':>8} {'calls':>6}")
+
+    def run(name, client, connector):
+        client.calls.clear()
+        started = time.perf_counter()
+        documents = asyncio.run(connector.sync())
+        elapsed = time.perf_counter() - started
+        print(f"{name:<28} {len(documents):>6} {elapsed:>8.2f} {len(documents) / elapsed:>8.1f} {len(client.calls):>6}")
+
+    for name, workers in (("one channel at a time", 1), (f"{args.workers} channels in flight", args.workers)):
+        client = FakeSlackClient(args.channels, args.messages, latency=args.latency_ms / 1000)
+        connector = slack_connector(client, max_concurrent_channels=workers)
+        run(name, client, connector)
+
+    for n in range(5):
+        client.post(f"C{n}", n)
+    run("incremental (5 new posts)", client, connector)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate grouping benchmark.
+
+Generates synthetic corpora with versioned documents, checks that the
+blocked sparse grouping matches the dense N x N reference on sizes where the
+reference is feasible, and reports time and peak memory per corpus size.
+
+Run: python3 benchmarks/bench_deduplication.py [--sizes 1000 5000 20000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from deduplicate_documents import (
+    _build_tfidf_matrix,
+    find_similar_document_groups,
+    find_similar_groups_in_jsonl,
+)
+
+
+def make_vocabulary(size=20000, seed=7):
+    """Pseudo-words, so TF-IDF rows are as sparse as real text"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [
+        ''.join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+        for _ in range(size)
+    ]
+
+
+VOCABULARY = make_vocabulary()
+# Zipf-like weights: a few very common words, a long tail of rare ones
+WEIGHTS = [1.0 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def make_corpus(n_docs, versions_per_doc=3, seed=42):
+    """Base documents plus lightly edited versions of each"""
+    rng = random.Random(seed)
+    docs = []
+    while len(docs) < n_docs:
+        base = rng.choices(VOCABULARY, weights=WEIGHTS, k=150)
+        for v in range(rng.randint(1, versions_per_doc)):
+            words = list(base)
+            for _ in range(rng.randint(0, 6)):
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            if v and rng.random() < 0.5:
+                words.append("TBD")
+            docs.append({
+                'content': ' '.join(words),
+                'metadata': {'file_name': f"doc_{len(docs)}.pdf"}
+            })
+    return docs[:n_docs]
+
+
+def dense_reference_groups(documents, similarity_threshold=0.70):
+    """Original algorithm: dense similarity matrix + all-pairs loop"""
+    matrix = _build_tfidf_matrix([d.get('content', '')[:5000] for d in documents])
+    similarity = cosine_similarity(matrix)
+
+    n = len(documents)
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            if similarity[i][j] >= similarity_threshold:
+                pi, pj = find(i), find(j)
+                if pi != pj:
+                    parent[pi] = pj
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def canonical(groups):
+    return sorted(sorted(g) for g in groups)
+
+
+def measure(fn, *args, **kwargs):
+    """Run fn, returning (result, seconds, peak MB)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--threshold', type=float, default=0.70)
+    parser.add_argument('--reference-limit', type=int, default=5000,
+                        help='Largest size to also run the dense reference on')
+    args = parser.parse_args()
+
+    print(f"{'docs':>8} {'groups':>8} {'sparse s':>9} {'sparse MB':>10} "
+          f"{'jsonl s':>8} {'jsonl MB':>9} {'dense s':>8} {'dense MB':>9} {'match':>6}")
+
+    for size in args.sizes:
+        docs = make_corpus(size)
+
+        groups, t_sparse, m_sparse = measure(
+            find_similar_document_groups, docs, args.threshold
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "corpus.jsonl"
+            with open(path, 'w', encoding='utf-8') as f:
+                for doc in docs:
+                    f.write(json.dumps(doc) + '\n')
+            jsonl_groups, t_jsonl, m_jsonl = measure(
+                find_similar_groups_in_jsonl, path, args.threshold
+            )
+
+        dense_cols = f"{'-':>8} {'-':>9} {'-':>6}"
+        if size <= args.reference_limit:
+            ref, t_dense, m_dense = measure(dense_reference_groups, docs, args.threshold)
+            match = canonical(ref) == canonical(groups) == canonical(jsonl_groups)
+            dense_cols = f"{t_dense:>8.2f} {m_dense:>9.1f} {str(match):>6}"
+
+        print(f"{size:>8} {len(groups):>8} {t_sparse:>9.2f} {m_sparse:>10.1f} "
+              f"{t_jsonl:>8.2f} {m_jsonl:>9.1f} {dense_cols}")
+
+
+if __name__ == '__main__':
+    main()
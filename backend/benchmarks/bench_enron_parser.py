@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Enron maildir parser benchmark.
+
+Generates a synthetic maildir and parses it with the serial parser
+(parse_all_emails + save_to_jsonl) and the process-pool parser streaming
+to JSONL. Reports files/s and peak Python memory in the parent process.
+
+Run: python3 benchmarks/bench_enron_parser.py [--files 20000] [--workers 4]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data_processing.enron_parser import EnronParser
+
+
+def make_maildir(root: Path, files: int, employees: int = 50) -> Path:
+    maildir = root / "maildir"
+    body = "Please review the attached schedule for the Q3 gas trades.\n" * 30
+    for n in range(files):
+        directory = maildir / f"employee-{n % employees}" / ("inbox" if n % 3 else "sent")
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{n}.").write_text(
+            f"From: e{n % employees}@enron.com\nTo: desk@enron.com\nSubject: Trade {n}\n"
+            f"Date: Mon, 14 May 2001 16:39:00 -0700 (PDT)\n\n{body}"
+        )
+    return maildir
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        maildir = make_maildir(tmp, args.files)
+        print(f"{'case':<24} {'seconds':>8} {'files/s':>9} {'peak MB':>8}")
+
+        def serial():
+            enron = EnronParser(str(maildir))
+            enron.parse_all_emails(str(tmp / "serial.jsonl"))
+
+        def parallel():
+            EnronParser(str(maildir)).parse_all_emails_parallel(
+                str(tmp / "parallel.jsonl"), workers=args.workers
+            )
+
+        for name, fn in (("serial", serial), (f"parallel ({args.workers} procs)", parallel)):
+            elapsed, peak = measure(fn)
+            print(f"{name:<24} {elapsed:>8.2f} {args.files / elapsed:>9.0f} {peak:>8.1f}")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Gap analysis scheduling benchmark.
+
+Builds synthetic project clusters and runs analyze_all_projects against a
+simulated LLM (fixed latency per call) one project at a time and with a
+worker pool, then re-runs with every project unchanged (checkpoint hits).
+Reports wall time and LLM calls.
+
+Run: python3 benchmarks/bench_gap_analysis.py [--projects 40] [--latency 0.2] [--workers 8]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gap_analysis.gap_analyzer import GapAnalyzer
+from utils.llm_batch import LLMBatchExecutor
+
+ANSWER = json.dumps({
+    "missing_document_types": ["decision records"],
+    "knowledge_gaps": ["why the vendor was chosen"],
+    "context_gaps": [],
+    "questions": []
+})
+
+
+def make_clusters(root: Path, projects: int, documents: int, employees: int = 4) -> Path:
+    clusters = root / "project_clusters"
+    for e in range(employees):
+        employee_dir = clusters / f"employee-{e}"
+        employee_dir.mkdir(parents=True)
+        names = [f"project-{p}" for p in range(e, projects, employees)]
+        for name in names:
+            with open(employee_dir / f"{name}.jsonl", 'w', encoding='utf-8') as f:
+                for n in range(documents):
+                    f.write(json.dumps({
+                        "content": f"Status update {n} on the pipeline contract from Jane Smith. " * 5,
+                        "metadata": {"subject": f"{name} update {n}", "timestamp": f"2001-05-{n % 28 + 1:02d}"}
+                    }) + "\n")
+        (employee_dir / "metadata.json").write_text(json.dumps({"projects": {n: {} for n in names}}))
+    return clusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=40)
+    parser.add_argument('--documents', type=int, default=500, help="Documents per project")
+    parser.add_argument('--latency', type=float, default=0.2, help="Seconds per LLM call")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    calls = []
+    lock = threading.Lock()
+
+    def llm(prompt, max_tokens):
+        with lock:
+            calls.append(prompt)
+        time.sleep(args.latency)
+        return ANSWER, {}
+
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        clusters = make_clusters(tmp, args.projects, args.documents)
+        analyzer = GapAnalyzer(api_key="bench", endpoint="https://example.invalid", deployment="bench",
+                               use_cache=False)
+        analyzer.llm_executor = LLMBatchExecutor(llm, model="bench", template_version="bench")
+
+        print(f"{'case':<26} {'seconds':>8} {'LLM calls':>10}")
+        for name, output, workers, force in (
+            ("serial", "serial", 1, True),
+            (f"{args.workers} workers", "pool", args.workers, True),
+            ("re-run, unchanged", "pool", args.workers, False),
+        ):
+            calls.clear()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):  # Per-project progress lines
+                analyzer.analyze_all_projects(str(clusters), str(tmp / output), max_workers=workers, force=force)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<26} {elapsed:>8.2f} {len(calls):>10}")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
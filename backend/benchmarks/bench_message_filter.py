@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Message filter v2 rule-scoring benchmark.
+
+Scores a synthetic Google Chat corpus (repeated short reactions, varied
+casual chatter, project updates and long messages) with the
+original per-pattern re.search loop, the compiled calculate_professional_score_v2,
+and score_messages_v2 across a process pool, checking all three agree.
+Reports messages/s.
+
+Run: python3 benchmarks/bench_message_filter.py [--messages 200000] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault('OPENAI_API_KEY', 'unused')  # No GPT calls are made
+
+import message_filter_v2 as mf
+from tests.test_message_filter import reference_score
+
+SHORT = ["ok", "lol", "kk", "thanks!", "sounds good", "yep", "haha", "omw", "np", "bet"]
+CASUAL = [
+    "wanna grab lunch after class?", "u free tonight", "bro the game last night",
+    "running late, be there soon", "who's down for boba", "im so tired today",
+]
+WORK = [
+    "Can you review the draft deck before the sync tomorrow?",
+    "I finished the competitor analysis, sending it to everyone now",
+    "The client wants the TAM estimate by Friday",
+    "Meeting moved to 4pm, same zoom link",
+    "Here is the updated model https://docs.google.com/spreadsheets/d/abc",
+    "Great work on the interviews. Next we should summarize the findings",
+]
+
+
+NAMES = ["Sam", "Priya", "Jordan", "Alex", "Wei", "Maria", "Chris", "Taylor"]
+
+
+def synthetic_corpus(count: int, seed: int = 13):
+    """Short reactions repeat verbatim; everything else is addressed and numbered"""
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(count):
+        roll = rng.random()
+        if roll < 0.45:
+            corpus.append(rng.choice(SHORT))
+        elif roll < 0.75:
+            corpus.append(f"{rng.choice(NAMES)} {rng.choice(CASUAL)} {n % 97}")
+        elif roll < 0.95:
+            corpus.append(f"{rng.choice(NAMES)}, {rng.choice(WORK)} (#{n})")
+        else:
+            corpus.append(". ".join(rng.sample(WORK + CASUAL, 5)) + f" {n}")
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=200000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.messages)
+    cases = (
+        ("per-pattern loop", lambda: [reference_score(c) for c in corpus]),
+        ("compiled, 1 process", lambda: mf.score_messages_v2(corpus, workers=1)),
+        (f"compiled, {args.workers} processes", lambda: mf.score_messages_v2(corpus, workers=args.workers)),
+    )
+
+    print(f"{'case':<24} {'seconds':>8} {'msgs/s':>9}")
+    baseline = None
+    for name, fn in cases:
+        started = time.perf_counter()
+        scores = fn()
+        elapsed = time.perf_counter() - started
+        print(f"{name:<24} {elapsed:>8.2f} {len(corpus) / elapsed:>9.0f}")
+        if baseline is None:
+            baseline = scores
+        elif scores != baseline:
+            raise SystemExit(f"❌ {name} disagrees with the per-pattern loop")
+
+    buckets = Counter(classification for _, classification, _ in baseline)
+    print("✓ All implementations agree: " + ", ".join(f"{k}={v}" for k, v in sorted(buckets.items())))
+
+
+if __name__ == '__main__':
+    main()
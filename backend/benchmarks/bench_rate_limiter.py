@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Rate limiter overhead benchmark.
+
+Runs the original fixed-window check (one EXISTS plus one INCR/EXPIRE
+pipeline per counter) and the single-script sliding-window limiter, with
+and without local token leases, against fakeredis with a simulated
+network round-trip, and reports per-request latency percentiles and
+round-trips.
+
+Run: python3 benchmarks/bench_rate_limiter.py [--requests 5000] [--rtt-ms 0.2]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fakeredis
+
+from security.enhanced_rate_limiter import EnhancedRateLimiter, RateLimitConfig
+
+
+class LatentRedis(fakeredis.FakeRedis):
+    """fakeredis with a fixed delay per round-trip"""
+
+    rtt = 0.0
+    round_trips = 0
+
+    def execute_command(self, *args, **kwargs):
+        LatentRedis.round_trips += 1
+        time.sleep(self.rtt)
+        return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def delayed_execute(*args, **kwargs):
+            LatentRedis.round_trips += 1
+            time.sleep(self.rtt)
+            return execute(*args, **kwargs)
+
+        pipe.execute = delayed_execute
+        return pipe
+
+
+class FixedWindowReference:
+    """Original algorithm: a round-trip per counter, fixed windows"""
+
+    def __init__(self, config, client):
+        self.config = config
+        self.client = client
+
+    def _incr(self, key, ttl):
+        pipe = self.client.pipeline()
+        pipe.incr(key)
+        pipe.expire(key, ttl)
+        return pipe.execute()[0]
+
+    def check_rate_limit(self, ip_address, user_id=None, endpoint=None):
+        now = int(time.time())
+        if self.client.exists(f"ratelimit:blocked:{ip_address}"):
+            return 'blocked'
+        checks = [(f"ip:{ip_address}", 60, self.config.requests_per_minute_ip),
+                  (f"ip:{ip_address}", 3600, self.config.requests_per_hour_ip)]
+        if user_id:
+            checks += [(f"user:{user_id}", 60, self.config.requests_per_minute_user),
+                       (f"user:{user_id}", 3600, self.config.requests_per_hour_user)]
+        for name, window, limit in checks:
+            if self._incr(f"ratelimit:{name}:{window}:{now // window}", window) > limit:
+                return 'rate_limited'
+        return 'allowed'
+
+
+def run(limiter, traffic):
+    LatentRedis.round_trips = 0
+    latencies = []
+    for ip, user in traffic:
+        started = time.perf_counter()
+        limiter.check_rate_limit(ip, user_id=user, endpoint='/api/data')
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return pick(0.5), pick(0.99), LatentRedis.round_trips / len(traffic)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--rtt-ms', type=float, default=0.2)
+    args = parser.parse_args()
+
+    LatentRedis.rtt = args.rtt_ms / 1000
+    rng = random.Random(1)
+    traffic = [(f"10.0.{i % 20}.{i % 7}", f"user{i % 25}") for i in range(args.requests)]
+    rng.shuffle(traffic)
+
+    config = RateLimitConfig(requests_per_minute_ip=100_000, requests_per_hour_ip=1_000_000,
+                             requests_per_minute_user=100_000, requests_per_hour_user=1_000_000,
+                             captcha_threshold_requests_per_minute=50_000)
+    single = RateLimitConfig(**{**config.__dict__, 'local_lease_size': 1})
+
+    rows = [
+        ('fixed window (original)', FixedWindowReference(config, LatentRedis(decode_responses=True))),
+        ('sliding window script', EnhancedRateLimiter(single, redis_client=LatentRedis(decode_responses=True))),
+        ('script + local leases', EnhancedRateLimiter(config, redis_client=LatentRedis(decode_responses=True))),
+    ]
+
+    print(f"\n{args.requests} requests, simulated RTT {args.rtt_ms} ms")
+    print(f"{'limiter':<26} {'p50 ms':>8} {'p99 ms':>8} {'trips/req':>10}")
+    for name, limiter in rows:
+        p50, p99, trips = run(limiter, traffic)
+        print(f"{name:<26} {p50:>8.3f} {p99:>8.3f} {trips:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
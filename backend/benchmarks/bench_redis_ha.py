@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+RedisHAManager pipeline benchmark.
+
+Issues the same command batches through RedisHAManager one command at a
+time (the original per-operation wrappers) and as one pipeline, then times
+the migrated rate limiter and JWT blacklist hot paths on the manager,
+against fakeredis with a simulated network round-trip. Reports latency
+percentiles and round-trips per call.
+
+Run: python3 benchmarks/bench_redis_ha.py [--iterations 300] [--rtt-ms 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.bench_rate_limiter import LatentRedis
+from security.enhanced_rate_limiter import EnhancedRateLimiter, RateLimitConfig
+from security.jwt_blacklist_manager import JWTBlacklistManager, BlacklistConfig
+from security.redis_ha_manager import RedisHAManager, RedisHAConfig
+
+
+def measure(fn, iterations):
+    """Run fn(i) repeatedly, returning (p50 ms, p99 ms, round-trips per call)"""
+    LatentRedis.round_trips = 0
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):  # Mute per-call status lines
+        for i in range(iterations):
+            started = time.perf_counter()
+            fn(i)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return (
+        timings[len(timings) // 2] * 1000,
+        timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000,
+        LatentRedis.round_trips / iterations
+    )
+
+
+def sequential_counters(manager, batch):
+    def run(i):
+        for k in range(batch):
+            manager.incr(f"counter:{i}:{k}")
+            manager.expire(f"counter:{i}:{k}", 60)
+    return run
+
+
+def pipelined_counters(manager, batch):
+    def run(i):
+        with manager.pipeline() as pipe:
+            for k in range(batch):
+                pipe.incr(f"counter:{i}:{k}").expire(f"counter:{i}:{k}", 60)
+            pipe.execute()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--rtt-ms', type=float, default=0.2)
+    parser.add_argument('--batch', type=int, default=4, help='Counters per batch')
+    parser.add_argument('--sessions', type=int, default=5, help='Sessions per mass blacklist')
+    args = parser.parse_args()
+
+    LatentRedis.rtt = args.rtt_ms / 1000
+    manager = RedisHAManager(RedisHAConfig(), redis_client=LatentRedis(decode_responses=True))
+    limiter = EnhancedRateLimiter(RateLimitConfig(), redis_client=manager)
+    blacklist = JWTBlacklistManager(
+        BlacklistConfig(enable_bloom_filter=False, max_concurrent_sessions=10 ** 6),
+        redis_client=manager
+    )
+
+    def mass_blacklist(i):
+        for s in range(args.sessions):
+            blacklist._track_user_session(f"user{i}", f"{i:032x}{s:032x}", 600)
+        blacklist.blacklist_all_user_tokens(f"user{i}")
+
+    def failed_then_successful_login(i):
+        limiter.record_failed_login(f"10.1.{i // 256}.{i % 256}", user_id=f"user{i}")
+        limiter.record_successful_login(f"10.1.{i // 256}.{i % 256}", f"user{i}")
+
+    cases = [
+        (f"{args.batch} counters, one op each", sequential_counters(manager, args.batch)),
+        (f"{args.batch} counters, pipelined", pipelined_counters(manager, args.batch)),
+        ("blacklist_token", lambda i: blacklist.blacklist_token(f"token-{i}", user_id=f"u{i}")),
+        (f"track {args.sessions} + mass blacklist", mass_blacklist),
+        ("failed + successful login", failed_then_successful_login),
+    ]
+
+    print(f"{'case':<32} {'p50 ms':>8} {'p99 ms':>8} {'RTT/call':>9}")
+    for name, fn in cases:
+        p50, p99, rtts = measure(fn, args.iterations)
+        print(f"{name:<32} {p50:>8.3f} {p99:>8.3f} {rtts:>9.1f}")
+
+    print()
+    print(f"manager: {manager.get_metrics()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,17 +10,27 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from openai import AzureOpenAI
 from tqdm import tqdm
-import time
 from collections import defaultdict
 
 # SECURITY: Import data sanitizer and audit logger
 from security.data_sanitizer import DataSanitizer
 from security.audit_logger import get_audit_logger
+from utils.llm_cache import get_llm_cache
+from utils.llm_batch import LLMBatchExecutor, TokenBucketLimiter, chat_completion_call
 
 
 class WorkPersonalClassifier:
     """Classifier to distinguish work-related from personal content"""
 
+    # Prompt template version (bump to invalidate cached classifications)
+    CLASSIFICATION_PROMPT_VERSION = "work-personal-v1"
+    PACKED_PROMPT_VERSION = "work-personal-packed-v1"
+
+    SYSTEM_PROMPT = (
+        "You are an expert at distinguishing work-related emails from personal emails. "
+        "You analyze email content and provide accurate classifications with confidence scores."
+    )
+
     def __init__(
         self,
         api_key: str = None,
@@ -28,7 +38,9 @@ class WorkPersonalClassifier:
         deployment: str = None,
         api_version: str = "2024-02-15-preview",
         organization_id: str = None,
-        user_id: str = "system"
+        user_id: str = "system",
+        use_cache: bool = True,
+        cache_path: str = None
     ):
         """
         Initialize classifier with Azure OpenAI
@@ -40,6 +52,8 @@ class WorkPersonalClassifier:
             api_version: Azure API version
             organization_id: Organization ID for audit logging
             user_id: User ID for audit logging
+            use_cache: Whether to cache LLM classifications
+            cache_path: SQLite cache file (default: shared LLM cache)
         """
         # Load from environment if not provided
         self.api_key = api_key or os.getenv('AZURE_OPENAI_API_KEY')
@@ -63,6 +77,11 @@ class WorkPersonalClassifier:
         # SECURITY: Initialize audit logger
         self.audit_logger = get_audit_logger(organization_id=organization_id)
 
+        self.llm_cache = get_llm_cache(cache_path) if use_cache else None
+
+        # Shared by every classify_batch() call on this classifier
+        self.rate_limiter = TokenBucketLimiter()
+
         print(f"✓ Initialized Azure OpenAI classifier (deployment: {self.deployment})")
 
     def classify_document(self, document: Dict) -> Dict:
@@ -85,6 +104,14 @@ class WorkPersonalClassifier:
         # Prepare classification prompt with SANITIZED data
         prompt = self._create_classification_prompt(sanitized_subject, sanitized_content)
 
+        if self.llm_cache:
+            cached = self.llm_cache.get(
+                self.deployment, self.CLASSIFICATION_PROMPT_VERSION, prompt
+            )
+            if cached:
+                document['classification'] = cached
+                return cached
+
         try:
             # Call Azure OpenAI for classification
             response = self.client.chat.completions.create(
@@ -92,7 +119,7 @@ class WorkPersonalClassifier:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert at distinguishing work-related emails from personal emails. You analyze email content and provide accurate classifications with confidence scores."
+                        "content": self.SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -107,6 +134,14 @@ class WorkPersonalClassifier:
             result_text = response.choices[0].message.content.strip()
             classification_result = self._parse_classification_result(result_text)
 
+            if self.llm_cache and classification_result['category'] != 'uncertain':
+                self.llm_cache.put(
+                    self.deployment,
+                    self.CLASSIFICATION_PROMPT_VERSION,
+                    prompt,
+                    classification_result
+                )
+
             # Add to document
             document['classification'] = classification_result
 
@@ -212,35 +247,158 @@ Be conservative - when in doubt, classify as work if it could reasonably be work
             'action': 'review'
         }
 
+    def _create_packed_prompt(self, emails: List[Tuple[str, str]]) -> str:
+        """Create one prompt classifying several (subject, content) emails"""
+        max_content_length = 1000
+        sections = []
+        for number, (subject, content) in enumerate(emails, 1):
+            truncated_content = content[:max_content_length]
+            if len(content) > max_content_length:
+                truncated_content += "... [truncated]"
+            sections.append(f"[{number}]\nSubject: {subject}\n\nContent:\n{truncated_content}")
+
+        emails_text = "\n\n".join(sections)
+        return f"""Classify each of the following {len(emails)} emails as either WORK or PERSONAL.
+
+{emails_text}
+
+Provide your response as a JSON array with one object per email, in order:
+[
+    {{"id": <email number>, "category": "work" or "personal", "confidence": <float between 0.0 and 1.0>, "reasoning": "<brief explanation>"}}
+]
+
+Work emails include: business communications, project discussions, client interactions, internal company matters, technical discussions, meeting scheduling, formal communications.
+
+Personal emails include: family matters, personal appointments, social invitations, personal shopping, personal travel, personal financial matters, casual conversations with friends.
+
+Be conservative - when in doubt, classify as work if it could reasonably be work-related."""
+
+    def _parse_packed_result(self, result_text: str, count: int) -> List[Optional[Dict]]:
+        """Parse a JSON array response; None for emails without an answer"""
+        results: List[Optional[Dict]] = [None] * count
+        try:
+            start = result_text.index('[')
+            end = result_text.rindex(']') + 1
+            answers = json.loads(result_text[start:end])
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"Error parsing result: {e}")
+            return results
+
+        for position, answer in enumerate(answers):
+            if not isinstance(answer, dict):
+                continue
+            try:
+                index = int(answer.get('id', position + 1)) - 1
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < count:
+                parsed = self._parse_classification_result(json.dumps(answer))
+                if parsed['category'] in ('work', 'personal'):
+                    results[index] = parsed
+        return results
+
     def classify_batch(
         self,
         documents: List[Dict],
-        batch_delay: float = 0.1
+        batch_delay: float = 0.1,
+        max_concurrency: int = 8,
+        docs_per_request: int = 8
     ) -> List[Dict]:
         """
         Classify a batch of documents
 
+        Cached documents are not sent again; the rest are packed
+        `docs_per_request` to a prompt and sent `max_concurrency` requests
+        at a time, rate limited from the API's rate-limit headers.
+
         Args:
             documents: List of documents to classify
-            batch_delay: Delay between API calls to avoid rate limits
+            batch_delay: Unused (kept for callers; rate limiting is adaptive)
+            max_concurrency: Max requests in flight
+            docs_per_request: Documents per prompt (1 for one-by-one prompts)
 
         Returns:
             List of documents with classification results
         """
         print(f"Classifying {len(documents)} documents...")
 
-        classified_docs = []
+        # SECURITY: Sanitize data before sending to OpenAI
+        emails = []
+        for doc in documents:
+            subject = doc.get('metadata', {}).get('subject', '')
+            emails.append((
+                self.sanitizer.sanitize_text(subject, truncate=False),
+                self.sanitizer.sanitize_text(doc['content'], truncate=True)
+            ))
+
+        packed = docs_per_request > 1
+        if packed:
+            build_prompt = self._create_packed_prompt
+            parse = self._parse_packed_result
+        else:
+            build_prompt = lambda pack: self._create_classification_prompt(*pack[0])
+            parse = lambda text, count: [self._parse_classification_result(text)]
+
+        executor = LLMBatchExecutor(
+            chat_completion_call(self.client, self.deployment, self.SYSTEM_PROMPT, temperature=0.1),
+            model=self.deployment,
+            template_version=self.PACKED_PROMPT_VERSION if packed else self.CLASSIFICATION_PROMPT_VERSION,
+            max_concurrency=max_concurrency,
+            limiter=self.rate_limiter,
+            cache=self.llm_cache
+        )
 
-        for doc in tqdm(documents, desc="Classifying"):
-            classification = self.classify_document(doc)
+        def audit(document_count, error):
+            # SECURITY: Audit log every LLM call
+            if error is None:
+                self.audit_logger.log_classification(
+                    user_id=self.user_id,
+                    model_deployment=self.deployment,
+                    document_count=document_count,
+                    sanitized=True,
+                    success=True
+                )
+            else:
+                print(f"Error classifying documents: {error}")
+                self.audit_logger.log_llm_call(
+                    action="classification",
+                    model_deployment=self.deployment,
+                    user_id=self.user_id,
+                    sanitized=True,
+                    success=False,
+                    error=str(error)
+                )
+
+        with tqdm(total=len(documents), desc="Classifying") as progress_bar:
+            run = executor.run(
+                emails,
+                build_prompt,
+                parse,
+                key=lambda email: self._create_classification_prompt(*email),
+                items_per_request=docs_per_request,
+                max_tokens=lambda count: 100 * count,
+                cacheable=lambda result: result['category'] != 'uncertain',
+                on_request=audit,
+                progress=progress_bar.update
+            )
+
+        for index, (doc, classification) in enumerate(zip(documents, run['results'])):
+            if classification is None:
+                error = run['errors'].get(index)
+                classification = {
+                    'category': 'uncertain',
+                    'confidence': 0.5,
+                    'reasoning': f'Classification failed: {error}' if error else 'Failed to parse classification',
+                    'action': 'review'
+                }
             doc['classification'] = classification
-            classified_docs.append(doc)
 
-            # Rate limiting
-            time.sleep(batch_delay)
+        stats = run['stats']
+        print(f"✓ Classified {stats['items']} documents in {stats['elapsed_seconds']}s "
+              f"({stats['cache_hits']} cached, {stats['requests']} requests, {stats['retries']} retries)")
 
-        self.classification_results = classified_docs
-        return classified_docs
+        self.classification_results = documents
+        return documents
 
     def filter_documents(
         self,
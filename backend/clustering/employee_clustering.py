@@ -5,11 +5,13 @@ Clusters documents by employee using metadata
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 from collections import defaultdict
 from datetime import datetime
 import pandas as pd
 
+from data_processing.jsonl_io import iter_jsonl
+
 
 class EmployeeClusterer:
     """Cluster documents by employee (metadata-based hard clustering)"""
@@ -18,22 +20,22 @@ class EmployeeClusterer:
         self.employee_clusters = defaultdict(list)
         self.statistics = {}
 
+    def iter_documents(self, jsonl_path: str) -> Iterator[Dict]:
+        """Lazily read documents from a JSONL file (or its .gz / rotated parts)"""
+        return iter_jsonl(jsonl_path)
+
     def load_documents(self, jsonl_path: str) -> List[Dict]:
         """Load documents from JSONL file"""
-        documents = []
-        with open(jsonl_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                doc = json.loads(line)
-                documents.append(doc)
+        documents = list(self.iter_documents(jsonl_path))
         print(f"✓ Loaded {len(documents)} documents")
         return documents
 
-    def cluster_by_employee(self, documents: List[Dict]) -> Dict[str, List[Dict]]:
+    def cluster_by_employee(self, documents: Iterable[Dict]) -> Dict[str, List[Dict]]:
         """
         Cluster documents by employee
 
         Args:
-            documents: List of document dictionaries
+            documents: Document dictionaries (a list or a lazy iterator)
 
         Returns:
             Dictionary mapping employee names to their documents
@@ -210,11 +212,8 @@ def cluster_by_employee(input_jsonl: str, output_dir: str) -> EmployeeClusterer:
     """
     clusterer = EmployeeClusterer()
 
-    # Load documents
-    documents = clusterer.load_documents(input_jsonl)
-
-    # Cluster by employee
-    clusterer.cluster_by_employee(documents)
+    # Stream documents straight into their employee clusters
+    clusterer.cluster_by_employee(clusterer.iter_documents(input_jsonl))
 
     # Save clusters
     clusterer.save_employee_clusters(output_dir)
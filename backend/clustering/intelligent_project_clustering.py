@@ -30,6 +30,8 @@ from sentence_transformers import SentenceTransformer
 from hdbscan import HDBSCAN
 from sklearn.metrics.pairwise import cosine_similarity
 
+from utils.llm_cache import get_llm_cache
+
 # Load environment
 from dotenv import load_dotenv
 load_dotenv()
@@ -72,12 +74,16 @@ class IntelligentProjectClusterer:
     Intelligent project clustering using LLM extraction and semantic deduplication.
     """
 
+    # Model and prompt template version (bump the version to invalidate cache)
+    EXTRACTION_MODEL = "gpt-4o-mini"
+    EXTRACTION_PROMPT_VERSION = "project-extraction-v1"
+
     def __init__(
         self,
         openai_api_key: str = None,
         embedding_model: str = "all-mpnet-base-v2",
-        cache_dir: str = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        cache_path: str = None
     ):
         """
         Initialize the intelligent clusterer.
@@ -85,8 +91,8 @@ class IntelligentProjectClusterer:
         Args:
             openai_api_key: OpenAI API key for LLM calls
             embedding_model: Sentence transformer model for semantic similarity
-            cache_dir: Directory to cache results
             use_cache: Whether to use caching
+            cache_path: SQLite LLM cache file (default: shared LLM cache)
         """
         self.api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=self.api_key)
@@ -95,11 +101,7 @@ class IntelligentProjectClusterer:
         self.use_cache = use_cache
 
         # Cache setup
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path(__file__).parent.parent / "club_data" / "project_cache"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.llm_cache = get_llm_cache(cache_path) if use_cache else None
 
         # Results storage
         self.document_extractions: Dict[str, DocumentProjectInfo] = {}
@@ -115,27 +117,21 @@ class IntelligentProjectClusterer:
             print("✓ Embedding model loaded")
         return self.embedding_model
 
-    def _get_cache_key(self, content: str) -> str:
-        """Generate cache key from content"""
-        return hashlib.md5(content[:1000].encode()).hexdigest()
-
-    def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
+    def _load_from_cache(self, cache_content: str) -> Optional[Dict]:
         """Load result from cache"""
         if not self.use_cache:
             return None
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        return None
+        return self.llm_cache.get(
+            self.EXTRACTION_MODEL, self.EXTRACTION_PROMPT_VERSION, cache_content
+        )
 
-    def _save_to_cache(self, cache_key: str, data: Dict):
+    def _save_to_cache(self, cache_content: str, data: Dict):
         """Save result to cache"""
         if not self.use_cache:
             return
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with open(cache_file, 'w') as f:
-            json.dump(data, f)
+        self.llm_cache.put(
+            self.EXTRACTION_MODEL, self.EXTRACTION_PROMPT_VERSION, cache_content, data
+        )
 
     # =========================================================================
     # Step 1: LLM-Based Document Project Extraction
@@ -155,9 +151,10 @@ class IntelligentProjectClusterer:
         content = document.get('content', '')
         metadata = document.get('metadata', {})
 
-        # Check cache first
-        cache_key = self._get_cache_key(content)
-        cached = self._load_from_cache(cache_key)
+        # Check cache first (keyed on subject + full content)
+        subject = metadata.get('subject', metadata.get('file_name', ''))
+        cache_content = f"{subject}\x1e{content}"
+        cached = self._load_from_cache(cache_content)
         if cached:
             return DocumentProjectInfo(
                 doc_id=doc_id,
@@ -166,7 +163,6 @@ class IntelligentProjectClusterer:
             )
 
         # Prepare content for LLM (truncate if too long)
-        subject = metadata.get('subject', metadata.get('file_name', ''))
         truncated_content = content[:3000] if len(content) > 3000 else content
 
         prompt = f"""Analyze this document and extract project information.
@@ -195,7 +191,7 @@ IMPORTANT:
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=self.EXTRACTION_MODEL,
                 messages=[
                     {"role": "system", "content": "You are a project analysis assistant. Extract project information from documents. Return only valid JSON."},
                     {"role": "user", "content": prompt}
@@ -216,7 +212,7 @@ IMPORTANT:
             result = json.loads(result_text)
 
             # Cache the result
-            self._save_to_cache(cache_key, result)
+            self._save_to_cache(cache_content, result)
 
             return DocumentProjectInfo(
                 doc_id=doc_id,
@@ -6,7 +6,7 @@ Uses LLM for understanding, graph for natural grouping.
 
 Pipeline:
 1. LLM extracts rich project signatures from content only
-2. LLM pairwise comparison (with embedding pre-filter for speed)
+2. LLM pairwise comparison (top-k embedding blocking, batched + concurrent)
 3. Graph-based community detection (Louvain algorithm)
 4. LLM cluster validation and naming
 5. LLM cross-cluster merge detection
@@ -14,12 +14,13 @@ Pipeline:
 
 import json
 import os
-import hashlib
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 import numpy as np
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pickle
 import warnings
 warnings.filterwarnings('ignore')
@@ -29,6 +30,8 @@ from sentence_transformers import SentenceTransformer
 import networkx as nx
 from networkx.algorithms import community
 
+from utils.llm_cache import get_llm_cache
+
 # Load environment
 from dotenv import load_dotenv
 load_dotenv()
@@ -67,28 +70,40 @@ class LLMFirstClusterer:
     Ignores all metadata, uses only content.
     """
 
+    # Models and prompt template versions (bump a version to invalidate cache)
+    SIGNATURE_MODEL = "gpt-4o"
+    SIGNATURE_PROMPT_VERSION = "signature-v1"
+    COMPARISON_MODEL = "gpt-4o-mini"
+    COMPARISON_PROMPT_VERSION = "comparison-v1"
+
     def __init__(
         self,
         openai_api_key: str = None,
         embedding_model: str = "all-mpnet-base-v2",
-        cache_dir: str = None
+        max_workers: int = 8,
+        comparison_batch_size: int = 8,
+        cache_path: str = None
     ):
         self.api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=self.api_key)
         self.embedding_model_name = embedding_model
         self.embedding_model = None  # Lazy load
 
+        # Comparison dispatch
+        self.max_workers = max_workers
+        self.comparison_batch_size = comparison_batch_size
+
         # Cache setup
-        if cache_dir:
-            self.cache_dir = Path(cache_dir)
-        else:
-            self.cache_dir = Path(__file__).parent.parent / "club_data" / "llm_cluster_cache"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.llm_cache = get_llm_cache(cache_path)  # Shared with the other LLM stages
 
         # Storage
         self.signatures: Dict[str, ProjectSignature] = {}
         self.similarity_matrix: Optional[np.ndarray] = None
         self.clusters: Dict[str, ProjectCluster] = {}
+        self.embeddings: Dict[str, np.ndarray] = {}
+        self.cluster_profiles: Dict[str, Dict] = {}
+        self.comparison_report: Dict = {}
+        self.incremental_report: Dict = {}
 
         print("✓ LLM-First Clusterer initialized (high-accuracy mode)")
 
@@ -99,24 +114,51 @@ class LLMFirstClusterer:
             self.embedding_model = SentenceTransformer(self.embedding_model_name)
         return self.embedding_model
 
-    def _get_cache_key(self, content: str, operation: str) -> str:
-        """Generate cache key"""
-        content_hash = hashlib.md5(content[:1000].encode()).hexdigest()
-        return f"{operation}_{content_hash}"
-
-    def _load_from_cache(self, cache_key: str) -> Optional[Dict]:
-        """Load from cache"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        return None
-
-    def _save_to_cache(self, cache_key: str, data: Dict):
-        """Save to cache"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        with open(cache_file, 'w') as f:
-            json.dump(data, f, indent=2)
+    def _pair_cache_content(
+        self,
+        sig1: ProjectSignature,
+        sig2: ProjectSignature
+    ) -> str:
+        """
+        Order-independent cache content for a signature pair.
+
+        Built from the signature content (not the doc ids), so the same pair
+        of signatures is only ever compared once regardless of order.
+        """
+        parts = sorted(
+            json.dumps(self._signature_payload(sig), sort_keys=True)
+            for sig in (sig1, sig2)
+        )
+        return "\x1e".join(parts)
+
+    def _save_comparisons(
+        self,
+        items: List[Tuple[ProjectSignature, ProjectSignature, Dict]]
+    ):
+        """Cache comparison results for (sig1, sig2, result) triples"""
+        self.llm_cache.put_many(
+            self.COMPARISON_MODEL,
+            self.COMPARISON_PROMPT_VERSION,
+            [(self._pair_cache_content(s1, s2), result) for s1, s2, result in items]
+        )
+
+    @staticmethod
+    def _signature_payload(sig: ProjectSignature) -> Dict:
+        """Content fields of a signature used for comparison prompts"""
+        return {
+            'deliverable': sig.core_deliverable,
+            'goal': sig.project_goal,
+            'entities': sig.key_entities,
+            'keywords': sig.technical_keywords,
+            'identifiers': sig.unique_identifiers,
+            'phase': sig.timeline_phase,
+            'summary': sig.content_summary
+        }
+
+    @staticmethod
+    def _signature_text(sig: ProjectSignature) -> str:
+        """Text used to embed a signature"""
+        return f"{sig.core_deliverable}. {sig.project_goal}. {' '.join(sig.key_entities)}"
 
     # =========================================================================
     # Phase 1: Deep Document Understanding
@@ -137,8 +179,9 @@ class LLMFirstClusterer:
         doc_id = document.get('doc_id', 'unknown')
 
         # Check cache
-        cache_key = self._get_cache_key(content, "signature")
-        cached = self._load_from_cache(cache_key)
+        cached = self.llm_cache.get(
+            self.SIGNATURE_MODEL, self.SIGNATURE_PROMPT_VERSION, content
+        )
         if cached:
             try:
                 return ProjectSignature(doc_id=doc_id, **cached)
@@ -173,7 +216,7 @@ Focus on CONCRETE deliverables, not vague mentions of work."""
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4o",
+                model=self.SIGNATURE_MODEL,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1,
                 response_format={"type": "json_object"}
@@ -181,10 +224,7 @@ Focus on CONCRETE deliverables, not vague mentions of work."""
 
             result = json.loads(response.choices[0].message.content)
 
-            # Cache result
-            self._save_to_cache(cache_key, result)
-
-            return ProjectSignature(
+            signature = ProjectSignature(
                 doc_id=doc_id,
                 core_deliverable=result.get('core_deliverable', ''),
                 project_goal=result.get('project_goal', ''),
@@ -197,6 +237,15 @@ Focus on CONCRETE deliverables, not vague mentions of work."""
                 is_project_work=result.get('is_project_work', True)
             )
 
+            # Cache the normalised signature (without doc_id)
+            cached = asdict(signature)
+            cached.pop('doc_id')
+            self.llm_cache.put(
+                self.SIGNATURE_MODEL, self.SIGNATURE_PROMPT_VERSION, content, cached
+            )
+
+            return signature
+
         except Exception as e:
             print(f"⚠ Extraction failed for {doc_id}: {e}")
             return ProjectSignature(
@@ -252,10 +301,12 @@ Focus on CONCRETE deliverables, not vague mentions of work."""
             Tuple of (decision, confidence, reasoning)
             decision: "YES" | "NO" | "MAYBE"
         """
-        # Create cache key from both signatures
-        content_key = f"{sig1.doc_id}_{sig2.doc_id}"
-        cache_key = self._get_cache_key(content_key, "comparison")
-        cached = self._load_from_cache(cache_key)
+        # Check cache (keyed on both signatures)
+        cached = self.llm_cache.get(
+            self.COMPARISON_MODEL,
+            self.COMPARISON_PROMPT_VERSION,
+            self._pair_cache_content(sig1, sig2)
+        )
         if cached:
             return cached['decision'], cached['confidence'], cached['reasoning']
 
@@ -297,7 +348,7 @@ Be conservative with YES (high recall). Only say NO if clearly different project
 
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Fast for comparisons
+                model=self.COMPARISON_MODEL,  # Fast for comparisons
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.0,
                 response_format={"type": "json_object"}
@@ -306,7 +357,7 @@ Be conservative with YES (high recall). Only say NO if clearly different project
             result = json.loads(response.choices[0].message.content)
 
             # Cache result
-            self._save_to_cache(cache_key, result)
+            self._save_comparisons([(sig1, sig2, result)])
 
             return (
                 result.get('decision', 'MAYBE'),
@@ -318,20 +369,181 @@ Be conservative with YES (high recall). Only say NO if clearly different project
             print(f"⚠ Comparison failed: {e}")
             return "MAYBE", 0.5, "Comparison error"
 
+    def compare_documents_batch(
+        self,
+        pairs: List[Tuple[ProjectSignature, ProjectSignature]]
+    ) -> List[Tuple[str, float, str]]:
+        """
+        Compare several document pairs in a single LLM call.
+
+        Args:
+            pairs: List of (signature, signature) tuples
+
+        Returns:
+            List of (decision, confidence, reasoning), aligned with pairs
+        """
+        if len(pairs) == 1:
+            return [self.compare_documents_llm(*pairs[0])]
+
+        pair_blocks = []
+        for n, (sig1, sig2) in enumerate(pairs, 1):
+            pair_blocks.append(
+                f"PAIR {n}:\n"
+                f"DOCUMENT A: {json.dumps(self._signature_payload(sig1))}\n"
+                f"DOCUMENT B: {json.dumps(self._signature_payload(sig2))}"
+            )
+
+        prompt = f"""For each numbered pair below, decide whether the two documents are part of the SAME project.
+
+{chr(10).join(pair_blocks)}
+
+Consider for each pair:
+- Same core deliverable? (even if worded differently)
+- Same entities/client/stakeholder?
+- Shared unique identifiers (project codes, names)?
+- Compatible timeline phases?
+- Same ultimate goal?
+
+Respond in JSON with exactly one result per pair:
+{{
+  "results": [
+    {{"pair": 1, "decision": "YES|NO|MAYBE", "confidence": 0.0-1.0, "reasoning": "Brief explanation"}}
+  ]
+}}
+
+Be conservative with YES (high recall). Only say NO if clearly different projects."""
+
+        fallback = ("MAYBE", 0.5, "Comparison error")
+        try:
+            response = self.client.chat.completions.create(
+                model=self.COMPARISON_MODEL,  # Fast for comparisons
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0,
+                response_format={"type": "json_object"}
+            )
+
+            result = json.loads(response.choices[0].message.content)
+            by_pair = {}
+            for item in result.get('results', []):
+                try:
+                    by_pair[int(item.get('pair'))] = item
+                except (TypeError, ValueError):
+                    continue
+
+            decisions = []
+            to_cache = []
+            for n, (sig1, sig2) in enumerate(pairs, 1):
+                item = by_pair.get(n)
+                if item is None:
+                    decisions.append(fallback)
+                    continue
+
+                cached = {
+                    'decision': item.get('decision', 'MAYBE'),
+                    'confidence': item.get('confidence', 0.5),
+                    'reasoning': item.get('reasoning', '')
+                }
+                to_cache.append((sig1, sig2, cached))
+                decisions.append(
+                    (cached['decision'], cached['confidence'], cached['reasoning'])
+                )
+
+            self._save_comparisons(to_cache)
+            return decisions
+
+        except Exception as e:
+            print(f"⚠ Batch comparison failed: {e}")
+            return [fallback] * len(pairs)
+
+    def embed_signatures(self, signatures: List[ProjectSignature]) -> np.ndarray:
+        """
+        Embed signatures and return L2-normalised vectors.
+
+        Embeddings are kept in self.embeddings keyed by doc_id; documents
+        that already have one (e.g. loaded from saved state) are not re-encoded.
+        """
+        missing = [s for s in signatures if s.doc_id not in self.embeddings]
+        if missing:
+            model = self._get_embedding_model()
+            texts = [self._signature_text(s) for s in missing]
+            embeddings = np.asarray(
+                model.encode(texts, show_progress_bar=False),
+                dtype=np.float32
+            )
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            embeddings = embeddings / norms
+
+            for sig, emb in zip(missing, embeddings):
+                self.embeddings[sig.doc_id] = emb
+
+        return np.stack([self.embeddings[s.doc_id] for s in signatures])
+
+    @staticmethod
+    def find_candidate_pairs(
+        embeddings: np.ndarray,
+        top_k: int = 20,
+        threshold: float = 0.6,
+        block_size: int = 1024,
+        query_rows: Optional[List[int]] = None
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Top-k neighbour blocking over normalised embeddings.
+
+        Similarities are computed one block of query rows at a time, so
+        memory is O(block_size * N) instead of a dense N x N matrix.
+
+        Args:
+            embeddings: L2-normalised vectors, one per row
+            top_k: Neighbours kept per query row
+            threshold: Min similarity for a candidate pair
+            block_size: Query rows per block
+            query_rows: Rows to find neighbours for (default: all rows)
+
+        Returns:
+            Sorted list of (i, j, similarity) with i < j
+        """
+        n = len(embeddings)
+        if n < 2:
+            return []
+
+        rows_to_query = np.arange(n) if query_rows is None else np.asarray(query_rows, dtype=int)
+        k = min(top_k, n - 1)
+        candidates: Dict[Tuple[int, int], float] = {}
+
+        for start in range(0, len(rows_to_query), block_size):
+            block_rows = rows_to_query[start:start + block_size]
+            sims = embeddings[block_rows] @ embeddings.T
+            sims[np.arange(len(block_rows)), block_rows] = -np.inf  # Exclude self-matches
+
+            neighbours = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            for row, cols in enumerate(neighbours):
+                i = int(block_rows[row])
+                for j in cols:
+                    sim = float(sims[row, j])
+                    if sim < threshold:
+                        continue
+                    pair = (i, int(j)) if i < j else (int(j), i)
+                    candidates[pair] = sim
+
+        return sorted((i, j, sim) for (i, j), sim in candidates.items())
+
     def build_similarity_graph(
         self,
         signatures: List[ProjectSignature],
         embedding_threshold: float = 0.6,
-        llm_threshold: float = 0.5
+        llm_threshold: float = 0.5,
+        top_k: int = 20
     ) -> nx.Graph:
         """
         Build graph where edges connect documents in same project.
-        Uses embedding pre-filter + LLM comparison.
+        Uses top-k embedding blocking + batched, concurrent LLM comparison.
 
         Args:
             signatures: List of project signatures
             embedding_threshold: Min embedding similarity to do LLM comparison
             llm_threshold: Min LLM confidence to add edge
+            top_k: Nearest neighbours considered per document
 
         Returns:
             NetworkX graph
@@ -341,72 +553,108 @@ Be conservative with YES (high recall). Only say NO if clearly different project
         print(f"{'='*70}")
         print(f"Building similarity graph for {len(signatures)} documents...")
 
-        # Create embeddings for pre-filtering
-        model = self._get_embedding_model()
-        texts = [
-            f"{s.core_deliverable}. {s.project_goal}. {' '.join(s.key_entities)}"
-            for s in signatures
-        ]
-        print("  Computing embeddings...")
-        embeddings = model.encode(texts, show_progress_bar=False)
+        started = time.time()
 
-        # Compute embedding similarities
-        print("  Computing embedding similarities...")
-        from sklearn.metrics.pairwise import cosine_similarity
-        embedding_sim = cosine_similarity(embeddings)
+        print("  Computing embeddings...")
+        embeddings = self.embed_signatures(signatures)
 
         # Build graph
         G = nx.Graph()
-        for i, sig in enumerate(signatures):
+        for sig in signatures:
             G.add_node(sig.doc_id, signature=sig)
 
-        # Only do LLM comparison for pairs above embedding threshold
         total_pairs = len(signatures) * (len(signatures) - 1) // 2
-        candidate_pairs = 0
-        llm_comparisons = 0
-        edges_added = 0
-
         print(f"  Total possible pairs: {total_pairs}")
-        print(f"  Filtering with embedding threshold: {embedding_threshold}")
-
-        for i in range(len(signatures)):
-            for j in range(i + 1, len(signatures)):
-                candidate_pairs += 1
-
-                # Pre-filter with embeddings
-                if embedding_sim[i][j] < embedding_threshold:
-                    continue
+        print(f"  Top-{top_k} neighbour blocking, threshold: {embedding_threshold}")
 
-                # Do LLM comparison
-                llm_comparisons += 1
-                if llm_comparisons % 50 == 0:
-                    print(f"    LLM comparisons: {llm_comparisons}...")
+        candidates = self.find_candidate_pairs(
+            embeddings,
+            top_k=top_k,
+            threshold=embedding_threshold
+        )
 
-                decision, confidence, reasoning = self.compare_documents_llm(
-                    signatures[i],
-                    signatures[j]
+        # Serve what we can from cache, batch the rest
+        results: Dict[Tuple[int, int], Tuple[str, float, str]] = {}
+        pending = []
+        pair_contents = {
+            (i, j): self._pair_cache_content(signatures[i], signatures[j])
+            for i, j, _ in candidates
+        }
+        cached_results = self.llm_cache.get_many(
+            self.COMPARISON_MODEL,
+            self.COMPARISON_PROMPT_VERSION,
+            pair_contents.values()
+        )
+        for (i, j), pair_content in pair_contents.items():
+            cached = cached_results.get(self.llm_cache.content_hash(pair_content))
+            if cached:
+                results[(i, j)] = (
+                    cached['decision'], cached['confidence'], cached['reasoning']
                 )
+            else:
+                pending.append((i, j))
+
+        cache_hits = len(results)
+        batch_size = max(1, self.comparison_batch_size)
+        batches = [pending[b:b + batch_size] for b in range(0, len(pending), batch_size)]
+
+        print(f"  Candidate pairs: {len(candidates)} ({cache_hits} cached)")
+        print(f"  Dispatching {len(batches)} LLM calls across {self.max_workers} workers...")
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self.compare_documents_batch,
+                        [(signatures[i], signatures[j]) for i, j in batch]
+                    ): batch
+                    for batch in batches
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    batch = futures[future]
+                    for pair, decision in zip(batch, future.result()):
+                        results[pair] = decision
+                    if done % 50 == 0:
+                        print(f"    LLM calls completed: {done}/{len(batches)}...")
 
-                # Add edge based on decision
-                edge_weight = 0.0
-                if decision == "YES":
-                    edge_weight = confidence
-                elif decision == "MAYBE":
-                    edge_weight = confidence * 0.5
-
-                if edge_weight >= llm_threshold:
-                    G.add_edge(
-                        signatures[i].doc_id,
-                        signatures[j].doc_id,
-                        weight=edge_weight,
-                        decision=decision,
-                        reasoning=reasoning
-                    )
-                    edges_added += 1
+        edges_added = 0
+        for (i, j), (decision, confidence, reasoning) in results.items():
+            # Add edge based on decision
+            edge_weight = 0.0
+            if decision == "YES":
+                edge_weight = confidence
+            elif decision == "MAYBE":
+                edge_weight = confidence * 0.5
+
+            if edge_weight >= llm_threshold:
+                G.add_edge(
+                    signatures[i].doc_id,
+                    signatures[j].doc_id,
+                    weight=edge_weight,
+                    decision=decision,
+                    reasoning=reasoning
+                )
+                edges_added += 1
+
+        self.comparison_report = {
+            'documents': len(signatures),
+            'total_pairs': total_pairs,
+            'top_k': top_k,
+            'embedding_threshold': embedding_threshold,
+            'candidate_pairs': len(candidates),
+            'cache_hits': cache_hits,
+            'pairs_sent_to_llm': len(pending),
+            'llm_calls': len(batches),
+            'comparisons_saved': total_pairs - len(pending),
+            'edges_added': edges_added,
+            'elapsed_seconds': round(time.time() - started, 2),
+            'llm_cache': self.llm_cache.stats()
+        }
 
         print(f"✓ Graph built")
-        print(f"  - Candidate pairs (embedding > {embedding_threshold}): {llm_comparisons}")
-        print(f"  - LLM comparisons performed: {llm_comparisons}")
+        print(f"  - Candidate pairs (top-{top_k}, embedding > {embedding_threshold}): {len(candidates)}")
+        print(f"  - Pairs compared by LLM: {len(pending)} in {len(batches)} calls")
+        print(f"  - Comparisons saved vs. all pairs: {total_pairs - len(pending)}")
         print(f"  - Edges added: {edges_added}")
         print(f"  - Nodes: {G.number_of_nodes()}, Edges: {G.number_of_edges()}")
 
@@ -587,43 +835,117 @@ Respond in JSON:
     # Phase 5: Cross-Cluster Merge Detection
     # =========================================================================
 
-    def detect_cluster_merges(
+    def compute_cluster_profiles(
+        self,
+        clusters: Dict[str, ProjectCluster]
+    ) -> Dict[str, Dict]:
+        """
+        Precompute a centroid embedding and entity set per cluster.
+
+        Profiles are cached in self.cluster_profiles and only recomputed when
+        a cluster's document set changes.
+
+        Returns:
+            Dict of cluster_id -> {'centroid', 'entities', 'doc_ids'}
+        """
+        missing = [
+            sig
+            for cluster in clusters.values()
+            for sig in cluster.signatures
+            if sig.doc_id not in self.embeddings
+        ]
+        if missing:
+            self.embed_signatures(missing)
+
+        for cluster_id, cluster in clusters.items():
+            doc_ids = frozenset(cluster.document_ids)
+            profile = self.cluster_profiles.get(cluster_id)
+            if profile and profile['doc_ids'] == doc_ids:
+                continue
+
+            vectors = [self.embeddings[s.doc_id] for s in cluster.signatures]
+            centroid = np.mean(vectors, axis=0)
+            norm = np.linalg.norm(centroid)
+            if norm > 0:
+                centroid = centroid / norm
+
+            self.cluster_profiles[cluster_id] = {
+                'centroid': centroid.astype(np.float32),
+                'entities': sorted({e for s in cluster.signatures for e in s.key_entities}),
+                'doc_ids': doc_ids
+            }
+
+        return {cid: self.cluster_profiles[cid] for cid in clusters}
+
+    def find_merge_candidates(
         self,
         clusters: Dict[str, ProjectCluster],
-        merge_threshold: float = 0.85
+        top_k: int = 5,
+        min_similarity: float = 0.5,
+        new_cluster_ids: Optional[List[str]] = None
     ) -> List[Tuple[str, str, float]]:
         """
-        Detect if any clusters should be merged.
+        Select the top-k most similar cluster pairs by centroid similarity.
+
+        Args:
+            clusters: Clusters to consider
+            top_k: Nearest clusters considered per cluster
+            min_similarity: Min centroid similarity to send a pair to the LLM
+            new_cluster_ids: If given, only pairs involving these clusters
 
         Returns:
-            List of (cluster_id1, cluster_id2, confidence) tuples to merge
+            List of (cluster_id1, cluster_id2, similarity)
         """
-        print(f"\n{'='*70}")
-        print("PHASE 5: Cross-Cluster Merge Detection")
-        print(f"{'='*70}")
-
+        profiles = self.compute_cluster_profiles(clusters)
         cluster_ids = list(clusters.keys())
-        merges = []
+        if len(cluster_ids) < 2:
+            return []
+
+        centroids = np.stack([profiles[cid]['centroid'] for cid in cluster_ids])
+
+        query_rows = None
+        if new_cluster_ids is not None:
+            # Incremental: only compare new clusters against everything else
+            index = {cid: i for i, cid in enumerate(cluster_ids)}
+            query_rows = [index[cid] for cid in new_cluster_ids if cid in index]
+            if not query_rows:
+                return []
+
+        pairs = self.find_candidate_pairs(
+            centroids,
+            top_k=top_k,
+            threshold=min_similarity,
+            query_rows=query_rows
+        )
+        return [(cluster_ids[i], cluster_ids[j], sim) for i, j, sim in pairs]
 
-        print(f"  Comparing {len(cluster_ids)} clusters...")
+    def compare_clusters_llm(
+        self,
+        c1: ProjectCluster,
+        c2: ProjectCluster
+    ) -> Tuple[bool, float, str]:
+        """
+        Ask the LLM whether two clusters are the same project.
 
-        for i in range(len(cluster_ids)):
-            for j in range(i + 1, len(cluster_ids)):
-                c1 = clusters[cluster_ids[i]]
-                c2 = clusters[cluster_ids[j]]
+        Uses the precomputed entity sets from self.cluster_profiles.
+
+        Returns:
+            Tuple of (should_merge, confidence, reasoning)
+        """
+        entities1 = self.cluster_profiles[c1.id]['entities'][:50]
+        entities2 = self.cluster_profiles[c2.id]['entities'][:50]
 
-                # Ask LLM if these should merge
-                prompt = f"""Are these two detected projects actually the SAME project?
+        prompt = f"""Are these two detected projects actually the SAME project?
 
 PROJECT A: {c1.name}
 Description: {c1.description}
 Documents: {len(c1.document_ids)}
-Key entities: {set([e for s in c1.signatures for e in s.key_entities])}
+Key entities: {', '.join(entities1)}
 
 PROJECT B: {c2.name}
 Description: {c2.description}
 Documents: {len(c2.document_ids)}
-Key entities: {set([e for s in c2.signatures for e in s.key_entities])}
+Key entities: {', '.join(entities2)}
 
 Respond in JSON:
 {{
@@ -632,26 +954,87 @@ Respond in JSON:
   "reasoning": "Why they should/shouldn't merge"
 }}"""
 
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.0,
-                        response_format={"type": "json_object"}
-                    )
-
-                    result = json.loads(response.choices[0].message.content)
-
-                    if result.get('should_merge', False):
-                        confidence = result.get('confidence', 0.0)
-                        if confidence >= merge_threshold:
-                            merges.append((cluster_ids[i], cluster_ids[j], confidence))
-                            print(f"  ✓ Merge detected: {c1.name} ← {c2.name} ({confidence:.2f})")
-
-                except Exception as e:
-                    print(f"⚠ Merge comparison failed: {e}")
-                    continue
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.0,
+                response_format={"type": "json_object"}
+            )
+
+            result = json.loads(response.choices[0].message.content)
+
+            return (
+                bool(result.get('should_merge', False)),
+                result.get('confidence', 0.0),
+                result.get('reasoning', '')
+            )
+
+        except Exception as e:
+            print(f"⚠ Merge comparison failed: {e}")
+            return False, 0.0, "Comparison error"
+
+    def detect_cluster_merges(
+        self,
+        clusters: Dict[str, ProjectCluster],
+        merge_threshold: float = 0.85,
+        top_k: int = 5,
+        min_similarity: float = 0.5,
+        new_cluster_ids: Optional[List[str]] = None
+    ) -> List[Tuple[str, str, float]]:
+        """
+        Detect if any clusters should be merged.
+
+        Only the top-k most similar cluster pairs (by centroid embedding) are
+        sent to the LLM, and those comparisons run concurrently.
+
+        Args:
+            clusters: Validated clusters
+            merge_threshold: Min LLM confidence to merge
+            top_k: Nearest clusters compared per cluster
+            min_similarity: Min centroid similarity to compare a pair
+            new_cluster_ids: Only check these clusters against the rest
+                (incremental merge check after a sync)
+
+        Returns:
+            List of (cluster_id1, cluster_id2, confidence) tuples to merge
+        """
+        print(f"\n{'='*70}")
+        print("PHASE 5: Cross-Cluster Merge Detection")
+        print(f"{'='*70}")
 
+        candidates = self.find_merge_candidates(
+            clusters,
+            top_k=top_k,
+            min_similarity=min_similarity,
+            new_cluster_ids=new_cluster_ids
+        )
+        merges = []
+
+        scope = f"{len(new_cluster_ids)} new" if new_cluster_ids is not None else "all"
+        print(f"  Comparing {len(candidates)} candidate pairs ({scope} of {len(clusters)} clusters)...")
+
+        if not candidates:
+            print(f"✓ Detected 0 potential merges")
+            return merges
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.compare_clusters_llm,
+                    clusters[cid1],
+                    clusters[cid2]
+                ): (cid1, cid2)
+                for cid1, cid2, _ in candidates
+            }
+            for future in as_completed(futures):
+                cid1, cid2 = futures[future]
+                should_merge, confidence, _ = future.result()
+                if should_merge and confidence >= merge_threshold:
+                    merges.append((cid1, cid2, confidence))
+                    print(f"  ✓ Merge detected: {clusters[cid1].name} ← {clusters[cid2].name} ({confidence:.2f})")
+
+        merges.sort()
         print(f"✓ Detected {len(merges)} potential merges")
 
         return merges
@@ -667,7 +1050,10 @@ Respond in JSON:
 
         print(f"\n  Executing {len(merges)} merges...")
 
-        # Build merge groups using union-find
+        # Build merge groups using union-find. The root is always the
+        # earliest cluster (existing projects precede new ones), so merging
+        # never renames a project that already exists.
+        order = {cid: i for i, cid in enumerate(clusters)}
         parent = {}
 
         def find(x):
@@ -680,7 +1066,9 @@ Respond in JSON:
         def union(x, y):
             px, py = find(x), find(y)
             if px != py:
-                parent[px] = py
+                if order[py] < order[px]:
+                    px, py = py, px
+                parent[py] = px
 
         # Apply all merges
         for c1, c2, _ in merges:
@@ -706,8 +1094,8 @@ Respond in JSON:
                     all_docs.extend(clusters[cid].document_ids)
                     all_sigs.extend(clusters[cid].signatures)
 
-                # Use first cluster's name (or re-validate)
-                primary = clusters[cluster_ids[0]]
+                # Keep the root (first) cluster's name
+                primary = clusters[root]
 
                 merged[root] = ProjectCluster(
                     id=root,
@@ -719,10 +1107,280 @@ Respond in JSON:
                     validation_status="validated"
                 )
 
+                # Absorbed clusters no longer exist; root profile is stale
+                for cid in cluster_ids:
+                    self.cluster_profiles.pop(cid, None)
+
         print(f"✓ Merged {len(clusters)} → {len(merged)} final clusters")
 
         return merged
 
+    # =========================================================================
+    # Incremental Clustering
+    # =========================================================================
+
+    def _next_cluster_ids(self, count: int) -> List[str]:
+        """Allocate cluster ids that don't collide with existing clusters"""
+        used = [
+            int(cid.rsplit('_', 1)[1])
+            for cid in self.clusters
+            if cid.startswith('cluster_') and cid.rsplit('_', 1)[1].isdigit()
+        ]
+        start = max(used) + 1 if used else 0
+        return [f"cluster_{start + i}" for i in range(count)]
+
+    def load_state(self, state_dir: str) -> bool:
+        """
+        Load signatures, embeddings and clusters written by save_results.
+
+        Args:
+            state_dir: Directory passed to save_results
+
+        Returns:
+            True if a previous clustering was loaded
+        """
+        state_path = Path(state_dir)
+        signatures_file = state_path / "project_signatures.json"
+        clusters_file = state_path / "canonical_projects.json"
+        embeddings_file = state_path / "cluster_state.npz"
+
+        if not (signatures_file.exists() and clusters_file.exists()):
+            return False
+
+        try:
+            with open(signatures_file, 'r') as f:
+                signatures = {k: ProjectSignature(**v) for k, v in json.load(f).items()}
+            with open(clusters_file, 'r') as f:
+                clusters_data = json.load(f)
+        except (json.JSONDecodeError, TypeError) as e:
+            print(f"⚠ Could not load clustering state: {e}")
+            return False
+
+        self.signatures.update(signatures)
+
+        for cluster_id, data in clusters_data.items():
+            doc_ids = [d for d in data.get('document_ids', []) if d in self.signatures]
+            if not doc_ids:
+                continue
+            self.clusters[cluster_id] = ProjectCluster(
+                id=data.get('id', cluster_id),
+                name=data.get('name', 'Unknown Project'),
+                description=data.get('description', ''),
+                document_ids=doc_ids,
+                signatures=[self.signatures[d] for d in doc_ids],
+                confidence=data.get('confidence', 0.0),
+                validation_status=data.get('validation_status', 'validated')
+            )
+
+        if embeddings_file.exists():
+            state = np.load(embeddings_file, allow_pickle=False)
+            for doc_id, emb in zip(state['doc_ids'], state['embeddings']):
+                self.embeddings[str(doc_id)] = emb
+
+            for cluster_id, centroid in zip(state['cluster_ids'], state['centroids']):
+                cluster = self.clusters.get(str(cluster_id))
+                if cluster is None:
+                    continue
+                self.cluster_profiles[cluster.id] = {
+                    'centroid': centroid,
+                    'entities': sorted({e for s in cluster.signatures for e in s.key_entities}),
+                    'doc_ids': frozenset(cluster.document_ids)
+                }
+
+        print(f"✓ Loaded clustering state: {len(self.clusters)} clusters, "
+              f"{len(self.signatures)} signatures, {len(self.embeddings)} embeddings")
+
+        return bool(self.clusters)
+
+    def assign_to_clusters(
+        self,
+        signatures: List[ProjectSignature],
+        auto_assign_threshold: float = 0.8,
+        confirm_threshold: float = 0.6,
+        llm_threshold: float = 0.5
+    ) -> Tuple[Dict[str, List[ProjectSignature]], List[ProjectSignature]]:
+        """
+        Assign new signatures to existing clusters by nearest centroid.
+
+        Documents whose nearest centroid is above auto_assign_threshold are
+        assigned directly. Those between confirm_threshold and
+        auto_assign_threshold are confirmed by the LLM against the closest
+        member of the candidate cluster (batched). Everything else is an
+        outlier.
+
+        Returns:
+            Tuple of (cluster_id -> assigned signatures, outlier signatures)
+        """
+        assignments: Dict[str, List[ProjectSignature]] = defaultdict(list)
+        outliers: List[ProjectSignature] = []
+
+        profiles = self.compute_cluster_profiles(self.clusters)
+        cluster_ids = list(profiles.keys())
+        if not cluster_ids:
+            return {}, list(signatures)
+
+        centroids = np.stack([profiles[cid]['centroid'] for cid in cluster_ids])
+        embeddings = self.embed_signatures(signatures)
+        sims = embeddings @ centroids.T
+        best = np.argmax(sims, axis=1)
+
+        to_confirm = []
+        auto_assigned = 0
+        confirmed = 0
+        for row, sig in enumerate(signatures):
+            cluster_id = cluster_ids[best[row]]
+            sim = float(sims[row, best[row]])
+
+            if sim >= auto_assign_threshold:
+                assignments[cluster_id].append(sig)
+                auto_assigned += 1
+            elif sim >= confirm_threshold:
+                members = self.clusters[cluster_id].signatures
+                member_sims = np.stack([self.embeddings[m.doc_id] for m in members]) @ embeddings[row]
+                to_confirm.append((sig, cluster_id, members[int(np.argmax(member_sims))]))
+            else:
+                outliers.append(sig)
+
+        confirmation_calls = 0
+        if to_confirm:
+            batch_size = max(1, self.comparison_batch_size)
+            batches = [to_confirm[b:b + batch_size] for b in range(0, len(to_confirm), batch_size)]
+            confirmation_calls = len(batches)
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        self.compare_documents_batch,
+                        [(sig, member) for sig, _, member in batch]
+                    ): batch
+                    for batch in batches
+                }
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    for (sig, cluster_id, _), (decision, confidence, _) in zip(batch, future.result()):
+                        if decision == "YES" and confidence >= llm_threshold:
+                            assignments[cluster_id].append(sig)
+                            confirmed += 1
+                        else:
+                            outliers.append(sig)
+
+        self.incremental_report.update({
+            'auto_assigned': auto_assigned,
+            'sent_for_confirmation': len(to_confirm),
+            'confirmed': confirmed,
+            'confirmation_llm_calls': confirmation_calls,
+            'outliers': len(outliers)
+        })
+
+        return dict(assignments), outliers
+
+    def process_new_documents(
+        self,
+        documents: List[Dict],
+        auto_assign_threshold: float = 0.8,
+        confirm_threshold: float = 0.6,
+        embedding_threshold: float = 0.6,
+        llm_threshold: float = 0.5,
+        merge_threshold: float = 0.85,
+        top_k: int = 20
+    ) -> Dict[str, ProjectCluster]:
+        """
+        Incrementally cluster newly synced documents into existing projects.
+
+        Requires existing clusters (see load_state); falls back to the full
+        pipeline otherwise. Documents already clustered are skipped, new ones
+        are assigned by nearest centroid (with LLM confirmation near the
+        boundary), and only outliers go through graph clustering. New
+        clusters are then merge-checked against the existing ones.
+
+        Args:
+            documents: List of dicts with 'content' and 'doc_id'
+            auto_assign_threshold: Centroid similarity to assign without LLM
+            confirm_threshold: Centroid similarity to ask the LLM
+            embedding_threshold: Pre-filter threshold for outlier clustering
+            llm_threshold: Min LLM confidence to connect documents
+            merge_threshold: Min confidence to merge clusters
+            top_k: Nearest neighbours compared per outlier
+
+        Returns:
+            Dict of cluster_id -> ProjectCluster (all projects, not just new)
+        """
+        if not self.clusters:
+            return self.process_documents(
+                documents,
+                embedding_threshold=embedding_threshold,
+                llm_threshold=llm_threshold,
+                merge_threshold=merge_threshold,
+                top_k=top_k
+            )
+
+        print("\n" + "="*70)
+        print("INCREMENTAL PROJECT CLUSTERING")
+        print("="*70)
+
+        new_docs = [d for d in documents if d.get('doc_id', 'unknown') not in self.signatures]
+        self.incremental_report = {
+            'documents_received': len(documents),
+            'already_clustered': len(documents) - len(new_docs)
+        }
+
+        if not new_docs:
+            print("✓ No new documents to cluster")
+            return self.clusters
+
+        signatures = self.extract_all_signatures(new_docs)
+        if not signatures:
+            print("⚠ No project work detected in new documents")
+            return self.clusters
+
+        assignments, outliers = self.assign_to_clusters(
+            signatures,
+            auto_assign_threshold=auto_assign_threshold,
+            confirm_threshold=confirm_threshold,
+            llm_threshold=llm_threshold
+        )
+
+        for cluster_id, sigs in assignments.items():
+            cluster = self.clusters[cluster_id]
+            cluster.document_ids = cluster.document_ids + [s.doc_id for s in sigs]
+            cluster.signatures = cluster.signatures + sigs
+
+        print(f"✓ Assigned {sum(len(v) for v in assignments.values())} documents "
+              f"to {len(assignments)} existing projects, {len(outliers)} outliers")
+
+        new_cluster_ids: List[str] = []
+        if outliers:
+            G = self.build_similarity_graph(
+                outliers,
+                embedding_threshold=embedding_threshold,
+                llm_threshold=llm_threshold,
+                top_k=top_k
+            )
+            communities = self.detect_project_communities(G)
+            new_cluster_ids = self._next_cluster_ids(len(communities))
+            renamed = dict(zip(new_cluster_ids, communities.values()))
+
+            self.validate_all_clusters(renamed)
+
+            merges = self.detect_cluster_merges(
+                self.clusters,
+                merge_threshold,
+                new_cluster_ids=new_cluster_ids
+            )
+            self.clusters = self.merge_clusters(self.clusters, merges)
+
+        # New clusters merged into an existing project keep its id, so only
+        # the unmerged ones are still present
+        self.incremental_report['new_clusters'] = len(
+            [cid for cid in new_cluster_ids if cid in self.clusters]
+        )
+
+        print(f"\n{'='*70}")
+        print(f"INCREMENTAL CLUSTERING COMPLETE - {len(self.clusters)} projects")
+        print(f"{'='*70}")
+
+        return self.clusters
+
     # =========================================================================
     # Main Pipeline
     # =========================================================================
@@ -732,7 +1390,8 @@ Respond in JSON:
         documents: List[Dict],
         embedding_threshold: float = 0.6,
         llm_threshold: float = 0.5,
-        merge_threshold: float = 0.85
+        merge_threshold: float = 0.85,
+        top_k: int = 20
     ) -> Dict[str, ProjectCluster]:
         """
         Complete high-accuracy clustering pipeline.
@@ -742,6 +1401,7 @@ Respond in JSON:
             embedding_threshold: Pre-filter threshold
             llm_threshold: Min confidence to connect documents
             merge_threshold: Min confidence to merge clusters
+            top_k: Nearest neighbours compared per document
 
         Returns:
             Dict of cluster_id -> ProjectCluster
@@ -761,7 +1421,8 @@ Respond in JSON:
         G = self.build_similarity_graph(
             signatures,
             embedding_threshold=embedding_threshold,
-            llm_threshold=llm_threshold
+            llm_threshold=llm_threshold,
+            top_k=top_k
         )
 
         # Phase 3: Detect communities
@@ -812,9 +1473,31 @@ Respond in JSON:
         with open(clusters_file, 'w') as f:
             json.dump(clusters_data, f, indent=2)
 
+        # Save comparison report
+        report_file = output_path / "comparison_report.json"
+        with open(report_file, 'w') as f:
+            json.dump(self.comparison_report, f, indent=2)
+
+        # Save embeddings and centroids for incremental runs
+        state_file = output_path / "cluster_state.npz"
+        profiles = self.compute_cluster_profiles(self.clusters) if self.clusters else {}
+        doc_ids = list(self.embeddings.keys())
+        dim = len(next(iter(self.embeddings.values()))) if self.embeddings else 0
+        np.savez(
+            state_file,
+            doc_ids=np.array(doc_ids, dtype=str),
+            embeddings=(np.stack([self.embeddings[d] for d in doc_ids])
+                        if doc_ids else np.zeros((0, dim), dtype=np.float32)),
+            cluster_ids=np.array(list(profiles.keys()), dtype=str),
+            centroids=(np.stack([p['centroid'] for p in profiles.values()])
+                       if profiles else np.zeros((0, dim), dtype=np.float32))
+        )
+
         print(f"\n✓ Results saved to {output_dir}")
         print(f"  - Signatures: {signatures_file}")
         print(f"  - Clusters: {clusters_file}")
+        print(f"  - Comparison report: {report_file}")
+        print(f"  - Clustering state: {state_file}")
 
     def get_project_summary(self) -> Dict:
         """Get summary statistics"""
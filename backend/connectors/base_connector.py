@@ -1,14 +1,19 @@
 """
 Base Connector Class
 Abstract base class for all data source connectors.
+
+stream() yields documents as an async iterator while the connector is
+still fetching, through a bounded buffer (see connectors/ingestion_pipeline.py).
 """
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, Callable, List, Dict, Optional, Any
 from enum import Enum
+import asyncio
 import json
+import threading
 
 
 class ConnectorStatus(Enum):
@@ -104,6 +109,13 @@ class Document:
         )
 
 
+class SyncCancelled(Exception):
+    """Raised inside a streaming sync when the consumer stopped reading"""
+
+
+_END_OF_STREAM = object()
+
+
 class BaseConnector(ABC):
     """
     Abstract base class for data source connectors.
@@ -119,6 +131,9 @@ class BaseConnector(ABC):
         self.status = ConnectorStatus.DISCONNECTED
         self.last_error: Optional[str] = None
         self.sync_stats: Dict[str, Any] = {}
+        # Persists self.config mid-sync (set by ConnectorManager); only
+        # stream() calls it, sync() leaves saving to its caller
+        self.checkpoint_hook: Optional[Callable[[], None]] = None
 
     @abstractmethod
     async def connect(self) -> bool:
@@ -163,6 +178,71 @@ class BaseConnector(ABC):
         """
         pass
 
+    def _sync_streaming(self, since: Optional[datetime], emit: Callable[[List[Document]], None]):
+        """
+        Blocking sync that hands documents to emit() as they are fetched.
+        Override to make stream() incremental; emit() blocks while the
+        consumer is behind and raises SyncCancelled if it stopped.
+        The default runs the batch sync() and emits its result at once.
+        """
+        emit(asyncio.run(self.sync(since)))
+
+    async def ensure_connected(self) -> bool:
+        """Connect if needed; True when ready to sync"""
+        if self.status not in (ConnectorStatus.CONNECTED, ConnectorStatus.SYNCING):
+            await self.connect()
+        return self.status == ConnectorStatus.CONNECTED
+
+    async def stream(
+        self,
+        since: Optional[datetime] = None,
+        max_buffered: int = 256
+    ) -> AsyncIterator[Document]:
+        """
+        Sync documents as an async iterator
+
+        Connectors implementing _sync_streaming() yield each document as
+        soon as it is fetched, holding at most `max_buffered` unread;
+        others yield the result of sync().
+        """
+        if type(self)._sync_streaming is BaseConnector._sync_streaming:
+            for document in await self.sync(since):
+                yield document
+            return
+
+        if not await self.ensure_connected():
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+        closed = threading.Event()
+
+        def emit(documents: List[Document]):
+            for document in documents:
+                if closed.is_set():
+                    raise SyncCancelled("stream consumer stopped")
+                asyncio.run_coroutine_threadsafe(queue.put(document), loop).result()
+
+        def produce():
+            try:
+                self._sync_streaming(since, emit)
+            finally:
+                if not closed.is_set():
+                    asyncio.run_coroutine_threadsafe(queue.put(_END_OF_STREAM), loop)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                document = await queue.get()
+                if document is _END_OF_STREAM:
+                    break
+                yield document
+            await producer
+        finally:
+            closed.set()
+            while not queue.empty():  # Unblock a producer waiting on a full queue
+                queue.get_nowait()
+
     @classmethod
     def get_auth_url(cls, redirect_uri: str, state: str) -> str:
         """
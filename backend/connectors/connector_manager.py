@@ -3,8 +3,11 @@ Connector Manager
 Manages all data source connectors for knowledge capture.
 """
 
+import copy
 import json
+import os
 import pickle
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Type
@@ -41,6 +44,7 @@ class ConnectorManager:
 
         self.connectors: Dict[str, BaseConnector] = {}  # user_id_type -> connector
         self.sync_history: List[Dict] = []
+        self._config_lock = threading.Lock()  # Checkpoints save from sync threads
 
     def get_connector_id(self, user_id: str, connector_type: str) -> str:
         """Generate unique connector ID"""
@@ -143,7 +147,7 @@ class ConnectorManager:
             }
 
         # Store connector
-        self.connectors[connector_id] = connector
+        self._attach(connector_id, connector)
 
         # Save config
         self._save_config(connector_id, config)
@@ -229,6 +233,91 @@ class ConnectorManager:
 
             return {"success": False, "error": str(e)}
 
+    async def ingest_connector(
+        self,
+        user_id: str,
+        connector_type: str,
+        pipeline,
+        since: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Stream a connector's sync through an IngestionPipeline (sanitize,
+        classify, chunk, embed, index) instead of collecting it in memory
+
+        Sync cursors are only saved once the pipeline has drained without
+        errors; if any stage dropped items or the pipeline itself failed,
+        the connector's cursors and last_sync are rolled back so the next
+        run fetches them again.
+        """
+        connector_id = self.get_connector_id(user_id, connector_type)
+
+        if connector_id not in self.connectors:
+            return {"success": False, "error": "Connector not found"}
+
+        connector = self.connectors[connector_id]
+        settings_before = copy.deepcopy(connector.config.settings)
+        last_sync_before = connector.config.last_sync
+
+        # No mid-sync checkpoints: a cursor saved while its documents are
+        # still in the pipeline would outlive them if a later stage fails
+        checkpoint_hook, connector.checkpoint_hook = connector.checkpoint_hook, None
+        stats = None
+
+        def roll_back():
+            connector.config.settings = settings_before
+            connector.config.last_sync = last_sync_before
+            self._save_config(connector_id, connector.config)
+
+        try:
+            try:
+                stats = await pipeline.run(connector.stream(since))
+            except BaseException:
+                # Cursors advanced for documents the pipeline never stored
+                roll_back()
+                raise
+            finally:
+                connector.checkpoint_hook = checkpoint_hook
+
+            failed = stats["items_failed"]
+            if failed:
+                roll_back()
+                raise RuntimeError(
+                    f"{failed} items failed in the ingestion pipeline; sync cursor not advanced"
+                )
+
+            if connector.status == ConnectorStatus.ERROR:
+                self._save_config(connector_id, connector.config)  # Cursors of sources that finished
+                raise RuntimeError(connector.last_error)
+
+            connector.config.last_sync = datetime.now()
+            self._save_config(connector_id, connector.config)
+
+            self.sync_history.append({
+                "connector_id": connector_id,
+                "user_id": user_id,
+                "connector_type": connector_type,
+                "timestamp": datetime.now().isoformat(),
+                "documents_synced": stats["items_read"],
+                "success": True
+            })
+
+            return {"success": True, "stats": stats, "sync_time": datetime.now().isoformat()}
+
+        except Exception as e:
+            self.sync_history.append({
+                "connector_id": connector_id,
+                "user_id": user_id,
+                "connector_type": connector_type,
+                "timestamp": datetime.now().isoformat(),
+                "error": str(e),
+                "success": False
+            })
+
+            result = {"success": False, "error": str(e)}
+            if stats is not None:
+                result["stats"] = stats
+            return result
+
     async def sync_all(self, user_id: str, since: Optional[datetime] = None) -> Dict:
         """Sync all connectors for a user"""
         results = {}
@@ -304,15 +393,23 @@ class ConnectorManager:
             "total_configured": len(statuses)
         }
 
+    def _attach(self, connector_id: str, connector: BaseConnector):
+        """Register a connector; its sync checkpoints save to the config store"""
+        connector.checkpoint_hook = lambda: self._save_config(connector_id, connector.config)
+        self.connectors[connector_id] = connector
+
     def _save_config(self, connector_id: str, config: ConnectorConfig):
-        """Save connector config to file"""
+        """Save connector config to file (atomically)"""
         config_file = self.config_dir / f"{connector_id}.json"
+        tmp_file = config_file.with_suffix(".json.tmp")
 
-        # Don't save sensitive credentials directly
-        safe_config = config.to_dict()
+        with self._config_lock:
+            # Don't save sensitive credentials directly
+            safe_config = config.to_dict()
 
-        with open(config_file, 'w') as f:
-            json.dump(safe_config, f, indent=2)
+            with open(tmp_file, 'w') as f:
+                json.dump(safe_config, f, indent=2)
+            os.replace(tmp_file, config_file)
 
     def _load_config(self, connector_id: str) -> Optional[ConnectorConfig]:
         """Load connector config from file"""
@@ -343,7 +440,7 @@ class ConnectorManager:
                     if config.enabled:
                         await connector.connect()
 
-                    self.connectors[connector_id] = connector
+                    self._attach(connector_id, connector)
 
             except Exception as e:
                 print(f"Error loading connector config {config_file}: {e}")
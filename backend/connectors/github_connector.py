@@ -1,13 +1,22 @@
 """
 GitHub Connector
 Connects to GitHub API to extract code, issues, PRs, and documentation.
+
+Repos are synced in parallel (SyncScheduler), paced by the
+X-RateLimit-Remaining / -Reset of the last response. Per repo, the newest
+issue/PR update and the last pushed_at are checkpointed: later syncs only
+list issues updated since then, skip README/code when nothing was pushed,
+and an interrupted sync resumes with the repos it had not finished. A repo
+whose issues, PRs or code fail to sync keeps its previous checkpoint.
 """
 
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import base64
 
-from .base_connector import BaseConnector, ConnectorConfig, ConnectorStatus, Document
+from .base_connector import BaseConnector, ConnectorConfig, ConnectorStatus, Document, SyncCancelled
+from .sync_scheduler import AdaptiveRateLimiter, SyncCheckpoint, SyncScheduler
 
 # Note: Requires PyGithub
 # pip install PyGithub
@@ -43,13 +52,19 @@ class GitHubConnector(BaseConnector):
         "max_issues_per_repo": 100,
         "max_prs_per_repo": 50,
         "code_extensions": [".py", ".js", ".ts", ".md", ".json", ".yaml", ".yml"],
-        "max_file_size": 100000  # Max file size in bytes
+        "max_file_size": 100000,  # Max file size in bytes
+        "max_concurrent_repos": 4
     }
 
+    # Comments included per issue
+    MAX_ISSUE_COMMENTS = 5
+
     def __init__(self, config: ConnectorConfig):
         super().__init__(config)
         self.client = None
         self.user = None
+        # Spread the last 10% of the hourly quota; keep 50 calls spare
+        self.rate_limiter = AdaptiveRateLimiter("github", reserve=50)
 
     async def connect(self) -> bool:
         """Connect to GitHub API"""
@@ -97,43 +112,92 @@ class GitHubConnector(BaseConnector):
             return False
 
     async def sync(self, since: Optional[datetime] = None) -> List[Document]:
-        """Sync documents from GitHub"""
-        if not self.client:
-            await self.connect()
+        """
+        Sync documents from GitHub
 
-        if self.status != ConnectorStatus.CONNECTED:
+        Without `since`, each repo continues from its checkpoint; `since`
+        starts a fresh run from that time.
+        """
+        if not await self.ensure_connected():
             return []
 
-        self.status = ConnectorStatus.SYNCING
+        # Cursors are saved by the caller once it has stored the documents
         documents = []
+        await asyncio.to_thread(self._sync_streaming, since, documents.extend, False)
+        return documents
 
-        try:
-            # Get repos to sync
-            repos = await self._get_repos()
-
-            for repo in repos:
-                repo_docs = await self._sync_repo(repo, since)
-                documents.extend(repo_docs)
+    def _sync_streaming(self, since: Optional[datetime], emit, checkpoint: bool = True):
+        """
+        Sync repos in parallel, emitting each repo's documents as it finishes
 
-            # Update stats
-            self.sync_stats["documents_synced"] = len(documents)
-            self.sync_stats["repos_synced"] = len(repos)
-            self.sync_stats["sync_time"] = datetime.now().isoformat()
+        With checkpoint=False cursors only advance in self.config and
+        checkpoint_hook is not called.
+        """
+        self.status = ConnectorStatus.SYNCING
 
+        try:
+            self._sync_blocking(since, emit, checkpoint)
             self.config.last_sync = datetime.now()
             self.status = ConnectorStatus.CONNECTED
 
+        except SyncCancelled:
+            self.status = ConnectorStatus.CONNECTED
         except Exception as e:
             self._set_error(f"Sync failed: {str(e)}")
 
-        return documents
+    def _sync_blocking(self, since: Optional[datetime], emit, checkpoint: bool = True):
+        """Sync repos in parallel through the scheduler"""
+        # Get repos to sync
+        repos = self._get_repos()
+
+        scheduler = SyncScheduler(
+            SyncCheckpoint(self.config, save=self.checkpoint_hook if checkpoint else None),
+            max_workers=self.config.settings.get("max_concurrent_repos", 4)
+        )
+        run_stats = scheduler.run(
+            {repo.full_name: repo for repo in repos},
+            lambda repo, cursor: self._sync_repo(repo, since, {} if since else cursor),
+            lambda repo_name, repo_docs: emit(repo_docs),
+            restart=since is not None
+        )
+
+        # Update stats
+        self.sync_stats["documents_synced"] = run_stats["documents"]
+        self.sync_stats["repos_synced"] = run_stats["sources_synced"]
+        self.sync_stats["repos_skipped"] = run_stats["sources_skipped"]
+        self.sync_stats["repos_failed"] = run_stats["errors"]
+        self.sync_stats["rate_limit"] = dict(self.rate_limiter.stats)
+        self.sync_stats["elapsed_seconds"] = run_stats["elapsed_seconds"]
+        self.sync_stats["sync_time"] = datetime.now().isoformat()
 
     async def get_document(self, doc_id: str) -> Optional[Document]:
         """Get a specific document"""
         # Parse doc_id to determine type and fetch
         return None
 
-    async def _get_repos(self) -> List:
+    def _throttle(self):
+        """Wait for the rate limiter before an API call"""
+        self.rate_limiter.acquire()
+
+    def _observe_rate_limit(self):
+        """Feed the quota from the last response headers to the rate limiter"""
+        try:
+            remaining, limit = self.client.rate_limiting
+            reset = self.client.rate_limiting_resettime
+        except Exception:
+            return
+        self.rate_limiter.observe({
+            "X-RateLimit-Remaining": remaining,
+            "X-RateLimit-Limit": limit,
+            "X-RateLimit-Reset": reset
+        })
+
+    @staticmethod
+    def _not_found(error) -> bool:
+        """404 / 410: nothing to sync (empty repo, issues disabled), not a failure"""
+        return getattr(error, "status", None) in (404, 410)
+
+    def _get_repos(self) -> List:
         """Get list of repos to sync"""
         repos = []
 
@@ -143,49 +207,79 @@ class GitHubConnector(BaseConnector):
             # Get specific repos
             for repo_name in configured_repos:
                 try:
+                    self._throttle()
                     repo = self.client.get_repo(repo_name)
                     repos.append(repo)
                 except GithubException:
                     print(f"Could not access repo: {repo_name}")
         else:
             # Get user's repos
+            self._throttle()
             for repo in self.user.get_repos():
                 if not repo.fork:  # Skip forks by default
                     repos.append(repo)
 
+        self._observe_rate_limit()
         return repos
 
-    async def _sync_repo(self, repo, since: Optional[datetime]) -> List[Document]:
-        """Sync documents from a single repository"""
+    def _sync_repo(
+        self,
+        repo,
+        since: Optional[datetime],
+        cursor: Optional[Dict] = None
+    ) -> Tuple[List[Document], Dict]:
+        """
+        Sync documents from a single repository
+
+        Args:
+            repo: Repository
+            since: Only issues/PRs updated after this
+            cursor: Checkpoint from the previous sync of this repo
+                ({"updated_since": iso, "pushed_at": iso})
+
+        Returns:
+            (documents, new checkpoint cursor)
+        """
         documents = []
+        cursor = cursor or {}
 
-        repo_name = repo.full_name
+        if since is None and cursor.get("updated_since"):
+            since = datetime.fromisoformat(cursor["updated_since"])
+        pushed_at = repo.pushed_at.isoformat() if repo.pushed_at else None
+        pushed = pushed_at is None or pushed_at != cursor.get("pushed_at")
+        newest_update = cursor.get("updated_since")
 
-        # Sync README
-        readme_doc = await self._get_readme(repo)
-        if readme_doc:
-            documents.append(readme_doc)
+        # Sync README (unchanged unless something was pushed)
+        if pushed:
+            readme_doc = self._get_readme(repo)
+            if readme_doc:
+                documents.append(readme_doc)
 
         # Sync issues
         if self.config.settings.get("include_issues", True):
-            issue_docs = await self._sync_issues(repo, since)
+            issue_docs = self._sync_issues(repo, since)
             documents.extend(issue_docs)
 
         # Sync PRs
         if self.config.settings.get("include_prs", True):
-            pr_docs = await self._sync_prs(repo, since)
+            pr_docs = self._sync_prs(repo, since)
             documents.extend(pr_docs)
 
-        # Sync code files
-        if self.config.settings.get("include_code", True):
-            code_docs = await self._sync_code(repo)
+        # Sync code files (unchanged unless something was pushed)
+        if pushed and self.config.settings.get("include_code", True):
+            code_docs = self._sync_code(repo)
             documents.extend(code_docs)
 
-        return documents
+        for doc in documents:
+            if doc.timestamp and (newest_update is None or doc.timestamp.isoformat() > newest_update):
+                newest_update = doc.timestamp.isoformat()
 
-    async def _get_readme(self, repo) -> Optional[Document]:
+        return documents, {"updated_since": newest_update, "pushed_at": pushed_at}
+
+    def _get_readme(self, repo) -> Optional[Document]:
         """Get repository README"""
         try:
+            self._throttle()
             readme = repo.get_readme()
             content = base64.b64decode(readme.content).decode('utf-8', errors='ignore')
 
@@ -207,13 +301,15 @@ class GitHubConnector(BaseConnector):
         except GithubException:
             return None
 
-    async def _sync_issues(self, repo, since: Optional[datetime]) -> List[Document]:
+    def _sync_issues(self, repo, since: Optional[datetime]) -> List[Document]:
         """Sync repository issues"""
         documents = []
         max_issues = self.config.settings.get("max_issues_per_repo", 100)
 
         try:
-            issues = repo.get_issues(state="all", sort="updated", direction="desc")
+            kwargs = {"since": since} if since else {}
+            self._throttle()
+            issues = repo.get_issues(state="all", sort="updated", direction="desc", **kwargs)
 
             count = 0
             for issue in issues:
@@ -236,9 +332,11 @@ Labels: {', '.join([l.name for l in issue.labels])}
 ---
 Comments ({issue.comments}):
 """
-                # Get top comments
-                for comment in issue.get_comments()[:5]:
-                    content += f"\n@{comment.user.login}: {comment.body[:500]}\n"
+                # Get top comments (no request when there are none)
+                if issue.comments:
+                    self._throttle()
+                    for comment in issue.get_comments()[:self.MAX_ISSUE_COMMENTS]:
+                        content += f"\n@{comment.user.login}: {comment.body[:500]}\n"
 
                 documents.append(Document(
                     doc_id=f"github_{repo.full_name}_issue_{issue.number}",
@@ -260,17 +358,22 @@ Comments ({issue.comments}):
 
                 count += 1
 
+            self._observe_rate_limit()
+
         except GithubException as e:
-            print(f"Error syncing issues for {repo.full_name}: {e}")
+            if not self._not_found(e):
+                # Fail the repo so the scheduler keeps its previous cursor
+                raise RuntimeError(f"Error syncing issues for {repo.full_name}: {e}") from e
 
         return documents
 
-    async def _sync_prs(self, repo, since: Optional[datetime]) -> List[Document]:
+    def _sync_prs(self, repo, since: Optional[datetime]) -> List[Document]:
         """Sync pull requests"""
         documents = []
         max_prs = self.config.settings.get("max_prs_per_repo", 50)
 
         try:
+            self._throttle()
             prs = repo.get_pulls(state="all", sort="updated", direction="desc")
 
             count = 0
@@ -318,12 +421,15 @@ Deletions: -{pr.deletions}
 
                 count += 1
 
+            self._observe_rate_limit()
+
         except GithubException as e:
-            print(f"Error syncing PRs for {repo.full_name}: {e}")
+            if not self._not_found(e):
+                raise RuntimeError(f"Error syncing PRs for {repo.full_name}: {e}") from e
 
         return documents
 
-    async def _sync_code(self, repo) -> List[Document]:
+    def _sync_code(self, repo) -> List[Document]:
         """Sync important code files"""
         documents = []
 
@@ -339,6 +445,7 @@ Deletions: -{pr.deletions}
         ]
 
         try:
+            self._throttle()
             contents = repo.get_contents("")
             files_to_process = []
 
@@ -349,9 +456,11 @@ Deletions: -{pr.deletions}
                 if file_content.type == "dir" and file_content.path.count('/') < 2:
                     # Only go 2 levels deep
                     try:
+                        self._throttle()
                         contents.extend(repo.get_contents(file_content.path))
-                    except GithubException:
-                        pass
+                    except GithubException as e:
+                        if not self._not_found(e):
+                            raise
                 elif file_content.type == "file":
                     # Check if we should include this file
                     is_important = file_content.name in important_files
@@ -384,7 +493,10 @@ Deletions: -{pr.deletions}
                 except Exception as e:
                     print(f"Error processing file {file_content.path}: {e}")
 
+            self._observe_rate_limit()
+
         except GithubException as e:
-            print(f"Error syncing code for {repo.full_name}: {e}")
+            if not self._not_found(e):
+                raise RuntimeError(f"Error syncing code for {repo.full_name}: {e}") from e
 
         return documents
@@ -1,24 +1,29 @@
 """
 Gmail Connector
 Connects to Gmail API to extract emails for knowledge capture.
+
+Sync runs through GmailSyncEngine (gmail_sync.py): batched, concurrent
+message fetches, and incremental runs from the historyId saved in
+settings["history_id"] after each sync.
 """
 
+import asyncio
 import base64
 import re
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from email.utils import parsedate_to_datetime
 
-from .base_connector import BaseConnector, ConnectorConfig, ConnectorStatus, Document
+from .base_connector import BaseConnector, ConnectorConfig, ConnectorStatus, Document, SyncCancelled
+from .gmail_sync import DEFAULT_API_BASE_URL, GmailAPIClient, GmailSyncEngine
 
 # Note: These imports require google-auth and google-api-python-client
 # pip install google-auth google-auth-oauthlib google-api-python-client
 
 try:
     from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request as GoogleAuthRequest
     from google_auth_oauthlib.flow import Flow
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
     GMAIL_AVAILABLE = True
 except ImportError:
     GMAIL_AVAILABLE = False
@@ -43,7 +48,11 @@ class GmailConnector(BaseConnector):
         "labels": ["INBOX", "SENT"],  # Labels to sync
         "include_attachments": False,
         "include_spam": False,
-        "query": ""  # Gmail search query
+        "query": "",  # Gmail search query (full syncs only)
+        "batch_size": 50,  # Message gets per batch HTTP request
+        "max_concurrent_requests": 4,  # Batch requests in flight
+        "history_id": None,  # Saved after each sync; enables incremental sync
+        "api_base_url": DEFAULT_API_BASE_URL
     }
 
     # Gmail API scopes
@@ -78,42 +87,49 @@ class GmailConnector(BaseConnector):
 
     def __init__(self, config: ConnectorConfig):
         super().__init__(config)
-        self.service = None
-
-    async def connect(self) -> bool:
-        """Connect to Gmail API"""
-        if not GMAIL_AVAILABLE:
-            self._set_error("Gmail dependencies not installed. Run: pip install google-auth google-auth-oauthlib google-api-python-client")
-            return False
+        self.service: Optional[GmailAPIClient] = None
+        self._credentials = None
 
+    def connect_blocking(self) -> bool:
+        """Connect to Gmail API (synchronous)"""
         try:
             self.status = ConnectorStatus.CONNECTING
 
-            # Create credentials from stored tokens
-            client_config = self._get_client_config()
-            credentials = Credentials(
-                token=self.config.credentials.get("access_token"),
-                refresh_token=self.config.credentials.get("refresh_token"),
-                token_uri=client_config["web"]["token_uri"],
-                client_id=client_config["web"]["client_id"],
-                client_secret=client_config["web"]["client_secret"],
-                scopes=self.SCOPES
+            # Create credentials from stored tokens (refreshable when
+            # google-auth is installed)
+            if GMAIL_AVAILABLE:
+                client_config = self._get_client_config()
+                self._credentials = Credentials(
+                    token=self.config.credentials.get("access_token"),
+                    refresh_token=self.config.credentials.get("refresh_token"),
+                    token_uri=client_config["web"]["token_uri"],
+                    client_id=client_config["web"]["client_id"],
+                    client_secret=client_config["web"]["client_secret"],
+                    scopes=self.SCOPES
+                )
+
+            self.service = GmailAPIClient(
+                token_provider=self._access_token,
+                refresh_token=self._refresh_access_token if GMAIL_AVAILABLE else None,
+                base_url=self.config.settings.get("api_base_url") or DEFAULT_API_BASE_URL
             )
 
-            # Build Gmail service
-            self.service = build('gmail', 'v1', credentials=credentials)
-
             # Test connection
-            self.service.users().labels().list(userId='me').execute()
+            self.service.get_profile()
 
             self.status = ConnectorStatus.CONNECTED
             self._clear_error()
             return True
 
         except Exception as e:
+            self.service = None
             self._set_error(f"Failed to connect: {str(e)}")
             return False
 
+    async def connect(self) -> bool:
+        """Connect to Gmail API"""
+        return await asyncio.to_thread(self.connect_blocking)
+
     async def disconnect(self) -> bool:
         """Disconnect from Gmail API"""
         self.service = None
@@ -126,11 +142,26 @@ class GmailConnector(BaseConnector):
             return False
 
         try:
-            self.service.users().labels().list(userId='me').execute()
+            await asyncio.to_thread(self.service.get_profile)
             return True
         except Exception:
             return False
 
+    def _access_token(self) -> str:
+        if self._credentials is not None and self._credentials.token:
+            return self._credentials.token
+        return self.config.credentials.get("access_token", "")
+
+    def _refresh_access_token(self) -> bool:
+        """Refresh an expired access token (called on HTTP 401)"""
+        try:
+            self._credentials.refresh(GoogleAuthRequest())
+            self.config.credentials["access_token"] = self._credentials.token
+            return True
+        except Exception as e:
+            print(f"Gmail token refresh failed: {e}")
+            return False
+
     @classmethod
     def get_auth_url(cls, redirect_uri: str, state: str) -> str:
         """Get Gmail OAuth authorization URL"""
@@ -173,16 +204,41 @@ class GmailConnector(BaseConnector):
             "expiry": credentials.expiry.isoformat() if credentials.expiry else None
         }
 
-    async def sync(self, since: Optional[datetime] = None) -> List[Document]:
-        """Sync emails from Gmail"""
+    def sync_blocking(self, since: Optional[datetime] = None) -> List[Document]:
+        """
+        Sync emails from Gmail (synchronous)
+
+        With a saved historyId and no `since`, only messages added to the
+        synced labels since the last run are fetched; otherwise the newest
+        max_results per label matching the query. The new historyId is
+        saved in settings["history_id"]; messages that failed transiently
+        are saved in settings["pending_messages"] and fetched next sync.
+        """
         if not self.service:
-            await self.connect()
+            self.connect_blocking()
 
         if self.status != ConnectorStatus.CONNECTED:
             return []
 
-        self.status = ConnectorStatus.SYNCING
         documents = []
+        self._sync_streaming(since, documents.extend)
+        return documents
+
+    def _sync_streaming(self, since: Optional[datetime], emit):
+        """Sync emails, emitting documents per fetched batch"""
+        self.status = ConnectorStatus.SYNCING
+        synced = 0
+
+        def emit_messages(messages):
+            nonlocal synced
+            documents = []
+            for message, message_labels in messages:
+                doc = self._message_to_document(message, message_labels[0])
+                if doc:
+                    doc.metadata["labels"] = message_labels
+                    documents.append(doc)
+            synced += len(documents)
+            emit(documents)
 
         try:
             # Build query
@@ -195,7 +251,8 @@ class GmailConnector(BaseConnector):
             if self.config.settings.get("query"):
                 query_parts.append(self.config.settings["query"])
 
-            if not self.config.settings.get("include_spam", False):
+            include_spam = self.config.settings.get("include_spam", False)
+            if not include_spam:
                 query_parts.append("-in:spam")
 
             query = " ".join(query_parts) if query_parts else None
@@ -203,42 +260,52 @@ class GmailConnector(BaseConnector):
             # Get labels to sync
             labels = self.config.settings.get("labels", ["INBOX", "SENT"])
 
-            for label in labels:
-                # List messages
-                results = self.service.users().messages().list(
-                    userId='me',
-                    labelIds=[label],
-                    q=query,
-                    maxResults=self.config.settings.get("max_results", 100)
-                ).execute()
-
-                messages = results.get('messages', [])
-
-                for msg_info in messages:
-                    msg = self.service.users().messages().get(
-                        userId='me',
-                        id=msg_info['id'],
-                        format='full'
-                    ).execute()
+            engine = GmailSyncEngine(
+                self.service,
+                batch_size=self.config.settings.get("batch_size", 50),
+                max_workers=self.config.settings.get("max_concurrent_requests", 4)
+            )
+            result = engine.run(
+                labels,
+                query=query,
+                max_results=self.config.settings.get("max_results", 100),
+                history_id=None if since else self.config.settings.get("history_id"),
+                include_spam=include_spam,
+                on_messages=emit_messages,
+                retry_messages=self.config.settings.get("pending_messages")
+            )
 
-                    doc = self._message_to_document(msg, label)
-                    if doc:
-                        documents.append(doc)
+            # Saved only once every message was handed over. Messages that
+            # failed to fetch are behind the new historyId, so they are kept
+            # and fetched again by the next sync
+            if result.history_id:
+                self.config.settings["history_id"] = result.history_id
+            if result.failed:
+                self.config.settings["pending_messages"] = result.failed
+            else:
+                self.config.settings.pop("pending_messages", None)
 
             # Update stats
             self.sync_stats = {
-                "documents_synced": len(documents),
+                **result.stats,
+                "documents_synced": synced,
                 "labels_synced": labels,
+                "history_id": result.history_id,
+                "messages_pending_retry": len(result.failed),
                 "sync_time": datetime.now().isoformat()
             }
 
             self.config.last_sync = datetime.now()
             self.status = ConnectorStatus.CONNECTED
 
+        except SyncCancelled:
+            self.status = ConnectorStatus.CONNECTED
         except Exception as e:
             self._set_error(f"Sync failed: {str(e)}")
 
-        return documents
+    async def sync(self, since: Optional[datetime] = None) -> List[Document]:
+        """Sync emails from Gmail (runs in a worker thread)"""
+        return await asyncio.to_thread(self.sync_blocking, since)
 
     async def get_document(self, doc_id: str) -> Optional[Document]:
         """Get a specific email by message ID"""
@@ -249,11 +316,7 @@ class GmailConnector(BaseConnector):
             # Extract Gmail message ID from doc_id
             msg_id = doc_id.replace("gmail_", "")
 
-            msg = self.service.users().messages().get(
-                userId='me',
-                id=msg_id,
-                format='full'
-            ).execute()
+            msg = await asyncio.to_thread(self.service.get_message, msg_id)
 
             return self._message_to_document(msg)
 
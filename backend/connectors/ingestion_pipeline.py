@@ -0,0 +1,356 @@
+"""
+Streaming Ingestion Pipeline
+Moves documents from a connector's stream() into the RAG embedding index
+through concurrent stages connected by bounded queues.
+
+    connector.stream() -> sanitize -> classify -> chunk -> embed -> index
+
+- Every stage runs as soon as its first input arrives, so the first
+  documents are searchable while the sync is still fetching
+- Queues between stages are bounded: a slow stage (embedding) throttles
+  the ones before it down to the connector, so memory stays flat however
+  large the mailbox is
+- Stages run their (blocking) work in worker threads; `workers` copies of
+  a stage run concurrently, and batching stages (embedding, index append)
+  collect up to `batch_size` items, waiting at most `max_wait` seconds
+- A failing item is counted and dropped; the rest keep flowing. The run's
+  stats report the failures (items_failed) so the caller can keep its
+  source cursor where it was (ConnectorManager.ingest_connector does)
+
+Usage:
+    pipeline = IngestionPipeline([
+        SanitizeStage(), ClassifyStage(classifier), ChunkStage(),
+        EmbedStage(client=openai_client), IndexAppendStage(rag.index_writer)
+    ])
+    stats = await pipeline.run(connector.stream())
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Sequence
+
+from .base_connector import Document
+
+
+_END = object()
+
+
+class PipelineStage:
+    """
+    One step of an IngestionPipeline
+
+    Subclasses implement process(item) -> list of items to pass on (empty
+    drops the item), or process_batch(items) for batching stages.
+    close() runs once after the last item.
+    """
+
+    name = "stage"
+
+    def __init__(self, workers: int = 1, batch_size: int = 1, max_wait: float = 0.5):
+        """
+        Args:
+            workers: Copies of this stage running concurrently
+            batch_size: Items per process_batch() call
+            max_wait: Seconds to wait for a batch to fill
+        """
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+
+    def process(self, item: Any) -> List[Any]:
+        return [item]
+
+    def process_batch(self, items: List[Any]) -> List[Any]:
+        outputs = []
+        for item in items:
+            outputs.extend(self.process(item))
+        return outputs
+
+    def close(self):
+        pass
+
+
+class SanitizeStage(PipelineStage):
+    """Redact PII from document content and title (EnhancedPIISanitizer)"""
+
+    name = "sanitize"
+
+    def __init__(self, sanitizer=None, workers: int = 2):
+        super().__init__(workers=workers)
+        if sanitizer is None:
+            from security.pii_sanitizer_enhanced import EnhancedPIISanitizer
+            sanitizer = EnhancedPIISanitizer()
+        self.sanitizer = sanitizer
+
+    def process(self, document: Document) -> List[Document]:
+        document.content, stats = self.sanitizer.sanitize(document.content)
+        document.title, title_stats = self.sanitizer.sanitize(document.title)
+        document.metadata["pii_redactions"] = sum(stats.values()) + sum(title_stats.values())
+        return [document]
+
+
+class ClassifyStage(PipelineStage):
+    """Classify work vs personal (WorkPersonalClassifier); drop personal documents"""
+
+    name = "classify"
+
+    def __init__(self, classifier, drop_actions: Sequence[str] = ("remove",), workers: int = 4):
+        """
+        Args:
+            classifier: WorkPersonalClassifier (or anything with classify_document)
+            drop_actions: Classification actions whose documents are dropped
+            workers: Concurrent classification requests
+        """
+        super().__init__(workers=workers)
+        self.classifier = classifier
+        self.drop_actions = set(drop_actions)
+
+    def process(self, document: Document) -> List[Document]:
+        classification = self.classifier.classify_document({
+            "content": document.content,
+            "metadata": {**document.metadata, "subject": document.title}
+        })
+        document.metadata["classification"] = classification
+        if classification.get("action") in self.drop_actions:
+            return []
+        return [document]
+
+
+class ChunkStage(PipelineStage):
+    """Split documents into index chunks (same layout as EnhancedRAGv2.add_documents)"""
+
+    name = "chunk"
+
+    def __init__(self, chunk_size: int = 3200, overlap: int = 400, min_chars: int = 50):
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.min_chars = min_chars
+
+    def process(self, document: Document) -> List[Dict]:
+        content = document.content
+        if not content or len(content) < self.min_chars:
+            return []
+
+        metadata = {
+            **document.metadata,
+            "source": document.source,
+            "title": document.title,
+            "author": document.author,
+            "timestamp": document.timestamp.isoformat() if document.timestamp else None,
+            "url": document.url,
+            "doc_type": document.doc_type
+        }
+
+        chunks = []
+        start = 0
+        while start < len(content):
+            end = start + self.chunk_size
+            chunk_content = content[start:end]
+
+            if len(chunk_content.strip()) > self.min_chars:
+                chunks.append({
+                    "chunk_id": f"{document.doc_id}_chunk_{len(chunks)}",
+                    "doc_id": document.doc_id,
+                    "content": chunk_content,
+                    "chunk_index": len(chunks),
+                    "metadata": metadata
+                })
+
+            start = end - self.overlap
+            if start >= len(content) - self.overlap:
+                break
+
+        return chunks
+
+
+class EmbedStage(PipelineStage):
+    """Embed chunks in batches; outputs (chunk, embedding) pairs"""
+
+    name = "embed"
+
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None,
+        client=None,
+        model: str = "text-embedding-3-small",
+        batch_size: int = 64,
+        max_wait: float = 0.5,
+        workers: int = 2
+    ):
+        """
+        Args:
+            embed_fn: texts -> embeddings (default: OpenAI embeddings API)
+            client: OpenAI client for the default embed_fn
+            model: Embedding model (must match the index)
+            batch_size: Chunks per embedding request
+            max_wait: Seconds to wait for a batch to fill
+            workers: Embedding requests in flight
+        """
+        super().__init__(workers=workers, batch_size=batch_size, max_wait=max_wait)
+        if embed_fn is None:
+            if client is None:
+                raise ValueError("EmbedStage needs embed_fn or an OpenAI client")
+
+            def embed_fn(texts):
+                response = client.embeddings.create(model=model, input=texts)
+                return [item.embedding for item in response.data]
+        self.embed_fn = embed_fn
+
+    def process_batch(self, chunks: List[Dict]) -> List[tuple]:
+        embeddings = self.embed_fn([chunk["content"][:8000] for chunk in chunks])
+        return list(zip(chunks, embeddings))
+
+
+class IndexAppendStage(PipelineStage):
+    """Append embedded chunks to the live index (EmbeddingIndexWriter); save on close"""
+
+    name = "index"
+
+    def __init__(self, writer, batch_size: int = 64, max_wait: float = 0.2, save: bool = True):
+        """
+        Args:
+            writer: rag.index_writer.EmbeddingIndexWriter (e.g. rag.index_writer)
+            batch_size: Chunks per append
+            max_wait: Seconds to wait for a batch to fill
+            save: Save the index when the pipeline finishes
+        """
+        super().__init__(batch_size=batch_size, max_wait=max_wait)
+        self.writer = writer
+        self.save = save
+        self.appended = 0
+
+    def process_batch(self, pairs: List[tuple]) -> List[Dict]:
+        chunks = [chunk for chunk, _ in pairs]
+        self.writer.append(chunks, [embedding for _, embedding in pairs])
+        self.appended += len(chunks)
+        return chunks
+
+    def close(self):
+        if self.save and self.appended and self.writer.path:
+            self.writer.save()
+
+
+class IngestionPipeline:
+    """Runs stages concurrently over an async source with bounded queues"""
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 64):
+        """
+        Args:
+            stages: Stages in order; the last one's outputs are counted as ingested
+            queue_size: Max items waiting in front of each stage
+        """
+        if not stages:
+            raise ValueError("IngestionPipeline needs at least one stage")
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, source: AsyncIterable[Any]) -> Dict[str, Any]:
+        """
+        Feed every item of `source` through the stages
+
+        Returns:
+            Stats: items read, items out of the last stage, items that failed
+            in any stage, seconds until the first output (e.g. first chunk
+            searchable), per-stage counts
+        """
+        started = time.perf_counter()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        stage_stats = [
+            {"stage": stage.name, "in": 0, "out": 0, "errors": 0, "busy_seconds": 0.0}
+            for stage in self.stages
+        ]
+        totals = {"read": 0, "output": 0, "first_output_seconds": None}
+        active = [stage.workers for stage in self.stages]
+
+        async def feed():
+            async for item in source:
+                totals["read"] += 1
+                await queues[0].put(item)
+            await queues[0].put(_END)
+
+        async def work(index: int, stage: PipelineStage):
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            stats = stage_stats[index]
+
+            while True:
+                batch, ended = await self._take(inbox, stage)
+                if batch:
+                    stats["in"] += len(batch)
+                    busy = time.perf_counter()
+                    try:
+                        if stage.batch_size > 1:
+                            outputs = await asyncio.to_thread(stage.process_batch, batch)
+                        else:
+                            outputs = await asyncio.to_thread(stage.process, batch[0])
+                    except Exception as e:
+                        stats["errors"] += len(batch)
+                        print(f"⚠ Pipeline stage {stage.name} failed: {e}")
+                        outputs = []
+                    stats["busy_seconds"] += time.perf_counter() - busy
+                    stats["out"] += len(outputs)
+
+                    for output in outputs:
+                        if outbox is not None:
+                            await outbox.put(output)
+                    if outbox is None and outputs:
+                        totals["output"] += len(outputs)
+                        if totals["first_output_seconds"] is None:
+                            totals["first_output_seconds"] = round(time.perf_counter() - started, 3)
+
+                if ended:
+                    await inbox.put(_END)  # For this stage's other workers
+                    active[index] -= 1
+                    if active[index] == 0:
+                        await asyncio.to_thread(stage.close)
+                        if outbox is not None:
+                            await outbox.put(_END)
+                    return
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(feed())
+            for index, stage in enumerate(self.stages):
+                for _ in range(stage.workers):
+                    group.create_task(work(index, stage))
+
+        elapsed = time.perf_counter() - started
+        for stats in stage_stats:
+            stats["busy_seconds"] = round(stats["busy_seconds"], 3)
+
+        return {
+            "items_read": totals["read"],
+            "items_output": totals["output"],
+            "items_failed": sum(stats["errors"] for stats in stage_stats),
+            "first_output_seconds": totals["first_output_seconds"],
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_second": round(totals["read"] / elapsed, 1) if elapsed > 0 else 0.0,
+            "stages": stage_stats
+        }
+
+    @staticmethod
+    async def _take(inbox: asyncio.Queue, stage: PipelineStage):
+        """Next item, or up to batch_size items within max_wait; (items, ended)"""
+        item = await inbox.get()
+        if item is _END:
+            return [], True
+
+        batch = [item]
+        if stage.batch_size == 1:
+            return batch, False
+
+        deadline = time.monotonic() + stage.max_wait
+        while len(batch) < stage.batch_size:
+            try:
+                item = inbox.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(0.01, remaining))
+                continue
+            if item is _END:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
@@ -1,12 +1,21 @@
 """
 Slack Connector
 Connects to Slack API to extract messages for knowledge capture.
+
+Channels are synced in parallel (SyncScheduler), paced by the Retry-After
+of rate-limited calls. Each channel's newest message ts is checkpointed,
+so later syncs only fetch newer messages and an interrupted sync resumes
+with the channels it had not finished. Threads started within the lookback
+window keep a reply cursor too, so new replies to older parents are fetched.
 """
 
+import asyncio
+import re
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
-from .base_connector import BaseConnector, ConnectorConfig, ConnectorStatus, Document
+from .base_connector import BaseConnector, ConnectorConfig, ConnectorStatus, Document, SyncCancelled
+from .sync_scheduler import AdaptiveRateLimiter, SyncCheckpoint, SyncScheduler
 
 # Note: Requires slack_sdk
 # pip install slack_sdk
@@ -38,13 +47,19 @@ class SlackConnector(BaseConnector):
         "include_dms": False,
         "include_threads": True,
         "max_messages_per_channel": 1000,
-        "oldest_days": 365  # How far back to sync
+        "oldest_days": 365,  # How far back to sync (first sync of a channel)
+        "thread_lookback_days": 7,  # Threads this recent are re-checked for new replies
+        "max_concurrent_channels": 4
     }
 
+    # Retries of a rate-limited (HTTP 429) call before giving up
+    MAX_RATE_LIMIT_RETRIES = 5
+
     def __init__(self, config: ConnectorConfig):
         super().__init__(config)
         self.client = None
         self.user_cache: Dict[str, str] = {}  # user_id -> display name
+        self.rate_limiter = AdaptiveRateLimiter("slack")
 
     async def connect(self) -> bool:
         """Connect to Slack API"""
@@ -95,44 +110,75 @@ class SlackConnector(BaseConnector):
             return False
 
     async def sync(self, since: Optional[datetime] = None) -> List[Document]:
-        """Sync messages from Slack"""
-        if not self.client:
-            await self.connect()
+        """
+        Sync messages from Slack
 
-        if self.status != ConnectorStatus.CONNECTED:
+        Without `since`, each channel continues from its checkpointed
+        newest message; `since` starts a fresh run from that time.
+        """
+        if not await self.ensure_connected():
             return []
 
-        self.status = ConnectorStatus.SYNCING
+        # Cursors are saved by the caller once it has stored the documents
         documents = []
+        await asyncio.to_thread(self._sync_streaming, since, documents.extend, False)
+        return documents
 
-        try:
-            # Get channels to sync
-            channels = await self._get_channels()
-
-            # Calculate oldest timestamp
-            oldest = None
-            if since:
-                oldest = since.timestamp()
-            elif self.config.settings.get("oldest_days"):
-                days = self.config.settings["oldest_days"]
-                oldest = (datetime.now().timestamp()) - (days * 24 * 60 * 60)
-
-            for channel in channels:
-                channel_docs = await self._sync_channel(channel, oldest)
-                documents.extend(channel_docs)
-
-            # Update stats
-            self.sync_stats["documents_synced"] = len(documents)
-            self.sync_stats["channels_synced"] = len(channels)
-            self.sync_stats["sync_time"] = datetime.now().isoformat()
+    def _sync_streaming(self, since: Optional[datetime], emit, checkpoint: bool = True):
+        """
+        Sync channels in parallel, emitting each channel's documents as it finishes
+
+        With checkpoint=False cursors only advance in self.config and
+        checkpoint_hook is not called.
+        """
+        self.status = ConnectorStatus.SYNCING
 
+        try:
+            self._sync_blocking(since, emit, checkpoint)
             self.config.last_sync = datetime.now()
             self.status = ConnectorStatus.CONNECTED
 
+        except SyncCancelled:
+            self.status = ConnectorStatus.CONNECTED
         except Exception as e:
             self._set_error(f"Sync failed: {str(e)}")
 
-        return documents
+    def _sync_blocking(self, since: Optional[datetime], emit, checkpoint: bool = True):
+        """Sync channels in parallel through the scheduler"""
+        # Get channels to sync
+        channels = self._get_channels()
+
+        # Calculate oldest timestamp
+        oldest = None
+        if since:
+            oldest = since.timestamp()
+        elif self.config.settings.get("oldest_days"):
+            days = self.config.settings["oldest_days"]
+            oldest = (datetime.now().timestamp()) - (days * 24 * 60 * 60)
+
+        scheduler = SyncScheduler(
+            SyncCheckpoint(self.config, save=self.checkpoint_hook if checkpoint else None),
+            max_workers=self.config.settings.get("max_concurrent_channels", 4)
+        )
+        run_stats = scheduler.run(
+            {channel["id"]: channel for channel in channels},
+            lambda channel, cursor: self._sync_channel(
+                channel, oldest,
+                None if since else cursor.get("latest_ts"),
+                None if since else cursor.get("threads")
+            ),
+            lambda channel_id, channel_docs: emit(channel_docs),
+            restart=since is not None
+        )
+
+        # Update stats
+        self.sync_stats["documents_synced"] = run_stats["documents"]
+        self.sync_stats["channels_synced"] = run_stats["sources_synced"]
+        self.sync_stats["channels_skipped"] = run_stats["sources_skipped"]
+        self.sync_stats["channels_failed"] = run_stats["errors"]
+        self.sync_stats["rate_limit"] = dict(self.rate_limiter.stats)
+        self.sync_stats["elapsed_seconds"] = run_stats["elapsed_seconds"]
+        self.sync_stats["sync_time"] = datetime.now().isoformat()
 
     async def get_document(self, doc_id: str) -> Optional[Document]:
         """Get a specific message"""
@@ -140,7 +186,21 @@ class SlackConnector(BaseConnector):
         # Would need to know channel and timestamp
         return None
 
-    async def _get_channels(self) -> List[Dict]:
+    def _api_call(self, method: str, **kwargs):
+        """Call a WebClient method through the rate limiter, retrying HTTP 429"""
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = getattr(self.client, method)(**kwargs)
+            except SlackApiError as e:
+                if e.response.status_code == 429 and attempt < self.MAX_RATE_LIMIT_RETRIES:
+                    self.rate_limiter.observe(e.response.headers, status=429)
+                    continue
+                raise
+            self.rate_limiter.observe(getattr(response, "headers", None))
+            return response
+
+    def _get_channels(self) -> List[Dict]:
         """Get list of channels to sync"""
         channels = []
 
@@ -149,12 +209,10 @@ class SlackConnector(BaseConnector):
 
         try:
             # Get public channels
-            response = self.client.conversations_list(
+            for channel in self._list_conversations(
                 types="public_channel,private_channel",
                 exclude_archived=True
-            )
-
-            for channel in response.get("channels", []):
+            ):
                 if not configured_channels or channel["id"] in configured_channels:
                     if channel.get("is_member"):
                         channels.append({
@@ -165,8 +223,7 @@ class SlackConnector(BaseConnector):
 
             # Get DMs if enabled
             if self.config.settings.get("include_dms"):
-                dm_response = self.client.conversations_list(types="im")
-                for dm in dm_response.get("channels", []):
+                for dm in self._list_conversations(types="im"):
                     channels.append({
                         "id": dm["id"],
                         "name": f"DM with {dm.get('user', 'Unknown')}",
@@ -178,73 +235,146 @@ class SlackConnector(BaseConnector):
 
         return channels
 
-    async def _sync_channel(self, channel: Dict, oldest: Optional[float]) -> List[Document]:
-        """Sync messages from a single channel"""
-        documents = []
-        max_messages = self.config.settings.get("max_messages_per_channel", 1000)
-
-        try:
-            cursor = None
-
-            while len(documents) < max_messages:
-                # Get message history
-                kwargs = {
-                    "channel": channel["id"],
-                    "limit": min(200, max_messages - len(documents))
-                }
-
-                if oldest:
-                    kwargs["oldest"] = str(oldest)
+    def _list_conversations(self, **kwargs) -> List[Dict]:
+        """All pages of conversations.list"""
+        conversations = []
+        cursor = None
 
-                if cursor:
-                    kwargs["cursor"] = cursor
+        while True:
+            response = self._api_call("conversations_list", limit=1000, cursor=cursor, **kwargs)
+            conversations.extend(response.get("channels", []))
+            cursor = response.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return conversations
 
-                response = self.client.conversations_history(**kwargs)
-
-                for message in response.get("messages", []):
-                    doc = await self._message_to_document(message, channel)
+    def _sync_channel(
+        self,
+        channel: Dict,
+        oldest: Optional[float],
+        latest_ts: Optional[str] = None,
+        threads: Optional[Dict[str, str]] = None
+    ) -> Tuple[List[Document], Dict]:
+        """
+        Sync messages from a single channel
+
+        Args:
+            channel: Channel to sync
+            oldest: Oldest timestamp to sync
+            latest_ts: Checkpointed newest message ts; only newer messages
+                are fetched
+            threads: Checkpointed thread parent ts -> newest reply ts synced
+
+        Returns:
+            (documents, new checkpoint cursor)
+        """
+        documents = []
+        max_messages = self.config.settings.get("max_messages_per_channel", 1000)
+        include_threads = self.config.settings.get("include_threads", True)
+        threads = dict(threads or {})
+        lookback = datetime.now().timestamp() - (
+            self.config.settings.get("thread_lookback_days", 7) * 24 * 60 * 60
+        )
+
+        # Lower bound for every page: the checkpoint if newer than `oldest`
+        oldest_param = str(oldest) if oldest else None
+        if latest_ts and (oldest is None or float(latest_ts) > oldest):
+            oldest_param = latest_ts
+            # Re-read parents inside the lookback window: their replies are
+            # not in the history and would be missed past the checkpoint
+            if include_threads and lookback < float(latest_ts):
+                oldest_param = str(max(lookback, oldest or 0))
+        newest = latest_ts
+
+        cursor = None
+
+        while len(documents) < max_messages:
+            # Get message history (newest first)
+            kwargs = {
+                "channel": channel["id"],
+                "limit": min(200, max_messages - len(documents))
+            }
+
+            if oldest_param:
+                kwargs["oldest"] = oldest_param
+
+            if cursor:
+                kwargs["cursor"] = cursor
+
+            response = self._api_call("conversations_history", **kwargs)
+
+            for message in response.get("messages", []):
+                if latest_ts is None or float(message["ts"]) > float(latest_ts):
+                    if newest is None or float(message["ts"]) > float(newest):
+                        newest = message["ts"]
+
+                    doc = self._message_to_document(message, channel)
                     if doc:
                         documents.append(doc)
 
-                    # Get thread replies if enabled
-                    if (self.config.settings.get("include_threads", True) and
-                        message.get("reply_count", 0) > 0):
-                        thread_docs = await self._sync_thread(channel, message["ts"])
+                # Get thread replies newer than the thread's cursor
+                if include_threads and message.get("reply_count", 0) > 0:
+                    seen = threads.get(message["ts"])
+                    latest_reply = message.get("latest_reply")
+                    if seen is None or (latest_reply and float(latest_reply) > float(seen)):
+                        thread_docs, threads[message["ts"]] = self._sync_thread(
+                            channel, message["ts"], seen
+                        )
                         documents.extend(thread_docs)
 
-                # Check for more pages
-                if response.get("has_more") and response.get("response_metadata", {}).get("next_cursor"):
-                    cursor = response["response_metadata"]["next_cursor"]
-                else:
-                    break
-
-        except SlackApiError as e:
-            print(f"Error syncing channel {channel['name']}: {e.response['error']}")
+            # Check for more pages
+            if response.get("has_more") and response.get("response_metadata", {}).get("next_cursor"):
+                cursor = response["response_metadata"]["next_cursor"]
+            else:
+                break
 
-        return documents
+        # Older threads are no longer re-read, so their cursors can go
+        threads = {ts: reply for ts, reply in threads.items() if float(ts) >= lookback}
+        return documents, {"latest_ts": newest, "threads": threads}
 
-    async def _sync_thread(self, channel: Dict, thread_ts: str) -> List[Document]:
-        """Sync replies in a thread"""
+    def _sync_thread(
+        self,
+        channel: Dict,
+        thread_ts: str,
+        reply_ts: Optional[str] = None
+    ) -> Tuple[List[Document], str]:
+        """
+        Sync replies in a thread
+
+        Args:
+            channel: Channel of the thread
+            thread_ts: Parent message ts
+            reply_ts: Newest reply already synced; only newer replies are kept
+
+        Returns:
+            (documents, newest reply ts synced)
+        """
         documents = []
+        newest = reply_ts or thread_ts
 
         try:
-            response = self.client.conversations_replies(
-                channel=channel["id"],
-                ts=thread_ts
-            )
-
-            # Skip first message (it's the parent)
-            for message in response.get("messages", [])[1:]:
-                doc = await self._message_to_document(message, channel, is_reply=True)
+            kwargs = {"channel": channel["id"], "ts": thread_ts}
+            if reply_ts:
+                kwargs["oldest"] = reply_ts
+            response = self._api_call("conversations_replies", **kwargs)
+
+            for message in response.get("messages", []):
+                # The parent is returned with the replies
+                if message["ts"] == thread_ts:
+                    continue
+                if reply_ts and float(message["ts"]) <= float(reply_ts):
+                    continue
+                if float(message["ts"]) > float(newest):
+                    newest = message["ts"]
+                doc = self._message_to_document(message, channel, is_reply=True)
                 if doc:
                     documents.append(doc)
 
         except SlackApiError:
             pass
 
-        return documents
+        return documents, newest
 
-    async def _message_to_document(
+    def _message_to_document(
         self,
         message: Dict,
         channel: Dict,
@@ -258,7 +388,7 @@ class SlackConnector(BaseConnector):
 
             # Get user name
             user_id = message.get("user", "Unknown")
-            author = await self._get_user_name(user_id)
+            author = self._get_user_name(user_id)
 
             # Parse timestamp
             ts = float(message.get("ts", 0))
@@ -268,7 +398,7 @@ class SlackConnector(BaseConnector):
             text = message.get("text", "")
 
             # Replace user mentions with names
-            text = await self._replace_user_mentions(text)
+            text = self._replace_user_mentions(text)
 
             # Create content
             content = f"""Slack Message in #{channel['name']}
@@ -321,13 +451,13 @@ Time: {timestamp.isoformat() if timestamp else 'Unknown'}
             print(f"Error converting message: {e}")
             return None
 
-    async def _get_user_name(self, user_id: str) -> str:
+    def _get_user_name(self, user_id: str) -> str:
         """Get display name for a user ID"""
         if user_id in self.user_cache:
             return self.user_cache[user_id]
 
         try:
-            response = self.client.users_info(user=user_id)
+            response = self._api_call("users_info", user=user_id)
             if response["ok"]:
                 user = response["user"]
                 name = user.get("real_name") or user.get("name") or user_id
@@ -338,21 +468,10 @@ Time: {timestamp.isoformat() if timestamp else 'Unknown'}
 
         return user_id
 
-    async def _replace_user_mentions(self, text: str) -> str:
+    def _replace_user_mentions(self, text: str) -> str:
         """Replace <@USER_ID> mentions with display names"""
-        import re
-
-        pattern = r'<@([A-Z0-9]+)>'
-
-        async def replace(match):
-            user_id = match.group(1)
-            name = await self._get_user_name(user_id)
-            return f"@{name}"
-
-        # Synchronous version for simplicity
-        matches = re.findall(pattern, text)
-        for user_id in matches:
-            name = await self._get_user_name(user_id)
-            text = text.replace(f"<@{user_id}>", f"@{name}")
-
-        return text
+        return re.sub(
+            r'<@([A-Z0-9]+)>',
+            lambda match: f"@{self._get_user_name(match.group(1))}",
+            text
+        )
@@ -0,0 +1,259 @@
+"""
+Connector Sync Scheduler
+Runs per-source sync work (Slack channels, GitHub repos) in parallel and
+resumably.
+
+- Sources are synced on a bounded thread pool
+- AdaptiveRateLimiter paces the calls to one API from its rate-limit
+  response headers (Retry-After, X-RateLimit-Remaining / -Reset)
+- SyncCheckpoint keeps a cursor per source in ConnectorConfig.settings and
+  saves it through the connector's checkpoint hook as each source finishes
+- A run that stops part way (error, crash) resumes with the sources it had
+  not finished; finished sources keep their new cursors
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .base_connector import ConnectorConfig, Document
+
+
+class AdaptiveRateLimiter:
+    """
+    Paces calls to one API, adapting to its rate-limit headers
+
+    Thread-safe. Call acquire() before a request and observe() with the
+    response headers after it:
+    - Retry-After (HTTP 429) pauses every caller and doubles the spacing
+      between calls; the spacing decays again on successful calls
+    - X-RateLimit-Remaining / -Reset: below `low_water` of the limit, the
+      remaining calls are spread evenly until the reset; at `reserve`
+      calls left, callers wait for the reset
+    """
+
+    def __init__(
+        self,
+        name: str,
+        min_interval: float = 0.0,
+        max_interval: float = 30.0,
+        low_water: float = 0.1,
+        reserve: int = 0
+    ):
+        """
+        Args:
+            name: API name (for stats)
+            min_interval: Minimum seconds between calls
+            max_interval: Cap on the adaptive spacing
+            low_water: Fraction of the quota below which calls are spread out
+            reserve: Calls to leave unused before the quota resets
+        """
+        self.name = name
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.low_water = low_water
+        self.reserve = reserve
+
+        self.interval = min_interval
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def acquire(self):
+        """Block until this caller may send a request"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot, self._paused_until)
+            self._next_slot = start + self.interval
+            wait = start - now
+            self.stats["calls"] += 1
+            self.stats["waited_seconds"] += wait
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, headers: Optional[Mapping[str, Any]] = None, status: Optional[int] = None):
+        """Adapt to a response's status and rate-limit headers"""
+        headers = {str(k).lower(): v for k, v in (headers or {}).items()}
+        now = time.monotonic()
+
+        with self._lock:
+            retry_after = _to_float(headers.get("retry-after"))
+            if status == 429 or retry_after is not None:
+                self.stats["throttled"] += 1
+                self._paused_until = max(self._paused_until, now + (retry_after or 1.0))
+                self.interval = min(self.max_interval, max(self.interval * 2, 0.05))
+                return
+
+            remaining = _to_float(headers.get("x-ratelimit-remaining"))
+            reset = _to_float(headers.get("x-ratelimit-reset"))  # Epoch seconds
+            limit = _to_float(headers.get("x-ratelimit-limit"))
+
+            if remaining is not None and reset is not None:
+                window = max(0.0, reset - time.time())
+                if remaining <= self.reserve:
+                    self._paused_until = max(self._paused_until, now + window)
+                    return
+                if limit and remaining < limit * self.low_water:
+                    self.interval = min(self.max_interval, max(self.min_interval, window / remaining))
+                    return
+
+            # Healthy response: decay back towards the configured pace
+            self.interval = max(self.min_interval, self.interval * 0.8)
+            if self.interval < 0.001:
+                self.interval = self.min_interval
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SyncCheckpoint:
+    """
+    Per-source cursors and run progress for one connector
+
+    Stored in config.settings["sync_state"]:
+        {"cursors": {source_id: {...}}, "run": {"started": iso, "done": [ids]}}
+    "run" is present only while a sync is unfinished. `save` persists the
+    config (ConnectorManager wires it to its config store).
+    """
+
+    SETTINGS_KEY = "sync_state"
+
+    def __init__(self, config: ConnectorConfig, save: Optional[Callable[[], None]] = None):
+        self.config = config
+        self.save = save
+        self._lock = threading.Lock()
+
+        state = config.settings.setdefault(self.SETTINGS_KEY, {})
+        state.setdefault("cursors", {})
+        self.state = state
+
+    def cursor(self, source_id: str) -> Dict[str, Any]:
+        """Saved cursor for a source (empty if never synced)"""
+        with self._lock:
+            return dict(self.state["cursors"].get(source_id, {}))
+
+    def begin(self, source_ids: List[str], restart: bool = False) -> List[str]:
+        """
+        Start (or resume) a run
+
+        Returns:
+            Sources still to sync: all of them, or those an unfinished
+            previous run had not completed
+        """
+        with self._lock:
+            run = self.state.get("run")
+            if run is None or restart:
+                run = self.state["run"] = {"started": datetime.now().isoformat(), "done": []}
+            done = set(run["done"])
+            self._persist()
+        return [source_id for source_id in source_ids if source_id not in done]
+
+    def complete(self, source_id: str, cursor: Dict[str, Any]):
+        """Record a finished source and its new cursor"""
+        with self._lock:
+            self.state["cursors"][source_id] = {**self.state["cursors"].get(source_id, {}), **cursor}
+            run = self.state.setdefault("run", {"started": datetime.now().isoformat(), "done": []})
+            run["done"].append(source_id)
+            self._persist()
+
+    def finish(self):
+        """Mark the run complete (the next sync starts a new one)"""
+        with self._lock:
+            self.state.pop("run", None)
+            self._persist()
+
+    def reset(self):
+        """Forget all cursors (next sync is a full sync)"""
+        with self._lock:
+            self.state["cursors"] = {}
+            self.state.pop("run", None)
+            self._persist()
+
+    def _persist(self):
+        if self.save:
+            try:
+                self.save()
+            except Exception as e:
+                print(f"⚠ Failed to save sync checkpoint: {e}")
+
+
+# worker(source, cursor) -> (documents, new cursor)
+SourceWorker = Callable[[Any, Dict[str, Any]], Tuple[List[Document], Dict[str, Any]]]
+
+
+class SyncScheduler:
+    """
+    Fans per-source sync work out over a bounded thread pool
+
+    Usage:
+        scheduler = SyncScheduler(checkpoint, max_workers=4)
+        stats = scheduler.run({"C1": channel1, "C2": channel2}, worker, sink)
+
+    Each source's documents go to `sink` before its cursor is committed, so
+    a source is never marked done with its documents undelivered.
+    """
+
+    def __init__(self, checkpoint: SyncCheckpoint, max_workers: int = 4):
+        self.checkpoint = checkpoint
+        self.max_workers = max(1, max_workers)
+
+    def run(
+        self,
+        sources: Dict[str, Any],
+        worker: SourceWorker,
+        sink: Callable[[str, List[Document]], None],
+        restart: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sync sources (source_id -> source) through `worker`
+
+        Args:
+            sources: Sources in priority order
+            worker: Syncs one source from its cursor
+            sink: Receives (source_id, documents), in the calling thread
+            restart: Start a new run even if the previous one is unfinished
+
+        Returns:
+            Run stats (sources synced / skipped / failed, errors, documents)
+        """
+        started = time.perf_counter()
+        pending = self.checkpoint.begin(list(sources), restart=restart)
+        errors: Dict[str, str] = {}
+        documents = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(worker, sources[source_id], self.checkpoint.cursor(source_id)): source_id
+                for source_id in pending
+            }
+            for future in as_completed(futures):
+                source_id = futures[future]
+                try:
+                    source_documents, cursor = future.result()
+                except Exception as e:
+                    errors[source_id] = str(e)
+                    continue
+                sink(source_id, source_documents)
+                self.checkpoint.complete(source_id, cursor)
+                documents += len(source_documents)
+
+        if not errors:
+            self.checkpoint.finish()
+
+        return {
+            "sources_total": len(sources),
+            "sources_skipped": len(sources) - len(pending),
+            "sources_synced": len(pending) - len(errors),
+            "sources_failed": len(errors),
+            "errors": errors,
+            "documents": documents,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
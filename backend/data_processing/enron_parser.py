@@ -1,18 +1,27 @@
 """
 Enron Email Dataset Parser and Unclustering Module
 Parses Enron maildir format and converts to JSONL with metadata
+
+parse_all_emails_parallel() shards the maildir across a process pool and
+streams documents to (optionally gzipped, size-rotated) JSONL as shards
+finish, instead of holding the whole corpus in memory.
 """
 
 import os
 import json
 import email
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 import re
 from tqdm import tqdm
 
+from data_processing.jsonl_io import JsonlWriter
+
 
 class EnronParser:
     """Parse Enron email dataset and convert to structured JSONL format"""
@@ -139,6 +148,26 @@ class EnronParser:
         except:
             return str(hash(str(file_path)))
 
+    def iter_email_files(self, limit: Optional[int] = None) -> Iterator[Path]:
+        """
+        Walk the maildir lazily, yielding email file paths
+
+        Args:
+            limit: Stop after this many files (optional)
+        """
+        count = 0
+        for root, dirs, files in os.walk(self.maildir_path):
+            for file in files:
+                # Skip hidden files and directories
+                if file.startswith('.'):
+                    continue
+                # Simple heuristic: email files typically don't have extensions
+                if '.' not in file or file.endswith('.'):
+                    yield Path(root) / file
+                    count += 1
+                    if limit and count >= limit:
+                        return
+
     def parse_all_emails(self, output_path: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
         """
         Parse all emails in the maildir and optionally save to JSONL
@@ -153,19 +182,7 @@ class EnronParser:
         print(f"Scanning {self.maildir_path} for emails...")
 
         # Find all email files
-        email_files = []
-        for root, dirs, files in os.walk(self.maildir_path):
-            for file in files:
-                # Skip hidden files and directories
-                if file.startswith('.'):
-                    continue
-                file_path = Path(root) / file
-                # Simple heuristic: email files typically don't have extensions
-                if '.' not in file or file.endswith('.'):
-                    email_files.append(file_path)
-
-        if limit:
-            email_files = email_files[:limit]
+        email_files = list(self.iter_email_files(limit))
 
         print(f"Found {len(email_files)} email files. Parsing...")
 
@@ -184,6 +201,98 @@ class EnronParser:
 
         return self.parsed_emails
 
+    def parse_all_emails_parallel(
+        self,
+        output_path: str,
+        workers: Optional[int] = None,
+        limit: Optional[int] = None,
+        shard_size: int = 256,
+        compress: bool = False,
+        max_bytes: Optional[int] = None
+    ) -> Dict:
+        """
+        Parse all emails on a process pool, streaming them to JSONL
+
+        File paths are sharded across worker processes while the maildir is
+        still being walked, and each shard's documents are written as soon
+        as it finishes. Output order therefore differs from the walk order;
+        memory is bounded by the shards in flight, not the corpus.
+
+        Args:
+            output_path: JSONL output (see JsonlWriter for gzip / part names)
+            workers: Worker processes (default: CPU count)
+            limit: Maximum number of email files (optional, for testing)
+            shard_size: Files per worker task
+            compress: Gzip the output
+            max_bytes: Rotate to a new part after this many bytes
+
+        Returns:
+            Statistics (same keys as get_statistics) plus throughput and the
+            output files written
+        """
+        workers = workers or os.cpu_count() or 1
+        started = time.perf_counter()
+        files_scanned = files_failed = parsed = 0
+        employee_counts: Dict[str, int] = {}
+        folders = set()
+
+        email_files = self.iter_email_files(limit)
+        shards = iter(lambda: [str(p) for p in islice(email_files, shard_size)], [])
+
+        print(f"Parsing {self.maildir_path} with {workers} worker processes...")
+
+        with JsonlWriter(output_path, compress=compress, max_bytes=max_bytes) as writer, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                                    initargs=(str(self.maildir_path),)) as executor, \
+                tqdm(desc="Parsing emails", unit="files") as progress:
+            pending = {}
+
+            def fill():
+                # Keep every worker busy with one shard queued behind it
+                while len(pending) < workers * 2:
+                    shard = next(shards, None)
+                    if shard is None:
+                        return
+                    pending[executor.submit(_parse_shard, shard)] = len(shard)
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard_files = pending.pop(future)
+                    documents, shard_failed = future.result()
+                    writer.write_many(documents)
+
+                    for doc in documents:
+                        metadata = doc['metadata']
+                        employee_counts[metadata['employee']] = employee_counts.get(metadata['employee'], 0) + 1
+                        folders.add(metadata['folder'])
+
+                    files_scanned += shard_files
+                    files_failed += shard_failed
+                    parsed += len(documents)
+                    progress.update(shard_files)
+                fill()
+
+        elapsed = time.perf_counter() - started
+        files_per_second = files_scanned / elapsed if elapsed > 0 else 0.0
+        print(f"✓ Parsed {parsed} emails from {files_scanned} files in {elapsed:.1f}s "
+              f"({files_per_second:.0f} files/s) → {', '.join(str(p) for p in writer.paths)}")
+
+        return {
+            'total_emails': parsed,
+            'unique_employees': len(employee_counts),
+            'unique_folders': len(folders),
+            'employees': sorted(employee_counts),
+            'folders': sorted(folders),
+            'emails_per_employee': employee_counts,
+            'files_scanned': files_scanned,
+            'files_failed': files_failed,
+            'elapsed_seconds': round(elapsed, 2),
+            'files_per_second': round(files_per_second, 1),
+            'output_files': [str(p) for p in writer.paths],
+        }
+
     def save_to_jsonl(self, output_path: str):
         """Save parsed emails to JSONL format"""
         output_file = Path(output_path)
@@ -219,6 +328,41 @@ class EnronParser:
         }
 
 
+# Per-process parser for parse_all_emails_parallel workers
+_worker_parser: Optional[EnronParser] = None
+
+
+def _init_parse_worker(maildir_path: str):
+    global _worker_parser
+    _worker_parser = EnronParser(maildir_path)
+
+
+def _parse_shard(paths: List[str]) -> Tuple[List[Dict], int]:
+    """Parse a shard of email files in a worker: (documents with content, failures)"""
+    documents = []
+    failed = 0
+    for path in paths:
+        doc = _worker_parser.parse_email_file(Path(path))
+        if doc is None:
+            failed += 1
+        elif doc['content']:  # Only include emails with content
+            documents.append(doc)
+    return documents, failed
+
+
+def _print_statistics(stats: Dict):
+    print("\n" + "="*50)
+    print("ENRON DATASET STATISTICS")
+    print("="*50)
+    print(f"Total emails parsed: {stats['total_emails']}")
+    print(f"Unique employees: {stats['unique_employees']}")
+    print(f"Unique folders: {stats['unique_folders']}")
+    print(f"\nTop 10 employees by email count:")
+    sorted_employees = sorted(stats['emails_per_employee'].items(), key=lambda x: x[1], reverse=True)[:10]
+    for emp, count in sorted_employees:
+        print(f"  {emp}: {count} emails")
+
+
 def uncluster_enron_data(maildir_path: str, output_path: str, limit: Optional[int] = None):
     """
     Main function to uncluster Enron data
@@ -232,21 +376,44 @@ def uncluster_enron_data(maildir_path: str, output_path: str, limit: Optional[in
     emails = parser.parse_all_emails(output_path, limit=limit)
 
     # Print statistics
-    stats = parser.get_statistics()
-    print("\n" + "="*50)
-    print("ENRON DATASET STATISTICS")
-    print("="*50)
-    print(f"Total emails parsed: {stats['total_emails']}")
-    print(f"Unique employees: {stats['unique_employees']}")
-    print(f"Unique folders: {stats['unique_folders']}")
-    print(f"\nTop 10 employees by email count:")
-    sorted_employees = sorted(stats['emails_per_employee'].items(), key=lambda x: x[1], reverse=True)[:10]
-    for emp, count in sorted_employees:
-        print(f"  {emp}: {count} emails")
+    _print_statistics(parser.get_statistics())
 
     return emails
 
 
+def uncluster_enron_data_parallel(
+    maildir_path: str,
+    output_path: str,
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+    compress: bool = False,
+    max_bytes: Optional[int] = None
+) -> Dict:
+    """
+    Uncluster Enron data on a process pool, streaming to JSONL
+
+    Args:
+        maildir_path: Path to Enron maildir
+        output_path: Path to save unclustered JSONL (read it back with
+            data_processing.jsonl_io.iter_jsonl, which follows .gz / parts)
+        limit: Optional limit for testing
+        workers: Worker processes (default: CPU count)
+        compress: Gzip the output
+        max_bytes: Rotate output parts at this size
+
+    Returns:
+        Parse statistics
+    """
+    parser = EnronParser(maildir_path)
+    stats = parser.parse_all_emails_parallel(
+        output_path, workers=workers, limit=limit, compress=compress, max_bytes=max_bytes
+    )
+
+    _print_statistics(stats)
+
+    return stats
+
+
 if __name__ == "__main__":
     # Test the parser
     from config.config import Config
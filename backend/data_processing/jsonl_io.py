@@ -0,0 +1,158 @@
+"""
+JSONL Reading and Writing
+Shared by the Enron parser (writer) and the clusterers (readers).
+
+- JsonlWriter optionally gzips and rotates output into numbered parts
+  once a part reaches `max_bytes` (uncompressed)
+- iter_jsonl() reads a file or all of its rotated parts lazily, so a
+  consumer never needs the whole corpus in memory
+"""
+
+import gzip
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+def _open_text(path: Path, mode: str):
+    if path.suffix == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8', compresslevel=6)
+    return open(path, mode, encoding='utf-8')
+
+
+def _split_name(path: Path):
+    """('dir/enron_emails', '.jsonl.gz') for 'dir/enron_emails.jsonl.gz'"""
+    name = path.name
+    for suffix in ('.jsonl.gz', '.jsonl'):
+        if name.endswith(suffix):
+            return path.parent / name[:-len(suffix)], suffix
+    return path.parent / path.stem, path.suffix
+
+
+class JsonlWriter:
+    """
+    Append-only JSONL writer with optional gzip and size-based rotation
+
+    Output names:
+        enron_emails.jsonl                  (no rotation)
+        enron_emails.jsonl.gz               (compress=True)
+        enron_emails.00000.jsonl[.gz], ...  (max_bytes set)
+    """
+
+    def __init__(self, output_path: str, compress: bool = False, max_bytes: Optional[int] = None):
+        """
+        Args:
+            output_path: Target file (.gz is added when compressing)
+            compress: Write gzip-compressed parts
+            max_bytes: Start a new part after this many (uncompressed) bytes
+        """
+        path = Path(output_path)
+        if compress and path.suffix != '.gz':
+            path = path.with_name(path.name + '.gz')
+        self.output_path = path
+        self.max_bytes = max_bytes
+        self.paths: List[Path] = []
+        self.documents_written = 0
+        self.bytes_written = 0
+
+        self._base, self._suffix = _split_name(path)
+        self._file = None
+        self._part_bytes = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self._suffix in ('.jsonl', '.jsonl.gz'):
+            # Earlier output in any form (plain, .gz, rotated) would be read back
+            for old_path in _outputs(self._base):
+                old_path.unlink()
+
+    def write(self, document: Dict):
+        line = json.dumps(document, ensure_ascii=False) + '\n'
+        size = len(line.encode('utf-8'))
+
+        if self._file is None or (self.max_bytes and self._part_bytes and
+                                  self._part_bytes + size > self.max_bytes):
+            self._next_part()
+
+        self._file.write(line)
+        self._part_bytes += size
+        self.bytes_written += size
+        self.documents_written += 1
+
+    def write_many(self, documents):
+        for document in documents:
+            self.write(document)
+
+    def close(self):
+        if self._file is None and not self.paths:
+            self._next_part()  # Empty output still produces a file
+        self._close_part()
+
+    def _close_part(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _next_part(self):
+        self._close_part()
+        if self.max_bytes:
+            path = Path(f"{self._base}.{len(self.paths):05d}{self._suffix}")
+        else:
+            path = self.output_path
+        self._file = _open_text(path, 'w')
+        self._part_bytes = 0
+        self.paths.append(path)
+
+
+def _rotated_parts(base: Path, suffixes: List[str]) -> List[Path]:
+    pattern = re.compile(re.escape(base.name) + r'\.(\d{5})(\.jsonl(?:\.gz)?)$')
+    parts = []
+    if base.parent.exists():
+        for candidate in base.parent.iterdir():
+            match = pattern.match(candidate.name)
+            if match and match.group(2) in suffixes:
+                parts.append((int(match.group(1)), candidate))
+    return [part for _, part in sorted(parts)]
+
+
+def _outputs(base: Path) -> List[Path]:
+    """Every existing output file for a base name"""
+    suffixes = ['.jsonl', '.jsonl.gz']
+    single = [Path(f"{base}{suffix}") for suffix in suffixes]
+    return [p for p in single if p.exists()] + _rotated_parts(base, suffixes)
+
+
+def jsonl_parts(path: str) -> List[Path]:
+    """
+    Files making up a JSONL output: the file itself, its .gz, or its
+    rotated parts in order
+    """
+    path = Path(path)
+    base, suffix = _split_name(path)
+    suffixes = [suffix] if suffix.endswith('.gz') else [suffix, suffix + '.gz']
+
+    for candidate_suffix in suffixes:
+        candidate = Path(f"{base}{candidate_suffix}")
+        if candidate.exists():
+            return [candidate]
+
+    return _rotated_parts(base, suffixes)
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """Lazily yield documents from a JSONL file or its rotated / gzipped parts"""
+    parts = jsonl_parts(path)
+    if not parts:
+        raise FileNotFoundError(f"No JSONL output at {path}")
+
+    for part in parts:
+        with _open_text(part, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
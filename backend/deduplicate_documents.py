@@ -7,6 +7,10 @@ Strategy:
 2. Score each document by "completeness" (fewer placeholders = better)
 3. Use timestamps as tiebreaker when available
 4. Keep only the best version from each group
+
+Similarities are computed as sparse row blocks, so the N x N matrix is never
+materialized. deduplicate_jsonl() streams a JSONL corpus end to end and only
+keeps the sparse TF-IDF matrix and a small score record per document.
 """
 
 import json
@@ -71,20 +75,16 @@ def extract_timestamp_from_metadata(metadata):
     return timestamp
 
 
-def find_similar_document_groups(documents, similarity_threshold=0.70):
-    """
-    Group documents by content similarity using TF-IDF cosine similarity.
-    Returns groups of similar documents.
+def _build_tfidf_matrix(contents):
     """
-    if len(documents) < 2:
-        return [[0]] if documents else []
+    Fit the TF-IDF vectorizer used for grouping.
 
-    print(f"\n🔍 Finding similar document groups (threshold: {similarity_threshold})...")
+    Args:
+        contents: Iterable of document contents (may be a generator)
 
-    # Extract content
-    contents = [doc.get('content', '')[:5000] for doc in documents]  # Use first 5000 chars
-
-    # Build TF-IDF vectors
+    Returns:
+        Sparse TF-IDF matrix, or None if no vocabulary could be built
+    """
     vectorizer = TfidfVectorizer(
         max_features=3000,
         ngram_range=(1, 2),
@@ -93,87 +93,152 @@ def find_similar_document_groups(documents, similarity_threshold=0.70):
     )
 
     try:
-        tfidf_matrix = vectorizer.fit_transform(contents)
+        return vectorizer.fit_transform(contents)
     except ValueError:
         # If all docs are too similar or empty
-        return [[i] for i in range(len(documents))]
+        return None
+
 
-    # Calculate pairwise similarities
-    similarity_matrix = cosine_similarity(tfidf_matrix)
+def _group_by_similarity(tfidf_matrix, similarity_threshold, block_size=256):
+    """
+    Union-find over pairs with cosine similarity >= threshold.
 
-    # Group similar documents using union-find approach
-    n = len(documents)
+    Similarities are computed one block of rows at a time as a sparse
+    matrix, so memory is bounded by the block rather than N x N.
+    """
+    n = tfidf_matrix.shape[0]
     parent = list(range(n))
 
     def find(x):
-        if parent[x] != x:
-            parent[x] = find(parent[x])
-        return parent[x]
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
 
     def union(x, y):
         px, py = find(x), find(y)
         if px != py:
             parent[px] = py
 
-    # Union similar documents
-    for i in range(n):
-        for j in range(i + 1, n):
-            if similarity_matrix[i][j] >= similarity_threshold:
-                union(i, j)
+    for start in range(0, n, block_size):
+        block = cosine_similarity(
+            tfidf_matrix[start:start + block_size],
+            tfidf_matrix,
+            dense_output=False
+        ).tocoo()
+
+        rows = block.row + start
+        mask = (block.col > rows) & (block.data >= similarity_threshold)
+        for i, j in zip(rows[mask], block.col[mask]):
+            union(int(i), int(j))
 
     # Collect groups
     groups = defaultdict(list)
     for i in range(n):
         groups[find(i)].append(i)
 
-    group_list = list(groups.values())
+    return list(groups.values())
 
-    # Stats
+
+def _report_groups(group_list):
+    """Print group statistics"""
     duplicate_groups = [g for g in group_list if len(g) > 1]
     print(f"  ✓ Found {len(group_list)} unique document groups")
     print(f"  ✓ {len(duplicate_groups)} groups have multiple versions")
 
+
+def find_similar_document_groups(documents, similarity_threshold=0.70, block_size=256):
+    """
+    Group documents by content similarity using TF-IDF cosine similarity.
+    Returns groups of similar documents.
+    """
+    if len(documents) < 2:
+        return [[0]] if documents else []
+
+    print(f"\n🔍 Finding similar document groups (threshold: {similarity_threshold})...")
+
+    # Extract content
+    contents = [doc.get('content', '')[:5000] for doc in documents]  # Use first 5000 chars
+
+    # Build TF-IDF vectors
+    tfidf_matrix = _build_tfidf_matrix(contents)
+    if tfidf_matrix is None:
+        return [[i] for i in range(len(documents))]
+
+    group_list = _group_by_similarity(tfidf_matrix, similarity_threshold, block_size)
+
+    # Stats
+    _report_groups(group_list)
+
     return group_list
 
 
-def select_best_document(documents, indices):
+def iter_jsonl_documents(path):
+    """Stream documents from a JSONL file, skipping blank lines"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def find_similar_groups_in_jsonl(path, similarity_threshold=0.70, block_size=256):
     """
-    From a group of similar documents, select the best (most complete) one.
+    Same grouping as find_similar_document_groups, streamed from JSONL.
+
+    Document contents are never held in memory together; indices in the
+    returned groups are line positions among non-blank lines.
     """
-    if len(indices) == 1:
-        return indices[0], None
+    print(f"\n🔍 Finding similar document groups in {path} (threshold: {similarity_threshold})...")
+
+    tfidf_matrix = _build_tfidf_matrix(
+        doc.get('content', '')[:5000] for doc in iter_jsonl_documents(path)
+    )
+    if tfidf_matrix is None:
+        count = sum(1 for _ in iter_jsonl_documents(path))
+        return [[i] for i in range(count)]
+
+    if tfidf_matrix.shape[0] < 2:
+        return [[0]] if tfidf_matrix.shape[0] else []
+
+    group_list = _group_by_similarity(tfidf_matrix, similarity_threshold, block_size)
+    _report_groups(group_list)
+
+    return group_list
+
+
+def score_document(doc):
+    """Completeness score plus timestamp bonus used to pick the best version"""
+    content = doc.get('content', '')
+    metadata = doc.get('metadata', {})
 
+    # Calculate completeness score
+    completeness = calculate_completeness_score(content)
+
+    # Timestamp bonus (newer is better)
+    timestamp = extract_timestamp_from_metadata(metadata)
+    timestamp_bonus = 0
+    if timestamp:
+        # Simple heuristic: later dates get small bonus
+        try:
+            # Try to extract year/month
+            if '2024' in timestamp:
+                timestamp_bonus = 5
+            if '2025' in timestamp:
+                timestamp_bonus = 10
+        except:
+            pass
+
+    return completeness + timestamp_bonus
+
+
+def _select_best_index(indices, scores):
+    """Highest-scoring index; earliest wins ties"""
     best_idx = None
     best_score = -float('inf')
-    scores = []
 
     for idx in indices:
-        doc = documents[idx]
-        content = doc.get('content', '')
-        metadata = doc.get('metadata', {})
-
-        # Calculate completeness score
-        completeness = calculate_completeness_score(content)
-
-        # Timestamp bonus (newer is better)
-        timestamp = extract_timestamp_from_metadata(metadata)
-        timestamp_bonus = 0
-        if timestamp:
-            # Simple heuristic: later dates get small bonus
-            try:
-                # Try to extract year/month
-                if '2024' in timestamp:
-                    timestamp_bonus = 5
-                if '2025' in timestamp:
-                    timestamp_bonus = 10
-            except:
-                pass
-
-        total_score = completeness + timestamp_bonus
-        scores.append((idx, total_score, completeness))
-
-        if total_score > best_score:
-            best_score = total_score
+        if scores[idx] > best_score:
+            best_score = scores[idx]
             best_idx = idx
 
     # Return best and info about rejected docs
@@ -181,6 +246,17 @@ def select_best_document(documents, indices):
     return best_idx, rejected
 
 
+def select_best_document(documents, indices):
+    """
+    From a group of similar documents, select the best (most complete) one.
+    """
+    if len(indices) == 1:
+        return indices[0], None
+
+    scores = {idx: score_document(documents[idx]) for idx in indices}
+    return _select_best_index(indices, scores)
+
+
 def deduplicate_documents(documents):
     """
     Main deduplication function.
@@ -241,6 +317,68 @@ def deduplicate_documents(documents):
     }
 
 
+def deduplicate_jsonl(input_path, output_path, similarity_threshold=0.70, block_size=256):
+    """
+    Streaming deduplication of a JSONL corpus.
+
+    Three passes over the input: fit TF-IDF and group, score each document,
+    then write the kept documents (in input order) to output_path. Only the
+    sparse TF-IDF matrix and a score and name per document stay in memory.
+
+    Returns:
+        dedup_info dict, as returned by deduplicate_documents
+    """
+    print("\n" + "=" * 80)
+    print("DOCUMENT DEDUPLICATION (STREAMING)")
+    print("=" * 80)
+
+    groups = find_similar_groups_in_jsonl(input_path, similarity_threshold, block_size)
+
+    # Score only documents that have competing versions
+    in_duplicate_group = {idx for group in groups if len(group) > 1 for idx in group}
+    scores = {}
+    names = {}
+    for idx, doc in enumerate(iter_jsonl_documents(input_path)):
+        if idx in in_duplicate_group:
+            scores[idx] = score_document(doc)
+            names[idx] = doc.get('metadata', {}).get('file_name', f'doc_{idx}')
+
+    kept = set()
+    dedup_log = []
+    for group in groups:
+        if len(group) == 1:
+            kept.add(group[0])
+            continue
+
+        best_idx, rejected = _select_best_index(group, scores)
+        kept.add(best_idx)
+        for rej_idx in rejected:
+            dedup_log.append({
+                'kept': names[best_idx],
+                'rejected': names[rej_idx],
+                'reason': 'Less complete version'
+            })
+
+    total = 0
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for idx, doc in enumerate(iter_jsonl_documents(input_path)):
+            total += 1
+            if idx in kept:
+                out.write(json.dumps(doc, ensure_ascii=False) + '\n')
+
+    print(f"\n✅ Deduplication Results:")
+    print(f"   • Original documents: {total}")
+    print(f"   • After deduplication: {len(kept)}")
+    print(f"   • Removed duplicates: {total - len(kept)}")
+
+    return {
+        'original_count': total,
+        'deduplicated_count': len(kept),
+        'removed_count': total - len(kept),
+        'log': dedup_log
+    }
+
+
 def analyze_document_versions(documents):
     """
     Analyze and report on document versions without modifying.
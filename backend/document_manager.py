@@ -1,12 +1,22 @@
 """
 Document Management System
 Handles file uploads, classification, parsing, and deletion
+
+Document metadata (category, confidence, review flag) is kept in a SQLite
+index next to the classified files (utils/document_index.py); listings
+and statistics query it and load full documents from JSON only as needed.
+
+submit_upload() returns a job id at once and parses/classifies in the
+background (utils/job_queue.py); identical files a user already uploaded
+are not parsed again.
 """
 
 import os
 import json
 import pickle
 import uuid
+import hashlib
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -19,12 +29,16 @@ from parsers.llamaparse_parser import LlamaParseDocumentParser as LlamaParsePars
 # Import classifier
 from classification.work_personal_classifier import WorkPersonalClassifier
 
+from utils.document_index import DocumentIndex
+from utils.job_queue import BackgroundJobQueue, JobQueueFull
+
 
 class DocumentManager:
     """Manages document lifecycle: upload → parse → classify → store"""
 
     UPLOAD_FOLDER = Path("club_data/uploads")
     CLASSIFIED_FOLDER = Path("club_data/classified")
+    INDEX_FILENAME = "document_index.db"
     ALLOWED_EXTENSIONS = {
         'pdf', 'doc', 'docx', 'txt', 'ppt', 'pptx',
         'xls', 'xlsx', 'csv', 'html', 'xml', 'md'
@@ -38,13 +52,21 @@ class DocumentManager:
         'spam': 'Spam or irrelevant content to delete'
     }
 
-    def __init__(self, api_key: str, llamaparse_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        llamaparse_key: str,
+        upload_workers: int = 4,
+        uploads_per_user: int = 2
+    ):
         """
         Initialize document manager
 
         Args:
             api_key: OpenAI API key
             llamaparse_key: LlamaParse API key
+            upload_workers: Background workers parsing/classifying uploads
+            uploads_per_user: Uploads processed at once for one user
         """
         self.client = OpenAI(api_key=api_key)
 
@@ -68,13 +90,72 @@ class DocumentManager:
 
         self.classifier = WorkPersonalClassifier(api_key, model="gpt-4o-mini")
 
-        # Create directories
+        self._init_storage()
+        self._init_upload_jobs(upload_workers, uploads_per_user)
+
+    def _init_upload_jobs(self, upload_workers: int = 4, uploads_per_user: int = 2):
+        """Background queue for submit_upload"""
+        self.upload_jobs = BackgroundJobQueue(
+            max_workers=upload_workers,
+            per_user_concurrency=uploads_per_user
+        )
+        self._inflight_uploads: Dict[Tuple[str, str], str] = {}  # (user, hash) -> job id
+        self._inflight_lock = threading.Lock()
+
+    def _init_storage(self):
+        """Create the document folders and open the metadata index"""
         self.UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
         self.CLASSIFIED_FOLDER.mkdir(parents=True, exist_ok=True)
 
         for category in self.CATEGORIES:
             (self.CLASSIFIED_FOLDER / category).mkdir(exist_ok=True)
 
+        self.index = DocumentIndex(self.CLASSIFIED_FOLDER / self.INDEX_FILENAME)
+
+        # Index documents classified before the index existed
+        if self.index.is_empty():
+            indexed = self.index.rebuild(self.CLASSIFIED_FOLDER, self.CATEGORIES)
+            if indexed:
+                print(f"✓ Indexed {indexed} existing classified documents")
+
+    def rebuild_index(self) -> int:
+        """Re-index all classified files (after editing them outside the manager)"""
+        return self.index.rebuild(self.CLASSIFIED_FOLDER, self.CATEGORIES)
+
+    def load_document(self, doc_id: str, category: Optional[str] = None) -> Optional[Dict]:
+        """
+        Load a classified document's full JSON
+
+        Args:
+            doc_id: Document ID
+            category: Category folder (looked up in the index if omitted)
+
+        Returns:
+            Document dict, or None if it no longer exists
+        """
+        if category is None:
+            row = self.index.get(doc_id)
+            if not row:
+                return None
+            category = row['category']
+
+        doc_path = self.CLASSIFIED_FOLDER / category / f"{doc_id}.json"
+        try:
+            with open(doc_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Removed outside the manager
+            self.index.delete(doc_id)
+            return None
+
+    def _load_rows(self, rows: List[Dict]) -> List[Dict]:
+        documents = []
+        for row in rows:
+            document = self.load_document(row['doc_id'], row['category'])
+            if document is not None:
+                documents.append(document)
+        return documents
+
     def allowed_file(self, filename: str) -> bool:
         """Check if file extension is allowed"""
         return '.' in filename and \
@@ -82,7 +163,8 @@ class DocumentManager:
 
     def upload_file(self, file, user_id: str = "default") -> Dict:
         """
-        Upload and process a file
+        Upload and process a file (blocks until parsed and classified;
+        see submit_upload for the background version)
 
         Args:
             file: FileStorage object from Flask request
@@ -91,6 +173,80 @@ class DocumentManager:
         Returns:
             Dict with upload status and document info
         """
+        saved = self._save_upload(file, user_id)
+        if not saved['success']:
+            return saved
+
+        duplicate = self._duplicate_result(user_id, saved)
+        if duplicate:
+            return duplicate
+
+        return self.process_upload(
+            saved['doc_id'], saved['filename'], saved['file_path'], user_id, saved['content_hash']
+        )
+
+    def submit_upload(self, file, user_id: str = "default") -> Dict:
+        """
+        Save a file and queue its parsing and classification
+
+        Identical content the user already uploaded is not parsed again: the
+        existing document is returned as a completed job (or, while the first
+        copy is still processing, its job).
+
+        Returns:
+            {'success': True, 'job': job record} or {'success': False, 'error'}
+
+        Raises:
+            JobQueueFull: The user has too many uploads pending
+        """
+        saved = self._save_upload(file, user_id)
+        if not saved['success']:
+            return saved
+
+        key = (user_id, saved['content_hash'])
+        with self._inflight_lock:
+            inflight_job = self._inflight_uploads.get(key)
+            if inflight_job:
+                Path(saved['file_path']).unlink(missing_ok=True)
+                job = self.upload_jobs.get(inflight_job)
+                if job:
+                    return {'success': True, 'duplicate': True, 'job': job}
+
+            duplicate = self._duplicate_result(user_id, saved)
+            if duplicate:
+                job = self.upload_jobs.add_completed(user_id, duplicate, filename=saved['filename'])
+                return {'success': True, 'duplicate': True, 'job': job}
+
+            try:
+                job = self.upload_jobs.submit(
+                    user_id, self._run_upload_job, saved, user_id, filename=saved['filename']
+                )
+            except JobQueueFull:
+                Path(saved['file_path']).unlink(missing_ok=True)
+                raise
+            self._inflight_uploads[key] = job['job_id']
+
+        return {'success': True, 'job': job}
+
+    def get_upload_job(self, job_id: str, user_id: str = "default") -> Optional[Dict]:
+        """Status of a submitted upload (None if unknown or another user's)"""
+        return self.upload_jobs.get(job_id, user_id)
+
+    def _run_upload_job(self, saved: Dict, user_id: str) -> Dict:
+        try:
+            result = self.process_upload(
+                saved['doc_id'], saved['filename'], saved['file_path'], user_id, saved['content_hash']
+            )
+        finally:
+            with self._inflight_lock:
+                self._inflight_uploads.pop((user_id, saved['content_hash']), None)
+
+        if not result['success']:
+            raise RuntimeError(result['error'])
+        return result
+
+    def _save_upload(self, file, user_id: str) -> Dict:
+        """Validate and store an uploaded file, hashing its content"""
         if not file or file.filename == '':
             return {'success': False, 'error': 'No file selected'}
 
@@ -101,12 +257,66 @@ class DocumentManager:
             }
 
         try:
-            # Save file
             filename = secure_filename(file.filename)
             doc_id = f"{user_id}_{uuid.uuid4().hex[:8]}_{filename}"
             filepath = self.UPLOAD_FOLDER / doc_id
             file.save(str(filepath))
 
+            content_hash = hashlib.sha256()
+            with open(filepath, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    content_hash.update(block)
+
+            return {
+                'success': True,
+                'doc_id': doc_id,
+                'filename': filename,
+                'file_path': str(filepath),
+                'content_hash': content_hash.hexdigest()
+            }
+
+        except Exception as e:
+            print(f"Error saving upload: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def _duplicate_result(self, user_id: str, saved: Dict) -> Optional[Dict]:
+        """Upload result for an already processed copy of the same file (drops the new copy)"""
+        row = self.index.find_by_hash(user_id, saved['content_hash'])
+        if not row or self.load_document(row['doc_id'], row['category']) is None:
+            return None
+
+        Path(saved['file_path']).unlink(missing_ok=True)
+        print(f"Skipping {saved['filename']}: identical to {row['doc_id']}")
+        return {
+            'success': True,
+            'duplicate': True,
+            'document': {
+                'doc_id': row['doc_id'],
+                'filename': row['filename'],
+                'category': row['category'],
+                'confidence': row['confidence'],
+                'size': row['file_size'],
+                'needs_review': row['needs_review']
+            }
+        }
+
+    def process_upload(
+        self,
+        doc_id: str,
+        filename: str,
+        file_path: str,
+        user_id: str = "default",
+        content_hash: Optional[str] = None
+    ) -> Dict:
+        """
+        Parse, classify and store a saved upload
+
+        Returns:
+            Dict with upload status and document info
+        """
+        filepath = Path(file_path)
+
+        try:
             # Parse with LlamaParse
             print(f"Parsing {filename} with LlamaParse...")
             parsed_data = self.parser.parse(str(filepath))
@@ -128,7 +338,8 @@ class DocumentManager:
                     **parsed_data.get('metadata', {}),
                     'upload_time': datetime.now().isoformat(),
                     'file_path': str(filepath),
-                    'file_size': os.path.getsize(filepath)
+                    'file_size': os.path.getsize(filepath),
+                    'content_hash': content_hash
                 },
                 'structured_data': parsed_data.get('structured_data', {}),
                 'parsing_status': 'success'
@@ -144,6 +355,7 @@ class DocumentManager:
             classified_file = self.CLASSIFIED_FOLDER / category / f"{doc_id}.json"
             with open(classified_file, 'w', encoding='utf-8') as f:
                 json.dump(document, f, indent=2, ensure_ascii=False)
+            self.index.upsert(document)
 
             return {
                 'success': True,
@@ -282,37 +494,25 @@ Guidelines:
         else:
             return 'review'
 
-    def get_documents_for_review(self, user_id: str = "default") -> List[Dict]:
+    def get_documents_for_review(
+        self,
+        user_id: str = "default",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict]:
         """
-        Get all documents that need user review
+        Get documents that need user review (uncertain, or flagged for review)
 
         Args:
             user_id: User identifier
+            limit: Page size (None for all)
+            offset: Documents to skip
 
         Returns:
             List of documents needing review
         """
-        review_docs = []
-
-        # Check uncertain category
-        uncertain_dir = self.CLASSIFIED_FOLDER / 'uncertain'
-        if uncertain_dir.exists():
-            for doc_file in uncertain_dir.glob(f"{user_id}_*.json"):
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    doc = json.load(f)
-                    review_docs.append(doc)
-
-        # Check documents with needs_review flag
-        for category in ['work', 'personal', 'spam']:
-            category_dir = self.CLASSIFIED_FOLDER / category
-            if category_dir.exists():
-                for doc_file in category_dir.glob(f"{user_id}_*.json"):
-                    with open(doc_file, 'r', encoding='utf-8') as f:
-                        doc = json.load(f)
-                        if doc.get('classification', {}).get('needs_review', False):
-                            review_docs.append(doc)
-
-        return review_docs
+        rows = self.index.query(user_id, review_queue=True, limit=limit, offset=offset)
+        return self._load_rows(rows)
 
     def user_decision(self, doc_id: str, decision: str, user_id: str = "default") -> Dict:
         """
@@ -329,11 +529,15 @@ Guidelines:
         if decision not in ['keep', 'delete']:
             return {'success': False, 'error': 'Decision must be "keep" or "delete"'}
 
-        # Find document in classified folders
+        # Find document via the index, then in classified folders
         doc_path = None
         current_category = None
 
-        for category in self.CATEGORIES:
+        row = self.index.get(doc_id)
+        candidates = [row['category']] if row else []
+        candidates += [c for c in self.CATEGORIES if c not in candidates]
+
+        for category in candidates:
             potential_path = self.CLASSIFIED_FOLDER / category / f"{doc_id}.json"
             if potential_path.exists():
                 doc_path = potential_path
@@ -341,6 +545,8 @@ Guidelines:
                 break
 
         if not doc_path:
+            if row:
+                self.index.delete(doc_id)
             return {'success': False, 'error': 'Document not found'}
 
         # Load document
@@ -350,6 +556,7 @@ Guidelines:
         if decision == 'delete':
             # Delete classified file
             doc_path.unlink()
+            self.index.delete(doc_id)
 
             # Delete original upload if exists
             upload_path = Path(document['metadata'].get('file_path', ''))
@@ -377,6 +584,7 @@ Guidelines:
 
                 # Delete old location
                 doc_path.unlink()
+                self.index.upsert(document)
 
             return {
                 'success': True,
@@ -385,59 +593,54 @@ Guidelines:
                 'ready_for_processing': True
             }
 
-    def get_documents_ready_for_rag(self, user_id: str = "default") -> List[Dict]:
+    def get_documents_ready_for_rag(
+        self,
+        user_id: str = "default",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict]:
         """
-        Get all work documents ready to be added to RAG
+        Get work documents ready to be added to RAG (not awaiting review)
 
         Args:
             user_id: User identifier
+            limit: Page size (None for all)
+            offset: Documents to skip
 
         Returns:
             List of documents ready for RAG processing
         """
-        work_docs = []
-        work_dir = self.CLASSIFIED_FOLDER / 'work'
+        rows = self.index.query(
+            user_id, categories=['work'], needs_review=False, limit=limit, offset=offset
+        )
+        return self._load_rows(rows)
 
-        if work_dir.exists():
-            for doc_file in work_dir.glob(f"{user_id}_*.json"):
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    doc = json.load(f)
-                    # Only include docs that don't need review
-                    if not doc.get('classification', {}).get('needs_review', False):
-                        work_docs.append(doc)
+    def count_documents_for_review(self, user_id: str = "default") -> int:
+        """Total documents awaiting review (for paginating get_documents_for_review)"""
+        return self.index.count(user_id, review_queue=True)
 
-        return work_docs
+    def count_documents_ready_for_rag(self, user_id: str = "default") -> int:
+        """Total documents ready for RAG (for paginating get_documents_ready_for_rag)"""
+        return self.index.count(user_id, categories=['work'], needs_review=False)
 
     def get_statistics(self, user_id: str = "default") -> Dict:
         """Get document statistics"""
+        by_category = self.index.statistics(user_id)
+
         stats = {
             'total': 0,
-            'by_category': {},
+            'by_category': {category: 0 for category in self.CATEGORIES},
             'needs_review': 0,
             'ready_for_rag': 0
         }
 
-        for category in self.CATEGORIES:
-            category_dir = self.CLASSIFIED_FOLDER / category
-            if category_dir.exists():
-                docs = list(category_dir.glob(f"{user_id}_*.json"))
-                stats['by_category'][category] = len(docs)
-                stats['total'] += len(docs)
-
-                # Count needs_review
-                for doc_file in docs:
-                    with open(doc_file, 'r', encoding='utf-8') as f:
-                        doc = json.load(f)
-                        if doc.get('classification', {}).get('needs_review', False):
-                            stats['needs_review'] += 1
+        for category, counts in by_category.items():
+            stats['by_category'][category] = counts['total']
+            stats['total'] += counts['total']
+            stats['needs_review'] += counts['needs_review']
 
         # Ready for RAG = work docs that don't need review
-        work_dir = self.CLASSIFIED_FOLDER / 'work'
-        if work_dir.exists():
-            for doc_file in work_dir.glob(f"{user_id}_*.json"):
-                with open(doc_file, 'r', encoding='utf-8') as f:
-                    doc = json.load(f)
-                    if not doc.get('classification', {}).get('needs_review', False):
-                        stats['ready_for_rag'] += 1
+        work = by_category.get('work', {'total': 0, 'needs_review': 0})
+        stats['ready_for_rag'] = work['total'] - work['needs_review']
 
         return stats
@@ -2,29 +2,53 @@
 Gap Analysis Engine
 Analyzes clustered data to identify missing information and knowledge gaps
 SECURITY: All data sanitized before sending to Azure OpenAI
+
+analyze_all_projects() runs project analyses on a worker pool (LLM calls
+rate limited from the API's headers and retried with backoff), streams
+each project's JSONL instead of loading it, and checkpoints every
+project's result as soon as it completes. Projects whose documents hash
+the same as at their checkpoint are not analyzed again.
 """
 
+import hashlib
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Set
 from openai import AzureOpenAI
 from collections import defaultdict
 import re
 
 # SECURITY: Import data sanitizer
 from security.data_sanitizer import DataSanitizer
+from utils.llm_cache import get_llm_cache
+from utils.llm_batch import LLMBatchExecutor, TokenBucketLimiter, chat_completion_call
 
 
 class GapAnalyzer:
     """Analyze projects for knowledge gaps and missing information"""
 
+    # Prompt template version (bump to invalidate cached analyses)
+    GAP_PROMPT_VERSION = "gap-analysis-v1"
+
+    SYSTEM_PROMPT = (
+        "You are an expert knowledge management analyst. You identify gaps in project "
+        "documentation and generate insightful questions to fill those gaps."
+    )
+
+    # Documents whose content is shown in the prompt
+    SAMPLE_DOCUMENTS = 3
+
     def __init__(
         self,
         api_key: str = None,
         endpoint: str = None,
         deployment: str = None,
-        api_version: str = "2024-02-15-preview"
+        api_version: str = "2024-02-15-preview",
+        use_cache: bool = True,
+        cache_path: str = None
     ):
         """
         Initialize gap analyzer with Azure OpenAI
@@ -34,6 +58,8 @@ class GapAnalyzer:
             endpoint: Azure OpenAI endpoint (or from env AZURE_OPENAI_ENDPOINT)
             deployment: Azure deployment name (or from env AZURE_OPENAI_DEPLOYMENT)
             api_version: Azure API version
+            use_cache: Whether to cache LLM responses
+            cache_path: SQLite cache file (default: shared LLM cache)
         """
         # Load from environment if not provided
         self.api_key = api_key or os.getenv('AZURE_OPENAI_API_KEY')
@@ -52,6 +78,17 @@ class GapAnalyzer:
         # SECURITY: Initialize data sanitizer
         self.sanitizer = DataSanitizer(max_length=2000)
 
+        self.llm_cache = get_llm_cache(cache_path) if use_cache else None
+
+        # Rate limited, retrying LLM calls (shared by analyze_all_projects workers)
+        self.rate_limiter = TokenBucketLimiter()
+        self.llm_executor = LLMBatchExecutor(
+            chat_completion_call(self.client, self.deployment, self.SYSTEM_PROMPT, temperature=0.3),
+            model=self.deployment,
+            template_version=self.GAP_PROMPT_VERSION,
+            limiter=self.rate_limiter
+        )
+
         print(f"✓ Initialized Azure OpenAI gap analyzer (deployment: {self.deployment})")
 
     def analyze_project_gaps(self, project_data: Dict) -> Dict:
@@ -81,14 +118,16 @@ class GapAnalyzer:
         project_summary = self._create_project_summary(documents)
 
         # Identify gaps using LLM
-        gaps = self._identify_gaps_with_llm(project_name, project_summary, documents)
+        gaps = self._identify_gaps_with_llm(
+            project_name, project_summary, documents[:self.SAMPLE_DOCUMENTS]
+        )
 
         return gaps
 
-    def _create_project_summary(self, documents: List[Dict]) -> Dict:
-        """Create a summary of project documents"""
+    def _create_project_summary(self, documents: Iterable[Dict]) -> Dict:
+        """Create a summary of project documents (one pass; any iterable)"""
         summary = {
-            'total_documents': len(documents),
+            'total_documents': 0,
             'subjects': [],
             'keywords': set(),
             'mentioned_people': set(),
@@ -100,6 +139,7 @@ class GapAnalyzer:
         timestamps = []
 
         for doc in documents:
+            summary['total_documents'] += 1
             metadata = doc['metadata']
 
             # Collect subjects (or group names for chat data)
@@ -174,34 +214,37 @@ class GapAnalyzer:
         summary: Dict,
         documents: List[Dict]
     ) -> Dict:
-        """Use LLM to identify knowledge gaps"""
+        """
+        Use LLM to identify knowledge gaps
+
+        Args:
+            documents: The project's first documents (content samples for the prompt)
+        """
 
         # SECURITY: Sanitize documents before sending to OpenAI
-        sanitized_documents = self.sanitizer.sanitize_batch(documents)
+        # (the sanitizer reads a top-level subject; ours is in metadata)
+        samples = []
+        for doc in documents[:self.SAMPLE_DOCUMENTS]:
+            metadata = doc.get('metadata', {})
+            samples.append({**doc, 'subject': metadata.get('subject', metadata.get('group', ''))})
+        sanitized_documents = self.sanitizer.sanitize_batch(samples)
 
         # Create analysis prompt with SANITIZED data
         prompt = self._create_gap_analysis_prompt(project_name, summary, sanitized_documents)
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.deployment,  # Azure uses deployment name
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert knowledge management analyst. You identify gaps in project documentation and generate insightful questions to fill those gaps."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=1500,
-            )
+        if self.llm_cache:
+            cached = self.llm_cache.get(self.deployment, self.GAP_PROMPT_VERSION, prompt)
+            if cached:
+                return cached
 
-            result_text = response.choices[0].message.content.strip()
+        try:
+            # Rate limited; rate-limit and server errors are retried with backoff
+            result_text = self.llm_executor.request(prompt, max_tokens=1500)
             gaps = self._parse_gap_analysis(result_text, project_name)
 
+            if self.llm_cache and 'knowledge_gaps' in gaps:
+                self.llm_cache.put(self.deployment, self.GAP_PROMPT_VERSION, prompt, gaps)
+
             return gaps
 
         except Exception as e:
@@ -232,9 +275,10 @@ class GapAnalyzer:
 
         # Sample content snippets
         content_samples = []
-        for doc in documents[:3]:
-            content = doc.get('content', '')[:200]
-            subject = doc['metadata'].get('subject', doc['metadata'].get('group', 'No subject'))
+        for doc in documents[:self.SAMPLE_DOCUMENTS]:
+            # Sanitized documents: subject + snippet (content already cut to 200 chars)
+            content = doc.get('snippet', '')[:200]
+            subject = doc.get('subject', 'No subject')
             content_samples.append(f"Subject/Group: {subject}\nContent: {content}...")
 
         content_preview = '\n\n'.join(content_samples)
@@ -318,14 +362,23 @@ Provide your response in the following JSON format:
     def analyze_all_projects(
         self,
         project_clusters_dir: str,
-        output_dir: str
+        output_dir: str,
+        max_workers: int = 4,
+        force: bool = False
     ) -> Dict:
         """
         Analyze all projects for gaps
 
+        Projects run `max_workers` at a time. Each result is checkpointed to
+        output_dir/checkpoints/<employee>/<project>.json when it completes,
+        so an interrupted run loses at most the projects in flight; projects
+        whose documents are unchanged since their checkpoint are skipped.
+
         Args:
             project_clusters_dir: Directory with project clusters
             output_dir: Directory to save gap analysis results
+            max_workers: Projects analyzed concurrently
+            force: Re-analyze every project, ignoring checkpoints
 
         Returns:
             Dictionary with all gap analyses
@@ -334,17 +387,13 @@ Provide your response in the following JSON format:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        all_gaps = {}
-
-        # Iterate through employee directories
+        # employee -> [(project_name, project_file)], in directory order
+        employee_projects: Dict[str, List] = {}
         for employee_dir in project_dir.iterdir():
             if not employee_dir.is_dir():
                 continue
 
-            employee = employee_dir.name
-            print(f"\nAnalyzing projects for {employee}...")
-
-            employee_gaps = {}
+            employee_projects[employee_dir.name] = []
 
             # Load metadata
             metadata_file = employee_dir / "metadata.json"
@@ -352,37 +401,154 @@ Provide your response in the following JSON format:
                 with open(metadata_file, 'r', encoding='utf-8') as f:
                     metadata = json.load(f)
 
-                # Analyze each project
                 for project_name in metadata.get('projects', {}).keys():
                     project_file = employee_dir / f"{project_name}.jsonl"
-
                     if project_file.exists():
-                        # Load project documents
-                        documents = []
-                        with open(project_file, 'r', encoding='utf-8') as f:
-                            for line in f:
-                                documents.append(json.loads(line))
-
-                        # Analyze gaps
-                        project_data = {
-                            'project_name': project_name,
-                            'documents': documents
-                        }
-
-                        gaps = self.analyze_project_gaps(project_data)
-                        employee_gaps[project_name] = gaps
-
-            all_gaps[employee] = employee_gaps
+                        employee_projects[employee_dir.name].append((project_name, project_file))
+
+        total = sum(len(projects) for projects in employee_projects.values())
+        print(f"\nAnalyzing {total} projects for {len(employee_projects)} employees "
+              f"({max_workers} at a time)...")
+
+        results: Dict[str, Dict] = {employee: {} for employee in employee_projects}
+        remaining = {employee: len(projects) for employee, projects in employee_projects.items()}
+        stats = {'analyzed': 0, 'unchanged': 0, 'failed': 0}
+
+        # Employees without projects are saved right away, as before
+        for employee, count in remaining.items():
+            if count == 0:
+                self._save_employee_gaps(employee, {}, output_path)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(
+                    self._analyze_project_file, employee, project_name, project_file, output_path, force
+                ): (employee, project_name)
+                for employee, projects in employee_projects.items()
+                for project_name, project_file in projects
+            }
 
-            # Save employee gap analysis
-            self._save_employee_gaps(employee, employee_gaps, output_path)
+            for future in as_completed(futures):
+                employee, project_name = futures[future]
+                try:
+                    gaps, status = future.result()
+                except Exception as e:
+                    print(f"  ⚠️  Gap analysis failed for {employee}/{project_name}: {e}")
+                    gaps, status = self._empty_gaps(project_name), 'failed'
+
+                stats[status] += 1
+                results[employee][project_name] = gaps
+
+                remaining[employee] -= 1
+                if remaining[employee] == 0:
+                    # Keep the employee's projects in metadata order
+                    ordered = {name: results[employee][name] for name, _ in employee_projects[employee]}
+                    self._save_employee_gaps(employee, ordered, output_path)
+
+        all_gaps = {
+            employee: {name: results[employee][name] for name, _ in projects}
+            for employee, projects in employee_projects.items()
+        }
 
         # Save overall summary
         self._save_gap_summary(all_gaps, output_path)
 
-        print(f"\n✓ Completed gap analysis for all projects")
+        print(f"\n✓ Completed gap analysis for all projects "
+              f"({stats['analyzed']} analyzed, {stats['unchanged']} unchanged, {stats['failed']} failed)")
         return all_gaps
 
+    def _analyze_project_file(
+        self,
+        employee: str,
+        project_name: str,
+        project_file: Path,
+        output_dir: Path,
+        force: bool
+    ):
+        """
+        Analyze one project JSONL unless its checkpoint is current
+
+        Returns:
+            (gap analysis, 'analyzed' | 'unchanged' | 'failed')
+        """
+        documents_hash = self._hash_file(project_file)
+        checkpoint_file = output_dir / "checkpoints" / employee / f"{project_name}.json"
+
+        if not force:
+            checkpoint = self._load_checkpoint(checkpoint_file)
+            if (checkpoint
+                    and checkpoint.get('documents_hash') == documents_hash
+                    and checkpoint.get('prompt_version') == self.GAP_PROMPT_VERSION):
+                return checkpoint['result'], 'unchanged'
+
+        # Stream the documents: the summary needs one pass, the prompt only the first few
+        samples: List[Dict] = []
+        summary = self._create_project_summary(self._iter_project_documents(project_file, samples))
+
+        if summary['total_documents'] == 0:
+            gaps = self._empty_gaps(project_name)
+        else:
+            print(f"Analyzing gaps for project: {project_name}")
+            gaps = self._identify_gaps_with_llm(project_name, summary, samples)
+            if 'knowledge_gaps' not in gaps:
+                return gaps, 'failed'  # Not checkpointed; retried on the next run
+
+        self._save_checkpoint(checkpoint_file, {
+            'employee': employee,
+            'project_name': project_name,
+            'documents_hash': documents_hash,
+            'prompt_version': self.GAP_PROMPT_VERSION,
+            'completed_at': datetime.now().isoformat(),
+            'result': gaps
+        })
+        return gaps, 'analyzed'
+
+    def _iter_project_documents(self, project_file: Path, samples: List[Dict]) -> Iterator[Dict]:
+        """Yield a project's documents one line at a time, keeping the first few in `samples`"""
+        with open(project_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                document = json.loads(line)
+                if len(samples) < self.SAMPLE_DOCUMENTS:
+                    samples.append(document)
+                yield document
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """SHA-256 of a project's JSONL (its document set)"""
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_file: Path) -> Optional[Dict]:
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_file: Path, checkpoint: Dict):
+        """Write atomically, so a crash never leaves a partial checkpoint"""
+        checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = checkpoint_file.with_name(checkpoint_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, checkpoint_file)
+
+    @staticmethod
+    def _empty_gaps(project_name: str) -> Dict:
+        return {
+            'project_name': project_name,
+            'gaps': [],
+            'missing_elements': [],
+            'questions': []
+        }
+
     def _save_employee_gaps(self, employee: str, gaps: Dict, output_dir: Path):
         """Save gap analysis for an employee"""
         employee_file = output_dir / f"{employee}_gaps.json"
@@ -7,22 +7,24 @@ import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import List
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config.config import Config
-from data_processing.enron_parser import uncluster_enron_data
+from data_processing.enron_parser import uncluster_enron_data_parallel
 from clustering.employee_clustering import cluster_by_employee
 from clustering.project_clustering import ProjectClusterer
 from classification.work_personal_classifier import classify_project_documents
 from gap_analysis.gap_analyzer import GapAnalyzer
 from gap_analysis.question_generator import QuestionGenerator
 from indexing.knowledge_graph import KnowledgeGraphBuilder
-from indexing.vector_database import build_vector_database
+from indexing.vector_database import VectorDatabaseBuilder, build_vector_database
 from rag.hierarchical_rag import HierarchicalRAG
 from content_generation.powerpoint_generator import PowerPointGenerator
 from content_generation.video_generator import VideoGenerator
+from utils.pipeline_dag import PipelineGraph, PipelineStep
 
 
 class KnowledgeVaultOrchestrator:
@@ -37,6 +39,7 @@ class KnowledgeVaultOrchestrator:
         """
         self.config = config
         self.start_time = datetime.now()
+        self.pipeline = None
 
         print("\n" + "="*80)
         print("KNOWLEDGEVAULT BACKEND ORCHESTRATOR")
@@ -59,7 +62,7 @@ class KnowledgeVaultOrchestrator:
 
         output_path = self.config.DATA_DIR / "unclustered" / "enron_emails.jsonl"
 
-        uncluster_enron_data(
+        uncluster_enron_data_parallel(
             maildir_path=self.config.ENRON_MAILDIR,
             output_path=str(output_path),
             limit=limit
@@ -248,75 +251,171 @@ class KnowledgeVaultOrchestrator:
         self,
         data_limit: int = None,
         skip_classification: bool = False,
-        skip_videos: bool = False
+        skip_videos: bool = False,
+        force: bool = False,
+        force_steps: List[str] = (),
+        max_parallel: int = 4
     ):
         """
         Run the complete KnowledgeVault pipeline
 
+        Steps run as a dependency graph: everything downstream of project
+        clustering only (gap analysis, knowledge graph, vector DB,
+        PowerPoints) runs in parallel, and steps whose inputs are unchanged
+        since their last successful run are skipped (see utils/pipeline_dag.py).
+
         Args:
             data_limit: Limit number of documents to process (for testing)
             skip_classification: Skip work/personal classification
             skip_videos: Skip video generation
+            force: Re-run every step even if up to date
+            force_steps: Step names to re-run even if up to date
+            max_parallel: Steps running at once
         """
-        try:
-            # Step 1: Uncluster data
-            unclustered_file = self.step_1_uncluster_data(limit=data_limit)
+        steps = self.build_pipeline_steps(data_limit, skip_classification, skip_videos)
+        unknown = set(force_steps) - {step.name for step in steps}
+        if unknown:
+            print(f"⚠ Unknown steps in --force-step: {sorted(unknown)}")
+
+        self.pipeline = PipelineGraph(
+            steps,
+            state_path=str(self.config.DATA_DIR / "pipeline_state.json"),
+            max_parallel=max_parallel
+        )
+        report = self.pipeline.run(force=force_steps, force_all=force)
+        self.pipeline.save_report(str(self.config.OUTPUT_DIR / "pipeline_run_report.json"))
+
+        if report['failed']:
+            blocked = [name for name, entry in report['steps'].items() if entry['status'] == 'blocked']
+            print(f"\n✗ Pipeline failed: {', '.join(report['failed'])}")
+            if blocked:
+                print(f"  Not run (depend on a failed step): {', '.join(blocked)}")
+            self.pipeline.print_report()
+            return None
 
-            # Step 2: Employee clustering
-            employee_dir, employee_clusterer = self.step_2_employee_clustering(unclustered_file)
+        # Final summary
+        self.print_final_summary()
 
-            # Step 3: Project clustering
-            project_dir, project_results = self.step_3_project_clustering(employee_dir)
+        results = self.pipeline.results
+        return {
+            'vector_db': results['vector_db'],
+            'rag_system': results['rag'],
+            'knowledge_graph': results['knowledge_graph']
+        }
 
-            # Step 4: Classification (optional)
-            if not skip_classification:
-                classified_dir, classifier = self.step_4_classify_documents(
-                    project_dir,
-                    sample_size=50  # Limit for API costs
+    def build_pipeline_steps(
+        self,
+        data_limit: int = None,
+        skip_classification: bool = False,
+        skip_videos: bool = False
+    ) -> List[PipelineStep]:
+        """Pipeline step graph; results are the step outputs' paths"""
+        config = self.config
+        project_dir = lambda deps: deps['project_clusters']
+
+        steps = [
+            PipelineStep(
+                name='uncluster',
+                run=lambda deps: self.step_1_uncluster_data(limit=data_limit),
+                inputs=[config.ENRON_MAILDIR],
+                outputs=[str(config.DATA_DIR / "unclustered" / "enron_emails.jsonl")],
+                params={'limit': data_limit}
+            ),
+            PipelineStep(
+                name='employee_clusters',
+                run=lambda deps: self.step_2_employee_clustering(deps['uncluster'])[0],
+                deps=['uncluster'],
+                outputs=[str(config.DATA_DIR / "employee_clusters")]
+            ),
+            PipelineStep(
+                name='project_clusters',
+                run=lambda deps: self.step_3_project_clustering(deps['employee_clusters'])[0],
+                deps=['employee_clusters'],
+                outputs=[str(config.DATA_DIR / "project_clusters")]
+            ),
+            PipelineStep(
+                name='gap_analysis',
+                run=lambda deps: self.step_5_gap_analysis(project_dir(deps))[0],
+                deps=['project_clusters'],
+                outputs=[str(config.OUTPUT_DIR / "gap_analysis")]
+            ),
+            PipelineStep(
+                name='questions',
+                run=lambda deps: self.step_6_generate_questions(deps['gap_analysis']),
+                deps=['gap_analysis'],
+                outputs=[str(config.OUTPUT_DIR / "questionnaires")]
+            ),
+            PipelineStep(
+                # The graph lives in Neo4j; a skipped step reconnects to it
+                name='knowledge_graph',
+                run=lambda deps: self.step_7_build_knowledge_graph(project_dir(deps)),
+                deps=['project_clusters'],
+                outputs=[str(config.OUTPUT_DIR / "neo4j_queries.cypher")],
+                params={'uri': config.NEO4J_URI},
+                succeeded=lambda graph: graph is not None,
+                record=lambda graph: config.NEO4J_URI,
+                load=lambda uri: KnowledgeGraphBuilder(
+                    uri=uri, user=config.NEO4J_USER, password=config.NEO4J_PASSWORD
                 )
-            else:
-                print("\n⚠ Skipping classification step")
-                classified_dir = project_dir
-
-            # Step 5: Gap analysis
-            gap_dir, gap_results = self.step_5_gap_analysis(project_dir)
-
-            # Step 6: Question generation
-            questions_dir = self.step_6_generate_questions(gap_dir)
-
-            # Step 7: Knowledge graph
-            knowledge_graph = self.step_7_build_knowledge_graph(project_dir)
-
-            # Step 8: Vector database
-            vector_db = self.step_8_build_vector_database(project_dir)
-
-            # Step 9: RAG system
-            rag_system = self.step_9_create_rag_system(vector_db, knowledge_graph)
-
-            # Step 10: PowerPoints
-            ppt_dir = self.step_10_generate_powerpoints(project_dir)
-
-            # Step 11: Videos (optional)
-            if not skip_videos and ppt_dir:
-                video_dir = self.step_11_generate_videos(ppt_dir)
-            else:
-                print("\n⚠ Skipping video generation")
-                video_dir = None
-
-            # Final summary
-            self.print_final_summary()
-
-            return {
-                'vector_db': vector_db,
-                'rag_system': rag_system,
-                'knowledge_graph': knowledge_graph
-            }
-
-        except Exception as e:
-            print(f"\n✗ Pipeline failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            ),
+            PipelineStep(
+                name='vector_db',
+                run=lambda deps: self.step_8_build_vector_database(project_dir(deps)),
+                deps=['project_clusters'],
+                outputs=[config.CHROMA_PERSIST_DIR],
+                params={'collection': config.COLLECTION_NAME, 'embedding_model': config.EMBEDDING_MODEL},
+                record=lambda vdb: config.CHROMA_PERSIST_DIR,
+                load=lambda persist_dir: VectorDatabaseBuilder(
+                    persist_directory=persist_dir,
+                    collection_name=config.COLLECTION_NAME,
+                    embedding_model=config.EMBEDDING_MODEL,
+                    use_openai_embeddings=False
+                )
+            ),
+            PipelineStep(
+                name='rag',
+                run=lambda deps: self.step_9_create_rag_system(deps['vector_db'], deps['knowledge_graph']),
+                deps=['vector_db', 'knowledge_graph'],
+                cacheable=False  # Live query system, cheap to create
+            ),
+            PipelineStep(
+                name='powerpoints',
+                run=lambda deps: self.step_10_generate_powerpoints(project_dir(deps)),
+                deps=['project_clusters'],
+                outputs=[str(config.OUTPUT_DIR / "powerpoints")],
+                succeeded=lambda ppt_dir: ppt_dir is not None
+            ),
+        ]
+
+        if not skip_classification:
+            steps.append(PipelineStep(
+                name='classify',
+                run=lambda deps: self.step_4_classify_documents(
+                    project_dir(deps),
+                    sample_size=50  # Limit for API costs
+                ),
+                deps=['project_clusters'],
+                outputs=[str(config.DATA_DIR / "classified")],
+                params={'sample_size': 50},
+                succeeded=lambda result: result[1] is not None,
+                record=lambda result: result[0],
+                load=lambda classified_dir: (classified_dir, None)
+            ))
+        else:
+            print("\n⚠ Skipping classification step")
+
+        if not skip_videos:
+            steps.append(PipelineStep(
+                name='videos',
+                run=lambda deps: self.step_11_generate_videos(deps['powerpoints']),
+                deps=['powerpoints'],
+                outputs=[str(config.VIDEO_OUTPUT_DIR)],
+                succeeded=lambda video_dir: video_dir is not None
+            ))
+        else:
+            print("\n⚠ Skipping video generation")
+
+        return steps
 
     def print_final_summary(self):
         """Print final pipeline summary"""
@@ -340,6 +439,9 @@ class KnowledgeVaultOrchestrator:
         print(f"  ✓ RAG query system")
         print(f"  ✓ PowerPoint presentations")
         print(f"  ✓ Training videos")
+        if self.pipeline is not None:
+            self.pipeline.print_report()
+            print(f"Run report: {self.config.OUTPUT_DIR / 'pipeline_run_report.json'}")
         print("="*80 + "\n")
 
 
@@ -366,6 +468,27 @@ def main():
         help='Skip video generation step'
     )
 
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-run every step, even those whose inputs are unchanged'
+    )
+
+    parser.add_argument(
+        '--force-step',
+        action='append',
+        default=[],
+        metavar='STEP',
+        help='Re-run this step even if up to date (repeatable), e.g. --force-step gap_analysis'
+    )
+
+    parser.add_argument(
+        '--max-parallel',
+        type=int,
+        default=4,
+        help='Maximum pipeline steps running at once'
+    )
+
     parser.add_argument(
         '--interactive-rag',
         action='store_true',
@@ -391,7 +514,10 @@ def main():
     results = orchestrator.run_full_pipeline(
         data_limit=args.limit,
         skip_classification=args.skip_classification,
-        skip_videos=args.skip_videos
+        skip_videos=args.skip_videos,
+        force=args.force,
+        force_steps=args.force_step,
+        max_parallel=args.max_parallel
     )
 
     # Interactive RAG mode
@@ -19,6 +19,7 @@ v2.1 Additions:
 - Conversational context (last 2-3 Q&A pairs)
 - Domain-aware BM25 tokenization
 - Add documents method for incremental updates
+  (EmbeddingIndexWriter: batched embeddings, searchable while appending)
 """
 
 import json
@@ -34,6 +35,8 @@ from datetime import datetime
 import time
 from collections import defaultdict
 
+from rag.index_writer import EmbeddingIndexWriter
+
 # Cross-encoder for re-ranking
 try:
     from sentence_transformers import CrossEncoder
@@ -823,6 +826,7 @@ class EnhancedRAGv2:
 
         # Store index path for add_documents
         self.index_path = embedding_index_path
+        self.index_writer = EmbeddingIndexWriter(self.index, embedding_index_path)
 
         print("✓ Enhanced RAG v2.1 initialized")
 
@@ -861,8 +865,9 @@ class EnhancedRAGv2:
 
         query_embedding = self._get_query_embedding(expanded_query)
 
-        chunk_embeddings = self.index['embeddings']
-        chunks = self.index['chunks']
+        # Consistent view while documents are being appended
+        chunks, chunk_embeddings = self.index_writer.snapshot()
+        chunks = chunks[:len(chunk_embeddings)]
         bm25_index = self.index.get('bm25_index')
 
         # Semantic search
@@ -874,7 +879,10 @@ class EnhancedRAGv2:
         if bm25_index:
             # Use domain tokenizer for better acronym handling
             query_tokens = DomainTokenizer.tokenize(query)
-            bm25_scores = bm25_index.get_scores(query_tokens)
+            bm25_scores = bm25_index.get_scores(query_tokens)[:len(chunks)]
+            if len(bm25_scores) < len(chunks):
+                # Chunks appended since BM25 was built score semantic-only
+                bm25_scores = np.pad(bm25_scores, (0, len(chunks) - len(bm25_scores)))
             bm25_max = np.max(bm25_scores) if np.max(bm25_scores) > 0 else 1
             bm25_scores = bm25_scores / bm25_max
         else:
@@ -1270,8 +1278,8 @@ You will be evaluated on citation accuracy. Uncited claims are considered failur
         if not documents:
             return {'status': 'error', 'message': 'No documents provided'}
 
-        added_chunks = 0
         index_model = self.index.get('model', 'text-embedding-3-small')
+        chunks = []
 
         for doc in documents:
             doc_id = doc.get('doc_id', f"doc_{len(self.index['chunks'])}")
@@ -1292,46 +1300,36 @@ You will be evaluated on citation accuracy. Uncited claims are considered failur
                 chunk_content = content[start:end]
 
                 if len(chunk_content.strip()) > 50:
-                    # Get embedding
-                    try:
-                        response = self.client.embeddings.create(
-                            model=index_model,
-                            input=chunk_content[:8000]
-                        )
-                        embedding = np.array(response.data[0].embedding, dtype=np.float32)
-
-                        # Add to index
-                        chunk = {
-                            'chunk_id': f"{doc_id}_chunk_{chunk_idx}",
-                            'doc_id': doc_id,
-                            'content': chunk_content,
-                            'chunk_index': chunk_idx,
-                            'metadata': metadata
-                        }
-                        self.index['chunks'].append(chunk)
-
-                        # Add embedding
-                        if len(self.index['embeddings']) == 0:
-                            self.index['embeddings'] = embedding.reshape(1, -1)
-                        else:
-                            self.index['embeddings'] = np.vstack([
-                                self.index['embeddings'],
-                                embedding.reshape(1, -1)
-                            ])
-
-                        added_chunks += 1
-                        chunk_idx += 1
-                    except Exception as e:
-                        print(f"Error adding chunk: {e}")
+                    chunks.append({
+                        'chunk_id': f"{doc_id}_chunk_{chunk_idx}",
+                        'doc_id': doc_id,
+                        'content': chunk_content,
+                        'chunk_index': chunk_idx,
+                        'metadata': metadata
+                    })
+                    chunk_idx += 1
 
                 start = end - overlap
                 if start >= len(content) - overlap:
                     break
 
+        # Embed in batches (one request per 100 chunks)
+        added_chunks = 0
+        for i in range(0, len(chunks), 100):
+            batch = chunks[i:i + 100]
+            try:
+                response = self.client.embeddings.create(
+                    model=index_model,
+                    input=[chunk['content'][:8000] for chunk in batch]
+                )
+                self.index_writer.append(batch, [item.embedding for item in response.data])
+                added_chunks += len(batch)
+            except Exception as e:
+                print(f"Error adding chunks: {e}")
+
         # Save updated index
         if added_chunks > 0:
-            with open(self.index_path, 'wb') as f:
-                pickle.dump(self.index, f)
+            self.index_writer.save()
 
         return {
             'status': 'success',
@@ -0,0 +1,127 @@
+"""
+Embedding Index Writer
+Appends chunks to a loaded embedding index (the embedding_index.pkl dict:
+'chunks', 'embeddings', 'doc_ids') while it is being searched.
+
+- Embeddings live in a row buffer with spare capacity, so appends are
+  amortized O(rows added) instead of an np.vstack copy per chunk
+- snapshot() gives searchers a consistent (chunks, embeddings) pair: rows
+  are only ever added past the snapshot's end
+- save() writes to a temp file and swaps it in, so a crash mid-save never
+  corrupts the index
+"""
+
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingIndexWriter:
+    """
+    Thread-safe appender for an in-memory embedding index
+
+    Usage:
+        writer = EmbeddingIndexWriter(index, index_path)
+        writer.append(chunks, embeddings)   # Searchable immediately
+        chunks, embeddings = writer.snapshot()
+        writer.save()
+    """
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self, index: Dict, path: Optional[str] = None):
+        """
+        Args:
+            index: Loaded index dict (created empty if missing keys)
+            path: Pickle path for save()
+        """
+        self.index = index
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._buffer: Optional[np.ndarray] = None
+
+        index.setdefault('chunks', [])
+        embeddings = index.get('embeddings')
+        if embeddings is None or len(embeddings) == 0:
+            index['embeddings'] = np.zeros((0, 0), dtype=np.float32)
+        index['doc_ids'] = list(index.get('doc_ids') or [])
+        self._doc_ids = set(index['doc_ids'])
+
+    def __len__(self) -> int:
+        return len(self.index['chunks'])
+
+    def append(self, chunks: List[Dict], embeddings) -> int:
+        """
+        Add chunks and their embeddings (one row per chunk)
+
+        Returns:
+            Total chunks in the index
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(chunks) != len(embeddings):
+            raise ValueError(f"{len(chunks)} chunks but {len(embeddings)} embeddings")
+        if not chunks:
+            return len(self)
+
+        with self._lock:
+            current = self.index['embeddings']
+            rows = len(current)
+            if rows and current.shape[1] != embeddings.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {embeddings.shape[1]} does not match index ({current.shape[1]})"
+                )
+
+            needed = rows + len(embeddings)
+            buffer = self._buffer
+            if buffer is None or buffer.shape[0] < needed or (rows and current.base is not buffer):
+                # Grow (or adopt an array loaded from disk)
+                capacity = max(needed, rows * 2, self.MIN_CAPACITY)
+                buffer = np.empty((capacity, embeddings.shape[1]), dtype=np.float32)
+                if rows:
+                    buffer[:rows] = current
+                self._buffer = buffer
+
+            # Fill rows past every published view, then publish
+            buffer[rows:needed] = embeddings
+            self.index['chunks'].extend(chunks)
+            self.index['embeddings'] = buffer[:needed]
+
+            for chunk in chunks:
+                doc_id = chunk.get('doc_id')
+                if doc_id is not None and doc_id not in self._doc_ids:
+                    self._doc_ids.add(doc_id)
+                    self.index['doc_ids'].append(doc_id)
+            return needed
+
+    def snapshot(self) -> Tuple[List[Dict], np.ndarray]:
+        """
+        Consistent view for searching
+
+        Returns:
+            (chunks, embeddings) with equal lengths; chunks may grow past
+            len(embeddings) afterwards but existing rows never change
+        """
+        with self._lock:
+            embeddings = self.index['embeddings']
+            return self.index['chunks'], embeddings
+
+    def save(self, path: Optional[str] = None):
+        """Pickle the index atomically (temp file + rename)"""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No index path to save to")
+
+        with self._lock:
+            data = dict(self.index)
+            data['embeddings'] = np.array(self.index['embeddings'])  # Compact copy
+            data['chunks'] = list(self.index['chunks'])
+            data['doc_ids'] = list(self.index['doc_ids'])
+
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f)
+        os.replace(tmp_path, path)
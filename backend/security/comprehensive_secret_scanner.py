@@ -30,11 +30,149 @@ import re
 import os
 import json
 import math
+import mmap
+import time
 import base64
+import hashlib
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Set
-from dataclasses import dataclass
-from collections import defaultdict
+from typing import List, Dict, Any, Tuple, Set, Optional
+from dataclasses import dataclass, asdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Bump when detection logic changes so incremental caches are invalidated
+SCANNER_VERSION = "2"
+
+# Quoted high-entropy candidates (checked with calculate_entropy)
+ENTROPY_CANDIDATE_PATTERN = r'["\']([a-zA-Z0-9+/=_\-]{20,})["\']'
+
+
+def _leading_literal(pattern: str) -> str:
+    """
+    Literal text every match of `pattern` must start with (lowercased)
+
+    Stops at the first metacharacter, class or escape sequence, and
+    before any character made optional or repeatable by a quantifier.
+    """
+    literal = []
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if not escaped or escaped.isalnum():
+                break  # \s, \d, \b, ...
+            step = 2
+        elif char in '.^$*+?{}[]()|':
+            break
+        else:
+            escaped = char
+            step = 1
+
+        quantifier = pattern[i + step:i + step + 1]
+        if quantifier in ('?', '*', '{'):
+            break
+        literal.append(escaped)
+        if quantifier == '+':
+            break
+        i += step
+
+    return ''.join(literal).lower()
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether `pattern` has a `|` outside every group and character class"""
+    depth = 0
+    in_class = False
+    i = 0
+
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1  # Literal ] first in the class
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+        i += 1
+
+    return False
+
+
+def _required_keywords(pattern: str) -> Optional[List[str]]:
+    """
+    Keywords (at least one of which every match contains), or None
+
+    Handles a plain literal prefix and a leading (?:a|b|c) group of literal
+    alternatives. Patterns without a usable literal, or with a top-level
+    `|` (whose later branches need not start with the prefix), return None
+    and are run over the whole text instead.
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+
+    body = pattern[4:] if pattern.startswith('(?i)') else pattern
+
+    if body.startswith('(?:'):
+        close = body.find(')')
+        group = body[3:close]
+        if close < 0 or '(' in group or '[' in group or body[close + 1:close + 2] in ('?', '*', '{'):
+            return None
+        keywords = [_leading_literal(alternative) for alternative in group.split('|')]
+    else:
+        keywords = [_leading_literal(body)]
+
+    if all(len(keyword) >= 2 for keyword in keywords):
+        return keywords
+    return None
+
+
+def _can_span_lines(pattern: str) -> bool:
+    """Conservatively, whether a pattern could match across a newline"""
+    stripped = pattern.replace('[^\\s]', '')
+    return '\\s' in stripped or '[^' in stripped or '.' in stripped.replace('\\.', '')
+
+
+def _keyword_trie_pattern(keywords) -> str:
+    """
+    Regex matching any keyword, factored into a trie
+
+    `re` tries alternatives one by one, so a flat alternation of ~100
+    keywords is slow; sharing prefixes leaves at most one branch per
+    character. Longer keywords win at the same position.
+    """
+    trie: Dict[str, Dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + build(node[char]) for char in sorted(node) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and ('' not in node or len(branches[0]) == 1):
+            body = branches[0]
+        else:
+            body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if '' in node else body
+
+    return build(trie)
 
 
 @dataclass
@@ -63,9 +201,25 @@ class ComprehensiveSecretScanner:
     ✅ Cloud provider key detection (AWS, Azure, GCP, Stripe, etc.)
     """
 
-    def __init__(self):
-        """Initialize comprehensive secret patterns"""
+    TEST_INDICATORS = [
+        'test', 'example', 'demo', 'mock', 'fake', 'dummy',
+        'sample', 'placeholder', 'TODO', 'FIXME', 'XXX'
+    ]
+
+    def __init__(self, mmap_threshold: int = 8 * 1024 * 1024, window_size: int = 4 * 1024 * 1024):
+        """
+        Initialize comprehensive secret patterns
+
+        Args:
+            mmap_threshold: Files at least this large are memory-mapped and
+                scanned in windows instead of read whole
+            window_size: Approximate bytes per window for memory-mapped files
+        """
         self.patterns = self._init_patterns()
+        self.mmap_threshold = mmap_threshold
+        self.window_size = window_size
+        self.last_scan_stats: Dict[str, Any] = {}
+        self._compile_patterns()
         self.file_extensions = {
             '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rb',
             '.php', '.cs', '.cpp', '.c', '.h', '.hpp', '.rs', '.swift',
@@ -359,6 +513,38 @@ class ComprehensiveSecretScanner:
              'Logz.io Token', 'high', 'Rotate via Logz.io Settings'),
         ]
 
+    def _compile_patterns(self):
+        """
+        Precompile patterns and build the keyword prefilter
+
+        Patterns with required keywords only run on lines where one of the
+        keywords occurs; a single pass of the keyword alternation over the
+        lowercased text finds those lines. Patterns without keywords that
+        cannot span lines run once over the whole text.
+        """
+        self.compiled_patterns = [re.compile(p[0]) for p in self.patterns]
+        self.keyword_patterns = []  # (index, keywords)
+        self.text_patterns = []  # index, run over the whole text
+        self.line_patterns = []  # index, run on every line
+
+        all_keywords = set()
+        for index, (pattern, _, _, _) in enumerate(self.patterns):
+            keywords = _required_keywords(pattern)
+            if keywords:
+                self.keyword_patterns.append((index, keywords))
+                all_keywords.update(keywords)
+            elif _can_span_lines(pattern):
+                self.line_patterns.append(index)
+            else:
+                self.text_patterns.append(index)
+
+        self.multiline_patterns = {
+            index: re.compile(self.patterns[index][0], re.MULTILINE)
+            for index in self.text_patterns
+        }
+        self.keyword_regex = re.compile(_keyword_trie_pattern(all_keywords))
+        self.entropy_regex = re.compile(ENTROPY_CANDIDATE_PATTERN)
+
     def scan_string(self, text: str) -> List[Dict[str, Any]]:
         """
         Scan a string for secret patterns
@@ -369,12 +555,9 @@ class ComprehensiveSecretScanner:
         Returns:
             List of detected secrets
         """
-        import re
-
         found = []
-        for pattern, secret_type, severity, remediation in self.patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
+        for regex, (pattern, secret_type, severity, remediation) in zip(self.compiled_patterns, self.patterns):
+            for match in regex.finditer(text):
                 found.append({
                     "type": secret_type,
                     "pattern": pattern,
@@ -400,13 +583,11 @@ class ComprehensiveSecretScanner:
         if not text:
             return 0.0
 
-        entropy = 0.0
-        for x in range(256):
-            p_x = text.count(chr(x)) / len(text)
-            if p_x > 0:
-                entropy += - p_x * math.log2(p_x)
-
-        return entropy
+        length = len(text)
+        return -sum(
+            count / length * math.log2(count / length)
+            for count in Counter(text).values()
+        )
 
     def is_high_entropy_string(self, text: str, min_length: int = 20) -> bool:
         """
@@ -440,57 +621,17 @@ class ComprehensiveSecretScanner:
         findings = []
 
         try:
+            # Every finding in a test/example file would be skipped anyway
+            if self._is_test_path(str(file_path)):
+                return findings
+
+            if file_path.stat().st_size >= self.mmap_threshold:
+                return self._scan_mapped_file(file_path)
+
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 lines = f.readlines()
 
-            for line_num, line in enumerate(lines, 1):
-                # Check all patterns
-                for pattern, secret_type, severity, remediation in self.patterns:
-                    matches = re.finditer(pattern, line)
-                    for match in matches:
-                        matched_text = match.group(0)
-
-                        # Get context (surrounding lines)
-                        context_start = max(0, line_num - 3)
-                        context_end = min(len(lines), line_num + 2)
-                        context = ''.join(lines[context_start:context_end])
-
-                        # Skip if looks like test data
-                        if self._is_test_context(str(file_path), line, context):
-                            continue
-
-                        findings.append(SecretFinding(
-                            file_path=str(file_path),
-                            line_number=line_num,
-                            secret_type=secret_type,
-                            severity=severity,
-                            pattern=pattern,
-                            matched_text=matched_text[:50] + ("..." if len(matched_text) > 50 else ""),
-                            context=context[:200],
-                            remediation=remediation
-                        ))
-
-                # Check for high-entropy strings (potential secrets)
-                words = re.findall(r'["\']([a-zA-Z0-9+/=_\-]{20,})["\']', line)
-                for word in words:
-                    if self.is_high_entropy_string(word):
-                        context_start = max(0, line_num - 3)
-                        context_end = min(len(lines), line_num + 2)
-                        context = ''.join(lines[context_start:context_end])
-
-                        if self._is_test_context(str(file_path), line, context):
-                            continue
-
-                        findings.append(SecretFinding(
-                            file_path=str(file_path),
-                            line_number=line_num,
-                            secret_type='High Entropy String (potential secret)',
-                            severity='low',
-                            pattern='Entropy analysis',
-                            matched_text=word[:50] + ("..." if len(word) > 50 else ""),
-                            context=context[:200],
-                            remediation='Review if this is a secret and move to environment variables'
-                        ))
+            findings = self._scan_lines(lines, str(file_path))
 
         except Exception as e:
             # SECURITY FIX (2025-12-08): Generic error message to prevent information leakage
@@ -498,6 +639,165 @@ class ComprehensiveSecretScanner:
 
         return findings
 
+    def _scan_mapped_file(self, file_path: Path) -> List[SecretFinding]:
+        """
+        Scan a large file through mmap, one window of whole lines at a time
+
+        Each window carries the two lines before and after it so finding
+        context matches a whole-file scan.
+        """
+        findings = []
+
+        with open(file_path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start, first_line = 0, 0
+            previous_tail: List[str] = []
+
+            while start < len(data):
+                end = data.find(b'\n', min(start + self.window_size, len(data)))
+                end = len(data) if end == -1 else end + 1
+                after = end
+                for _ in range(2):
+                    after = data.find(b'\n', after)
+                    after = len(data) if after == -1 else after + 1
+
+                lines = self._decode_lines(data[start:end])
+                following = self._decode_lines(data[end:after])
+
+                findings.extend(self._scan_lines(
+                    previous_tail + lines + following,
+                    str(file_path),
+                    first_line=first_line - len(previous_tail),
+                    report_range=(len(previous_tail), len(previous_tail) + len(lines))
+                ))
+
+                first_line += len(lines)
+                previous_tail = lines[-2:]
+                start = end
+
+        return findings
+
+    @staticmethod
+    def _decode_lines(data: bytes) -> List[str]:
+        """Decode like text-mode readlines (UTF-8, universal newlines)"""
+        text = data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+        lines = [line + '\n' for line in text.split('\n')]
+        lines[-1] = lines[-1][:-1]
+        return lines if lines[-1] else lines[:-1]
+
+    def _scan_lines(
+        self,
+        lines: List[str],
+        file_path: str,
+        first_line: int = 0,
+        report_range: Optional[Tuple[int, int]] = None
+    ) -> List[SecretFinding]:
+        """
+        Scan decoded lines
+
+        Args:
+            lines: Lines with line endings, as from readlines()
+            file_path: Path used in findings
+            first_line: Zero-based file line number of lines[0]
+            report_range: Only report findings for lines[lo:hi] (context
+                may still use lines outside it)
+
+        Returns:
+            Findings ordered by line, then pattern order, then entropy
+        """
+        lo, hi = report_range or (0, len(lines))
+        text = ''.join(lines)
+        hits = []  # (line index, order, position, matched text, pattern index or None)
+
+        # 1. Keyword-gated patterns, only on lines with a keyword hit
+        lowered = text.lower()
+        line_index, previous = 0, 0
+        candidate_lines = []
+        for match in self.keyword_regex.finditer(lowered):
+            line_index += lowered.count('\n', previous, match.start())
+            previous = match.start()
+            if not candidate_lines or candidate_lines[-1] != line_index:
+                candidate_lines.append(line_index)
+
+        for index in candidate_lines:
+            line = lines[index]
+            line_lower = line.lower()
+            for pattern_index, keywords in self.keyword_patterns:
+                if any(keyword in line_lower for keyword in keywords):
+                    for match in self.compiled_patterns[pattern_index].finditer(line):
+                        hits.append((index, pattern_index, match.start(), match.group(0), pattern_index))
+
+        # 2. Single-line patterns without keywords, once over the whole text
+        for pattern_index in self.text_patterns:
+            for index, position, matched in self._iter_text_matches(
+                    self.multiline_patterns[pattern_index], text):
+                hits.append((index, pattern_index, position, matched, pattern_index))
+
+        for pattern_index in self.line_patterns:
+            regex = self.compiled_patterns[pattern_index]
+            for index, line in enumerate(lines):
+                for match in regex.finditer(line):
+                    hits.append((index, pattern_index, match.start(), match.group(0), pattern_index))
+
+        # 3. High-entropy quoted strings (potential secrets)
+        entropy_order = len(self.patterns)
+        for index, position, word in self._iter_text_matches(self.entropy_regex, text, group=1):
+            if self.is_high_entropy_string(word):
+                hits.append((index, entropy_order, position, word, None))
+
+        findings = []
+        for index, _, _, matched_text, pattern_index in sorted(hits, key=lambda h: h[:3]):
+            if not lo <= index < hi:
+                continue
+
+            line = lines[index]
+            # Get context (surrounding lines)
+            context = ''.join(lines[max(0, index - 2):index + 3])
+
+            # Skip if looks like test data
+            if self._is_test_context(file_path, line, context):
+                continue
+
+            if pattern_index is None:
+                findings.append(SecretFinding(
+                    file_path=file_path,
+                    line_number=first_line + index + 1,
+                    secret_type='High Entropy String (potential secret)',
+                    severity='low',
+                    pattern='Entropy analysis',
+                    matched_text=matched_text[:50] + ("..." if len(matched_text) > 50 else ""),
+                    context=context[:200],
+                    remediation='Review if this is a secret and move to environment variables'
+                ))
+            else:
+                pattern, secret_type, severity, remediation = self.patterns[pattern_index]
+                findings.append(SecretFinding(
+                    file_path=file_path,
+                    line_number=first_line + index + 1,
+                    secret_type=secret_type,
+                    severity=severity,
+                    pattern=pattern,
+                    matched_text=matched_text[:50] + ("..." if len(matched_text) > 50 else ""),
+                    context=context[:200],
+                    remediation=remediation
+                ))
+
+        return findings
+
+    @staticmethod
+    def _iter_text_matches(regex, text: str, group: int = 0):
+        """Yield (line index, position, matched text) for matches in text"""
+        line_index, previous = 0, 0
+        for match in regex.finditer(text):
+            line_index += text.count('\n', previous, match.start())
+            previous = match.start()
+            yield line_index, match.start(), match.group(group)
+
+    def _is_test_path(self, file_path: str) -> bool:
+        """Check if a file path looks like test/example code"""
+        file_path_lower = file_path.lower()
+        return any(indicator in file_path_lower for indicator in self.TEST_INDICATORS)
+
     def _is_test_context(self, file_path: str, line: str, context: str) -> bool:
         """
         Check if secret is in test/example context (likely safe)
@@ -510,19 +810,13 @@ class ComprehensiveSecretScanner:
         Returns:
             True if test context
         """
-        test_indicators = [
-            'test', 'example', 'demo', 'mock', 'fake', 'dummy',
-            'sample', 'placeholder', 'TODO', 'FIXME', 'XXX'
-        ]
-
         # Check file path
-        file_path_lower = file_path.lower()
-        if any(indicator in file_path_lower for indicator in test_indicators):
+        if self._is_test_path(file_path):
             return True
 
         # Check context
         context_lower = context.lower()
-        if any(indicator in context_lower for indicator in test_indicators):
+        if any(indicator in context_lower for indicator in self.TEST_INDICATORS):
             return True
 
         # Check for common test values
@@ -535,43 +829,180 @@ class ComprehensiveSecretScanner:
 
         return False
 
-    def scan_directory(self, directory: Path, recursive: bool = True) -> Dict[str, List[SecretFinding]]:
+    def scan_directory(
+        self,
+        directory: Path,
+        recursive: bool = True,
+        workers: Optional[int] = None,
+        incremental: bool = False,
+        cache_path: Optional[Path] = None
+    ) -> Dict[str, List[SecretFinding]]:
         """
         Scan a directory for secrets
 
         Args:
             directory: Directory to scan
             recursive: Recursively scan subdirectories
+            workers: Worker processes (default: CPU count; 1 scans in-process)
+            incremental: Reuse findings for files whose (size, mtime, hash)
+                is unchanged since the last scan
+            cache_path: Incremental scan cache (default: under
+                ~/.cache/secret_scanner, keyed by directory)
 
         Returns:
             Dictionary of {file_path: [findings]}
         """
-        all_findings = defaultdict(list)
+        started = time.perf_counter()
+        directory = Path(directory)
+        files = self._collect_files(directory, recursive)
 
-        if recursive:
-            files = directory.rglob('*')
-        else:
-            files = directory.glob('*')
+        cache = {}
+        if incremental:
+            cache_path = Path(cache_path) if cache_path else self._default_cache_path(directory)
+            cache = self._load_scan_cache(cache_path)
+
+        new_cache = {}
+        results = {}
+        to_scan = []
 
         for file_path in files:
-            # Skip directories
-            if not file_path.is_file():
+            key = str(file_path)
+            try:
+                stat = file_path.stat()
+            except OSError:
                 continue
 
-            # Skip excluded directories
-            if any(excluded in file_path.parts for excluded in self.exclude_dirs):
+            entry = cache.get(key)
+            if entry and (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                new_cache[key] = entry
                 continue
 
-            # Check file extension
-            if file_path.suffix not in self.file_extensions:
+            if entry and entry['size'] == stat.st_size:
+                # Touched but possibly unchanged: compare content hash
+                digest = self._file_hash(file_path)
+                if digest == entry['sha256']:
+                    new_cache[key] = dict(entry, mtime_ns=stat.st_mtime_ns)
+                    continue
+
+            to_scan.append((file_path, stat))
+
+        for file_path, findings in self._scan_files([f for f, _ in to_scan], workers):
+            results[str(file_path)] = findings
+
+        if incremental:
+            for file_path, stat in to_scan:
+                key = str(file_path)
+                new_cache[key] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha256': self._file_hash(file_path),
+                    'findings': [asdict(f) for f in results.get(key, [])]
+                }
+            self._save_scan_cache(cache_path, new_cache)
+
+        all_findings = {}
+        for file_path in files:
+            key = str(file_path)
+            if key in results:
+                findings = results[key]
+            elif key in new_cache:
+                findings = [SecretFinding(**f) for f in new_cache[key]['findings']]
+            else:
                 continue
-
-            # Scan file
-            findings = self.scan_file(file_path)
             if findings:
-                all_findings[str(file_path)] = findings
+                all_findings[key] = findings
+
+        self.last_scan_stats = {
+            'files_total': len(files),
+            'files_scanned': len(to_scan),
+            'files_skipped': len(files) - len(to_scan),
+            'seconds': time.perf_counter() - started
+        }
+
+        return all_findings
+
+    def _collect_files(self, directory: Path, recursive: bool) -> List[Path]:
+        """Files to scan, pruning excluded directories while walking"""
+        files = []
+
+        for root, dirnames, filenames in os.walk(directory):
+            dirnames[:] = sorted(d for d in dirnames if d not in self.exclude_dirs)
+            for name in sorted(filenames):
+                file_path = Path(root) / name
+
+                # Skip excluded directories
+                if any(excluded in file_path.parts for excluded in self.exclude_dirs):
+                    continue
+
+                # Check file extension
+                if file_path.suffix in self.file_extensions and file_path.is_file():
+                    files.append(file_path)
+
+            if not recursive:
+                break
+
+        return files
+
+    def _scan_files(self, files: List[Path], workers: Optional[int]):
+        """Yield (file_path, findings), in a process pool when worthwhile"""
+        workers = workers or os.cpu_count() or 1
+
+        if workers <= 1 or len(files) < 2:
+            for file_path in files:
+                yield file_path, self.scan_file(file_path)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(files)),
+            initializer=_init_scan_worker,
+            initargs=(self,)
+        ) as executor:
+            chunksize = max(1, min(32, len(files) // (workers * 4)))
+            yield from zip(files, executor.map(_scan_file_worker, files, chunksize=chunksize))
+
+    def _fingerprint(self) -> str:
+        """Identifies the detection rules, so rule changes invalidate caches"""
+        payload = json.dumps([SCANNER_VERSION, self.patterns, self.TEST_INDICATORS])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _default_cache_path(directory: Path) -> Path:
+        key = hashlib.sha256(str(directory.resolve()).encode('utf-8')).hexdigest()[:16]
+        return Path.home() / '.cache' / 'secret_scanner' / f'{key}.json'
+
+    @staticmethod
+    def _file_hash(file_path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load_scan_cache(self, cache_path: Path) -> Dict[str, Dict]:
+        """Load the incremental cache, discarding it if the rules changed"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
 
-        return dict(all_findings)
+        if cache.get('fingerprint') != self._fingerprint():
+            return {}
+        return cache.get('files', {})
+
+    def _save_scan_cache(self, cache_path: Path, files: Dict[str, Dict]):
+        """
+        Atomically write the incremental cache
+
+        The cache holds finding excerpts, so it is created owner-only.
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self._fingerprint(), 'files': files}, f)
+        os.replace(tmp_path, cache_path)
 
     def generate_report(self, findings: Dict[str, List[SecretFinding]]) -> str:
         """
@@ -635,6 +1066,19 @@ class ComprehensiveSecretScanner:
         return "\n".join(report)
 
 
+# Per-process scanner for scan_directory worker pools
+_worker_scanner: Optional[ComprehensiveSecretScanner] = None
+
+
+def _init_scan_worker(scanner: ComprehensiveSecretScanner):
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _scan_file_worker(file_path: Path) -> List[SecretFinding]:
+    return _worker_scanner.scan_file(file_path)
+
+
 if __name__ == "__main__":
     print("="*80)
     print("COMPREHENSIVE SECRET SCANNER - FIX #6")
@@ -14,15 +14,28 @@ ATTACK PREVENTION:
 ✅ CAPTCHA after suspicious activity
 ✅ Adaptive rate limiting
 ✅ Distributed rate limiting (Redis cluster)
+
+PERFORMANCE:
+Every dimension (block list, IP, user, login) is evaluated by one Lua
+script in a single Redis round-trip, using sliding-window counters (the
+previous fixed window weighted by its remaining overlap) so there is no
+2x burst at window boundaries. Clearly-allowed traffic is served from a
+small local token bucket leased from Redis (tokens left when a lease
+expires are refunded), and the in-process fallback runs the same algorithm
+when Redis is unavailable.
 """
 
 import time
+import math
 import hashlib
-from typing import Optional, Dict, Tuple
+import threading
+from typing import Optional, Dict, Tuple, List
 from dataclasses import dataclass
 from enum import Enum
 import os
 
+from security.expiring_counter_store import ExpiringCounterStore
+
 
 class RateLimitResult(Enum):
     """Rate limit check result"""
@@ -62,6 +75,269 @@ class RateLimitConfig:
     redis_password: Optional[str] = None
     redis_cluster_mode: bool = False
 
+    # Local token bucket: when every counter is well under its limit, this
+    # many requests are reserved in Redis at once and served locally
+    local_lease_size: int = 10
+    local_lease_ttl_seconds: float = 1.0
+    local_lease_headroom: float = 0.5  # Lease only below this fraction of limits
+
+
+# Sliding-window check of every limit in one round-trip.
+#
+# KEYS: [block key], [failed-login key], then one counter prefix per limit
+# ARGV: now, lease, has_block, has_failed, then window, limit, soft per limit
+#
+# Limits are incremented in order and evaluation stops at the first one
+# exceeded, returning {stage, ceil(count), kind} (kind 1 = limit, 2 = soft/CAPTCHA
+# threshold; stage -1 = blocked). Otherwise returns {0, 0, failed, granted}.
+# Counter keys share the prefix's hash tag, so cluster slots match.
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local lease = tonumber(ARGV[2])
+local k = 1
+if ARGV[3] == '1' then
+    if redis.call('EXISTS', KEYS[k]) == 1 then
+        return {-1, 0, 0}
+    end
+    k = k + 1
+end
+local failed_key = nil
+if ARGV[4] == '1' then
+    failed_key = KEYS[k]
+    k = k + 1
+end
+
+local current_keys, counts, limits, softs = {}, {}, {}, {}
+for i = k, #KEYS do
+    local a = 5 + (i - k) * 3
+    local window = tonumber(ARGV[a])
+    local limit = tonumber(ARGV[a + 1])
+    local soft = tonumber(ARGV[a + 2])
+    local bucket = math.floor(now / window)
+    local current_key = KEYS[i] .. ':' .. string.format('%d', bucket)
+    local current = redis.call('INCR', current_key)
+    if current == 1 then
+        redis.call('EXPIRE', current_key, window * 2)
+    end
+    local previous = tonumber(redis.call('GET', KEYS[i] .. ':' .. string.format('%d', bucket - 1))) or 0
+    local count = previous * (1 - (now - bucket * window) / window) + current
+
+    if count > limit then
+        return {i - k + 1, math.ceil(count), 1}
+    end
+    if soft > 0 and count > soft then
+        return {i - k + 1, math.ceil(count), 2}
+    end
+    current_keys[#current_keys + 1] = current_key
+    counts[#counts + 1] = count
+    limits[#limits + 1] = limit
+    softs[#softs + 1] = soft
+end
+
+local failed = 0
+if failed_key then
+    failed = tonumber(redis.call('GET', failed_key)) or 0
+end
+
+local granted = 1
+if lease > 1 then
+    local headroom = tonumber(ARGV[#ARGV])
+    granted = lease
+    for i = 1, #counts do
+        local cap = limits[i]
+        if softs[i] > 0 and softs[i] < cap then
+            cap = softs[i]
+        end
+        if counts[i] + lease - 1 > cap * headroom then
+            granted = 1
+        end
+    end
+    if granted > 1 then
+        for i = 1, #current_keys do
+            redis.call('INCRBY', current_keys[i], granted - 1)
+        end
+    end
+end
+
+return {0, 0, failed, granted}
+"""
+
+# Return a lease's unused tokens to the counter buckets it was charged to.
+# KEYS: charged bucket keys; ARGV: tokens. Buckets that already expired are
+# skipped, and a counter never drops below zero.
+LEASE_REFUND_SCRIPT = """
+local tokens = tonumber(ARGV[1])
+for i = 1, #KEYS do
+    local current = tonumber(redis.call('GET', KEYS[i]))
+    if current and current > 0 then
+        redis.call('DECRBY', KEYS[i], math.min(tokens, current))
+    end
+end
+return 1
+"""
+
+# (counter prefix, window seconds, limit, soft threshold or 0, stage name)
+Limit = Tuple[str, int, int, int, str]
+
+
+class LocalSlidingWindowStore:
+    """
+    In-process counters with the same semantics as SLIDING_WINDOW_SCRIPT
+
+    Used when Redis is not installed or unreachable, so limits stay
+    consistent (just not shared between processes). Counters live in a
+    bounded ExpiringCounterStore, so a flood of unique IPs is capped.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self._store = ExpiringCounterStore(max_keys=max_keys, name="rate limiter fallback")
+        self._lock = threading.Lock()
+
+    def evaluate(
+        self,
+        now: float,
+        lease: int,
+        headroom: float,
+        block_key: Optional[str],
+        failed_key: Optional[str],
+        limits: List[Limit]
+    ) -> List[int]:
+        """Mirror of SLIDING_WINDOW_SCRIPT"""
+        store = self._store
+        with self._lock:
+            if block_key and store.contains(block_key):
+                return [-1, 0, 0]
+
+            passed = []
+            for stage, (prefix, window, limit, soft, _) in enumerate(limits, 1):
+                bucket = math.floor(now / window)
+                current_key = f"{prefix}:{bucket}"
+                current = store.incr(current_key, window * 2, refresh_ttl=False)
+                previous = store.get(f"{prefix}:{bucket - 1}")
+                count = previous * (1 - (now - bucket * window) / window) + current
+
+                if count > limit:
+                    return [stage, math.ceil(count), 1]
+                if soft > 0 and count > soft:
+                    return [stage, math.ceil(count), 2]
+                passed.append((current_key, window, count, min(limit, soft) if soft > 0 else limit))
+
+            failed = store.get(failed_key) if failed_key else 0
+
+            granted = 1
+            if lease > 1 and all(count + lease - 1 <= cap * headroom for _, _, count, cap in passed):
+                granted = lease
+                for current_key, window, _, _ in passed:
+                    store.incr(current_key, window * 2, amount=granted - 1, refresh_ttl=False)
+
+            return [0, 0, failed, granted]
+
+    def refund(self, keys: List[str], tokens: int):
+        """Mirror of LEASE_REFUND_SCRIPT"""
+        with self._lock:
+            for key in keys:
+                current = self._store.get(key)
+                if current > 0:
+                    self._store.incr(key, 0, amount=-min(tokens, current), refresh_ttl=False)
+
+    def peek(self, prefix: str, window: int, now: float) -> int:
+        """Sliding-window count without incrementing"""
+        bucket = math.floor(now / window)
+        current = self._store.get(f"{prefix}:{bucket}")
+        previous = self._store.get(f"{prefix}:{bucket - 1}")
+        return math.ceil(previous * (1 - (now - bucket * window) / window) + current)
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Fixed-TTL counter increment (INCR + EXPIRE)"""
+        return self._store.incr(key, ttl)
+
+    def get(self, key: str) -> int:
+        return self._store.get(key)
+
+    def setex(self, key: str, ttl: float, value: int = 1):
+        self._store.set(key, value, ttl)
+
+    def delete(self, key: str):
+        self._store.delete(key)
+
+
+class _Lease:
+    """Tokens left on one lease and the counter buckets they were charged to"""
+
+    __slots__ = ('tokens', 'expires_at', 'charged', 'local')
+
+    def __init__(self, tokens: int, expires_at: float, charged: List[str], local: bool):
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.charged = charged
+        self.local = local  # Charged to the in-process fallback, not Redis
+
+
+class LocalTokenBucket:
+    """
+    Per-process tokens leased from the shared limiter
+
+    Tokens are already counted in Redis when granted, so serving them
+    locally never lets traffic exceed the distributed limits. Tokens still
+    unused when a lease expires are handed back by expired() for a refund,
+    so idle leases don't eat into the configured limits.
+    """
+
+    def __init__(self, max_entries: int = 100_000, refund_window: float = 7200.0):
+        """
+        Args:
+            max_entries: Max tracked leases (least recently used evicted)
+            refund_window: Seconds an expired lease is kept for its refund
+                (the longest counter bucket lives twice its 3600s window)
+        """
+        self._leases = ExpiringCounterStore(max_keys=max_entries, name="rate limit leases")
+        self._refund_window = refund_window
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(ip_address: str, user_id: str) -> str:
+        return f"{ip_address}|{user_id}"
+
+    def take(self, ip_address: str, user_id: str, now: float) -> bool:
+        """Consume one local token if a live lease has any left"""
+        with self._lock:
+            lease = self._leases.get(self._key(ip_address, user_id), None)
+            if lease is None or lease.tokens <= 0 or now >= lease.expires_at:
+                return False
+            lease.tokens -= 1
+            return True
+
+    def expired(self, ip_address: str, user_id: str, now: float) -> Optional[_Lease]:
+        """Remove an expired lease; returns it if it has unused tokens to refund"""
+        key = self._key(ip_address, user_id)
+        with self._lock:
+            lease = self._leases.get(key, None)
+            if lease is None or now < lease.expires_at:
+                return None
+            self._leases.delete(key)
+            return lease if lease.tokens > 0 else None
+
+    def grant(
+        self,
+        ip_address: str,
+        user_id: str,
+        tokens: int,
+        ttl: float,
+        now: float,
+        charged: List[str],
+        local: bool
+    ):
+        self._leases.set(
+            self._key(ip_address, user_id),
+            _Lease(tokens, now + ttl, charged, local),
+            ttl + self._refund_window
+        )
+
+    def revoke(self, ip_address: str):
+        """Drop leases for an IP (e.g. when it gets blocked)"""
+        prefix = self._key(ip_address, '')
+        self._leases.delete_matching(lambda key: key.startswith(prefix))
+
 
 class EnhancedRateLimiter:
     """
@@ -98,12 +374,14 @@ class EnhancedRateLimiter:
             }
     """
 
-    def __init__(self, config: Optional[RateLimitConfig] = None):
+    def __init__(self, config: Optional[RateLimitConfig] = None, redis_client=None):
         """
         Initialize rate limiter
 
         Args:
             config: Rate limit configuration
+            redis_client: Existing Redis client (or RedisHAManager, for its
+                retry / failure-mode handling) to use instead of connecting
         """
         if config is None:
             config = RateLimitConfig(
@@ -114,8 +392,11 @@ class EnhancedRateLimiter:
             )
 
         self.config = config
-        self._redis_client = None
-        self._local_cache: Dict[str, list] = {}  # Fallback storage
+        self._redis_client = redis_client
+        self._script = None
+        self._refund_script = None
+        self._local_store = LocalSlidingWindowStore()  # Fallback storage
+        self._local_tokens = LocalTokenBucket()
 
         # Initialize Redis
         self._init_redis()
@@ -123,7 +404,9 @@ class EnhancedRateLimiter:
     def _init_redis(self):
         """Initialize Redis connection"""
         try:
-            if self.config.redis_cluster_mode:
+            if self._redis_client is not None:
+                pass
+            elif self.config.redis_cluster_mode:
                 from rediscluster import RedisCluster
                 startup_nodes = [
                     {"host": self.config.redis_host, "port": self.config.redis_port}
@@ -144,8 +427,11 @@ class EnhancedRateLimiter:
                     socket_connect_timeout=5
                 )
 
-            # Test connection
-            self._redis_client.ping()
+            # Test connection (RedisHAManager.ping returns False rather than raising)
+            if not self._redis_client.ping():
+                raise ConnectionError("Redis ping failed")
+            self._script = self._redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+            self._refund_script = self._redis_client.register_script(LEASE_REFUND_SCRIPT)
             print(f"✅ Rate Limiter: Connected to Redis")
         except ImportError:
             print("⚠️  Redis not installed, using local fallback (NOT production-safe)")
@@ -174,134 +460,184 @@ class EnhancedRateLimiter:
         Returns:
             Tuple of (RateLimitResult, retry_after_seconds)
         """
-        current_time = int(time.time())
-
-        # 1. Check if IP is blocked
-        if self._is_blocked(ip_address):
-            return RateLimitResult.BLOCKED, 3600
+        current_time = time.time()
+        is_login = endpoint in self.LOGIN_ENDPOINTS
 
-        # 2. Check per-IP rate limits
-        ip_result, ip_retry = self._check_ip_rate_limit(ip_address, current_time)
-        if ip_result != RateLimitResult.ALLOWED:
-            return ip_result, ip_retry
+        # Clearly-allowed traffic already has quota reserved in Redis
+        if not is_login:
+            if self._local_tokens.take(ip_address, user_id or '', current_time):
+                return RateLimitResult.ALLOWED, 0
+            self._refund_expired_lease(ip_address, user_id or '', current_time)
 
-        # 3. Check per-user rate limits (if authenticated)
+        # 1-4. Block list, per-IP, per-user and per-endpoint limits, in order
+        identifier = user_id if user_id else ip_address
+        limits = self._ip_limits(ip_address)
         if user_id:
-            user_result, user_retry = self._check_user_rate_limit(user_id, current_time)
-            if user_result != RateLimitResult.ALLOWED:
-                return user_result, user_retry
-
-        # 4. Check per-endpoint rate limits
-        if endpoint:
-            endpoint_result, endpoint_retry = self._check_endpoint_rate_limit(
-                ip_address, user_id, endpoint, action, current_time
-            )
-            if endpoint_result != RateLimitResult.ALLOWED:
-                return endpoint_result, endpoint_retry
-
-        # 5. Record successful check
-        self._record_request(ip_address, user_id, endpoint, current_time)
-
-        return RateLimitResult.ALLOWED, 0
-
-    def _check_ip_rate_limit(
-        self,
-        ip_address: str,
-        current_time: int
-    ) -> Tuple[RateLimitResult, int]:
-        """Check per-IP rate limits"""
-        # Check minute limit
-        minute_key = f"ratelimit:ip:{ip_address}:minute:{current_time // 60}"
-        minute_count = self._increment_counter(minute_key, ttl=60)
-
-        if minute_count > self.config.requests_per_minute_ip:
-            return RateLimitResult.RATE_LIMITED, 60
+            limits += self._user_limits(user_id)
+        if is_login:
+            limits += self._login_limits(identifier)
+
+        failed_key = self._failed_login_key(identifier) if is_login else None
+        lease = 1 if is_login else self.config.local_lease_size
+        (stage, count, extra, *granted), local = self._evaluate_limits(
+            current_time, lease, self._block_key(ip_address), failed_key, limits
+        )
 
-        # Check hour limit
-        hour_key = f"ratelimit:ip:{ip_address}:hour:{current_time // 3600}"
-        hour_count = self._increment_counter(hour_key, ttl=3600)
+        if stage == -1:
+            return RateLimitResult.BLOCKED, 3600
 
-        if hour_count > self.config.requests_per_hour_ip:
-            return RateLimitResult.RATE_LIMITED, 3600
+        if stage > 0:
+            _, window, _, _, name = limits[stage - 1]
+            if extra == 2:
+                # Soft threshold: rapid requests need human verification
+                return RateLimitResult.CAPTCHA_REQUIRED, 0
+            if name == 'login_minute' and count <= self.config.captcha_threshold_failed_logins + 2:
+                return RateLimitResult.CAPTCHA_REQUIRED, 0
+            return RateLimitResult.RATE_LIMITED, window
 
-        # Check if CAPTCHA required (rapid requests)
-        if minute_count > self.config.captcha_threshold_requests_per_minute:
+        # Check if CAPTCHA required (after failed attempts)
+        if is_login and extra >= self.config.captcha_threshold_failed_logins:
             return RateLimitResult.CAPTCHA_REQUIRED, 0
 
-        return RateLimitResult.ALLOWED, 0
+        if granted and granted[0] > 1:
+            charged = [f"{prefix}:{math.floor(current_time / window)}" for prefix, window, *_ in limits]
+            self._local_tokens.grant(
+                ip_address, user_id or '', granted[0] - 1, self.config.local_lease_ttl_seconds,
+                current_time, charged, local
+            )
 
-    def _check_user_rate_limit(
-        self,
-        user_id: str,
-        current_time: int
-    ) -> Tuple[RateLimitResult, int]:
-        """Check per-user rate limits"""
-        # Check minute limit
-        minute_key = f"ratelimit:user:{user_id}:minute:{current_time // 60}"
-        minute_count = self._increment_counter(minute_key, ttl=60)
+        # 5. Record successful check
+        self._record_request(ip_address, user_id, endpoint, int(current_time))
 
-        if minute_count > self.config.requests_per_minute_user:
-            return RateLimitResult.RATE_LIMITED, 60
+        return RateLimitResult.ALLOWED, 0
 
-        # Check hour limit
-        hour_key = f"ratelimit:user:{user_id}:hour:{current_time // 3600}"
-        hour_count = self._increment_counter(hour_key, ttl=3600)
+    LOGIN_ENDPOINTS = ("/login", "/api/login", "/api/v1/auth/login")
 
-        if hour_count > self.config.requests_per_hour_user:
-            return RateLimitResult.RATE_LIMITED, 3600
+    def _refund_expired_lease(self, ip_address: str, user_id: str, now: float):
+        """Return an expired lease's unused tokens to the counters it was charged to"""
+        lease = self._local_tokens.expired(ip_address, user_id, now)
+        if lease is None:
+            return
 
-        return RateLimitResult.ALLOWED, 0
+        if lease.local:
+            self._local_store.refund(lease.charged, lease.tokens)
+        elif self._redis_client and self._refund_script:
+            try:
+                self._refund_script(keys=lease.charged, args=[lease.tokens])
+            except Exception as e:
+                # Over-counting is the safe direction; the tokens age out
+                print(f"⚠️  Redis lease refund failed: {e}")
+
+    # Keys carry a {hash tag} per identifier so each dimension maps to one
+    # Redis Cluster slot
+
+    @staticmethod
+    def _block_key(ip_address: str) -> str:
+        return f"ratelimit:blocked:{{{ip_address}}}"
+
+    @staticmethod
+    def _failed_login_key(identifier: str) -> str:
+        return f"ratelimit:login_failed:{{{identifier}}}"
+
+    def _ip_limits(self, ip_address: str) -> List[Limit]:
+        """Per-IP limits (minute limit also carries the CAPTCHA threshold)"""
+        prefix = f"ratelimit:ip:{{{ip_address}}}"
+        return [
+            (f"{prefix}:minute", 60, self.config.requests_per_minute_ip,
+             self.config.captcha_threshold_requests_per_minute, 'ip_minute'),
+            (f"{prefix}:hour", 3600, self.config.requests_per_hour_ip, 0, 'ip_hour'),
+        ]
 
-    def _check_endpoint_rate_limit(
-        self,
-        ip_address: str,
-        user_id: Optional[str],
-        endpoint: str,
-        action: str,
-        current_time: int
-    ) -> Tuple[RateLimitResult, int]:
-        """Check per-endpoint rate limits (e.g., login attempts)"""
-        # Special handling for login endpoint
-        if endpoint in ["/login", "/api/login", "/api/v1/auth/login"]:
-            return self._check_login_rate_limit(ip_address, user_id, current_time)
+    def _user_limits(self, user_id: str) -> List[Limit]:
+        """Per-user limits"""
+        prefix = f"ratelimit:user:{{{user_id}}}"
+        return [
+            (f"{prefix}:minute", 60, self.config.requests_per_minute_user, 0, 'user_minute'),
+            (f"{prefix}:hour", 3600, self.config.requests_per_hour_user, 0, 'user_hour'),
+        ]
 
-        # Add more endpoint-specific limits here
-        return RateLimitResult.ALLOWED, 0
+    def _login_limits(self, identifier: str) -> List[Limit]:
+        """Login-specific limits"""
+        prefix = f"ratelimit:login:{{{identifier}}}"
+        return [
+            (f"{prefix}:minute", 60, self.config.login_attempts_per_minute, 0, 'login_minute'),
+            (f"{prefix}:hour", 3600, self.config.login_attempts_per_hour, 0, 'login_hour'),
+        ]
 
-    def _check_login_rate_limit(
+    def _evaluate_limits(
         self,
-        ip_address: str,
-        user_id: Optional[str],
-        current_time: int
-    ) -> Tuple[RateLimitResult, int]:
-        """Check login-specific rate limits"""
-        identifier = user_id if user_id else ip_address
+        now: float,
+        lease: int,
+        block_key: Optional[str],
+        failed_key: Optional[str],
+        limits: List[Limit]
+    ) -> Tuple[List[int], bool]:
+        """
+        Evaluate all limits atomically (one script call per round-trip)
 
-        # Check minute limit
-        minute_key = f"ratelimit:login:{identifier}:minute:{current_time // 60}"
-        minute_count = self._increment_counter(minute_key, ttl=60)
+        In cluster mode keys for different identifiers live in different
+        slots, so each dimension is evaluated separately (no leasing).
 
-        if minute_count > self.config.login_attempts_per_minute:
-            # Check if CAPTCHA required
-            if minute_count <= self.config.captcha_threshold_failed_logins + 2:
-                return RateLimitResult.CAPTCHA_REQUIRED, 0
-            return RateLimitResult.RATE_LIMITED, 60
+        Returns:
+            Tuple of (script result, whether the local fallback answered)
+        """
+        headroom = self.config.local_lease_headroom
 
-        # Check hour limit
-        hour_key = f"ratelimit:login:{identifier}:hour:{current_time // 3600}"
-        hour_count = self._increment_counter(hour_key, ttl=3600)
+        if self._redis_client and self._script:
+            try:
+                if not self.config.redis_cluster_mode:
+                    return self._run_script(now, lease, headroom, block_key, failed_key, limits), False
+
+                offset = 0
+                for group in self._group_limits(limits):
+                    has_block = offset == 0
+                    has_failed = group[0][4].startswith('login')
+                    result = self._run_script(
+                        now, 1, headroom,
+                        block_key if has_block else None,
+                        failed_key if has_failed else None,
+                        group
+                    )
+                    if result[0] == -1:
+                        return result, False
+                    if result[0] > 0:
+                        return [result[0] + offset, result[1], result[2]], False
+                    offset += len(group)
+                    if has_failed:
+                        failed = result[2]
+                return [0, 0, failed if failed_key else 0, 1], False
 
-        if hour_count > self.config.login_attempts_per_hour:
-            return RateLimitResult.RATE_LIMITED, 3600
+            except Exception as e:
+                print(f"⚠️  Redis rate limit check failed: {e}")
 
-        # Check if CAPTCHA required (after failed attempts)
-        failed_key = f"ratelimit:login_failed:{identifier}"
-        failed_count = self._get_counter(failed_key)
+        return self._local_store.evaluate(now, lease, headroom, block_key, failed_key, limits), True
 
-        if failed_count >= self.config.captcha_threshold_failed_logins:
-            return RateLimitResult.CAPTCHA_REQUIRED, 0
+    @staticmethod
+    def _group_limits(limits: List[Limit]) -> List[List[Limit]]:
+        """Split limits into runs sharing a key prefix (one slot each)"""
+        groups: List[List[Limit]] = []
+        for limit in limits:
+            if groups and groups[-1][0][0].rsplit(':', 1)[0] == limit[0].rsplit(':', 1)[0]:
+                groups[-1].append(limit)
+            else:
+                groups.append([limit])
+        return groups
 
-        return RateLimitResult.ALLOWED, 0
+    def _run_script(
+        self,
+        now: float,
+        lease: int,
+        headroom: float,
+        block_key: Optional[str],
+        failed_key: Optional[str],
+        limits: List[Limit]
+    ) -> List[int]:
+        keys = [key for key in (block_key, failed_key) if key] + [limit[0] for limit in limits]
+        args = [repr(now), lease, int(bool(block_key)), int(bool(failed_key))]
+        for _, window, limit, soft, _ in limits:
+            args += [window, limit, soft]
+        args.append(headroom)
+        return [int(value) for value in self._script(keys=keys, args=args)]
 
     def record_failed_login(self, ip_address: str, user_id: Optional[str] = None):
         """
@@ -312,7 +648,7 @@ class EnhancedRateLimiter:
             user_id: User ID (if known)
         """
         identifier = user_id if user_id else ip_address
-        failed_key = f"ratelimit:login_failed:{identifier}"
+        failed_key = self._failed_login_key(identifier)
 
         # Increment failed login counter
         failed_count = self._increment_counter(failed_key, ttl=3600)
@@ -330,17 +666,15 @@ class EnhancedRateLimiter:
             ip_address: IP address
             user_id: User ID
         """
-        # Reset failed login counter
-        failed_key = f"ratelimit:login_failed:{user_id}"
-        self._delete_counter(failed_key)
-
-        # Also reset IP-based counter
-        failed_ip_key = f"ratelimit:login_failed:{ip_address}"
-        self._delete_counter(failed_ip_key)
+        # Reset failed login counters (user and IP based) in one round-trip
+        self._delete_counter(
+            self._failed_login_key(user_id),
+            self._failed_login_key(ip_address)
+        )
 
     def _is_blocked(self, ip_address: str) -> bool:
         """Check if IP is blocked"""
-        block_key = f"ratelimit:blocked:{ip_address}"
+        block_key = self._block_key(ip_address)
 
         if self._redis_client:
             try:
@@ -348,21 +682,23 @@ class EnhancedRateLimiter:
             except Exception:
                 return False
         else:
-            # Fallback: check local cache
-            return block_key in self._local_cache
+            # Fallback: check local store
+            return self._local_store.get(block_key) > 0
 
     def _block_ip(self, ip_address: str, duration: int):
         """Block an IP address"""
-        block_key = f"ratelimit:blocked:{ip_address}"
+        block_key = self._block_key(ip_address)
+        self._local_tokens.revoke(ip_address)
 
         if self._redis_client:
             try:
                 self._redis_client.setex(block_key, duration, "1")
             except Exception as e:
                 print(f"⚠️  Failed to block IP: {e}")
+                self._local_store.setex(block_key, duration)
         else:
-            # Fallback: local cache
-            self._local_cache[block_key] = [time.time() + duration]
+            # Fallback: local store
+            self._local_store.setex(block_key, duration)
 
     def _increment_counter(self, key: str, ttl: int) -> int:
         """Increment counter with TTL"""
@@ -375,9 +711,9 @@ class EnhancedRateLimiter:
                 return results[0]
             except Exception as e:
                 print(f"⚠️  Redis increment failed: {e}")
-                return self._local_increment(key)
+                return self._local_store.incr(key, ttl)
         else:
-            return self._local_increment(key)
+            return self._local_store.incr(key, ttl)
 
     def _get_counter(self, key: str) -> int:
         """Get counter value"""
@@ -388,32 +724,37 @@ class EnhancedRateLimiter:
             except Exception:
                 return 0
         else:
-            return len(self._local_cache.get(key, []))
+            return self._local_store.get(key)
 
-    def _delete_counter(self, key: str):
-        """Delete counter"""
+    def _delete_counter(self, *keys: str):
+        """Delete counters"""
         if self._redis_client:
             try:
-                self._redis_client.delete(key)
+                if self.config.redis_cluster_mode:
+                    # Keys carry different hash tags (no cross-slot DEL)
+                    for key in keys:
+                        self._redis_client.delete(key)
+                else:
+                    self._redis_client.delete(*keys)
             except Exception:
                 pass
-        else:
-            self._local_cache.pop(key, None)
-
-    def _local_increment(self, key: str) -> int:
-        """Local fallback for counter increment"""
-        if key not in self._local_cache:
-            self._local_cache[key] = []
-
-        self._local_cache[key].append(time.time())
-
-        # Clean up old entries (simple TTL simulation)
-        self._local_cache[key] = [
-            t for t in self._local_cache[key]
-            if time.time() - t < 3600  # Keep for 1 hour
-        ]
+        for key in keys:
+            self._local_store.delete(key)
 
-        return len(self._local_cache[key])
+    def _peek_sliding_count(self, prefix: str, window: int, now: float) -> int:
+        """Sliding-window count for a limit, without incrementing"""
+        if self._redis_client:
+            try:
+                bucket = math.floor(now / window)
+                current, previous = self._redis_client.mget(
+                    f"{prefix}:{bucket}", f"{prefix}:{bucket - 1}"
+                )
+                return math.ceil(
+                    int(previous or 0) * (1 - (now - bucket * window) / window) + int(current or 0)
+                )
+            except Exception:
+                pass
+        return self._local_store.peek(prefix, window, now)
 
     def _record_request(
         self,
@@ -441,16 +782,16 @@ class EnhancedRateLimiter:
         Returns:
             Dictionary of rate limit headers
         """
-        current_time = int(time.time())
+        current_time = time.time()
 
-        # Get current IP usage
-        minute_key = f"ratelimit:ip:{ip_address}:minute:{current_time // 60}"
-        ip_minute_count = self._get_counter(minute_key)
+        # Get current IP usage (sliding window)
+        prefix, window = self._ip_limits(ip_address)[0][:2]
+        ip_minute_count = self._peek_sliding_count(prefix, window, current_time)
 
         headers = {
             "X-RateLimit-Limit": str(self.config.requests_per_minute_ip),
             "X-RateLimit-Remaining": str(max(0, self.config.requests_per_minute_ip - ip_minute_count)),
-            "X-RateLimit-Reset": str((current_time // 60 + 1) * 60)
+            "X-RateLimit-Reset": str((int(current_time) // 60 + 1) * 60)
         }
 
         return headers
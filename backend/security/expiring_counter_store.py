@@ -0,0 +1,295 @@
+"""
+Expiring Counter Store - Bounded in-process state for limiters and blacklists
+
+Shared by the in-process fallbacks of EnhancedRateLimiter, the Auth0
+RateLimiter and JWTBlacklistManager, which previously kept unbounded dicts
+of timestamp lists / sets and did O(requests) cleanup on every check.
+
+DESIGN:
+✅ Fixed-TTL values and counters (INCR + EXPIRE semantics)
+✅ Sliding-window counters as ring buffers of buckets with a running total
+✅ Time-wheel expiry: each tick only visits keys scheduled for that slot
+✅ Hard cap on tracked keys with LRU eviction (a flood of unique IPs
+   cannot exhaust worker memory)
+✅ O(1) amortized per operation, thread-safe
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+
+class _Entry:
+    """One tracked key: a plain value, or a ring buffer of window buckets"""
+
+    __slots__ = ('value', 'expires_at', 'ring', 'head')
+
+    def __init__(self, value: int, expires_at: float):
+        self.value = value  # Counter value, or running total of the ring
+        self.expires_at = expires_at
+        self.ring: Optional[List[int]] = None
+        self.head = 0  # Absolute bucket number of the newest ring slot
+
+
+class ExpiringCounterStore:
+    """
+    Bounded, expiring key -> counter store
+
+    Usage:
+        store = ExpiringCounterStore(max_keys=100_000)
+
+        # Fixed-TTL counter / flag
+        store.incr("login_failed:1.2.3.4", ttl=3600)
+        store.set("blocked:1.2.3.4", 1, ttl=600)
+
+        # Sliding window (last 60s, 12 buckets of 5s)
+        if store.window_total("ip:1.2.3.4", window=60) < limit:
+            store.window_add("ip:1.2.3.4", window=60)
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 100_000,
+        wheel_slots: int = 4096,
+        resolution: float = 1.0,
+        name: str = "store",
+        on_evict: Optional[Callable[[str, object, float], None]] = None
+    ):
+        """
+        Initialize the store
+
+        Args:
+            max_keys: Hard cap on tracked keys (least recently used evicted)
+            wheel_slots: Slots in the expiry time wheel
+            resolution: Seconds per wheel slot
+            name: Label reported in stats()
+            on_evict: Called as on_evict(key, value, expires_at) for each key
+                the cap evicts (store lock held; must not use the store)
+        """
+        self.max_keys = max_keys
+        self.name = name
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._wheel: List[Set[str]] = [set() for _ in range(wheel_slots)]
+        self._resolution = resolution
+        self._tick = int(time.time() / resolution)
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+        self.expirations = 0
+
+    # ------------------------------------------------------------------
+    # Internals (lock held)
+    # ------------------------------------------------------------------
+
+    def _advance(self, now: float):
+        """Expire keys in wheel slots the clock has passed"""
+        tick = int(now / self._resolution)
+        if tick <= self._tick:
+            return
+
+        slots = len(self._wheel)
+        for t in range(self._tick + 1, min(tick, self._tick + slots) + 1):
+            slot = self._wheel[t % slots]
+            for key in list(slot):
+                entry = self._entries.get(key)
+                if entry is None:
+                    slot.discard(key)
+                elif entry.expires_at <= now:
+                    del self._entries[key]
+                    slot.discard(key)
+                    self.expirations += 1
+                elif int(entry.expires_at / self._resolution) % slots != t % slots:
+                    slot.discard(key)  # Rescheduled; it lives in another slot now
+        self._tick = tick
+
+    def _slot(self, entry: _Entry) -> Set[str]:
+        return self._wheel[int(entry.expires_at / self._resolution) % len(self._wheel)]
+
+    def _schedule(self, key: str, entry: _Entry):
+        self._slot(entry).add(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._slot(entry).discard(key)
+
+    def _live(self, key: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _insert(self, key: str, entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_keys:
+            evicted, old = self._entries.popitem(last=False)
+            self._slot(old).discard(evicted)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted, old.value, old.expires_at)
+        self._schedule(key, entry)
+
+    def _rotate(self, entry: _Entry, bucket: int):
+        """Advance a ring buffer to `bucket`, clearing buckets that left the window"""
+        ring = entry.ring
+        steps = bucket - entry.head
+        if steps <= 0:
+            return
+        if steps >= len(ring):
+            ring[:] = [0] * len(ring)
+            entry.value = 0
+        else:
+            for b in range(entry.head + 1, bucket + 1):
+                index = b % len(ring)
+                entry.value -= ring[index]
+                ring[index] = 0
+        entry.head = bucket
+
+    # ------------------------------------------------------------------
+    # Fixed-TTL values
+    # ------------------------------------------------------------------
+
+    def incr(self, key: str, ttl: float, amount: int = 1, refresh_ttl: bool = True) -> int:
+        """
+        Increment a counter (created at 0 if missing or expired)
+
+        Args:
+            key: Counter key
+            ttl: Seconds until expiry
+            amount: Increment
+            refresh_ttl: Reset the expiry on every increment (like INCR +
+                EXPIRE); otherwise only when the counter is created
+
+        Returns:
+            New counter value
+        """
+        now = time.time()
+        with self._lock:
+            self._advance(now)
+            entry = self._live(key, now)
+            if entry is None:
+                entry = _Entry(0, now + ttl)
+                self._insert(key, entry)
+            elif refresh_ttl:
+                entry.expires_at = now + ttl
+                self._schedule(key, entry)
+            entry.value += amount
+            return entry.value
+
+    def get(self, key: str, default=0):
+        """Current value (default if missing or expired)"""
+        now = time.time()
+        with self._lock:
+            self._advance(now)
+            entry = self._live(key, now)
+            return entry.value if entry is not None else default
+
+    def set(self, key: str, value, ttl: float):
+        """Set a value with a TTL (values set here may be any object)"""
+        now = time.time()
+        with self._lock:
+            self._advance(now)
+            self._remove(key)
+            self._insert(key, _Entry(value, now + ttl))
+
+    def contains(self, key: str) -> bool:
+        """Whether a live key exists"""
+        now = time.time()
+        with self._lock:
+            self._advance(now)
+            return self._live(key, now) is not None
+
+    def delete(self, key: str):
+        """Remove a key"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """Remove all keys"""
+        with self._lock:
+            self._entries.clear()
+            for slot in self._wheel:
+                slot.clear()
+
+    def delete_matching(self, predicate) -> int:
+        """Remove keys for which predicate(key) is true; returns the count"""
+        with self._lock:
+            victims = [key for key in self._entries if predicate(key)]
+            for key in victims:
+                self._remove(key)
+            return len(victims)
+
+    # ------------------------------------------------------------------
+    # Sliding windows
+    # ------------------------------------------------------------------
+
+    def window_add(self, key: str, window: float, amount: int = 1, buckets: int = 12) -> int:
+        """
+        Record events in a sliding window
+
+        Args:
+            key: Window key
+            window: Window length in seconds
+            amount: Events to add
+            buckets: Ring buffer size (window / buckets is the granularity)
+
+        Returns:
+            Events in the window, including these
+        """
+        now = time.time()
+        width = window / buckets
+        bucket = math.floor(now / width)
+        with self._lock:
+            self._advance(now)
+            entry = self._live(key, now)
+            if entry is None or entry.ring is None or len(entry.ring) != buckets:
+                self._remove(key)
+                entry = _Entry(0, now + window)
+                entry.ring = [0] * buckets
+                entry.head = bucket
+                self._insert(key, entry)
+            else:
+                self._rotate(entry, bucket)
+                entry.expires_at = now + window
+                self._schedule(key, entry)
+
+            entry.ring[bucket % buckets] += amount
+            entry.value += amount
+            return entry.value
+
+    def window_total(self, key: str, window: float, buckets: int = 12) -> int:
+        """Events in the sliding window, without recording one"""
+        now = time.time()
+        bucket = math.floor(now / (window / buckets))
+        with self._lock:
+            self._advance(now)
+            entry = self._live(key, now)
+            if entry is None or entry.ring is None or len(entry.ring) != buckets:
+                return 0
+            self._rotate(entry, bucket)
+            return entry.value
+
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Tracked keys and eviction/expiry counts"""
+        with self._lock:
+            return {
+                'name': self.name,
+                'keys': len(self._entries),
+                'max_keys': self.max_keys,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -11,15 +11,50 @@ For database queries, ALWAYS use parameterized queries:
     ❌ WRONG:   cursor.execute(f"SELECT * FROM users WHERE id = {user_id}")
 
 This validator is for display/logging/non-critical validation only.
+
+PERFORMANCE:
+- Pattern lists are compiled once at import into a combined prefilter per
+  rule table; clean input (the common case) costs one regex search
+- validate_payload() checks request bodies against a schema compiled once
+  (see compile_schema), walking nested objects with an explicit stack
 """
 
 import re
 import html
 import os
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 
+class CompiledRuleTable:
+    """
+    Ordered regex rules compiled into one combined prefilter
+
+    search() returns the first rule (in list order) that matches, exactly
+    like looping over re.search() per rule, but input that matches no rule
+    is rejected by a single search over the combined alternation.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str]], flags: int = 0):
+        """
+        Args:
+            rules: Ordered (label, pattern) pairs
+            flags: re flags for every rule
+        """
+        self.rules = [(label, pattern, re.compile(pattern, flags)) for label, pattern in rules]
+        self.combined = re.compile('|'.join(f'(?:{pattern})' for _, pattern in rules), flags)
+
+    def search(self, value: str) -> Optional[Tuple[str, str]]:
+        """First matching (label, pattern), or None"""
+        if not self.combined.search(value):
+            return None
+        for label, pattern, compiled in self.rules:
+            if compiled.search(value):
+                return label, pattern
+        return None
+
+
 class InputValidator:
     """
     Validates and sanitizes all user inputs to prevent injection attacks
@@ -58,6 +93,31 @@ class InputValidator:
         r"\/proc\/",  # System files
     ]
 
+    # Hosts rejected by sanitize_url (SSRF protection)
+    BLOCKED_URL_HOSTS = ('localhost', '127.0.0.1', '0.0.0.0', '::1')
+
+    # Compiled by compile_rules() at import
+    _string_rules: CompiledRuleTable = None
+    _path_rules: CompiledRuleTable = None
+
+    @classmethod
+    def compile_rules(cls):
+        """
+        Compile the pattern lists into rule tables
+
+        Runs once at import; call again after changing the pattern lists.
+        """
+        cls._string_rules = CompiledRuleTable(
+            [("SQL injection", p) for p in cls.SQL_INJECTION_PATTERNS] +
+            [("Command injection", p) for p in cls.COMMAND_INJECTION_PATTERNS] +
+            [("Path traversal", p) for p in cls.PATH_TRAVERSAL_PATTERNS],
+            re.IGNORECASE
+        )
+        cls._path_rules = CompiledRuleTable(
+            [("Path traversal", p) for p in cls.PATH_TRAVERSAL_PATTERNS]
+        )
+        _sanitize_key.cache_clear()
+
     @staticmethod
     def sanitize_string(value: str, max_length: int = 1000) -> str:
         """
@@ -80,20 +140,10 @@ class InputValidator:
         if len(value) > max_length:
             raise ValueError(f"Input too long (max {max_length} chars)")
 
-        # Check for SQL injection
-        for pattern in InputValidator.SQL_INJECTION_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                raise ValueError(f"SQL injection detected: {pattern}")
-
-        # Check for command injection
-        for pattern in InputValidator.COMMAND_INJECTION_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                raise ValueError(f"Command injection detected: {pattern}")
-
-        # Check for path traversal
-        for pattern in InputValidator.PATH_TRAVERSAL_PATTERNS:
-            if re.search(pattern, value, re.IGNORECASE):
-                raise ValueError(f"Path traversal detected: {pattern}")
+        # Check for SQL injection, command injection and path traversal
+        violation = InputValidator._string_rules.search(value)
+        if violation:
+            raise ValueError(f"{violation[0]} detected: {violation[1]}")
 
         # HTML escape to prevent XSS
         value = html.escape(value)
@@ -148,8 +198,8 @@ class InputValidator:
             raise ValueError("Only HTTP/HTTPS URLs allowed")
 
         # Block localhost/internal IPs (SSRF protection)
-        blocked_hosts = ['localhost', '127.0.0.1', '0.0.0.0', '::1']
-        if any(host in parsed.netloc.lower() for host in blocked_hosts):
+        netloc = parsed.netloc.lower()
+        if any(host in netloc for host in InputValidator.BLOCKED_URL_HOSTS):
             raise ValueError("Access to internal resources blocked")
 
         return url
@@ -157,12 +207,15 @@ class InputValidator:
     @staticmethod
     def sanitize_dict(data: Dict[str, Any], max_depth: int = 5, current_depth: int = 0) -> Dict[str, Any]:
         """
-        Recursively sanitize dictionary
+        Sanitize dictionary, including nested dictionaries
+
+        Nested dictionaries are walked depth-first with an explicit stack
+        (no recursion), in the same order as a recursive walk.
 
         Args:
             data: Dictionary to sanitize
             max_depth: Maximum nesting depth
-            current_depth: Current recursion depth
+            current_depth: Depth of `data` itself
 
         Returns:
             Sanitized dictionary
@@ -173,33 +226,39 @@ class InputValidator:
         if current_depth > max_depth:
             raise ValueError(f"Dictionary nesting too deep (max {max_depth})")
 
-        sanitized = {}
-
-        for key, value in data.items():
-            # Sanitize key
-            clean_key = InputValidator.sanitize_string(str(key), max_length=100)
-
-            # Sanitize value based on type
-            if isinstance(value, str):
-                sanitized[clean_key] = InputValidator.sanitize_string(value)
-            elif isinstance(value, dict):
-                sanitized[clean_key] = InputValidator.sanitize_dict(
-                    value,
-                    max_depth=max_depth,
-                    current_depth=current_depth + 1
-                )
-            elif isinstance(value, list):
-                sanitized[clean_key] = [
-                    InputValidator.sanitize_string(str(item)) if isinstance(item, str) else item
-                    for item in value
-                ]
-            elif isinstance(value, (int, float, bool)) or value is None:
-                sanitized[clean_key] = value
+        sanitize_string = InputValidator.sanitize_string
+        root = {}
+        stack = [(iter(data.items()), root, current_depth)]
+
+        while stack:
+            items, sanitized, depth = stack[-1]
+            for key, value in items:
+                # Sanitize key (keys repeat across requests; cached)
+                clean_key = _sanitize_key(str(key))
+
+                # Sanitize value based on type
+                if isinstance(value, str):
+                    sanitized[clean_key] = sanitize_string(value)
+                elif isinstance(value, dict):
+                    if depth + 1 > max_depth:
+                        raise ValueError(f"Dictionary nesting too deep (max {max_depth})")
+                    nested = sanitized[clean_key] = {}
+                    stack.append((iter(value.items()), nested, depth + 1))
+                    break
+                elif isinstance(value, list):
+                    sanitized[clean_key] = [
+                        sanitize_string(item) if isinstance(item, str) else item
+                        for item in value
+                    ]
+                elif isinstance(value, (int, float, bool)) or value is None:
+                    sanitized[clean_key] = value
+                else:
+                    # Convert unknown types to string and sanitize
+                    sanitized[clean_key] = sanitize_string(str(value))
             else:
-                # Convert unknown types to string and sanitize
-                sanitized[clean_key] = InputValidator.sanitize_string(str(value))
+                stack.pop()
 
-        return sanitized
+        return root
 
     @staticmethod
     def sanitize_organization_id(org_id: str) -> str:
@@ -246,22 +305,15 @@ class InputValidator:
             raise ValueError("Path must be string")
 
         # Check for path traversal
-        for pattern in InputValidator.PATH_TRAVERSAL_PATTERNS:
-            if re.search(pattern, path):
-                raise ValueError("Path traversal detected")
+        if InputValidator._path_rules.search(path):
+            raise ValueError("Path traversal detected")
 
         # If allowed directories specified, verify path is within them
         if allowed_dirs:
-            import os
             abs_path = os.path.abspath(path)
+            prefixes = _absolute_dirs(tuple(allowed_dirs), os.getcwd())
 
-            allowed = False
-            for allowed_dir in allowed_dirs:
-                if abs_path.startswith(os.path.abspath(allowed_dir)):
-                    allowed = True
-                    break
-
-            if not allowed:
+            if not abs_path.startswith(prefixes):
                 raise ValueError(f"Path not in allowed directories: {allowed_dirs}")
 
         return path
@@ -333,6 +385,249 @@ class InputValidator:
         return token
 
 
+@lru_cache(maxsize=4096)
+def _sanitize_key(key: str) -> str:
+    """sanitize_string for dictionary keys (small, repetitive vocabulary)"""
+    return InputValidator.sanitize_string(key, max_length=100)
+
+
+@lru_cache(maxsize=256)
+def _absolute_dirs(allowed_dirs: Tuple[str, ...], cwd: str) -> Tuple[str, ...]:
+    """Absolute forms of allowed directories (cwd keys the cache)"""
+    return tuple(os.path.abspath(allowed_dir) for allowed_dir in allowed_dirs)
+
+
+InputValidator.compile_rules()
+
+
+# ----------------------------------------------------------------------
+# Schema-driven payload validation
+# ----------------------------------------------------------------------
+
+class _Field:
+    """One compiled schema field"""
+
+    __slots__ = ('name', 'kind', 'required', 'default', 'check', 'fields', 'items', 'max_items')
+
+    def __init__(self, name: str, kind: str, required: bool, default: Any):
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.default = default
+        self.check = None  # Scalar validator
+        self.fields: Tuple["_Field", ...] = ()  # Object members
+        self.items: Optional["_Field"] = None  # Array element
+        self.max_items = 0
+
+
+def _scalar_check(kind: str, spec: Dict[str, Any]):
+    """Build the validator for a scalar field type"""
+    max_length = spec.get('max_length', 1000)
+    minimum = spec.get('min')
+    maximum = spec.get('max')
+
+    def require_string(value):
+        if not isinstance(value, str):
+            raise ValueError("expected string")
+        if len(value) > max_length:
+            raise ValueError(f"Input too long (max {max_length} chars)")
+        return value
+
+    def check_range(value):
+        if minimum is not None and value < minimum:
+            raise ValueError(f"Value must be >= {minimum}")
+        if maximum is not None and value > maximum:
+            raise ValueError(f"Value must be <= {maximum}")
+        return value
+
+    if kind == 'string':  # Pattern checks + HTML escape
+        def check(value):
+            return InputValidator.sanitize_string(require_string(value), max_length)
+    elif kind == 'text':  # Free text: HTML escape only
+        def check(value):
+            return html.escape(require_string(value))
+    elif kind == 'raw':  # Passwords, tokens: length only, returned as is
+        check = require_string
+    elif kind == 'email':
+        def check(value):
+            return InputValidator.sanitize_email(require_string(value))
+    elif kind == 'url':
+        def check(value):
+            return InputValidator.sanitize_url(require_string(value))
+    elif kind == 'org_id':
+        def check(value):
+            return InputValidator.sanitize_organization_id(require_string(value))
+    elif kind == 'path':
+        allowed_dirs = spec.get('allowed_dirs')
+
+        def check(value):
+            return InputValidator.sanitize_file_path(require_string(value), allowed_dirs)
+    elif kind == 'integer':
+        def check(value):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise ValueError("expected integer")
+            return check_range(value)
+    elif kind == 'number':
+        def check(value):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError("expected number")
+            return check_range(value)
+    elif kind == 'boolean':
+        def check(value):
+            if not isinstance(value, bool):
+                raise ValueError("expected boolean")
+            return value
+    else:
+        raise ValueError(f"Unknown schema type: {kind}")
+
+    choices = spec.get('choices')
+    if choices is None:
+        return check
+
+    allowed = frozenset(choices)
+
+    def check_choice(value):
+        value = check(value)
+        if value not in allowed:
+            raise ValueError(f"must be one of {sorted(allowed)}")
+        return value
+
+    return check_choice
+
+
+def _compile_field(name: str, spec: Dict[str, Any]) -> _Field:
+    kind = spec.get('type', 'string')
+    field = _Field(name, kind, spec.get('required', False), spec.get('default'))
+
+    if kind == 'object':
+        field.fields = tuple(
+            _compile_field(child, child_spec) for child, child_spec in spec.get('fields', {}).items()
+        )
+    elif kind == 'array':
+        field.items = _compile_field('[]', spec.get('items', {}))
+        field.max_items = spec.get('max_items', 1000)
+    else:
+        field.check = _scalar_check(kind, spec)
+
+    return field
+
+
+class CompiledSchema:
+    """
+    Request body schema compiled into validator tables
+
+    Build once at import (compile_schema) and reuse for every request.
+    """
+
+    def __init__(self, fields: Dict[str, Dict[str, Any]]):
+        self._root = _compile_field('', {'type': 'object', 'fields': fields})
+
+    def validate(self, data: Any) -> Dict[str, Any]:
+        """
+        Validate a decoded JSON body
+
+        Only fields declared in the schema are returned; undeclared fields
+        are dropped. Nested objects are walked with an explicit stack and
+        the output is built in the same pass (the input is never copied).
+
+        Raises:
+            ValueError: "<field path>: <reason>" for the first invalid field
+        """
+        result: Dict[str, Any] = {}
+        stack = [(self._root, data, result, '')]
+
+        while stack:
+            node, source, target, path = stack.pop()
+            if not isinstance(source, dict):
+                raise ValueError(f"{path or 'payload'}: expected object")
+
+            for field in node.fields:
+                field_path = f"{path}.{field.name}" if path else field.name
+                value = source.get(field.name)
+                if value is None:
+                    if field.required:
+                        raise ValueError(f"{field_path}: required")
+                    if field.default is not None:
+                        target[field.name] = field.default
+                    continue
+                target[field.name] = self._convert(field, value, field_path, stack)
+
+        return result
+
+    def _convert(self, field: _Field, value: Any, path: str, stack: list) -> Any:
+        if field.check is not None:
+            try:
+                return field.check(value)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+
+        if field.kind == 'object':
+            converted: Dict[str, Any] = {}
+            stack.append((field, value, converted, path))
+            return converted
+
+        # Array
+        if not isinstance(value, list):
+            raise ValueError(f"{path}: expected array")
+        if len(value) > field.max_items:
+            raise ValueError(f"{path}: too many items (max {field.max_items})")
+        return [
+            self._convert(field.items, item, f"{path}[{index}]", stack)
+            for index, item in enumerate(value)
+        ]
+
+
+def compile_schema(fields: Dict[str, Dict[str, Any]]) -> CompiledSchema:
+    """
+    Compile a request body schema
+
+    Each field spec is a dict with:
+        type: string (default; pattern-checked and HTML-escaped), text
+            (HTML-escaped only), raw (length only), email, url, org_id,
+            path, integer, number, boolean, object, array
+        required: Reject the body if missing or null (default False)
+        default: Value used when missing
+        max_length: Max string length (default 1000)
+        min / max: Numeric range
+        choices: Allowed values
+        allowed_dirs: For path
+        fields: Member specs, for object
+        items / max_items: Element spec and max length (default 1000), for array
+
+    Example:
+        SIGNUP_SCHEMA = compile_schema({
+            'email': {'type': 'email', 'required': True},
+            'password': {'type': 'raw', 'required': True, 'max_length': 128},
+            'userType': {'choices': ['student', 'pi'], 'default': 'student'},
+        })
+        data = validate_payload(SIGNUP_SCHEMA, request.get_json())
+    """
+    return CompiledSchema(fields)
+
+
+def validate_payload(
+    schema: Union[CompiledSchema, Dict[str, Dict[str, Any]]],
+    data: Any
+) -> Dict[str, Any]:
+    """
+    Validate a decoded JSON request body against a schema
+
+    Args:
+        schema: CompiledSchema, or a field spec dict (compiled on every call;
+            compile once with compile_schema on hot paths)
+        data: Decoded JSON body
+
+    Returns:
+        Validated (sanitized) fields declared in the schema
+
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    if not isinstance(schema, CompiledSchema):
+        schema = compile_schema(schema)
+    return schema.validate(data)
+
+
 # Global validator instance
 _validator = InputValidator()
 
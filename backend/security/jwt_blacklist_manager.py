@@ -12,15 +12,45 @@ ATTACK PREVENTION:
 ✅ Immediate token invalidation
 ✅ Per-user session limits
 ✅ Suspicious activity detection
+
+PERFORMANCE:
+A local Bloom filter of blacklisted token hashes answers the common
+"not blacklisted" case without a Redis round-trip. It is only trusted while
+it is provably in sync: every blacklist event bumps a Redis version counter
+and is published on a channel; a subscriber thread applies events in order,
+and a gap in versions (or a periodic version poll that disagrees) triggers
+a resync from Redis. Until then checks go to Redis.
 """
 
 import os
+import math
 import time
 import hashlib
-from typing import Optional, Set
+import threading
+from typing import Optional
 from dataclasses import dataclass
 import json
 
+from security.expiring_counter_store import ExpiringCounterStore
+from security.truly_immutable_audit_logger import SecurityIncident, SecurityIncidentLevel
+from security.verified_token_cache import get_verified_token_cache
+
+
+BLACKLIST_CHANNEL = "jwt:blacklist:events"
+BLACKLIST_VERSION_KEY = "jwt:blacklist:version"
+
+# Blacklist entries + version bump + event in one atomic round-trip.
+# KEYS: version key, then blacklist keys; ARGV: channel, event JSON, then
+# (ttl, entry) per blacklist key. Publishes "<version>|<event JSON>".
+BLACKLIST_EVENT_SCRIPT = """
+for i = 2, #KEYS do
+    redis.call('SETEX', KEYS[i], ARGV[2 * i - 1], ARGV[2 * i])
+end
+local version = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], version .. '|' .. ARGV[2])
+return version
+"""
+
 
 @dataclass
 class BlacklistConfig:
@@ -31,6 +61,45 @@ class BlacklistConfig:
     redis_password: Optional[str] = None
     max_concurrent_sessions: int = 5
     enable_anomaly_detection: bool = True
+    max_local_entries: int = 500_000  # Cap on in-memory fallback entries (past it, fail closed)
+
+    # Local Bloom filter of blacklisted token hashes (Redis mode)
+    enable_bloom_filter: bool = True
+    bloom_capacity: int = 1_000_000
+    bloom_error_rate: float = 0.001
+    bloom_sync_check_seconds: float = 1.0  # Version poll interval
+    bloom_rebuild_seconds: float = 3600.0  # Rebuild to drop expired entries
+
+
+class BloomFilter:
+    """
+    Bloom filter over SHA-256 hex digests
+
+    No false negatives; false positives at about `error_rate` when holding
+    `capacity` items. Indexes come from double hashing the (already
+    uniform) digest, so no extra hashing is needed.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, digest: str):
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:32], 16) | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: str):
+        for index in self._indexes(digest):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(digest))
 
 
 class JWTBlacklistManager:
@@ -57,13 +126,15 @@ class JWTBlacklistManager:
             return {"error": "Token invalidated"}, 401
     """
 
-    def __init__(self, config: Optional[BlacklistConfig] = None, fallback_mode=True):
+    def __init__(self, config: Optional[BlacklistConfig] = None, fallback_mode=True, redis_client=None):
         """
         Initialize JWT blacklist manager
 
         Args:
             config: Blacklist configuration
             fallback_mode: Use in-memory fallback if Redis unavailable
+            redis_client: Existing Redis client (or RedisHAManager, for its
+                retry / failure-mode handling) to use instead of connecting
         """
         if config is None:
             config = BlacklistConfig(
@@ -76,27 +147,50 @@ class JWTBlacklistManager:
 
         self.config = config
         self.fallback_mode = fallback_mode
-        self._redis_client = None
-        self._local_blacklist: Set[str] = set()  # Fallback storage
+        self._redis_client = redis_client
+        # Fallback storage: entries expire with their tokens; past the cap the
+        # least recently used are evicted. An evicted token can't be told
+        # apart from a valid one, so checks fail closed until it expires
+        self._fallback_evicted_until = 0.0
+        self._local_blacklist = ExpiringCounterStore(
+            max_keys=config.max_local_entries, name="JWT blacklist fallback",
+            on_evict=self._on_fallback_evict
+        )
+        self._token_cache = get_verified_token_cache()
+
+        # Bloom filter state (None version = not in sync, ask Redis)
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_version: Optional[int] = None
+        self._bloom_built_at = 0.0
+        self._version_checked_at = 0.0
+        self._bloom_lock = threading.Lock()
+        self._pubsub = None
+        self._pubsub_thread = None
+        self._event_script = None
 
         # Try to connect to Redis
         self._initialize_redis()
 
+        if self._redis_client and self.config.enable_bloom_filter:
+            self._start_bloom_sync()
+
     def _initialize_redis(self):
         """Initialize Redis connection"""
         try:
-            import redis
-            self._redis_client = redis.Redis(
-                host=self.config.redis_host,
-                port=self.config.redis_port,
-                db=self.config.redis_db,
-                password=self.config.redis_password,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
-            )
-            # Test connection
-            self._redis_client.ping()
+            if self._redis_client is None:
+                import redis
+                self._redis_client = redis.Redis(
+                    host=self.config.redis_host,
+                    port=self.config.redis_port,
+                    db=self.config.redis_db,
+                    password=self.config.redis_password,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+            # Test connection (RedisHAManager.ping returns False rather than raising)
+            if not self._redis_client.ping():
+                raise ConnectionError("Redis ping failed")
             print(f"✅ JWT Blacklist: Connected to Redis at {self.config.redis_host}:{self.config.redis_port}")
         except ImportError:
             if not self.fallback_mode:
@@ -109,6 +203,195 @@ class JWTBlacklistManager:
             print(f"⚠️  Redis connection failed, using in-memory fallback: {e}")
             self._redis_client = None
 
+    # ------------------------------------------------------------------
+    # Bloom filter sync
+    # ------------------------------------------------------------------
+
+    def _start_bloom_sync(self):
+        """Subscribe to blacklist events, then build the filter from Redis"""
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except Exception:
+                pass
+        try:
+            self._pubsub = self._redis_client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{BLACKLIST_CHANNEL: self._on_blacklist_event})
+            self._pubsub_thread = self._pubsub.run_in_thread(
+                sleep_time=0.1, daemon=True, exception_handler=self._on_pubsub_error
+            )
+        except Exception as e:
+            print(f"⚠️  JWT blacklist events unavailable, Bloom filter disabled: {e}")
+            self._pubsub = None
+            return
+
+        # Subscribed first, so no event can fall between the scan and the feed
+        self._rebuild_bloom()
+        self._version_checked_at = time.time()
+
+    def _rebuild_bloom(self, attempts: int = 3):
+        """
+        Rebuild the filter from the blacklist keys in Redis
+
+        The version is read before and after the scan; if an event landed
+        in between the scan may have missed it, so try again.
+        """
+        for _ in range(attempts):
+            try:
+                version = int(self._redis_client.get(BLACKLIST_VERSION_KEY) or 0)
+                bloom = BloomFilter(self.config.bloom_capacity, self.config.bloom_error_rate)
+                for key in self._redis_client.scan_iter(match="jwt:blacklist:*", count=1000):
+                    token_hash = key.rsplit(":", 1)[-1]
+                    if len(token_hash) == 64:
+                        bloom.add(token_hash)
+                if int(self._redis_client.get(BLACKLIST_VERSION_KEY) or 0) != version:
+                    continue
+            except Exception as e:
+                print(f"⚠️  JWT blacklist Bloom filter rebuild failed: {e}")
+                break
+
+            with self._bloom_lock:
+                self._bloom = bloom
+                self._bloom_version = version
+                self._bloom_built_at = time.time()
+            return
+
+        with self._bloom_lock:
+            self._bloom_version = None
+
+    def _on_blacklist_event(self, message):
+        """Apply a published blacklist event (subscriber thread)"""
+        try:
+            version, _, body = message["data"].partition("|")
+            version = int(version)
+            event = json.loads(body)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return
+
+        if event.get("token_hash"):
+            self._token_cache.invalidate(event["token_hash"])
+        else:
+            self._token_cache.clear()
+
+        with self._bloom_lock:
+            if self._bloom is None or self._bloom_version is None:
+                return
+            if version <= self._bloom_version:
+                return  # Already covered by the last rebuild
+            if version != self._bloom_version + 1:
+                # Missed events: stop trusting the filter until resync
+                self._bloom_version = None
+                return
+            for token_hash in event.get("token_hashes") or [event.get("token_hash")]:
+                if token_hash:
+                    self._bloom.add(token_hash)
+            self._bloom_version = version
+
+    def _on_pubsub_error(self, error, pubsub, thread):
+        """Subscriber lost its connection: distrust the filter until resync"""
+        with self._bloom_lock:
+            self._bloom_version = None
+        print(f"⚠️  JWT blacklist event subscription failed: {error}")
+        thread.stop()
+        self._pubsub_thread = None
+
+    def _bloom_in_sync(self) -> bool:
+        """
+        Whether a Bloom-filter negative can be trusted right now
+
+        Between version polls the subscriber keeps the filter current; at
+        most every bloom_sync_check_seconds the Redis version is compared
+        and the filter rebuilt if it is behind, too old or too full.
+        """
+        now = time.time()
+        if now - self._version_checked_at < self.config.bloom_sync_check_seconds:
+            return self._bloom_version is not None
+
+        if not self._bloom_lock.acquire(blocking=False):
+            return False  # Another thread is checking; use Redis meanwhile
+        try:
+            self._version_checked_at = now
+            version = int(self._redis_client.get(BLACKLIST_VERSION_KEY) or 0)
+            stale = (
+                self._bloom_version is None
+                or version != self._bloom_version
+                or now - self._bloom_built_at >= self.config.bloom_rebuild_seconds
+                or self._bloom.count >= self.config.bloom_capacity
+            )
+        except Exception:
+            return False
+        finally:
+            self._bloom_lock.release()
+
+        if stale:
+            if self._pubsub_thread is None:
+                self._start_bloom_sync()
+            else:
+                self._rebuild_bloom()
+        return self._bloom_version is not None
+
+    def _blacklist_hashes(self, entries: list, event: dict) -> int:
+        """
+        Store blacklist entries and announce them in one round-trip
+
+        Args:
+            entries: List of (token_hash, ttl, entry JSON)
+            event: Event payload for other processes
+
+        Returns:
+            New blacklist version
+        """
+        if self._event_script is None:
+            self._event_script = self._redis_client.register_script(BLACKLIST_EVENT_SCRIPT)
+
+        keys = [BLACKLIST_VERSION_KEY] + [f"jwt:blacklist:{h}" for h, _, _ in entries]
+        args = [BLACKLIST_CHANNEL, json.dumps(event)]
+        for _, ttl, entry in entries:
+            args += [ttl, entry]
+        version = self._event_script(keys=keys, args=args)
+        if version is None:
+            # Fail-open RedisHAManager returns None instead of raising
+            raise RuntimeError("Blacklist update was not applied")
+
+        # Apply locally right away (the event also arrives via pub/sub)
+        with self._bloom_lock:
+            if self._bloom is not None:
+                for token_hash, _, _ in entries:
+                    self._bloom.add(token_hash)
+        if event.get("token_hash"):
+            self._token_cache.invalidate(event["token_hash"])
+        else:
+            self._token_cache.clear()
+
+        return version
+
+    def _on_fallback_evict(self, token_hash: str, value, expires_at: float):
+        """A revoked token was evicted from the full fallback store"""
+        self._fallback_evicted_until = max(self._fallback_evicted_until, expires_at)
+        SecurityIncident.trigger(
+            SecurityIncidentLevel.HIGH,
+            "JWT Blacklist Fallback Full",
+            "Revoked token evicted from the in-memory blacklist; rejecting all "
+            "tokens until it expires",
+            {
+                "token_hash": token_hash,
+                "expires_at": expires_at,
+                "max_local_entries": self.config.max_local_entries
+            }
+        )
+
+    def _in_local_blacklist(self, token_hash: str) -> bool:
+        """
+        Check the in-memory fallback, failing closed after evictions
+
+        While a revoked token evicted by the cap could still be live, every
+        token is treated as blacklisted.
+        """
+        return (
+            self._local_blacklist.contains(token_hash)
+            or time.time() < self._fallback_evicted_until
+        )
+
     def _hash_token(self, token: str) -> str:
         """
         Hash token for privacy-preserving storage
@@ -180,12 +463,10 @@ class JWTBlacklistManager:
 
         if self._redis_client:
             try:
-                # Store in Redis with TTL
-                key = f"jwt:blacklist:{token_hash}"
-                self._redis_client.setex(
-                    key,
-                    ttl,
-                    json.dumps(entry)
+                # Store in Redis with TTL and notify other processes
+                self._blacklist_hashes(
+                    [(token_hash, ttl, json.dumps(entry))],
+                    {"token_hash": token_hash}
                 )
 
                 # Track user sessions for concurrent session limit
@@ -195,12 +476,14 @@ class JWTBlacklistManager:
             except Exception as e:
                 print(f"⚠️  Redis blacklist failed: {e}")
                 if self.fallback_mode:
-                    self._local_blacklist.add(token_hash)
+                    self._local_blacklist.set(token_hash, 1, ttl)
+                    self._token_cache.invalidate(token_hash)
                     return True
                 return False
         else:
             # Fallback to local storage
-            self._local_blacklist.add(token_hash)
+            self._local_blacklist.set(token_hash, 1, ttl)
+            self._token_cache.invalidate(token_hash)
             return True
 
     def is_blacklisted(self, token: str) -> bool:
@@ -216,15 +499,19 @@ class JWTBlacklistManager:
         token_hash = self._hash_token(token)
 
         if self._redis_client:
+            # Common case: definitely not blacklisted, no round-trip
+            if self._pubsub is not None and self._bloom_in_sync() and token_hash not in self._bloom:
+                return self._in_local_blacklist(token_hash)
+
             try:
                 key = f"jwt:blacklist:{token_hash}"
                 return self._redis_client.exists(key) > 0
             except Exception as e:
                 print(f"⚠️  Redis check failed: {e}")
                 # Fallback to local check
-                return token_hash in self._local_blacklist
+                return self._in_local_blacklist(token_hash)
         else:
-            return token_hash in self._local_blacklist
+            return self._in_local_blacklist(token_hash)
 
     def blacklist_all_user_tokens(self, user_id: str, reason: str = "security_incident"):
         """
@@ -238,6 +525,13 @@ class JWTBlacklistManager:
         Args:
             user_id: User ID
             reason: Reason for mass blacklist
+
+        Returns:
+            Number of sessions revoked
+
+        Raises:
+            RuntimeError: If the tokens could not be blacklisted (sessions
+                are kept, so the call can be retried)
         """
         if self._redis_client:
             try:
@@ -246,34 +540,32 @@ class JWTBlacklistManager:
                 sessions = self._redis_client.keys(session_pattern)
 
                 # Blacklist each session token
-                for session_key in sessions:
+                entry = json.dumps({
+                    "user_id": user_id,
+                    "reason": reason,
+                    "blacklisted_at": time.time(),
+                    "mass_blacklist": True
+                })
+                entries = []
+                for session_key, ttl in zip(sessions, self._get_ttls(sessions)):
                     token_hash = session_key.split(":")[-1]
-                    ttl = self._redis_client.ttl(session_key)
-
                     if ttl > 0:
-                        entry = {
-                            "user_id": user_id,
-                            "reason": reason,
-                            "blacklisted_at": time.time(),
-                            "mass_blacklist": True
-                        }
-
-                        blacklist_key = f"jwt:blacklist:{token_hash}"
-                        self._redis_client.setex(
-                            blacklist_key,
-                            ttl,
-                            json.dumps(entry)
-                        )
+                        entries.append((token_hash, ttl, entry))
+
+                self._blacklist_hashes(
+                    entries,
+                    {"token_hashes": [h for h, _, _ in entries], "user_id": user_id}
+                )
 
                 # Clean up session tracking
-                for session_key in sessions:
-                    self._redis_client.delete(session_key)
+                if sessions:
+                    self._redis_client.delete(*sessions)
 
                 print(f"✅ Blacklisted all tokens for user {user_id} ({len(sessions)} sessions)")
                 return len(sessions)
             except Exception as e:
                 print(f"⚠️  Mass blacklist failed: {e}")
-                return 0
+                raise RuntimeError(f"Failed to blacklist tokens for user {user_id}: {e}") from e
         else:
             print("⚠️  Mass blacklist requires Redis")
             return 0
@@ -291,13 +583,15 @@ class JWTBlacklistManager:
             return
 
         try:
-            # Store session
+            # Store session and list the user's sessions in one round-trip
             session_key = f"jwt:session:{user_id}:{token_hash}"
-            self._redis_client.setex(session_key, ttl, "1")
+            session_pattern = f"jwt:session:{user_id}:*"
+            pipe = self._redis_client.pipeline(transaction=False)
+            pipe.setex(session_key, ttl, "1")
+            pipe.keys(session_pattern)
+            _, active_sessions = pipe.execute()
 
             # Check concurrent session limit
-            session_pattern = f"jwt:session:{user_id}:*"
-            active_sessions = self._redis_client.keys(session_pattern)
 
             if len(active_sessions) > self.config.max_concurrent_sessions:
                 # Log suspicious activity
@@ -320,10 +614,7 @@ class JWTBlacklistManager:
             return
 
         # Get session creation times
-        sessions_with_ttl = []
-        for session_key in active_sessions:
-            ttl = self._redis_client.ttl(session_key)
-            sessions_with_ttl.append((session_key, ttl))
+        sessions_with_ttl = list(zip(active_sessions, self._get_ttls(active_sessions)))
 
         # Sort by TTL (oldest first - lowest TTL means created earlier)
         sessions_with_ttl.sort(key=lambda x: x[1])
@@ -331,18 +622,42 @@ class JWTBlacklistManager:
         # Blacklist oldest sessions
         # SECURITY FIX: Directly blacklist by hash since we don't have original token
         excess_count = len(active_sessions) - self.config.max_concurrent_sessions
+        entry = json.dumps({
+            "user_id": user_id,
+            "reason": "session_limit_exceeded",
+            "blacklisted_at": time.time()
+        })
+        entries = []
         for session_key, ttl in sessions_with_ttl[:excess_count]:
             token_hash = session_key.split(":")[-1]
             if ttl > 0:
-                blacklist_key = f"jwt:blacklist:{token_hash}"
-                entry = json.dumps({
-                    "user_id": user_id,
-                    "reason": "session_limit_exceeded",
-                    "blacklisted_at": time.time()
-                })
-                self._redis_client.setex(blacklist_key, ttl, entry)
-                # Remove from active sessions
-                self._redis_client.delete(session_key)
+                entries.append((token_hash, ttl, entry))
+
+        if entries:
+            # Remove from active sessions
+            self._redis_client.delete(*[f"jwt:session:{user_id}:{h}" for h, _, _ in entries])
+            self._blacklist_hashes(
+                entries,
+                {"token_hashes": [h for h, _, _ in entries], "user_id": user_id}
+            )
+
+    def _get_ttls(self, keys: list) -> list:
+        """
+        TTLs of several keys in one round-trip
+
+        Raises RuntimeError if the pipeline returns no result (a fail-open
+        RedisHAManager returns None): an empty list would read as "nothing
+        to revoke".
+        """
+        if not keys:
+            return []
+        pipe = self._redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        ttls = pipe.execute()
+        if not ttls or len(ttls) != len(keys):
+            raise RuntimeError(f"TTL lookup failed for {len(keys)} keys")
+        return ttls
 
     def get_user_active_sessions(self, user_id: str) -> int:
         """
@@ -368,13 +683,14 @@ class JWTBlacklistManager:
         """
         Cleanup expired blacklist entries (automatic with Redis TTL)
 
-        This is a no-op for Redis (TTL handles cleanup automatically)
-        For fallback mode, you'd need to implement manual cleanup
+        This is a no-op: Redis TTLs and the fallback store's time wheel
+        both expire entries automatically
         """
-        if not self._redis_client and self._local_blacklist:
-            # In fallback mode, we can't determine expiration
-            # You'd need to store expiration times locally
-            print("⚠️  Manual cleanup not implemented for fallback mode")
+        stats = self._local_blacklist.stats()
+        if time.time() < self._fallback_evicted_until:
+            print(f"⚠️  JWT blacklist fallback evicted {stats['evictions']} entries "
+                  f"(cap {stats['max_keys']}); rejecting all tokens until "
+                  f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self._fallback_evicted_until))}")
 
 
 # Global blacklist manager instance
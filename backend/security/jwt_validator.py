@@ -12,6 +12,7 @@ CRITICAL SECURITY IMPROVEMENTS:
 ✅ SECURITY FIX (2025-12-08): Explicit alg:none rejection
 ✅ SECURITY FIX (2025-12-08): kid validation
 ✅ SECURITY FIX (2025-12-08): Token hashing before blacklist
+✅ Verified-claims cache (repeat bearer tokens skip re-verification)
 
 WHY PyJWT vs python-jose:
 - PyJWT is more actively maintained
@@ -28,6 +29,8 @@ from typing import Optional, Dict, List
 from dataclasses import dataclass
 from functools import lru_cache
 
+from security.verified_token_cache import VerifiedTokenCache, get_verified_token_cache
+
 try:
     import jwt
     from jwt import PyJWKClient
@@ -85,8 +88,21 @@ class JWTValidator:
             user_id = payload.get('sub')
     """
 
-    def __init__(self, config: Optional[JWTConfig] = None):
-        """Initialize JWT validator with configuration"""
+    def __init__(
+        self,
+        config: Optional[JWTConfig] = None,
+        token_cache: Optional[VerifiedTokenCache] = None,
+        use_token_cache: bool = True
+    ):
+        """
+        Initialize JWT validator with configuration
+
+        Args:
+            config: JWT validation configuration
+            token_cache: Verified-claims cache (default: process-wide cache,
+                which blacklist events invalidate)
+            use_token_cache: Set False to verify every token from scratch
+        """
         if not JWT_AVAILABLE:
             raise ImportError("PyJWT not installed. Run: pip install pyjwt[crypto]")
 
@@ -112,6 +128,16 @@ class JWTValidator:
             lifespan=3600  # Cache for 1 hour
         )
 
+        self.token_cache = (token_cache or get_verified_token_cache()) if use_token_cache else None
+        # Everything that affects acceptance, so differently-configured
+        # validators never share cached verdicts
+        self._cache_namespace = "|".join([
+            "jwt_validator", self.config.issuer, self.config.audience,
+            ",".join(self.config.algorithms), str(self.config.require_mfa),
+            str(self.config.max_token_age_seconds),
+            os.getenv('MAX_JWT_LIFETIME_SECONDS', '86400')
+        ])
+
     def validate_token(self, token: str) -> Optional[Dict]:
         """
         Validate JWT token with full security checks
@@ -133,7 +159,31 @@ class JWTValidator:
         8. MFA validation (if required)
         9. SECURITY FIX: Explicit alg:none rejection
         10. SECURITY FIX: kid validation
+
+        Tokens that passed all checks are cached (see VerifiedTokenCache)
+        until the earliest of the cache TTL, exp and the max-age deadline.
         """
+        if self.token_cache is not None:
+            generation = self.token_cache.generation
+            cached = self.token_cache.get(self._cache_namespace, token)
+            if cached is not None:
+                return cached
+
+        payload = self._verify_token(token)
+
+        if payload and self.token_cache is not None:
+            not_after = min(
+                payload.get('exp', 0),
+                payload.get('iat', 0) + self.config.max_token_age_seconds
+            )
+            self.token_cache.put(
+                self._cache_namespace, token, payload, not_after, generation=generation
+            )
+
+        return payload
+
+    def _verify_token(self, token: str) -> Optional[Dict]:
+        """Full verification (signature, JWKS, claims); see validate_token"""
         try:
             # SECURITY FIX 1: Explicit alg:none rejection
             # Decode header without verification to check algorithm
@@ -14,8 +14,13 @@ IMPROVEMENTS:
 For production-grade NER: Consider Microsoft Presidio or spaCy
 """
 
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+import bisect
+import heapq
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 import hashlib
 
 
@@ -160,6 +165,23 @@ class EnhancedPIISanitizer:
         ]
     }
 
+    # Statistics keys, in detection priority order (names last: least precise)
+    STAT_KEYS = [
+        'names', 'emails', 'phones', 'ssns', 'credit_cards', 'passports',
+        'drivers_licenses', 'ibans', 'swifts', 'addresses', 'ipv4s', 'ipv6s',
+        'crypto_addresses', 'api_keys_jwt', 'api_keys_aws', 'api_keys_github',
+        'api_keys_slack', 'api_keys_google', 'api_keys_stripe', 'api_keys_azure',
+        'api_keys_generic',
+    ]
+
+    # Scan families: (name, lookahead guard, pattern prefixes after \\b).
+    # Name patterns stay out of the families: they overlap each other and
+    # every uppercase-led type, so they are scanned on their own.
+    SCAN_FAMILIES = [
+        ('digit', r'(?=\d)', (r'\b\d', r'\b[13]', r'\b0x')),
+        ('upper', r'(?=[A-Z])', (r'\b[A-Z]',)),
+    ]
+
     def __init__(self, hash_pii: bool = True, replacement_token: str = '[REDACTED]'):
         """
         Initialize PII sanitizer
@@ -203,6 +225,243 @@ class EnhancedPIISanitizer:
         for key_type, patterns in self.API_KEY_PATTERNS.items():
             self.api_key_regexes[key_type] = [re.compile(p, re.IGNORECASE) for p in patterns]
 
+        self._compile_detectors()
+
+    def _detection_order(self) -> List[Tuple[str, int, str, str]]:
+        """
+        All patterns in detection priority order
+
+        Returns:
+            List of (pattern, flags, stat_key, replacement_type)
+        """
+        order = []
+        order += [(p, 0, 'ssns', 'SSN') for p in self.SSN_PATTERNS]
+        order += [(p, 0, 'credit_cards', 'CC') for p in self.CREDIT_CARD_PATTERNS]
+        order += [(self.EMAIL_PATTERN, re.IGNORECASE, 'emails', 'EMAIL')]
+        for patterns in self.PHONE_PATTERNS.values():
+            order += [(p, 0, 'phones', 'PHONE') for p in patterns]
+        order += [(p, 0, 'passports', 'PASSPORT') for p in self.PASSPORT_PATTERNS]
+        order += [(p, 0, 'drivers_licenses', 'DL') for p in self.DRIVERS_LICENSE_PATTERNS]
+        order += [(self.IBAN_PATTERN, 0, 'ibans', 'IBAN')]
+        order += [(self.SWIFT_PATTERN, 0, 'swifts', 'SWIFT')]
+        order += [(p, 0, 'addresses', 'ADDRESS') for p in self.ADDRESS_PATTERNS]
+        order += [(self.IPV4_PATTERN, 0, 'ipv4s', 'IPV4')]
+        order += [(self.IPV6_PATTERN, 0, 'ipv6s', 'IPV6')]
+        order += [(p, 0, 'crypto_addresses', 'CRYPTO') for p in self.CRYPTO_PATTERNS]
+        for key_type, patterns in self.API_KEY_PATTERNS.items():
+            order += [
+                (p, re.IGNORECASE, f'api_keys_{key_type.lower()}', f'API_KEY_{key_type.upper()}')
+                for p in patterns
+            ]
+        order += [(p, 0, 'names', 'NAME') for p in self.NAME_PATTERNS]
+        return order
+
+    def _compile_detectors(self):
+        """
+        Compile the detection order into as few scans as possible
+
+        Case-sensitive patterns that start with a word boundary and a digit
+        (or an uppercase letter) share one alternation of named groups per
+        family, guarded by a lookahead, so each family costs about one scan.
+        The alternation sits inside a lookahead too, so the scan reports a
+        match at every word start rather than skipping past the first
+        (lower-priority) match; otherwise a long low-priority match could
+        hide a higher-priority one starting inside it.
+        The remaining patterns are compiled on their own and skipped when
+        the per-document prefilter rules their type out.
+        """
+        families = {name: ([], {}) for name, _, _ in self.SCAN_FAMILIES}
+        self.detectors = []
+        self._pattern_regexes = []  # By priority, for re-scanning uncovered gaps
+
+        for priority, (pattern, flags, stat_key, pii_type) in enumerate(self._detection_order()):
+            group = f"pii{priority}"
+            self._pattern_regexes.append((re.compile(pattern, flags), stat_key, pii_type))
+            family = None
+            if not flags and stat_key != 'names':
+                family = next(
+                    (name for name, _, prefixes in self.SCAN_FAMILIES
+                     if pattern.startswith(prefixes)),
+                    None
+                )
+
+            if family:
+                alternatives, groups = families[family]
+                alternatives.append(f"(?P<{group}>{pattern[2:]})")
+                groups[group] = (priority, stat_key, pii_type)
+            else:
+                regex = re.compile(f"(?P<{group}>{pattern})", flags)
+                self.detectors.append((regex, {group: (priority, stat_key, pii_type)}))
+
+        for name, lookahead, _ in self.SCAN_FAMILIES:
+            alternatives, groups = families[name]
+            if alternatives:
+                regex = re.compile(rf"\b{lookahead}(?=(?:{'|'.join(alternatives)}))")
+                self.detectors.append((regex, groups))
+
+        self._digit_regex = re.compile(r'\d')
+        self._upper_pair_regex = re.compile(r'[A-Z][A-Z0-9]')
+        self._long_token_regex = re.compile(r'[A-Za-z0-9/+=]{88}')
+
+    def _active_types(self, text: str) -> set:
+        """Prefilter: stat keys whose patterns can possibly match in text"""
+        lowered = text.lower()
+        has_digit = self._digit_regex.search(text) is not None
+        has_upper_pair = self._upper_pair_regex.search(text) is not None
+
+        active = {'names'}
+        if has_digit:
+            active.update(('phones', 'ssns', 'credit_cards', 'passports',
+                           'drivers_licenses', 'addresses', 'crypto_addresses'))
+            if '.' in text:
+                active.add('ipv4s')
+            if has_upper_pair:
+                active.add('ibans')
+        if has_upper_pair:
+            active.add('swifts')
+        if '@' in text:
+            active.add('emails')
+        if text.count(':') >= 7:
+            active.add('ipv6s')
+        if 'eyj' in lowered:
+            active.add('api_keys_jwt')
+        if 'akia' in lowered or 'aws' in lowered:
+            active.add('api_keys_aws')
+        if 'gh' in lowered:
+            active.add('api_keys_github')
+        if 'xox' in lowered:
+            active.add('api_keys_slack')
+        if 'aiza' in lowered:
+            active.add('api_keys_google')
+        if '_live_' in lowered or '_test_' in lowered:
+            active.add('api_keys_stripe')
+        if self._long_token_regex.search(text):
+            active.add('api_keys_azure')
+        if 'api' in lowered or 'bearer' in lowered:
+            active.add('api_keys_generic')
+
+        return active
+
+    def find_pii(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """
+        Find non-overlapping PII spans in the original text
+
+        Each detector scans the original text once; overlapping candidates
+        are resolved in favour of the higher-priority type (detection order),
+        as if higher-priority types had been replaced first. When a candidate
+        loses to a higher-priority span, the uncovered text around it is
+        re-scanned on its own by that type and every lower-priority type,
+        just as the sequential replacements would have re-scanned it (e.g.
+        an IBAN whose tail was taken by a phone number is still redacted).
+
+        Args:
+            text: Input text
+
+        Returns:
+            Sorted list of (start, end, stat_key, replacement_type)
+        """
+        active = self._active_types(text)
+
+        candidates = []
+        for regex, groups in self.detectors:
+            if all(stat_key not in active for _, stat_key, _ in groups.values()):
+                continue
+            for match in regex.finditer(text):
+                group = match.lastgroup
+                priority, stat_key, pii_type = groups[group]
+                start, end = match.span(group)
+                # Filter out common false positives for names
+                if stat_key == 'names' and not self._is_likely_name(text[start:end]):
+                    continue
+                candidates.append((priority, start, end, stat_key, pii_type))
+
+        # Accept by priority; spans overlapping an accepted span are dropped
+        heapq.heapify(candidates)
+        starts: List[int] = []
+        spans: List[Tuple[int, int, str, str]] = []
+        rescanned = set()
+
+        while candidates:
+            priority, start, end, stat_key, pii_type = heapq.heappop(candidates)
+            i = bisect.bisect_right(starts, start)
+            if (i and spans[i - 1][1] > start) or (i < len(spans) and spans[i][0] < end):
+                for gap in self._uncovered_gaps(spans, starts, start, end, len(text)):
+                    if (priority, gap) not in rescanned:
+                        rescanned.add((priority, gap))
+                        for candidate in self._scan_gap(text, gap, priority, active):
+                            heapq.heappush(candidates, candidate)
+                continue
+            starts.insert(i, start)
+            spans.insert(i, (start, end, stat_key, pii_type))
+
+            # A span that splits a word creates a word boundary the original
+            # text lacked, so lower-priority types may now match beside it
+            for edge in (start, end):
+                if 0 < edge < len(text) and text[edge - 1].isalnum() and text[edge].isalnum():
+                    for gap in self._uncovered_gaps(spans, starts, edge - 1, edge + 1, len(text)):
+                        if (priority + 1, gap) not in rescanned:
+                            rescanned.add((priority + 1, gap))
+                            for candidate in self._scan_gap(text, gap, priority + 1, active):
+                                heapq.heappush(candidates, candidate)
+
+        # A detected name is redacted wherever else it appears, even where
+        # the pattern itself would not match (e.g. glued to other text)
+        for name in {text[start:end] for start, end, stat_key, _ in list(spans) if stat_key == 'names'}:
+            position = text.find(name)
+            while position != -1:
+                end = position + len(name)
+                i = bisect.bisect_right(starts, position)
+                if not ((i and spans[i - 1][1] > position) or (i < len(spans) and spans[i][0] < end)):
+                    starts.insert(i, position)
+                    spans.insert(i, (position, end, 'names', 'NAME'))
+                position = text.find(name, end)
+
+        return spans
+
+    def _uncovered_gaps(
+        self,
+        spans: List[Tuple[int, int, str, str]],
+        starts: List[int],
+        start: int,
+        end: int,
+        length: int
+    ) -> List[Tuple[int, int]]:
+        """Maximal uncovered stretches of text that intersect [start, end)"""
+        gaps = []
+        i = bisect.bisect_right(starts, start)
+        gap_start = spans[i - 1][1] if i else 0
+        while True:
+            gap_end = spans[i][0] if i < len(spans) else length
+            if gap_start < min(gap_end, end) and gap_end > start:
+                gaps.append((gap_start, gap_end))
+            if i >= len(spans) or gap_end >= end:
+                return gaps
+            gap_start = spans[i][1]
+            i += 1
+
+    def _scan_gap(
+        self,
+        text: str,
+        gap: Tuple[int, int],
+        min_priority: int,
+        active: set
+    ) -> List[Tuple[int, int, int, str, str]]:
+        """Candidates of min_priority and lower found in text[gap] on its own"""
+        offset, gap_end = gap
+        segment = text[offset:gap_end]
+        found = []
+        for priority in range(min_priority, len(self._pattern_regexes)):
+            regex, stat_key, pii_type = self._pattern_regexes[priority]
+            if stat_key not in active:
+                continue
+            for match in regex.finditer(segment):
+                if match.start() == match.end():
+                    continue
+                if stat_key == 'names' and not self._is_likely_name(match.group()):
+                    continue
+                found.append((priority, offset + match.start(), offset + match.end(), stat_key, pii_type))
+        return found
+
     def _hash_string(self, text: str) -> str:
         """Create hash of PII for audit purposes"""
         return hashlib.sha256(text.encode()).hexdigest()[:16]
@@ -225,114 +484,69 @@ class EnhancedPIISanitizer:
         Returns:
             Tuple of (sanitized_text, statistics_dict)
         """
-        stats = {
-            'names': 0,
-            'emails': 0,
-            'phones': 0,
-            'ssns': 0,
-            'credit_cards': 0,
-            'passports': 0,
-            'drivers_licenses': 0,
-            'ibans': 0,
-            'swifts': 0,
-            'addresses': 0,
-            'ipv4s': 0,
-            'ipv6s': 0,
-            'crypto_addresses': 0,
-            'api_keys_jwt': 0,
-            'api_keys_aws': 0,
-            'api_keys_github': 0,
-            'api_keys_slack': 0,
-            'api_keys_google': 0,
-            'api_keys_stripe': 0,
-            'api_keys_azure': 0,
-            'api_keys_generic': 0,
-        }
+        stats = dict.fromkeys(self.STAT_KEYS, 0)
+
+        # Rebuild the output once from the resolved spans
+        parts = []
+        last_end = 0
+
+        for start, end, stat_key, pii_type in self.find_pii(text):
+            stats[stat_key] += 1
+            parts.append(text[last_end:start])
+            parts.append(self._replace(text[start:end], pii_type))
+            last_end = end
+
+        parts.append(text[last_end:])
+        return ''.join(parts), stats
+
+    def sanitize_stream(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = 64
+    ) -> Iterator[Tuple[str, Dict[str, int]]]:
+        """
+        Sanitize an iterable of texts in a process pool, lazily and in order
+
+        Each worker compiles its own sanitizer once. Input is consumed in
+        chunks with a bounded number in flight, so the corpus is never
+        materialized and the stream can sit inside generator pipelines.
+
+        Args:
+            texts: Iterable of input texts
+            workers: Worker processes (default: CPU count; 1 = in-process)
+            chunk_size: Texts per task sent to a worker
 
-        # 1. Sanitize SSNs (highest priority)
-        for regex in self.ssn_regexes:
-            matches = regex.findall(text)
-            stats['ssns'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'SSN'), text)
-
-        # 2. Sanitize credit cards
-        for regex in self.credit_card_regexes:
-            matches = regex.findall(text)
-            stats['credit_cards'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'CC'), text)
-
-        # 3. Sanitize emails
-        matches = self.email_regex.findall(text)
-        stats['emails'] += len(matches)
-        text = self.email_regex.sub(lambda m: self._replace(m.group(), 'EMAIL'), text)
-
-        # 4. Sanitize phone numbers (all international formats)
-        for regex in self.phone_regexes:
-            matches = regex.findall(text)
-            stats['phones'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'PHONE'), text)
-
-        # 5. Sanitize passport numbers
-        for regex in self.passport_regexes:
-            matches = regex.findall(text)
-            stats['passports'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'PASSPORT'), text)
-
-        # 6. Sanitize driver's licenses
-        for regex in self.drivers_license_regexes:
-            matches = regex.findall(text)
-            stats['drivers_licenses'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'DL'), text)
-
-        # 7. Sanitize IBAN
-        matches = self.iban_regex.findall(text)
-        stats['ibans'] += len(matches)
-        text = self.iban_regex.sub(lambda m: self._replace(m.group(), 'IBAN'), text)
-
-        # 8. Sanitize SWIFT/BIC
-        matches = self.swift_regex.findall(text)
-        stats['swifts'] += len(matches)
-        text = self.swift_regex.sub(lambda m: self._replace(m.group(), 'SWIFT'), text)
-
-        # 9. Sanitize addresses
-        for regex in self.address_regexes:
-            matches = regex.findall(text)
-            stats['addresses'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'ADDRESS'), text)
-
-        # 10. Sanitize IP addresses
-        matches = self.ipv4_regex.findall(text)
-        stats['ipv4s'] += len(matches)
-        text = self.ipv4_regex.sub(lambda m: self._replace(m.group(), 'IPV4'), text)
-
-        matches = self.ipv6_regex.findall(text)
-        stats['ipv6s'] += len(matches)
-        text = self.ipv6_regex.sub(lambda m: self._replace(m.group(), 'IPV6'), text)
-
-        # 11. Sanitize cryptocurrency addresses
-        for regex in self.crypto_regexes:
-            matches = regex.findall(text)
-            stats['crypto_addresses'] += len(matches)
-            text = regex.sub(lambda m: self._replace(m.group(), 'CRYPTO'), text)
-
-        # 12. Sanitize API keys and tokens (GPT recommendation)
-        for key_type, regexes in self.api_key_regexes.items():
-            stat_key = f'api_keys_{key_type.lower()}'
-            for regex in regexes:
-                matches = regex.findall(text)
-                stats[stat_key] += len(matches)
-                text = regex.sub(lambda m: self._replace(m.group(), f'API_KEY_{key_type.upper()}'), text)
-
-        # 13. Sanitize names (last, as it's less precise)
-        for regex in self.name_regexes:
-            matches = regex.findall(text)
-            # Filter out common false positives
-            for match in matches:
-                if self._is_likely_name(match):
-                    stats['names'] += 1
-                    text = text.replace(match, self._replace(match, 'NAME'))
-
-        return text, stats
+        Yields:
+            (sanitized_text, statistics_dict) per input text, in input order
+        """
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            for text in texts:
+                yield self.sanitize(text)
+            return
+
+        max_in_flight = workers * 2
+        iterator = iter(texts)
+        pending = deque()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_stream_worker,
+            initargs=(type(self), self.hash_pii, self.replacement_token)
+        ) as executor:
+            while True:
+                while len(pending) < max_in_flight:
+                    chunk = [text for _, text in zip(range(chunk_size), iterator)]
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_sanitize_chunk, chunk))
+
+                if not pending:
+                    return
+
+                yield from pending.popleft().result()
 
     def _is_likely_name(self, text: str) -> bool:
         """
@@ -368,6 +582,20 @@ class EnhancedPIISanitizer:
         return True
 
 
+# Per-process sanitizer for sanitize_stream workers
+_stream_sanitizer: Optional[EnhancedPIISanitizer] = None
+
+
+def _init_stream_worker(sanitizer_class, hash_pii: bool, replacement_token: str):
+    """Compile patterns once per worker process"""
+    global _stream_sanitizer
+    _stream_sanitizer = sanitizer_class(hash_pii=hash_pii, replacement_token=replacement_token)
+
+
+def _sanitize_chunk(texts: List[str]) -> List[Tuple[str, Dict[str, int]]]:
+    return [_stream_sanitizer.sanitize(text) for text in texts]
+
+
 # Convenience function
 def sanitize_pii(text: str, hash_pii: bool = True) -> Tuple[str, Dict[str, int]]:
     """
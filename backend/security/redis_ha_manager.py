@@ -9,13 +9,22 @@ Features:
 - Redis Sentinel support (automatic failover)
 - Fail-closed behavior (refuse operation on Redis failure)
 - Connection pooling and retry logic
-- Health monitoring and alerting
+- Pipelines and Lua scripts with the same retry / fail-closed semantics
+- Health monitoring and alerting (latency, retries, pool usage)
 - Authentication and TLS support
+
+PERFORMANCE:
+- Multi-command sequences go through pipeline() as ONE round-trip (and one
+  retry / circuit-breaker decision) instead of one per command
+- Bounded blocking connection pool: bursts wait pool_timeout for a free
+  connection instead of failing with "Too many connections"
 """
 
 import os
+import threading
 import time
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
 
@@ -54,7 +63,8 @@ class RedisHAConfig:
     socket_timeout: float = 1.0  # Short timeout for fail-fast
     socket_connect_timeout: float = 2.0
     socket_keepalive: bool = True
-    max_connections: int = 50
+    max_connections: int = 50  # Size for peak concurrent requests per process (threads)
+    pool_timeout: float = 0.5  # Seconds to wait for a free pooled connection
 
     # Retry settings
     retry_on_timeout: bool = True
@@ -66,6 +76,67 @@ class RedisHAConfig:
     circuit_breaker_timeout: int = 60  # Seconds before retry
 
 
+class RedisHAPipeline:
+    """
+    Buffered batch of Redis commands, sent in one round-trip
+
+    Commands are queued locally and replayed onto a fresh redis-py pipeline
+    on each attempt, so a retry resends the whole batch. With
+    transaction=True (default) the batch runs as MULTI/EXEC and is applied
+    all-or-nothing; use transaction=False for independent reads.
+
+    Usage:
+        with redis_ha.pipeline() as pipe:
+            pipe.incr('counter').expire('counter', 60)
+            count, _ = pipe.execute()
+    """
+
+    def __init__(self, manager: "RedisHAManager", transaction: bool = True):
+        self._manager = manager
+        self._transaction = transaction
+        self._commands: List[tuple] = []
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        client = self._manager._client
+        if client is not None and not callable(getattr(client, name, None)):
+            raise AttributeError(f"Unknown Redis command: {name}")
+
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.reset()
+
+    def reset(self):
+        """Discard queued commands"""
+        self._commands = []
+
+    def execute(self) -> Optional[list]:
+        """
+        Send queued commands (fail-safe)
+
+        Returns:
+            One result per command, or None in fail-open / circuit-breaker
+            mode when Redis is unavailable (caller must handle)
+        """
+        commands, self._commands = self._commands, []
+        if not commands:
+            return []
+        return self._manager._execute_pipeline(commands, self._transaction)
+
+
 class RedisHAManager:
     """
     Redis High Availability Manager with fail-closed security
@@ -90,12 +161,24 @@ class RedisHAManager:
         if redis_ha.exists('token:abc123'):
             # Token is blacklisted
             raise Unauthorized("Token revoked")
+
+        # Several commands, one round-trip
+        with redis_ha.pipeline() as pipe:
+            pipe.incr('ratelimit:ip:1.2.3.4').expire('ratelimit:ip:1.2.3.4', 60)
+            count, _ = pipe.execute()
+
+        # Drop-in client for the rate limiter and blacklist manager
+        limiter = EnhancedRateLimiter(redis_client=redis_ha)
+        blacklist = JWTBlacklistManager(redis_client=redis_ha)
     """
 
+    LATENCY_SAMPLES = 1024
+
     def __init__(
         self,
         config: Optional[RedisHAConfig] = None,
-        audit_logger=None
+        audit_logger=None,
+        redis_client=None
     ):
         """
         Initialize Redis HA Manager
@@ -103,23 +186,37 @@ class RedisHAManager:
         Args:
             config: Redis HA configuration
             audit_logger: Audit logger for Redis failures
+            redis_client: Existing Redis client to use instead of connecting
         """
         if config is None:
             config = RedisHAConfig(
                 redis_host=os.getenv("REDIS_HOST", "localhost"),
                 redis_port=int(os.getenv("REDIS_PORT", "6379")),
                 redis_password=os.getenv("REDIS_PASSWORD"),
+                max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
                 failure_mode=RedisFailureMode.FAIL_CLOSED if os.getenv("ENVIRONMENT") == "production" else RedisFailureMode.FAIL_OPEN
             )
 
         self.config = config
         self.audit_logger = audit_logger
-        self._client = None
+        self._client = redis_client
         self._circuit_breaker_failures = 0
         self._circuit_breaker_opened_at = None
 
+        # Health metrics
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "operations": 0,
+            "commands": 0,
+            "pipelines": 0,
+            "retries": 0,
+            "failures": 0
+        }
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
         # Initialize Redis connection
-        self._initialize_redis()
+        if self._client is None:
+            self._initialize_redis()
 
     def _initialize_redis(self):
         """Initialize Redis connection with HA support"""
@@ -169,7 +266,7 @@ class RedisHAManager:
                 # Single instance (dev only)
                 print(f"✓ Initializing Redis single instance (DEV ONLY)...")
 
-                self._client = redis.Redis(
+                connection_kwargs = dict(
                     host=self.config.redis_host,
                     port=self.config.redis_port,
                     db=self.config.redis_db,
@@ -178,17 +275,31 @@ class RedisHAManager:
                     socket_timeout=self.config.socket_timeout,
                     socket_connect_timeout=self.config.socket_connect_timeout,
                     socket_keepalive=self.config.socket_keepalive,
+                    retry_on_timeout=self.config.retry_on_timeout
+                )
+                if self.config.use_tls:
+                    connection_kwargs.update(
+                        connection_class=redis.SSLConnection,
+                        ssl_cert_reqs='required',
+                        ssl_ca_certs=self.config.tls_ca_cert,
+                        ssl_certfile=self.config.tls_cert_file,
+                        ssl_keyfile=self.config.tls_key_file
+                    )
+
+                # Blocking pool: at max_connections, callers wait up to
+                # pool_timeout for a free connection instead of erroring
+                pool = redis.BlockingConnectionPool(
                     max_connections=self.config.max_connections,
-                    retry_on_timeout=self.config.retry_on_timeout,
-                    ssl=self.config.use_tls,
-                    ssl_cert_reqs='required' if self.config.use_tls else None,
-                    ssl_ca_certs=self.config.tls_ca_cert if self.config.use_tls else None
+                    timeout=self.config.pool_timeout,
+                    **connection_kwargs
                 )
+                self._client = redis.Redis(connection_pool=pool)
 
                 # Test connection
                 self._client.ping()
 
                 print(f"✅ Redis connected: {self.config.redis_host}:{self.config.redis_port}")
+                print(f"   Pool: {self.config.max_connections} connections")
                 print(f"   ⚠️  WARNING: Single instance - no automatic failover")
                 print(f"   Failure mode: {self.config.failure_mode.value}")
 
@@ -221,6 +332,7 @@ class RedisHAManager:
     def _execute_with_retry(self, operation, *args, **kwargs):
         """Execute Redis operation with retry logic"""
         last_error = None
+        started = time.perf_counter()
 
         for attempt in range(self.config.max_retries + 1):
             try:
@@ -236,6 +348,7 @@ class RedisHAManager:
                 self._circuit_breaker_failures = 0
                 self._circuit_breaker_opened_at = None
 
+                self._record_operation(started, attempt)
                 return result
 
             except Exception as e:
@@ -265,7 +378,35 @@ class RedisHAManager:
                     break
 
         # Operation failed after all retries
-        self._handle_operation_failure(operation.__name__, last_error)
+        self._record_operation(started, self.config.max_retries, failed=True)
+        return self._handle_operation_failure(operation.__name__, last_error)
+
+    def _execute_pipeline(self, commands: List[tuple], transaction: bool) -> Optional[list]:
+        """Run queued (command, args, kwargs) in one round-trip with retry logic"""
+        if self._client is None:
+            return self._handle_operation_failure("pipeline", Exception("Redis client not initialized"))
+
+        def pipeline():
+            pipe = self._client.pipeline(transaction=transaction)
+            for name, args, kwargs in commands:
+                getattr(pipe, name)(*args, **kwargs)
+            return pipe.execute()
+
+        with self._metrics_lock:
+            self._metrics["pipelines"] += 1
+            self._metrics["commands"] += len(commands) - 1  # _record_operation adds the last one
+
+        return self._execute_with_retry(pipeline)
+
+    def _record_operation(self, started: float, retries: int, failed: bool = False):
+        """Update health metrics for one (possibly retried) operation"""
+        with self._metrics_lock:
+            self._metrics["operations"] += 1
+            self._metrics["commands"] += 1
+            self._metrics["retries"] += retries
+            if failed:
+                self._metrics["failures"] += 1
+            self._latencies.append(time.perf_counter() - started)
 
     def _handle_operation_failure(self, operation_name: str, error: Exception):
         """Handle Redis operation failure according to failure mode"""
@@ -387,13 +528,13 @@ class RedisHAManager:
         result = self._execute_with_retry(self._client.exists, key)
         return bool(result) if result is not None else False
 
-    def delete(self, key: str) -> bool:
-        """Delete key from Redis (fail-safe)"""
+    def delete(self, *keys: str) -> bool:
+        """Delete keys from Redis (fail-safe); True if any existed"""
         if self._client is None:
             self._handle_operation_failure("delete", Exception("Redis client not initialized"))
             return False
 
-        result = self._execute_with_retry(self._client.delete, key)
+        result = self._execute_with_retry(self._client.delete, *keys)
         return bool(result) if result is not None else False
 
     def setex(self, key: str, seconds: int, value: str) -> bool:
@@ -441,6 +582,102 @@ class RedisHAManager:
         result = self._execute_with_retry(self._client.expire, key, seconds)
         return bool(result) if result is not None else False
 
+    def mget(self, *keys: str) -> List[Optional[str]]:
+        """Get several values in one round-trip (fail-safe)"""
+        if self._client is None:
+            self._handle_operation_failure("mget", Exception("Redis client not initialized"))
+            return [None] * len(keys)
+
+        result = self._execute_with_retry(self._client.mget, *keys)
+        return list(result) if result is not None else [None] * len(keys)
+
+    def ttl(self, key: str) -> int:
+        """Seconds until a key expires (fail-safe; -2 if missing)"""
+        if self._client is None:
+            self._handle_operation_failure("ttl", Exception("Redis client not initialized"))
+            return -2
+
+        result = self._execute_with_retry(self._client.ttl, key)
+        return int(result) if result is not None else -2
+
+    def keys(self, pattern: str) -> List[str]:
+        """Keys matching a pattern (fail-safe)"""
+        if self._client is None:
+            self._handle_operation_failure("keys", Exception("Redis client not initialized"))
+            return []
+
+        result = self._execute_with_retry(self._client.keys, pattern)
+        return list(result) if result is not None else []
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None):
+        """
+        Iterate keys with SCAN (each page is one retried operation)
+
+        Raises RuntimeError if a page cannot be read even in fail-open mode:
+        a silently truncated scan would look like a complete one.
+        """
+        if self._client is None:
+            self._handle_operation_failure("scan", Exception("Redis client not initialized"))
+            raise RuntimeError("Redis client not initialized")
+
+        cursor = 0
+        while True:
+            page = self._execute_with_retry(self._client.scan, cursor, match=match, count=count)
+            if page is None:
+                raise RuntimeError("Redis SCAN interrupted")
+            cursor, keys = page
+            yield from keys
+            if int(cursor) == 0:
+                return
+
+    def pipeline(self, transaction: bool = True) -> RedisHAPipeline:
+        """
+        Batch commands into one round-trip (fail-safe)
+
+        Args:
+            transaction: Wrap the batch in MULTI/EXEC (all-or-nothing)
+
+        Returns:
+            RedisHAPipeline; execute() applies retry / failure-mode handling
+            to the batch as a whole
+        """
+        return RedisHAPipeline(self, transaction=transaction)
+
+    def register_script(self, script: str):
+        """
+        Register a Lua script (fail-safe)
+
+        Returns:
+            Callable(keys=[...], args=[...]) run with retry logic; returns
+            None in fail-open / circuit-breaker mode when Redis is unavailable
+        """
+        registered = None
+
+        def run_script(keys=(), args=()):
+            nonlocal registered
+            if self._client is None:
+                return self._handle_operation_failure("evalsha", Exception("Redis client not initialized"))
+            if registered is None:
+                registered = self._client.register_script(script)
+
+            def evalsha():
+                return registered(keys=list(keys), args=list(args))
+
+            return self._execute_with_retry(evalsha)
+
+        return run_script
+
+    def pubsub(self, **kwargs):
+        """
+        Pub/sub connection (not retried; subscribers handle reconnects)
+
+        Raises:
+            RuntimeError: Redis client not initialized
+        """
+        if self._client is None:
+            raise RuntimeError("Redis client not initialized")
+        return self._client.pubsub(**kwargs)
+
     def ping(self) -> bool:
         """Health check"""
         if self._client is None:
@@ -472,8 +709,50 @@ class RedisHAManager:
             status["circuit_breaker_open"] = self._is_circuit_breaker_open()
             status["circuit_breaker_failures"] = self._circuit_breaker_failures
 
+        status["pool"] = self._get_pool_stats()
+        status["metrics"] = self.get_metrics()
+
         return status
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Operation counters and latency percentiles
+
+        Latency covers the whole operation including retries, over the last
+        LATENCY_SAMPLES operations.
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            latencies = sorted(self._latencies)
+
+        if latencies:
+            def percentile(p):
+                return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 3)
+
+            metrics["latency_ms"] = {
+                "p50": percentile(0.50),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 3)
+            }
+        return metrics
+
+    def _get_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool usage (redis-py ConnectionPool / BlockingConnectionPool)"""
+        pool = getattr(self._client, "connection_pool", None)
+        stats = {"max_connections": getattr(pool, "max_connections", self.config.max_connections)}
+
+        if hasattr(pool, "_in_use_connections"):
+            stats["created"] = pool._created_connections
+            stats["in_use"] = len(pool._in_use_connections)
+            stats["idle"] = len(pool._available_connections)
+        elif hasattr(pool, "pool"):
+            idle = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+            stats["created"] = len(pool._connections)
+            stats["in_use"] = len(pool._connections) - idle
+            stats["idle"] = idle
+
+        return stats
+
 
 if __name__ == "__main__":
     """Test Redis HA setup"""
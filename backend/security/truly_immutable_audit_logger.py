@@ -20,16 +20,19 @@ ATTACK PREVENTION:
 ✅ Enterprise-grade immutable audit trail
 """
 
+import atexit
 import json
 import logging
 import os
 import hashlib
 import hmac
+import queue
 import time
 import fcntl
 import sys
 import traceback
 import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
@@ -145,6 +148,87 @@ class LockedFileHandler(logging.FileHandler):
             raise
 
 
+def _compute_hmac(secret: bytes, entry: Dict[str, Any]) -> str:
+    """HMAC-SHA256 over the canonical (sorted keys) JSON of an entry"""
+    canonical = json.dumps(entry, sort_keys=True)
+    return hmac.new(secret, canonical.encode(), hashlib.sha256).hexdigest()
+
+
+def _verify_chain_segment(
+    log_file: str,
+    start_offset: int,
+    start_line: int,
+    anchor_hash: Optional[str],
+    hmac_secret: bytes,
+    buffer_size: int = 1024 * 1024
+) -> Dict[str, Any]:
+    """
+    Verify one log file from a byte offset, streaming fixed-size buffers
+
+    Module-level so it can run in a worker process. A trailing line without
+    a newline is an entry still being written; it is left for the next run.
+
+    Args:
+        log_file: Path of the daily log file
+        start_offset: Byte offset to resume from (end of a complete line)
+        start_line: Number of lines before start_offset
+        anchor_hash: entry_hash the first verified entry must link to
+        hmac_secret: HMAC key
+        buffer_size: Read size in bytes
+
+    Returns:
+        Dict with verified end offset, line count, last hash and errors
+    """
+    name = Path(log_file).name
+    errors = []
+    previous_hash = anchor_hash
+    offset = start_offset
+    line_num = start_line
+
+    with open(log_file, 'rb') as f:
+        f.seek(start_offset)
+        remainder = b''
+
+        while True:
+            chunk = f.read(buffer_size)
+            if not chunk:
+                break
+
+            lines = (remainder + chunk).split(b'\n')
+            remainder = lines.pop()
+
+            for raw in lines:
+                line_num += 1
+                offset += len(raw) + 1
+
+                try:
+                    entry = json.loads(raw)
+                except ValueError as e:
+                    # FIX #4: NO SILENT FAILURES - record corruption details
+                    errors.append(f"{name}: Corrupted JSON at line {line_num}: {e}")
+                    continue
+
+                # Verify previous hash matches
+                if entry.get("previous_hash") != previous_hash:
+                    errors.append(f"{name}: Chain broken at line {line_num}")
+
+                # Verify entry hash (HMAC signature)
+                stored_hash = entry.pop("entry_hash", None)
+                if _compute_hmac(hmac_secret, entry) != stored_hash:
+                    errors.append(f"{name}: HMAC signature mismatch at line {line_num}")
+
+                previous_hash = stored_hash
+
+    return {
+        "file": name,
+        "offset": offset,
+        "lines": line_num,
+        "entries": line_num - start_line,
+        "last_hash": previous_hash,
+        "errors": errors
+    }
+
+
 class TrulyImmutableAuditLogger:
     """
     Truly Immutable Audit Logger - ALL VULNERABILITIES FIXED
@@ -167,6 +251,14 @@ class TrulyImmutableAuditLogger:
     ✅ Automatic verification on read
     ✅ Sequence numbers (detect missing entries)
 
+    Pipeline mode (async_pipeline=True):
+        log_event only enqueues. A single writer thread assigns sequence
+        numbers, chains HMACs strictly in order, writes each batch with one
+        lock + fsync, checkpoints chain state every `checkpoint_every`
+        entries, and hands batches to a cloud shipper thread that retries
+        with bounded backoff. Call flush() to wait for pending events and
+        close() on shutdown (also registered with atexit).
+
     Usage:
         logger = TrulyImmutableAuditLogger(organization_id="org123")
 
@@ -188,7 +280,13 @@ class TrulyImmutableAuditLogger:
         enable_cloud_backup: bool = True,
         cloud_backend: str = "cloudwatch",  # cloudwatch, azure_monitor, gcs
         enable_file_integrity_check: bool = True,
-        enable_secret_detection: bool = True
+        enable_secret_detection: bool = True,
+        async_pipeline: bool = False,
+        batch_size: int = 512,
+        flush_interval: float = 0.05,
+        checkpoint_every: int = 1000,
+        max_queue_size: int = 100_000,
+        cloud_max_retries: int = 3
     ):
         """
         Initialize truly immutable audit logger
@@ -200,6 +298,12 @@ class TrulyImmutableAuditLogger:
             cloud_backend: Cloud logging backend
             enable_file_integrity_check: Enable FIM
             enable_secret_detection: Enable runtime secret detection
+            async_pipeline: Enqueue events for a single writer thread
+            batch_size: Max events written per lock/fsync (pipeline mode)
+            flush_interval: Max seconds an event waits for its batch
+            checkpoint_every: Entries between chain state checkpoints
+            max_queue_size: Pending events before log_event blocks
+            cloud_max_retries: Attempts per cloud batch before alerting
         """
         self.log_dir = Path(log_dir)
         self.organization_id = organization_id
@@ -224,6 +328,7 @@ class TrulyImmutableAuditLogger:
         self._lock = threading.Lock()
         self.sequence_number = self._load_last_sequence_number()
         self.previous_hash = self._load_last_hash()
+        self._recover_chain_state()
 
         # Cloud logging client
         self.cloud_client = None
@@ -247,12 +352,30 @@ class TrulyImmutableAuditLogger:
         else:
             self.secret_detector = None
 
+        # Single-writer pipeline
+        self.async_pipeline = async_pipeline
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        self.cloud_max_retries = cloud_max_retries
+        self.pipeline_stats = {
+            'events_written': 0,
+            'batches_written': 0,
+            'write_failures': 0,
+            'cloud_batches_sent': 0,
+            'cloud_batches_failed': 0
+        }
+        self._stats_lock = threading.Lock()  # Writer and cloud threads both count
+        if async_pipeline:
+            self._start_pipeline(max_queue_size)
+
         print(f"✅ Truly Immutable Audit Logger initialized")
         print(f"   Organization: {organization_id or 'shared'}")
         print(f"   Cloud backup: {enable_cloud_backup} ({cloud_backend})")
         print(f"   File integrity: {enable_file_integrity_check}")
         print(f"   Secret detection: {enable_secret_detection}")
         print(f"   File locking: fcntl (multi-process safe)")
+        print(f"   Write pipeline: {'single-writer, batched' if async_pipeline else 'synchronous'}")
 
     def _load_hmac_secret(self) -> bytes:
         """
@@ -410,6 +533,132 @@ class TrulyImmutableAuditLogger:
 
         return '0' * 64  # Genesis hash
 
+    def _recover_chain_state(self):
+        """
+        Advance chain state past entries written after the last checkpoint
+
+        Chain state is only checkpointed periodically in pipeline mode, so
+        after a crash the newest log file may be ahead of .chain_state.json.
+        Continuing from the stale state would fork the chain.
+        """
+        log_files = sorted(self.log_dir.glob("audit_*.jsonl"))
+        if not log_files:
+            return
+
+        self._repair_torn_tail(log_files[-1])
+        last_line = self._read_last_line(log_files[-1])
+        if not last_line:
+            return
+
+        try:
+            entry = json.loads(last_line)
+        except json.JSONDecodeError as e:
+            # A complete line that doesn't parse is not a crash artefact
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.CRITICAL,
+                "Audit Log Tail Corrupted",
+                f"Last entry of {log_files[-1].name} is not valid JSON: {e}",
+                {"log_file": str(log_files[-1])}
+            )
+            raise RuntimeError(
+                f"Refusing to start: cannot recover chain state from {log_files[-1].name}"
+            ) from e
+
+        sequence = entry.get('sequence_number', 0)
+        if sequence > self.sequence_number and entry.get('entry_hash'):
+            self.sequence_number = sequence
+            self.previous_hash = entry['entry_hash']
+
+    def _repair_torn_tail(self, log_file: Path, chunk_size: int = 8192):
+        """
+        Cut an incomplete last line left by a crash mid-write
+
+        Every entry is written with its newline, so a file that doesn't end
+        in one stops inside an entry that was never checkpointed. Left in
+        place, recovery would resume from the stale checkpoint and the next
+        append would glue onto the fragment. If the file can't be truncated
+        (e.g. append-only), refuse to start rather than fork the chain.
+        """
+        with open(log_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+
+            keep = 0
+            position = size
+            while position > 0:
+                read_size = min(chunk_size, position)
+                position -= read_size
+                f.seek(position)
+                newline = f.read(read_size).rfind(b'\n')
+                if newline != -1:
+                    keep = position + newline + 1
+                    break
+
+            f.seek(keep)
+            fragment = f.read()
+
+        try:
+            json.loads(fragment)
+            torn = False  # Only the newline is missing
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            torn = True
+
+        try:
+            if torn:
+                os.truncate(log_file, keep)
+            else:
+                with open(log_file, 'ab') as f:
+                    f.write(b'\n')
+        except OSError as e:
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.CRITICAL,
+                "Audit Log Tail Corrupted",
+                f"{log_file.name} ends in an incomplete entry that cannot be repaired: {e}",
+                {"log_file": str(log_file), "fragment_bytes": size - keep}
+            )
+            raise RuntimeError(
+                f"Refusing to start: {log_file.name} ends in an incomplete entry"
+            ) from e
+
+        if torn:
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.HIGH,
+                "Audit Log Torn Tail Truncated",
+                f"Removed an incomplete {size - keep}-byte entry from the end of {log_file.name}",
+                {"log_file": str(log_file), "truncated_at": keep}
+            )
+
+    @staticmethod
+    def _read_last_line(
+        path: Path,
+        end: Optional[int] = None,
+        chunk_size: int = 8192
+    ) -> Optional[str]:
+        """Read the last non-empty line before `end` (default EOF) without reading all of it"""
+        with open(path, 'rb') as f:
+            if end is None:
+                f.seek(0, os.SEEK_END)
+                end = f.tell()
+            position = end
+            tail = b''
+
+            while position > 0:
+                read_size = min(chunk_size, position)
+                position -= read_size
+                f.seek(position)
+                tail = f.read(read_size) + tail
+                stripped = tail.rstrip(b'\n')
+                if b'\n' in stripped:
+                    return stripped.rsplit(b'\n', 1)[1].decode()
+
+            stripped = tail.rstrip(b'\n')
+            return stripped.decode() if stripped else None
+
     def _save_chain_state(self, sequence_number: int, entry_hash: str):
         """
         Save chain state to file with locking
@@ -455,17 +704,8 @@ class TrulyImmutableAuditLogger:
         Returns:
             HMAC-SHA256 signature
         """
-        # Create canonical representation (sorted keys)
-        canonical = json.dumps(entry, sort_keys=True)
-
-        # FIX #2: HMAC with secret (prevents rainbow table attacks)
-        signature = hmac.new(
-            self.hmac_secret,
-            canonical.encode(),
-            hashlib.sha256
-        ).hexdigest()
-
-        return signature
+        # FIX #2: HMAC with secret over canonical JSON (sorted keys)
+        return _compute_hmac(self.hmac_secret, entry)
 
     def log_event(
         self,
@@ -495,35 +735,35 @@ class TrulyImmutableAuditLogger:
             user_agent: User agent string
             metadata: Additional metadata
         """
+        if self.async_pipeline:
+            # Pipeline mode: scan, chain, write and ship on the writer thread.
+            # Serialize now so an event that can't be logged fails its own
+            # caller rather than the writer's batch (the round-trip also
+            # snapshots metadata the caller may mutate later)
+            event = {
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "user_id": user_id,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "success": success,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "metadata": metadata
+            }
+            try:
+                event = json.loads(json.dumps(event))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Audit event for {action} is not JSON serializable: {e}") from e
+            self._queue.put(event)
+            return
+
         try:
             # FIX #6: Detect secrets in metadata
-            if self.secret_detector and metadata:
-                secrets_found = self.secret_detector.scan_dict(metadata)
-                if secrets_found:
-                    SecurityIncident.trigger(
-                        SecurityIncidentLevel.HIGH,
-                        "Secret Detected in Audit Log",
-                        "Secret patterns detected in audit log metadata",
-                        {
-                            "secrets_found": secrets_found,
-                            "action": action,
-                            "user_id": user_id
-                        }
-                    )
-                    # Redact secrets
-                    metadata = self.secret_detector.redact_dict(metadata)
+            metadata = self._redact_metadata_secrets(metadata, action, user_id)
 
-            # Thread-safe sequence increment
-            with self._lock:
-                self.sequence_number += 1
-                current_sequence = self.sequence_number
-                current_previous_hash = self.previous_hash
-
-            # Create entry (without hash initially)
-            entry = {
+            event = {
                 "timestamp": datetime.utcnow().isoformat() + "Z",
-                "sequence_number": current_sequence,
-                "organization_id": self.organization_id,
                 "user_id": user_id,
                 "action": action,
                 "resource_type": resource_type,
@@ -531,33 +771,35 @@ class TrulyImmutableAuditLogger:
                 "success": success,
                 "ip_address": ip_address,
                 "user_agent": user_agent,
-                "metadata": metadata or {},
-                "previous_hash": current_previous_hash
+                "metadata": metadata
             }
 
-            # FIX #2: Compute HMAC signature (always, even without encryption)
-            entry_hash = self._compute_entry_hash(entry)
-            entry["entry_hash"] = entry_hash
-
-            # Update chain state
+            # Sequence assignment, chaining, write and publish happen in ONE
+            # critical section, so concurrent callers can't fork the chain or
+            # write entries out of chain order
             with self._lock:
-                self.previous_hash = entry_hash
-                self._save_chain_state(current_sequence, entry_hash)
+                current_sequence = self.sequence_number + 1
+                entry = self._create_chained_entry(event, current_sequence, self.previous_hash)
+
+                # Optionally encrypt sensitive fields
+                record = entry
+                if self.encryption_enabled and self.cipher:
+                    record = self._encrypt_sensitive_fields(entry)
 
-            # Optionally encrypt sensitive fields
-            if self.encryption_enabled and self.cipher:
-                entry = self._encrypt_sensitive_fields(entry)
+                # Write to local log (with fcntl locking in LockedFileHandler)
+                self.logger.info(json.dumps(record))
 
-            # Write to local log (with fcntl locking in LockedFileHandler)
-            self.logger.info(json.dumps(entry))
+                self.sequence_number = current_sequence
+                self.previous_hash = entry["entry_hash"]
+                self._save_chain_state(current_sequence, entry["entry_hash"])
 
             # FIX #5: Send to cloud with failure alerting
             if self.enable_cloud_backup:
-                self._send_to_cloud_with_alerting(entry)
+                self._send_to_cloud_with_alerting(record)
 
             # Alert on suspicious actions
             if action in ["config.change", "user.delete", "permission.grant"]:
-                self._alert_suspicious_action(entry)
+                self._alert_suspicious_action(record)
 
         except Exception as e:
             # FIX #4: NO SILENT FAILURES
@@ -575,6 +817,359 @@ class TrulyImmutableAuditLogger:
             # Re-raise to prevent silent audit trail loss
             raise
 
+    def _redact_metadata_secrets(
+        self,
+        metadata: Optional[Dict[str, Any]],
+        action: str,
+        user_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Scan metadata for secrets and redact them
+
+        FIX #6: Metadata scanned for secrets
+        """
+        if not (self.secret_detector and metadata):
+            return metadata
+
+        secrets_found = self.secret_detector.scan_dict(metadata)
+        if not secrets_found:
+            return metadata
+
+        SecurityIncident.trigger(
+            SecurityIncidentLevel.HIGH,
+            "Secret Detected in Audit Log",
+            "Secret patterns detected in audit log metadata",
+            {
+                "secrets_found": secrets_found,
+                "action": action,
+                "user_id": user_id
+            }
+        )
+        # Redact secrets
+        return self.secret_detector.redact_dict(metadata)
+
+    def _create_chained_entry(
+        self,
+        event: Dict[str, Any],
+        sequence_number: int,
+        previous_hash: str
+    ) -> Dict[str, Any]:
+        """
+        Build a log entry linked to previous_hash and sign it
+
+        FIX #2: HMAC signature computed always, even without encryption
+        """
+        entry = {
+            "timestamp": event["timestamp"],
+            "sequence_number": sequence_number,
+            "organization_id": self.organization_id,
+            "user_id": event["user_id"],
+            "action": event["action"],
+            "resource_type": event["resource_type"],
+            "resource_id": event["resource_id"],
+            "success": event["success"],
+            "ip_address": event["ip_address"],
+            "user_agent": event["user_agent"],
+            "metadata": event["metadata"] or {},
+            "previous_hash": previous_hash
+        }
+        entry["entry_hash"] = self._compute_entry_hash(entry)
+        return entry
+
+    # =========================================================================
+    # Single-writer pipeline
+    # =========================================================================
+
+    _STOP = object()
+
+    def _start_pipeline(self, max_queue_size: int):
+        """Start the writer and cloud shipper threads"""
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._cloud_queue = queue.Queue(maxsize=1000)
+        self._entries_since_checkpoint = 0
+        self._batch_file = None
+        self._batch_file_path = None
+        self._closed = False
+
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name=f"audit-writer-{self.organization_id or 'shared'}",
+            daemon=True
+        )
+        self._writer_thread.start()
+
+        self._cloud_thread = None
+        if self.enable_cloud_backup:
+            self._cloud_thread = threading.Thread(
+                target=self._cloud_loop,
+                name=f"audit-cloud-{self.organization_id or 'shared'}",
+                daemon=True
+            )
+            self._cloud_thread.start()
+
+        atexit.register(self.close)
+
+    def _next_batch(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Block for the first event, then drain up to batch_size
+
+        Returns:
+            Tuple of (events, stop_requested)
+        """
+        batch = []
+        first = self._queue.get()
+        if first is self._STOP:
+            return batch, True
+        batch.append(first)
+
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _writer_loop(self):
+        """Writer thread: assign sequence numbers, chain, write, checkpoint"""
+        while True:
+            batch, stop = self._next_batch()
+
+            if batch:
+                try:
+                    self._process_batch(batch)
+                except Exception as e:
+                    SecurityIncident.trigger(
+                        SecurityIncidentLevel.CRITICAL,
+                        "Audit Pipeline Failure",
+                        f"Audit writer failed to process a batch: {e}",
+                        {
+                            "batch_size": len(batch),
+                            "exception": str(e),
+                            "traceback": traceback.format_exc()
+                        }
+                    )
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+            if stop:
+                self._queue.task_done()  # For the stop marker
+                return
+
+    def _process_batch(self, batch: List[Dict[str, Any]]):
+        """Chain and durably write one batch of events"""
+        sequence = self.sequence_number
+        previous_hash = self.previous_hash
+
+        records = []
+        lines = []
+        for event in batch:
+            # One bad event is rejected on its own; the rest of the batch is
+            # chained past it
+            try:
+                event["metadata"] = self._redact_metadata_secrets(
+                    event["metadata"], event["action"], event["user_id"]
+                )
+                entry = self._create_chained_entry(event, sequence + 1, previous_hash)
+                record = entry
+                if self.encryption_enabled and self.cipher:
+                    record = self._encrypt_sensitive_fields(entry)
+                line = json.dumps(record) + '\n'
+            except Exception as e:
+                SecurityIncident.trigger(
+                    SecurityIncidentLevel.CRITICAL,
+                    "Audit Log Event Failure",
+                    f"Failed to log audit event: {e}",
+                    {
+                        "action": str(event.get("action")),
+                        "user_id": str(event.get("user_id")),
+                        "exception": str(e)
+                    }
+                )
+                continue
+
+            sequence += 1
+            previous_hash = entry["entry_hash"]
+            records.append(record)
+            lines.append(line)
+
+        if not records:
+            return
+
+        self._write_batch_with_retry(''.join(lines), len(records))
+
+        with self._lock:
+            self.sequence_number = sequence
+            self.previous_hash = previous_hash
+
+            self._entries_since_checkpoint += len(records)
+            if self._entries_since_checkpoint >= self.checkpoint_every:
+                self._save_chain_state(sequence, previous_hash)
+                self._entries_since_checkpoint = 0
+
+        self._count('events_written', len(records))
+        self._count('batches_written')
+
+        if self.enable_cloud_backup:
+            try:
+                self._cloud_queue.put_nowait(records)
+            except queue.Full:
+                self._count('cloud_batches_failed')
+                SecurityIncident.trigger(
+                    SecurityIncidentLevel.HIGH,
+                    "Cloud Audit Backlog Full",
+                    "Cloud shipping is falling behind; batch kept locally only",
+                    {"batch_size": len(records), "backend": self.cloud_backend}
+                )
+
+        for record in records:
+            if record["action"] in ["config.change", "user.delete", "permission.grant"]:
+                self._alert_suspicious_action(record)
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._stats_lock:
+            self.pipeline_stats[stat] += amount
+
+    def _write_batch_with_retry(self, data: str, count: int, max_backoff: float = 5.0):
+        """
+        Append a batch with one lock + fsync, retrying with backoff until written
+
+        A batch is never dropped: while the log can't be written the writer
+        stalls here, the bounded queue fills and log_event blocks
+        (backpressure) instead of losing audit events.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self._write_batch(data)
+                return
+            except Exception as e:
+                self._count('write_failures')
+                try:
+                    self._close_batch_file()
+                except OSError:
+                    pass  # Buffered data of the failed write; reopened on retry
+
+                # FIX #4: NO SILENT FAILURES
+                SecurityIncident.trigger(
+                    SecurityIncidentLevel.CRITICAL,
+                    "Audit Log Write Failure",
+                    f"Failed to write audit batch (attempt {attempt}), retrying: {e}",
+                    {"batch_size": count, "exception": str(e)}
+                )
+                time.sleep(min(0.1 * 2 ** min(attempt - 1, 6), max_backoff))
+
+    def _write_batch(self, data: str):
+        """
+        Append lines to today's log under one exclusive lock, then fsync
+
+        FIX #1: fcntl locking, held once per batch instead of per entry
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        log_file = self.log_dir / f"audit_{today}.jsonl"
+
+        if self._batch_file_path != log_file:
+            self._close_batch_file()
+            self._batch_file = open(log_file, 'a', encoding='utf-8')
+            self._batch_file_path = log_file
+
+        f = self._batch_file
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            start = os.fstat(f.fileno()).st_size
+            try:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            except Exception:
+                # Drop a partial batch so the retry doesn't follow a torn line
+                try:
+                    os.ftruncate(f.fileno(), start)
+                except OSError:
+                    pass  # Repaired at next start if it is the tail
+                raise
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _close_batch_file(self):
+        if self._batch_file is not None:
+            try:
+                self._batch_file.close()
+            finally:
+                self._batch_file = None
+                self._batch_file_path = None
+
+    def _cloud_loop(self):
+        """Cloud shipper thread: send written batches with bounded retry"""
+        while True:
+            records = self._cloud_queue.get()
+            try:
+                if records is self._STOP:
+                    return
+                self._send_batch_to_cloud_with_alerting(records, self.cloud_max_retries)
+            finally:
+                self._cloud_queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every enqueued event is written and checkpoint chain state
+
+        Args:
+            timeout: Max seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        if not self.async_pipeline:
+            return True
+
+        if timeout is None:
+            self._queue.join()
+        else:
+            deadline = time.monotonic() + timeout
+            while self._queue.unfinished_tasks:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.005)
+
+        with self._lock:
+            self._save_chain_state(self.sequence_number, self.previous_hash)
+            self._entries_since_checkpoint = 0
+
+        return True
+
+    def close(self, timeout: float = 30.0):
+        """Drain the pipeline, checkpoint chain state and stop worker threads"""
+        if not self.async_pipeline or self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(self._STOP)
+        self._writer_thread.join(timeout)
+
+        if self._cloud_thread is not None:
+            self._cloud_queue.put(self._STOP)
+            self._cloud_thread.join(timeout)
+
+        with self._lock:
+            self._save_chain_state(self.sequence_number, self.previous_hash)
+            self._entries_since_checkpoint = 0
+
+        self._close_batch_file()
+
     def _encrypt_sensitive_fields(self, entry: Dict[str, Any]) -> Dict[str, Any]:
         """Encrypt sensitive fields in log entry"""
         if not self.cipher:
@@ -600,69 +1195,98 @@ class TrulyImmutableAuditLogger:
 
         FIX #5: Cloud failures trigger high-severity security alerts
         """
-        try:
-            if self.cloud_backend == "cloudwatch":
-                self._send_to_cloudwatch(entry)
-            elif self.cloud_backend == "azure_monitor":
-                self._send_to_azure_monitor(entry)
-            elif self.cloud_backend == "gcs":
-                self._send_to_gcs(entry)
+        self._send_batch_to_cloud_with_alerting([entry], max_attempts=1)
 
-            # Reset failure counter on success
-            self.cloud_failures = 0
+    def _send_batch_to_cloud_with_alerting(
+        self,
+        entries: List[Dict[str, Any]],
+        max_attempts: int = 1
+    ):
+        """
+        Send a batch of entries to the cloud backend, retrying with backoff
 
-        except Exception as e:
-            # FIX #5: Track consecutive failures
-            self.cloud_failures += 1
+        FIX #5: Consecutive failures escalate to CRITICAL alerts
+        """
+        for attempt in range(1, max_attempts + 1):
+            try:
+                if self.cloud_backend == "cloudwatch":
+                    self._send_batch_to_cloudwatch(entries)
+                elif self.cloud_backend == "azure_monitor":
+                    for entry in entries:
+                        self._send_to_azure_monitor(entry)
+                elif self.cloud_backend == "gcs":
+                    for entry in entries:
+                        self._send_to_gcs(entry)
+
+                # Reset failure counter on success
+                self.cloud_failures = 0
+                self._count('cloud_batches_sent')
+                return
 
-            if self.cloud_failures == 1:
-                # First failure: Medium severity
-                SecurityIncident.trigger(
-                    SecurityIncidentLevel.MEDIUM,
-                    "Cloud Logging Failure",
-                    f"Failed to send audit log to cloud: {e}",
-                    {
-                        "backend": self.cloud_backend,
-                        "consecutive_failures": self.cloud_failures,
-                        "exception": str(e)
-                    }
-                )
-            elif self.cloud_failures >= 5:
-                # FIX #5: Multiple failures = CRITICAL (possible DoS attack)
-                SecurityIncident.trigger(
-                    SecurityIncidentLevel.CRITICAL,
-                    "Cloud Logging Total Failure - Possible Attack",
-                    f"Cloud logging failed {self.cloud_failures} times consecutively",
-                    {
-                        "backend": self.cloud_backend,
-                        "consecutive_failures": self.cloud_failures,
-                        "possible_attack": "DoS to force local logging for tampering",
-                        "action_required": "Investigate network connectivity and potential attack"
-                    }
-                )
+            except Exception as e:
+                if attempt < max_attempts:
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 8.0))
+                    continue
+                error = e
+
+        self._count('cloud_batches_failed')
+
+        # FIX #5: Track consecutive failures
+        self.cloud_failures += 1
+
+        if self.cloud_failures == 1:
+            # First failure: Medium severity
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.MEDIUM,
+                "Cloud Logging Failure",
+                f"Failed to send audit log to cloud: {error}",
+                {
+                    "backend": self.cloud_backend,
+                    "consecutive_failures": self.cloud_failures,
+                    "batch_size": len(entries),
+                    "exception": str(error)
+                }
+            )
+        elif self.cloud_failures >= 5:
+            # FIX #5: Multiple failures = CRITICAL (possible DoS attack)
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.CRITICAL,
+                "Cloud Logging Total Failure - Possible Attack",
+                f"Cloud logging failed {self.cloud_failures} times consecutively",
+                {
+                    "backend": self.cloud_backend,
+                    "consecutive_failures": self.cloud_failures,
+                    "possible_attack": "DoS to force local logging for tampering",
+                    "action_required": "Investigate network connectivity and potential attack"
+                }
+            )
 
     def _send_to_cloudwatch(self, entry: Dict[str, Any]):
         """Send entry to AWS CloudWatch Logs"""
+        self._send_batch_to_cloudwatch([entry])
+
+    def _send_batch_to_cloudwatch(self, entries: List[Dict[str, Any]]):
+        """Send entries to AWS CloudWatch Logs (chunked to API limits)"""
         if not self.cloud_client:
             return
 
-        try:
-            log_group = f"/audit/{self.organization_id or 'shared'}"
-            log_stream = datetime.now().strftime("%Y-%m-%d")
+        log_group = f"/audit/{self.organization_id or 'shared'}"
+        log_stream = datetime.now().strftime("%Y-%m-%d")
+        timestamp = int(time.time() * 1000)
 
+        # put_log_events accepts at most 10,000 events / 1 MB per call
+        for start in range(0, len(entries), 500):
             self.cloud_client.put_log_events(
                 logGroupName=log_group,
                 logStreamName=log_stream,
                 logEvents=[
                     {
-                        'timestamp': int(time.time() * 1000),
+                        'timestamp': timestamp,
                         'message': json.dumps(entry)
                     }
+                    for entry in entries[start:start + 500]
                 ]
             )
-        except Exception as e:
-            # Re-raise to trigger alerting in _send_to_cloud_with_alerting
-            raise
 
     def _send_to_azure_monitor(self, entry: Dict[str, Any]):
         """Send entry to Azure Monitor"""
@@ -716,24 +1340,42 @@ class TrulyImmutableAuditLogger:
 
         baseline = {}
         for log_file in self.log_dir.glob("audit_*.jsonl"):
-            with open(log_file, 'rb') as f:
-                content = f.read()
-                file_hash = hashlib.sha256(content).hexdigest()
-                baseline[str(log_file.name)] = {
-                    "hash": file_hash,
-                    "size": len(content),
-                    "last_checked": datetime.utcnow().isoformat() + "Z"
-                }
+            size = log_file.stat().st_size
+            baseline[str(log_file.name)] = {
+                "hash": self._hash_file_prefix(log_file, size),
+                "size": size,
+                "last_checked": datetime.utcnow().isoformat() + "Z"
+            }
 
         with open(baseline_file, 'w') as f:
             json.dump(baseline, f, indent=2)
 
-    def verify_integrity(self) -> bool:
+    @staticmethod
+    def _hash_file_prefix(path: Path, length: int, buffer_size: int = 1024 * 1024) -> str:
+        """SHA-256 of the first `length` bytes of a file, read in fixed-size buffers"""
+        digest = hashlib.sha256()
+        remaining = length
+
+        with open(path, 'rb') as f:
+            while remaining > 0:
+                chunk = f.read(min(buffer_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+
+        return digest.hexdigest()
+
+    def verify_integrity(self, full: bool = False, max_workers: Optional[int] = None) -> bool:
         """
         Verify file integrity and chain integrity
 
         FIX #4: Triggers security incidents on tampering detection
 
+        Args:
+            full: Re-verify every entry instead of resuming from the checkpoint
+            max_workers: Processes for chain verification (default: CPU count)
+
         Returns:
             True if all logs are intact, False if tampering detected
         """
@@ -762,9 +1404,14 @@ class TrulyImmutableAuditLogger:
                         all_intact = False
                         continue
 
-                    with open(log_file, 'rb') as f:
-                        content = f.read()
-                        current_hash = hashlib.sha256(content).hexdigest()
+                    # Logs are append-only: the baselined prefix must be unchanged
+                    if log_file.stat().st_size < expected["size"]:
+                        print(f"   ❌ TAMPERING: {filename} truncated!")
+                        tampering_details.append(f"File truncated: {filename}")
+                        all_intact = False
+                        continue
+
+                    current_hash = self._hash_file_prefix(log_file, expected["size"])
 
                     if current_hash != expected["hash"]:
                         print(f"   ❌ TAMPERING: {filename} modified!")
@@ -775,13 +1422,20 @@ class TrulyImmutableAuditLogger:
 
         # 2. Verify chain integrity
         print("\n2️⃣  Chain Integrity Check:")
-        chain_intact, chain_errors = self._verify_chain_integrity()
+        report = self.verify_chain(full=full, max_workers=max_workers)
+
+        for error in report["errors"]:
+            print(f"   ❌ {error}")
 
-        if chain_intact:
+        print(f"   Verified {report['entries_verified']:,} entries in "
+              f"{report['files_verified']}/{report['files']} files "
+              f"({report['entries_per_second']:,.0f} entries/s)")
+
+        if report["intact"]:
             print("   ✅ Log chain intact (no entries removed/reordered)")
         else:
             print("   ❌ TAMPERING: Chain broken!")
-            tampering_details.extend(chain_errors)
+            tampering_details.extend(report["errors"])
             all_intact = False
 
         print("\n" + "="*80)
@@ -815,58 +1469,206 @@ class TrulyImmutableAuditLogger:
         Returns:
             Tuple of (intact: bool, errors: List[str])
         """
+        report = self.verify_chain()
+        return report["intact"], report["errors"]
+
+    def verify_chain(
+        self,
+        full: bool = False,
+        max_workers: Optional[int] = None,
+        save_checkpoint: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Verify the hash chain across all daily log files
+
+        The chain continues across days, so each file is anchored on the
+        last entry_hash of the previous file (read from its tail) and files
+        are verified in parallel. A signed checkpoint records how far each
+        file has been verified; later runs only verify appended entries.
+
+        Args:
+            full: Ignore the checkpoint and verify every entry from genesis
+            max_workers: Processes to verify files with (default: CPU count)
+            save_checkpoint: Record verified offsets for the next run
+
+        Returns:
+            Report dict: intact, errors, files, files_verified,
+            entries_verified, seconds, entries_per_second
+        """
+        started = time.perf_counter()
         errors = []
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_file = self.log_dir / f"audit_{today}.jsonl"
+        log_files = sorted(self.log_dir.glob("audit_*.jsonl"))
+        checkpoint = {} if full else self._load_verification_checkpoint()
+
+        for name in checkpoint:
+            if not (self.log_dir / name).exists():
+                errors.append(f"{name}: File deleted after verification")
+
+        # (path, start offset, start line, anchor hash) per file
+        segments = []
+        new_checkpoint = {}
+        anchor = '0' * 64  # Genesis
+
+        for log_file in log_files:
+            state = checkpoint.get(log_file.name)
+            size = log_file.stat().st_size
+
+            if state:
+                problem = self._check_verification_boundary(log_file, state)
+                if problem:
+                    errors.append(problem)
+                    state = None
+
+            if state:
+                new_checkpoint[log_file.name] = state
+                if size > state["offset"]:
+                    segments.append((str(log_file), state["offset"], state["lines"], state["last_hash"]))
+            elif size:
+                segments.append((str(log_file), 0, 0, anchor))
+
+            if size:
+                anchor = self._tail_entry_hash(log_file)
+
+        results = []
+        failed = False
+        try:
+            workers = max_workers or os.cpu_count() or 1
+            if len(segments) > 1 and workers > 1:
+                with ProcessPoolExecutor(max_workers=min(workers, len(segments))) as executor:
+                    futures = [
+                        executor.submit(_verify_chain_segment, *segment, self.hmac_secret)
+                        for segment in segments
+                    ]
+                    results = [future.result() for future in futures]
+            else:
+                results = [
+                    _verify_chain_segment(*segment, self.hmac_secret)
+                    for segment in segments
+                ]
+        except Exception as e:
+            # FIX #4: NO SILENT FAILURES
+            errors.append(f"Chain verification exception: {e}")
+            failed = True
+
+        entries_verified = 0
+        for result in results:
+            entries_verified += result["entries"]
+            if result["errors"]:
+                errors.extend(result["errors"])
+                new_checkpoint.pop(result["file"], None)
+            else:
+                new_checkpoint[result["file"]] = {
+                    "offset": result["offset"],
+                    "lines": result["lines"],
+                    "last_hash": result["last_hash"]
+                }
 
-        if not log_file.exists():
-            return True, []  # No logs yet
+        if save_checkpoint and not failed:
+            self._save_verification_checkpoint(new_checkpoint)
+
+        elapsed = time.perf_counter() - started
+        report = {
+            "intact": not errors,
+            "errors": errors,
+            "files": len(log_files),
+            "files_verified": len(results),
+            "entries_verified": entries_verified,
+            "seconds": elapsed,
+            "entries_per_second": entries_verified / elapsed if elapsed > 0 else 0.0
+        }
+        self.last_verification_report = report
+        return report
 
-        previous_hash = '0' * 64  # Genesis
-        intact = True
+    def _tail_entry_hash(self, log_file: Path) -> Optional[str]:
+        """entry_hash of the last entry in a file (anchor for the next file)"""
+        last_line = self._read_last_line(log_file)
+        if not last_line:
+            return None
 
         try:
-            with open(log_file, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        entry = json.loads(line.strip())
-
-                        # Verify previous hash matches
-                        if entry.get("previous_hash") != previous_hash:
-                            error = f"Chain broken at line {line_num}"
-                            print(f"   ❌ {error}")
-                            errors.append(error)
-                            intact = False
-
-                        # Verify entry hash (HMAC signature)
-                        stored_hash = entry.get("entry_hash")
-                        entry_copy = entry.copy()
-                        del entry_copy["entry_hash"]
-                        computed_hash = self._compute_entry_hash(entry_copy)
-
-                        if computed_hash != stored_hash:
-                            error = f"HMAC signature mismatch at line {line_num}"
-                            print(f"   ❌ {error}")
-                            errors.append(error)
-                            intact = False
-
-                        previous_hash = stored_hash
-
-                    except json.JSONDecodeError as e:
-                        # FIX #4: NO SILENT FAILURES - record corruption details
-                        error = f"Corrupted JSON at line {line_num}: {e}"
-                        print(f"   ❌ {error}")
-                        errors.append(error)
-                        intact = False
+            return json.loads(last_line).get("entry_hash")
+        except json.JSONDecodeError:
+            return None  # Reported when the file itself is verified
+
+    def _check_verification_boundary(self, log_file: Path, state: Dict[str, Any]) -> Optional[str]:
+        """
+        Check a file still ends its verified prefix where the checkpoint says
+
+        Returns:
+            Error message, or None if verification can resume from the checkpoint
+        """
+        if log_file.stat().st_size < state["offset"]:
+            return f"{log_file.name}: File truncated below verified offset {state['offset']}"
+
+        if state["offset"] == 0:
+            return None
 
+        boundary_line = self._read_last_line(log_file, end=state["offset"])
+        try:
+            boundary_hash = json.loads(boundary_line).get("entry_hash") if boundary_line else None
+        except json.JSONDecodeError:
+            boundary_hash = None
+
+        if boundary_hash != state["last_hash"]:
+            return f"{log_file.name}: Entry at verification checkpoint was modified"
+
+        return None
+
+    def _load_verification_checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        """Load per-file verified offsets, rejecting checkpoints with a bad signature"""
+        checkpoint_file = self.log_dir / ".verification_checkpoint.json"
+
+        if not checkpoint_file.exists():
+            return {}
+
+        try:
+            with open(checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+            files = checkpoint["files"]
+            signature = checkpoint["signature"]
         except Exception as e:
-            # FIX #4: NO SILENT FAILURES
-            error = f"Chain verification exception: {e}"
-            print(f"   ❌ {error}")
-            errors.append(error)
-            intact = False
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.HIGH,
+                "Verification Checkpoint Load Failure",
+                f"Failed to load verification checkpoint, verifying from genesis: {e}",
+                {"checkpoint_file": str(checkpoint_file)}
+            )
+            return {}
+
+        if not hmac.compare_digest(_compute_hmac(self.hmac_secret, files), signature):
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.CRITICAL,
+                "Verification Checkpoint Tampered",
+                "Verification checkpoint signature mismatch, verifying from genesis",
+                {"checkpoint_file": str(checkpoint_file)}
+            )
+            return {}
+
+        return files
+
+    def _save_verification_checkpoint(self, files: Dict[str, Dict[str, Any]]):
+        """Atomically write the HMAC-signed verification checkpoint"""
+        checkpoint_file = self.log_dir / ".verification_checkpoint.json"
+        temp_file = checkpoint_file.with_suffix(".tmp")
 
-        return intact, errors
+        checkpoint = {
+            "files": files,
+            "signature": _compute_hmac(self.hmac_secret, files),
+            "last_verified": datetime.utcnow().isoformat() + "Z"
+        }
+
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump(checkpoint, f)
+            os.replace(temp_file, checkpoint_file)
+        except Exception as e:
+            # FIX #4: NO SILENT FAILURES
+            SecurityIncident.trigger(
+                SecurityIncidentLevel.HIGH,
+                "Verification Checkpoint Save Failure",
+                f"Failed to save verification checkpoint: {e}",
+                {"checkpoint_file": str(checkpoint_file)}
+            )
 
     def _alert_suspicious_action(self, entry: Dict[str, Any]):
         """Alert on suspicious actions"""
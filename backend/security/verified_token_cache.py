@@ -0,0 +1,160 @@
+"""
+Verified Token Cache - Skip re-verifying the same bearer token
+
+API clients reuse one JWT for thousands of requests, and JWTValidator /
+Auth0Handler would otherwise repeat signature verification, JWKS lookup
+and claim checks every time.
+
+SECURITY PROPERTIES:
+✅ Keyed by SHA-256 of the token (raw tokens are never stored)
+✅ Namespaced per validator configuration (issuer, audience, algorithms,
+   MFA/age policy), so a token verified for one audience is never accepted
+   for another
+✅ Entries live at most ttl_seconds and never past the token's own exp /
+   maximum-age deadline
+✅ Invalidated on blacklist events (JWTBlacklistManager calls
+   invalidate()/clear(), locally and via Redis pub/sub); a generation
+   counter stops a verification that raced with a revocation from
+   re-populating the cache
+✅ Bounded (LRU) so a flood of distinct tokens cannot exhaust memory
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+from security.expiring_counter_store import ExpiringCounterStore
+
+
+class VerifiedTokenCache:
+    """
+    Short-TTL cache of verified JWT claims
+
+    Usage:
+        cache = get_verified_token_cache()
+
+        generation = cache.generation
+        payload = cache.get(namespace, token)
+        if payload is None:
+            payload = verify(token)
+            if payload:
+                cache.put(namespace, token, payload, not_after=payload['exp'],
+                          generation=generation)
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 50_000):
+        """
+        Initialize cache
+
+        Args:
+            ttl_seconds: Max seconds a verification result is reused
+            max_entries: Max cached tokens (least recently used evicted)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries = ExpiringCounterStore(max_keys=max_entries, name="verified tokens")
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_token(token: str) -> str:
+        """SHA-256 of the token (same digest the blacklist stores)"""
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, namespace: str, token: str) -> Optional[Dict]:
+        """
+        Cached claims for a token verified under `namespace`
+
+        Returns:
+            Copy of the verified payload, or None
+        """
+        entry = self._entries.get(self.hash_token(token), None)
+        cached = entry.get(namespace) if entry else None
+
+        if cached is None or cached[1] <= time.time():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return copy.deepcopy(cached[0])
+
+    def put(
+        self,
+        namespace: str,
+        token: str,
+        payload: Dict,
+        not_after: float,
+        generation: Optional[int] = None
+    ):
+        """
+        Cache verified claims
+
+        Args:
+            namespace: Validator configuration the token was verified under
+            token: JWT token
+            payload: Verified claims
+            not_after: Deadline past which the token must be re-verified
+                (exp, or the max-age deadline if sooner)
+            generation: `generation` read before verification started; the
+                entry is dropped if an invalidation happened since
+        """
+        now = time.time()
+        expires_at = min(now + self.ttl_seconds, not_after)
+        if expires_at <= now:
+            return
+
+        token_hash = self.hash_token(token)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            entry = dict(self._entries.get(token_hash, None) or {})
+            entry[namespace] = (copy.deepcopy(payload), expires_at)
+            latest = max(expiry for _, expiry in entry.values())
+            self._entries.set(token_hash, entry, ttl=latest - now)
+
+    def invalidate(self, token_hash: str):
+        """Drop a token (e.g. it was blacklisted)"""
+        with self._lock:
+            self.generation += 1
+            self._entries.delete(token_hash)
+
+    def clear(self):
+        """Drop everything (e.g. mass revocation for a user)"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'generation': self.generation
+        }
+
+
+# Shared instance, so blacklist events reach every validator in the process
+_verified_token_cache: Optional[VerifiedTokenCache] = None
+_verified_token_cache_lock = threading.Lock()
+
+
+def get_verified_token_cache() -> VerifiedTokenCache:
+    """
+    Get the process-wide verified token cache
+
+    Returns:
+        VerifiedTokenCache instance
+    """
+    global _verified_token_cache
+
+    with _verified_token_cache_lock:
+        if _verified_token_cache is None:
+            _verified_token_cache = VerifiedTokenCache()
+        return _verified_token_cache
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+AUDIT LOG PIPELINE TESTS
+Tests hash-chain integrity of TrulyImmutableAuditLogger under concurrent writers
+
+Run: python3 tests/test_audit_pipeline.py
+"""
+
+import os
+import sys
+import json
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import unittest
+import tempfile
+import threading
+from unittest import mock
+
+os.environ.setdefault('AUDIT_HMAC_SECRET', 'k3Q9vX2mL7pR4tY8wZ1nB6cF5hJ0sD3g')
+
+
+class TestAuditPipeline(unittest.TestCase):
+    """Test that concurrent producers leave a single, intact chain"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.loggers = []
+
+    def tearDown(self):
+        for audit_logger in self.loggers:
+            audit_logger.close()
+        self.tmpdir.cleanup()
+
+    def _make_logger(self, **kwargs):
+        from security.truly_immutable_audit_logger import TrulyImmutableAuditLogger
+        audit_logger = TrulyImmutableAuditLogger(
+            log_dir=self.tmpdir.name,
+            enable_cloud_backup=False,
+            enable_file_integrity_check=False,
+            **kwargs
+        )
+        self.loggers.append(audit_logger)
+        return audit_logger
+
+    def _log_concurrently(self, audit_logger, threads=8, events_per_thread=50):
+        def produce(worker):
+            for i in range(events_per_thread):
+                audit_logger.log_event(
+                    user_id=f"user{worker}",
+                    action="document.read",
+                    resource_type="document",
+                    resource_id=str(i),
+                    success=True
+                )
+
+        workers = [threading.Thread(target=produce, args=(w,)) for w in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+    def _read_entries(self):
+        entries = []
+        for log_file in sorted(Path(self.tmpdir.name).glob("audit_*.jsonl")):
+            with open(log_file) as f:
+                entries.extend(json.loads(line) for line in f if line.strip())
+        return entries
+
+    def test_sync_mode_chain_not_forked(self):
+        """Test: concurrent synchronous writers produce one ordered chain"""
+        audit_logger = self._make_logger()
+        self._log_concurrently(audit_logger)
+
+        intact, errors = audit_logger._verify_chain_integrity()
+        self.assertTrue(intact, errors)
+
+        entries = self._read_entries()
+        self.assertEqual([e['sequence_number'] for e in entries], list(range(1, 401)))
+
+    def test_pipeline_mode_chain_intact(self):
+        """Test: pipeline writer chains every event exactly once, in order"""
+        audit_logger = self._make_logger(async_pipeline=True, batch_size=32)
+        self._log_concurrently(audit_logger)
+        self.assertTrue(audit_logger.flush(timeout=30))
+
+        intact, errors = audit_logger._verify_chain_integrity()
+        self.assertTrue(intact, errors)
+        self.assertEqual(audit_logger.pipeline_stats['events_written'], 400)
+
+    def test_restart_recovers_from_log_tail(self):
+        """Test: a stale checkpoint is advanced from the newest log entry"""
+        audit_logger = self._make_logger(async_pipeline=True, checkpoint_every=10_000)
+        self._log_concurrently(audit_logger, threads=2, events_per_thread=10)
+        audit_logger.close()
+
+        # Simulate a crash before the last checkpoint
+        state_file = Path(self.tmpdir.name) / ".chain_state.json"
+        state_file.write_text(json.dumps({"last_sequence_number": 3, "last_hash": "0" * 64}))
+
+        restarted = self._make_logger()
+        restarted.log_event("after-restart", "document.read", "document", None, True)
+
+        intact, errors = restarted._verify_chain_integrity()
+        self.assertTrue(intact, errors)
+        self.assertEqual(self._read_entries()[-1]['sequence_number'], 21)
+
+    def test_failed_batch_write_is_retried_not_dropped(self):
+        """Test: a batch that fails to write is retried until it lands"""
+        audit_logger = self._make_logger(async_pipeline=True)
+        write_batch = audit_logger._write_batch
+        failures = [OSError("disk full")] * 6  # More than any fixed retry budget
+
+        def flaky_write(data):
+            if failures:
+                raise failures.pop()
+            write_batch(data)
+
+        with mock.patch.object(audit_logger, '_write_batch', side_effect=flaky_write), \
+                mock.patch('security.truly_immutable_audit_logger.time.sleep'):
+            self._log_concurrently(audit_logger, threads=2, events_per_thread=10)
+            self.assertTrue(audit_logger.flush(timeout=30))
+
+        intact, errors = audit_logger._verify_chain_integrity()
+        self.assertTrue(intact, errors)
+        self.assertEqual([e['sequence_number'] for e in self._read_entries()], list(range(1, 21)))
+        self.assertEqual(audit_logger.pipeline_stats['write_failures'], 6)
+        self.assertEqual(audit_logger.pipeline_stats['events_written'], 20)
+
+    def test_unserializable_event_fails_only_its_caller(self):
+        """Test: a bad event raises to its caller; other events are still written"""
+        from datetime import datetime
+
+        audit_logger = self._make_logger(async_pipeline=True)
+        audit_logger.log_event("u1", "document.read", "document", "1", True)
+        with self.assertRaises(ValueError):
+            audit_logger.log_event("u2", "document.read", "document", "2", True,
+                                   metadata={"at": datetime(2026, 1, 1)})
+        audit_logger.log_event("u3", "document.read", "document", "3", True)
+
+        # An event that still fails on the writer thread is skipped alone
+        audit_logger._queue.put({
+            "timestamp": "2026-01-01T00:00:00Z", "user_id": "u4", "action": "document.read",
+            "resource_type": "document", "resource_id": "4", "success": True,
+            "ip_address": None, "user_agent": None, "metadata": {"ids": {1, 2}}
+        })
+        audit_logger.log_event("u5", "document.read", "document", "5", True)
+        self.assertTrue(audit_logger.flush(timeout=30))
+
+        intact, errors = audit_logger._verify_chain_integrity()
+        self.assertTrue(intact, errors)
+        entries = self._read_entries()
+        self.assertEqual([e['user_id'] for e in entries], ["u1", "u3", "u5"])
+        self.assertEqual([e['sequence_number'] for e in entries], [1, 2, 3])
+
+    def _crash_mid_write(self):
+        """Write 20 entries, then leave a stale checkpoint and a torn last line"""
+        audit_logger = self._make_logger(async_pipeline=True, checkpoint_every=10_000)
+        self._log_concurrently(audit_logger, threads=2, events_per_thread=10)
+        audit_logger.close()
+
+        state_file = Path(self.tmpdir.name) / ".chain_state.json"
+        state_file.write_text(json.dumps({"last_sequence_number": 3, "last_hash": "0" * 64}))
+        log_file = sorted(Path(self.tmpdir.name).glob("audit_*.jsonl"))[-1]
+        with open(log_file, 'a') as f:
+            f.write('{"timestamp": "2026-01-01T00:00:00Z", "sequence_number": 21, "organiz')
+        return log_file
+
+    def test_restart_truncates_torn_tail(self):
+        """Test: a partially written last entry is cut instead of forking the chain"""
+        self._crash_mid_write()
+
+        restarted = self._make_logger()
+        restarted.log_event("after-restart", "document.read", "document", None, True)
+
+        intact, errors = restarted._verify_chain_integrity()
+        self.assertTrue(intact, errors)
+        entries = self._read_entries()
+        self.assertEqual([e['sequence_number'] for e in entries], list(range(1, 22)))
+        self.assertEqual(entries[-1]['user_id'], "after-restart")
+
+    def test_restart_refuses_untruncatable_torn_tail(self):
+        """Test: if the torn tail can't be cut (append-only), the logger won't start"""
+        log_file = self._crash_mid_write()
+        size = log_file.stat().st_size
+
+        with mock.patch('os.truncate', side_effect=PermissionError("append-only")):
+            with self.assertRaises(RuntimeError):
+                self._make_logger()
+        self.assertEqual(log_file.stat().st_size, size)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
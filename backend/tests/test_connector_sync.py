@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+CONNECTOR SYNC SCHEDULER TESTS
+Tests parallel Slack/GitHub syncs, per-source checkpoints and resume, and
+the adaptive rate limiter, with in-memory Slack and GitHub clients
+
+Run: python3 tests/test_connector_sync.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from connectors import github_connector
+from connectors.base_connector import ConnectorConfig, ConnectorStatus
+from connectors.github_connector import GitHubConnector
+from connectors.slack_connector import SlackConnector
+from connectors.sync_scheduler import AdaptiveRateLimiter, SyncCheckpoint, SyncScheduler
+
+
+class FakeSlackClient:
+    """WebClient surface used by SlackConnector"""
+
+    def __init__(self, channels=6, messages=5, latency=0.0):
+        self.latency = latency
+        self.channels = [
+            {"id": f"C{i}", "name": f"channel-{i}", "is_member": True} for i in range(channels)
+        ]
+        self.history = {
+            c["id"]: [{"ts": f"1700000{n:03d}.000100", "user": "U1", "text": f"{c['name']} message {n} <@U1>"}
+                      for n in range(messages)]
+            for c in self.channels
+        }
+        self.replies = {}  # Thread parent ts -> replies
+        self.failing = set()  # Channel ids raising on history
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def post(self, channel_id, n):
+        self.history[channel_id].append(
+            {"ts": f"1700001{n:03d}.000100", "user": "U1", "text": f"new {n}"}
+        )
+
+    def reply(self, channel_id, thread_ts, ts):
+        parent = next(m for m in self.history[channel_id] if m["ts"] == thread_ts)
+        parent["reply_count"] = parent.get("reply_count", 0) + 1
+        parent["latest_reply"] = ts
+        self.replies.setdefault(thread_ts, []).append(
+            {"ts": ts, "thread_ts": thread_ts, "user": "U1", "text": f"reply {ts}"}
+        )
+
+    def conversations_list(self, types, limit=None, cursor=None, exclude_archived=None):
+        self.calls.append(("conversations_list", cursor))
+        start = int(cursor or 0)
+        page = self.channels[start:start + 4]
+        more = start + 4 < len(self.channels)
+        return {"channels": page, "response_metadata": {"next_cursor": str(start + 4) if more else ""}}
+
+    def conversations_history(self, channel, limit, oldest=None, cursor=None):
+        with self.lock:
+            self.calls.append(("conversations_history", channel, oldest))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if channel in self.failing:
+                raise RuntimeError("connection reset")
+            messages = [m for m in self.history[channel] if oldest is None or float(m["ts"]) > float(oldest)]
+            return {"messages": sorted(messages, key=lambda m: m["ts"], reverse=True)[:limit], "has_more": False}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def conversations_replies(self, channel, ts, oldest=None):
+        self.calls.append(("conversations_replies", ts, oldest))
+        parent = next(m for m in self.history[channel] if m["ts"] == ts)
+        replies = [m for m in self.replies.get(ts, []) if oldest is None or float(m["ts"]) > float(oldest)]
+        return {"messages": [parent] + replies}
+
+    def users_info(self, user):
+        self.calls.append(("users_info", user))
+        return {"ok": True, "user": {"real_name": "Alice"}}
+
+
+def slack_connector(client, **settings):
+    connector = SlackConnector(ConnectorConfig(
+        connector_type="slack", user_id="u1",
+        credentials={"bot_token": "x"}, settings=settings
+    ))
+    connector.client = client
+    connector.status = ConnectorStatus.CONNECTED
+    return connector
+
+
+class TestSlackSync(unittest.TestCase):
+    """Test channel fan-out, cursors and resume"""
+
+    def test_parallel_sync_and_incremental_cursor(self):
+        client = FakeSlackClient(channels=8, latency=0.02)
+        connector = slack_connector(client, max_concurrent_channels=4)
+        saves = []
+        connector.checkpoint_hook = lambda: saves.append(True)
+
+        documents = asyncio.run(connector.sync())
+        self.assertEqual(len(documents), 40, connector.last_error)
+        self.assertEqual(connector.status, ConnectorStatus.CONNECTED)
+        self.assertGreater(client.max_active, 1)
+        self.assertLessEqual(client.max_active, 4)
+        self.assertIn("@Alice", documents[0].content)
+        self.assertEqual(len([c for c in client.calls if c[0] == "users_info"]), 1)  # Cached
+
+        cursors = connector.config.settings["sync_state"]["cursors"]
+        self.assertEqual(cursors["C3"], {"latest_ts": "1700000004.000100", "threads": {}})
+        self.assertNotIn("run", connector.config.settings["sync_state"])
+        self.assertEqual(saves, [])  # Saved by the caller once documents are stored
+
+        client.post("C3", 1)
+        client.calls.clear()
+        documents = asyncio.run(connector.sync())
+        self.assertEqual([d.metadata["message_ts"] for d in documents], ["1700001001.000100"])
+        oldest = {c[1]: c[2] for c in client.calls if c[0] == "conversations_history"}
+        self.assertEqual(oldest["C3"], "1700000004.000100")
+
+    def test_stream_checkpoints_each_channel(self):
+        client = FakeSlackClient(channels=3)
+        connector = slack_connector(client)
+        saves = []
+        connector.checkpoint_hook = lambda: saves.append(True)
+
+        async def consume():
+            return [document async for document in connector.stream()]
+
+        self.assertEqual(len(asyncio.run(consume())), 15)
+        self.assertGreaterEqual(len(saves), 5)  # Run start + one per channel + finish
+
+    def test_new_replies_to_older_threads(self):
+        now = time.time()
+        client = FakeSlackClient(channels=1, messages=0)
+        client.history["C0"] = [
+            {"ts": f"{now - 3600 + n:.6f}", "user": "U1", "text": f"message {n}"} for n in range(3)
+        ]
+        parent = client.history["C0"][0]["ts"]
+        client.reply("C0", parent, f"{now - 1800:.6f}")
+        connector = slack_connector(client)
+
+        documents = asyncio.run(connector.sync())
+        self.assertEqual(len(documents), 4)
+        cursor = connector.config.settings["sync_state"]["cursors"]["C0"]
+        self.assertEqual(cursor["threads"], {parent: f"{now - 1800:.6f}"})
+
+        # A reply to the oldest parent and one to a parent without replies
+        # yet, both behind the latest_ts checkpoint
+        client.reply("C0", parent, f"{now - 60:.6f}")
+        client.reply("C0", client.history["C0"][1]["ts"], f"{now - 30:.6f}")
+        client.calls.clear()
+        documents = asyncio.run(connector.sync())
+        self.assertEqual(
+            sorted(d.metadata["message_ts"] for d in documents),
+            [f"{now - 60:.6f}", f"{now - 30:.6f}"]
+        )
+        self.assertTrue(all(d.metadata["is_reply"] for d in documents))
+        replies = [c for c in client.calls if c[0] == "conversations_replies"]
+        self.assertIn(("conversations_replies", parent, f"{now - 1800:.6f}"), replies)
+
+        # Nothing new: parents are re-read but no thread is fetched again
+        client.calls.clear()
+        self.assertEqual(asyncio.run(connector.sync()), [])
+        self.assertFalse([c for c in client.calls if c[0] == "conversations_replies"])
+
+    def test_failed_channels_resume(self):
+        client = FakeSlackClient(channels=5)
+        client.failing = {"C2"}
+        connector = slack_connector(client)
+
+        documents = asyncio.run(connector.sync())
+        self.assertEqual(len(documents), 20)
+        self.assertIn("C2", connector.sync_stats["channels_failed"])
+        self.assertIn("run", connector.config.settings["sync_state"])
+
+        # Resumed run: only the unfinished channel is fetched
+        client.failing = set()
+        client.calls.clear()
+        documents = asyncio.run(connector.sync())
+        self.assertEqual({d.metadata["channel_id"] for d in documents}, {"C2"})
+        self.assertEqual(connector.sync_stats["channels_skipped"], 4)
+        self.assertEqual([c[1] for c in client.calls if c[0] == "conversations_history"], ["C2"])
+        self.assertNotIn("run", connector.config.settings["sync_state"])
+
+    def test_explicit_since_restarts(self):
+        client = FakeSlackClient(channels=2)
+        connector = slack_connector(client)
+        asyncio.run(connector.sync())
+
+        documents = asyncio.run(connector.sync(since=datetime.fromtimestamp(1699999999)))
+        self.assertEqual(len(documents), 10)
+
+
+class FakeGithubException(Exception):
+    """GithubException surface (status) for when PyGithub is not installed"""
+
+    def __init__(self, status, data=None):
+        super().__init__(status, data)
+        self.status = status
+
+
+GithubException = getattr(github_connector, "GithubException", FakeGithubException)
+
+
+class FakeRepo:
+    """PyGithub Repository surface used by GitHubConnector"""
+
+    def __init__(self, name, issues=3):
+        self.full_name = f"org/{name}"
+        self.name = name
+        self.owner = SimpleNamespace(login="org")
+        self.fork = False
+        self.pushed_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.issues = [self._issue(n, self.base + timedelta(days=n), comments=n % 2) for n in range(issues)]
+        self.calls = []
+
+    def _issue(self, number, updated, comments=0):
+        issue = SimpleNamespace(
+            number=number, title=f"Issue {number}", state="open", body="body",
+            created_at=updated, updated_at=updated, user=SimpleNamespace(login="bob"),
+            labels=[], comments=comments, html_url=f"https://example.com/{number}"
+        )
+        issue.get_comments = lambda: self.calls.append(("comments", number)) or [
+            SimpleNamespace(user=SimpleNamespace(login="carol"), body="comment")
+        ]
+        return issue
+
+    def get_readme(self):
+        self.calls.append(("readme",))
+        return SimpleNamespace(content="IyBSRUFETUU=", path="README.md", html_url="https://example.com/readme")
+
+    def get_issues(self, state, sort, direction, since=None):
+        self.calls.append(("issues", since))
+        issues = sorted(self.issues, key=lambda i: i.updated_at, reverse=True)
+        return [i for i in issues if since is None or i.updated_at >= since]
+
+    def get_pulls(self, state, sort, direction):
+        self.calls.append(("pulls",))
+        if getattr(self, "pulls_error", None):
+            raise GithubException(self.pulls_error, {"message": "error"})
+        return []
+
+    def get_contents(self, path):
+        self.calls.append(("contents", path))
+        return []
+
+
+class TestGitHubSync(unittest.TestCase):
+    """Test repo fan-out and since / pushed_at checkpoints"""
+
+    def make_connector(self, repos):
+        connector = GitHubConnector(ConnectorConfig(
+            connector_type="github", user_id="u1", credentials={"access_token": "x"},
+            settings={"repos": [r.full_name for r in repos]}
+        ))
+        by_name = {r.full_name: r for r in repos}
+        connector.client = SimpleNamespace(
+            get_repo=by_name.__getitem__,
+            rate_limiting=(4000, 5000),
+            rate_limiting_resettime=time.time() + 3600
+        )
+        connector.status = ConnectorStatus.CONNECTED
+        return connector
+
+    def test_incremental_repo_sync(self):
+        repos = [FakeRepo(f"r{i}") for i in range(3)]
+        connector = self.make_connector(repos)
+
+        documents = asyncio.run(connector.sync())
+        self.assertEqual(len(documents), 12, connector.last_error)  # README + 3 issues per repo
+        self.assertEqual(len([c for c in repos[0].calls if c[0] == "comments"]), 1)  # Only issue 1 has comments
+
+        cursor = connector.config.settings["sync_state"]["cursors"]["org/r0"]
+        self.assertEqual(cursor["pushed_at"], "2024-01-01T00:00:00+00:00")
+        self.assertEqual(cursor["updated_since"], "2024-01-03T00:00:00+00:00")
+
+        # Nothing pushed: README/code skipped, issues listed since the cursor
+        repos[0].issues.append(repos[0]._issue(7, repos[0].base + timedelta(days=7)))
+        for repo in repos:
+            repo.calls.clear()
+        documents = asyncio.run(connector.sync())
+        self.assertEqual([d.title for d in documents if d.title == "Issue #7: Issue 7"], ["Issue #7: Issue 7"])
+        self.assertNotIn(("readme",), repos[1].calls)
+        self.assertNotIn(("contents", ""), repos[1].calls)
+        self.assertEqual(repos[1].calls[0], ("issues", datetime(2024, 1, 3, tzinfo=timezone.utc)))
+
+
+    def test_failed_part_keeps_repo_checkpoint(self):
+        repos = [FakeRepo("r0"), FakeRepo("r1")]
+        connector = self.make_connector(repos)
+        repos[1].pulls_error = 502
+
+        with mock.patch.object(github_connector, "GithubException", GithubException, create=True):
+            asyncio.run(connector.sync())
+            state = connector.config.settings["sync_state"]
+            self.assertEqual(list(state["cursors"]), ["org/r0"])
+            self.assertEqual(connector.sync_stats["repos_failed"], {"org/r1": mock.ANY})
+            self.assertIn("run", state)  # Unfinished run: r1 is retried next time
+
+            repos[1].pulls_error = None
+            for repo in repos:
+                repo.calls.clear()
+            documents = asyncio.run(connector.sync())
+            self.assertEqual(repos[0].calls, [])  # Done last run
+            self.assertEqual(len(documents), 4)  # r1 README + 3 issues
+            self.assertIn("org/r1", state["cursors"])
+
+    def test_not_found_is_not_a_failure(self):
+        repo = FakeRepo("empty")
+        repo.pulls_error = 404
+        connector = self.make_connector([repo])
+
+        with mock.patch.object(github_connector, "GithubException", GithubException, create=True):
+            documents = asyncio.run(connector.sync())
+        self.assertEqual(len(documents), 4, connector.last_error)
+        self.assertIn("org/empty", connector.config.settings["sync_state"]["cursors"])
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """Test header-driven pacing"""
+
+    def test_retry_after_pauses_then_decays(self):
+        limiter = AdaptiveRateLimiter("test")
+        limiter.observe({"Retry-After": "0.1"}, status=429)
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertGreater(limiter.interval, 0)
+        for _ in range(40):
+            limiter.observe({})
+        self.assertEqual(limiter.interval, 0)
+        self.assertEqual(limiter.stats["throttled"], 1)
+
+    def test_low_quota_spreads_and_reserve_waits(self):
+        limiter = AdaptiveRateLimiter("test", reserve=5)
+        limiter.observe({"X-RateLimit-Remaining": 4000, "X-RateLimit-Limit": 5000,
+                         "X-RateLimit-Reset": time.time() + 100})
+        self.assertEqual(limiter.interval, 0)
+
+        limiter.observe({"X-RateLimit-Remaining": 100, "X-RateLimit-Limit": 5000,
+                         "X-RateLimit-Reset": time.time() + 100})
+        self.assertAlmostEqual(limiter.interval, 1.0, delta=0.05)
+
+        limiter.observe({"x-ratelimit-remaining": 5, "x-ratelimit-reset": time.time() + 0.1})
+        started = time.monotonic()
+        limiter.interval = 0
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+
+class TestCheckpointStore(unittest.TestCase):
+    """Test checkpoints persist through ConnectorManager's config store"""
+
+    def test_manager_persists_cursors(self):
+        from connectors.connector_manager import ConnectorManager
+
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = ConnectorManager(config_dir=Path(tmp))
+            connector = slack_connector(FakeSlackClient(channels=2))
+            manager._attach("u1_slack", connector)
+
+            result = asyncio.run(manager.sync_connector("u1", "slack"))
+            self.assertTrue(result["success"])
+
+            saved = json.loads((Path(tmp) / "u1_slack.json").read_text())
+            self.assertEqual(set(saved["settings"]["sync_state"]["cursors"]), {"C0", "C1"})
+            self.assertFalse(list(Path(tmp).glob("*.tmp")))
+
+    def test_scheduler_commits_after_sink(self):
+        config = ConnectorConfig(connector_type="x", user_id="u")
+        checkpoint = SyncCheckpoint(config)
+        delivered = []
+
+        def sink(source_id, docs):
+            if source_id == "b":
+                raise RuntimeError("sink down")
+            delivered.append(source_id)
+
+        with self.assertRaises(RuntimeError):
+            SyncScheduler(checkpoint, max_workers=1).run(
+                {"a": 1, "b": 2}, lambda source, cursor: ([], {"n": source}), sink
+            )
+        self.assertEqual(checkpoint.cursor("a"), {"n": 1})
+        self.assertEqual(checkpoint.cursor("b"), {})
+        self.assertEqual(checkpoint.begin(["a", "b"]), ["b"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+DOCUMENT DEDUPLICATION TESTS
+Tests grouping, best-version selection and output order on a small fixed
+corpus. Expected values were produced by the original dense N x N
+implementation, so the blocked similarity search must reproduce them.
+
+Run: python3 tests/test_deduplicate_documents.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import contextlib
+import io
+import json
+import tempfile
+import unittest
+
+try:
+    import sklearn  # noqa: F401
+    HAS_SKLEARN = True
+except ImportError:
+    HAS_SKLEARN = False
+
+
+BUDGET = ("Project Falcon budget review for the western region pipeline expansion. "
+          "Capital spend covers compressor stations, right of way and permitting. ")
+DESK_NOTES = ("Quarterly trading desk notes: gas storage injections ran ahead of plan, "
+              "weather hedges were rolled into the winter strip")
+
+CORPUS = [
+    {'content': BUDGET + "Total cost $XXXX with contingency (TBD). Margin TODO.",
+     'metadata': {'file_name': 'falcon_budget_draft.docx', 'date': '2023-11-02'}},
+    {'content': DESK_NOTES + ".", 'metadata': {'file_name': 'desk_notes_q3.txt'}},
+    {'content': '', 'metadata': {'file_name': 'empty_attachment.pdf'}},
+    {'content': BUDGET + "Total cost $4.2M with contingency of 12%. Margin 8.5%.",
+     'metadata': {'file_name': 'falcon_budget_final.docx', 'date': '2024-03-15'}},
+    {'content': DESK_NOTES + "!", 'metadata': {'file_name': 'desk_notes_q3_copy.txt'}},
+    {'content': '   \n', 'metadata': {}},
+    {'content': BUDGET + "Total cost $4.2M with contingency of 12%. Margin 8.5%.",
+     'metadata': {'file_name': 'falcon_budget_final_v2.docx', 'timestamp': '2025-01-10'}},
+    {'content': "Board offsite agenda: safety review, retail expansion, and the broadband unit.",
+     'metadata': {'file_name': 'offsite_agenda.txt'}},
+    {'content': '', 'metadata': {'file_name': 'empty_attachment_2.pdf'}},
+]
+
+# Output of the original implementation on CORPUS
+EXPECTED_GROUPS = [[0, 3, 6], [1, 4], [2], [5], [7], [8]]
+EXPECTED_KEPT = [1, 2, 5, 6, 7, 8]
+EXPECTED_LOG = [
+    {'kept': 'falcon_budget_final_v2.docx', 'rejected': 'falcon_budget_draft.docx',
+     'reason': 'Less complete version'},
+    {'kept': 'falcon_budget_final_v2.docx', 'rejected': 'falcon_budget_final.docx',
+     'reason': 'Less complete version'},
+    {'kept': 'desk_notes_q3.txt', 'rejected': 'desk_notes_q3_copy.txt',
+     'reason': 'Less complete version'},
+]
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with its progress output suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+@unittest.skipUnless(HAS_SKLEARN, "scikit-learn not installed")
+class TestDeduplicateDocuments(unittest.TestCase):
+    """Test grouping and selection match the original implementation"""
+
+    def test_groups_match_original(self):
+        """Test: near-duplicates group together, empty documents stay apart"""
+        from deduplicate_documents import find_similar_document_groups
+
+        self.assertEqual(quiet(find_similar_document_groups, CORPUS), EXPECTED_GROUPS)
+        # Row blocks smaller than the corpus give the same groups
+        self.assertEqual(quiet(find_similar_document_groups, CORPUS, block_size=2), EXPECTED_GROUPS)
+
+    def test_keeps_best_version_in_input_order(self):
+        """Test: most complete / newest version kept, earliest wins ties"""
+        from deduplicate_documents import deduplicate_documents
+
+        deduplicated, info = quiet(deduplicate_documents, CORPUS)
+
+        self.assertEqual(deduplicated, [CORPUS[i] for i in EXPECTED_KEPT])
+        self.assertEqual(info, {
+            'original_count': 9,
+            'deduplicated_count': 6,
+            'removed_count': 3,
+            'log': EXPECTED_LOG
+        })
+
+    def test_degenerate_corpora(self):
+        """Test: empty, single and vocabulary-free corpora"""
+        from deduplicate_documents import deduplicate_documents, find_similar_document_groups
+
+        self.assertEqual(quiet(find_similar_document_groups, []), [])
+        self.assertEqual(quiet(find_similar_document_groups, CORPUS[:1]), [[0]])
+
+        blank = [{'content': ''}, {'content': ' '}]
+        self.assertEqual(quiet(find_similar_document_groups, blank), [[0], [1]])
+        deduplicated, info = quiet(deduplicate_documents, blank)
+        self.assertEqual(deduplicated, blank)
+        self.assertEqual(info['removed_count'], 0)
+
+    def test_jsonl_groups_match_in_memory(self):
+        """Test: streamed JSONL grouping equals in-memory grouping"""
+        from deduplicate_documents import find_similar_groups_in_jsonl
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'docs.jsonl'
+            path.write_text(''.join(json.dumps(doc) + '\n' for doc in CORPUS))
+            self.assertEqual(quiet(find_similar_groups_in_jsonl, path), EXPECTED_GROUPS)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
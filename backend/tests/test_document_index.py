@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+DOCUMENT INDEX TESTS
+Tests the SQLite metadata index behind DocumentManager: statistics,
+paginated review / RAG listings, user decisions and backfill of existing
+classified files
+
+Run: python3 tests/test_document_index.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import tempfile
+import unittest
+
+from utils.document_index import DocumentIndex
+
+try:
+    from document_manager import DocumentManager
+    HAS_DOCUMENT_MANAGER = True
+except ImportError:  # Parser / classifier dependencies not installed
+    HAS_DOCUMENT_MANAGER = False
+
+
+def classified(doc_id, category, confidence=0.9, needs_review=False, user_id="alice", n=0):
+    return {
+        "doc_id": doc_id,
+        "filename": f"{doc_id}.pdf",
+        "user_id": user_id,
+        "content": f"content of {doc_id}",
+        "metadata": {"upload_time": f"2024-01-01T00:00:{n:02d}", "file_size": 100},
+        "classification": {"category": category, "confidence": confidence, "needs_review": needs_review}
+    }
+
+
+@unittest.skipUnless(HAS_DOCUMENT_MANAGER, "document_manager dependencies not installed")
+class TestDocumentManagerIndex(unittest.TestCase):
+    """Test DocumentManager listings and stats through the index"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.manager = self.make_manager(root)
+
+        self.docs = [
+            classified("alice_w1", "work", n=1),
+            classified("alice_w2", "work", needs_review=True, n=2),
+            classified("alice_w3", "work", n=3),
+            classified("alice_u1", "uncertain", 0.5, needs_review=True, n=4),
+            classified("alice_p1", "personal", 0.8, needs_review=True, n=5),
+            classified("alice_s1", "spam", 0.95, n=6),
+            classified("bob_w1", "work", user_id="bob", n=7),
+        ]
+        for doc in self.docs:
+            upload = self.manager.UPLOAD_FOLDER / doc["doc_id"]
+            upload.write_text("original")
+            doc["metadata"]["file_path"] = str(upload)
+            self.write(doc)
+
+    def tearDown(self):
+        self.manager.index.close()
+        self.tmp.cleanup()
+
+    def make_manager(self, root):
+        manager = DocumentManager.__new__(DocumentManager)  # Storage only, no API clients
+        manager.UPLOAD_FOLDER = root / "uploads"
+        manager.CLASSIFIED_FOLDER = root / "classified"
+        manager._init_storage()
+        return manager
+
+    def write(self, doc):
+        path = self.manager.CLASSIFIED_FOLDER / doc["classification"]["category"] / f"{doc['doc_id']}.json"
+        path.write_text(json.dumps(doc))
+        self.manager.index.upsert(doc)
+
+    def test_statistics(self):
+        stats = self.manager.get_statistics("alice")
+        self.assertEqual(stats, {
+            "total": 6,
+            "by_category": {"work": 3, "personal": 1, "uncertain": 1, "spam": 1},
+            "needs_review": 3,
+            "ready_for_rag": 2
+        })
+        self.assertEqual(self.manager.get_statistics("carol")["total"], 0)
+
+    def test_review_and_rag_listings_paginate(self):
+        review = self.manager.get_documents_for_review("alice")
+        self.assertEqual([d["doc_id"] for d in review], ["alice_w2", "alice_u1", "alice_p1"])
+        self.assertEqual(review[0]["content"], "content of alice_w2")  # Full document loaded
+
+        page = self.manager.get_documents_for_review("alice", limit=2, offset=2)
+        self.assertEqual([d["doc_id"] for d in page], ["alice_p1"])
+        self.assertEqual(self.manager.count_documents_for_review("alice"), 3)
+
+        ready = self.manager.get_documents_ready_for_rag("alice")
+        self.assertEqual([d["doc_id"] for d in ready], ["alice_w1", "alice_w3"])
+        self.assertEqual(self.manager.count_documents_ready_for_rag("bob"), 1)
+
+    def test_user_decision_updates_index(self):
+        self.assertTrue(self.manager.user_decision("alice_u1", "keep", "alice")["success"])
+        self.assertEqual(self.manager.index.get("alice_u1")["category"], "work")
+        self.assertFalse(self.manager.index.get("alice_u1")["needs_review"])
+        self.assertTrue((self.manager.CLASSIFIED_FOLDER / "work" / "alice_u1.json").exists())
+
+        self.assertTrue(self.manager.user_decision("alice_p1", "delete", "alice")["success"])
+        self.assertIsNone(self.manager.index.get("alice_p1"))
+        self.assertFalse((self.manager.UPLOAD_FOLDER / "alice_p1").exists())
+
+        stats = self.manager.get_statistics("alice")
+        self.assertEqual(stats["by_category"]["uncertain"], 0)
+        self.assertEqual(stats["ready_for_rag"], 3)
+        self.assertEqual(stats["total"], 5)
+
+    def test_file_removed_outside_manager_is_dropped(self):
+        (self.manager.CLASSIFIED_FOLDER / "work" / "alice_w1.json").unlink()
+        ready = self.manager.get_documents_ready_for_rag("alice")
+        self.assertEqual([d["doc_id"] for d in ready], ["alice_w3"])
+        self.assertIsNone(self.manager.index.get("alice_w1"))
+
+    def test_existing_files_backfilled(self):
+        self.manager.index.close()
+        for path in self.manager.CLASSIFIED_FOLDER.glob(DocumentManager.INDEX_FILENAME + "*"):
+            path.unlink()  # Database plus WAL files
+
+        self.manager = self.make_manager(Path(self.tmp.name))
+        self.assertEqual(self.manager.get_statistics("alice")["total"], 6)
+        self.assertEqual(self.manager.get_statistics("bob")["ready_for_rag"], 1)
+
+
+class TestDocumentIndex(unittest.TestCase):
+    """Test the index on its own"""
+
+    def test_upsert_keeps_created_at(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = DocumentIndex(Path(tmp) / "index.db")
+            doc = classified("d1", "uncertain", needs_review=True, n=1)
+            index.upsert(doc)
+
+            doc["classification"] = {"category": "work", "confidence": 1.0, "needs_review": False}
+            doc["metadata"]["upload_time"] = "2030-01-01T00:00:00"
+            index.upsert(doc)
+
+            row = index.get("d1")
+            self.assertEqual(row["category"], "work")
+            self.assertEqual(row["created_at"], "2024-01-01T00:00:01")
+            self.assertEqual(index.count("alice"), 1)
+            index.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+ENRON PARSER TESTS
+Tests the parallel maildir parser against the serial one, and streaming
+JSONL output (gzip, size rotation, lazy reading)
+
+Run: python3 tests/test_enron_parser.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import gzip
+import tempfile
+import unittest
+
+from data_processing.jsonl_io import JsonlWriter, iter_jsonl, jsonl_parts
+
+try:
+    from data_processing.enron_parser import EnronParser
+    HAS_PARSER = True
+except ImportError:  # tqdm not installed
+    HAS_PARSER = False
+
+
+def make_maildir(root: Path, employees=3, per_folder=7) -> Path:
+    maildir = root / "maildir"
+    n = 0
+    for e in range(employees):
+        for folder in ("inbox", "sent"):
+            directory = maildir / f"employee-{e}" / folder
+            directory.mkdir(parents=True)
+            for i in range(1, per_folder + 1):
+                n += 1
+                body = "" if i == per_folder else f"Body of message {n}\n\n\n\nwith   spacing"
+                (directory / f"{i}.").write_text(
+                    f"From: e{e}@enron.com\nTo: x@enron.com\nSubject: Message {n}\n"
+                    f"Date: Mon, 14 May 2001 16:39:00 -0700 (PDT)\n\n{body}"
+                )
+            (directory / ".hidden").write_text("skip")
+    return maildir
+
+
+class TestJsonlIO(unittest.TestCase):
+    """Test JsonlWriter and iter_jsonl"""
+
+    def test_rotated_gzip_parts_read_back_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "emails.jsonl"
+            with JsonlWriter(output, compress=True, max_bytes=200) as writer:
+                for n in range(20):
+                    writer.write({"doc_id": n, "content": "x" * 40})
+
+            self.assertGreater(len(writer.paths), 3)
+            self.assertEqual(writer.paths[0].name, "emails.00000.jsonl.gz")
+            with gzip.open(writer.paths[0], "rt") as f:
+                self.assertEqual(len(f.readlines()), 2)  # ~60 bytes per line
+
+            self.assertEqual([d["doc_id"] for d in iter_jsonl(output)], list(range(20)))
+            self.assertEqual(jsonl_parts(output), writer.paths)
+
+    def test_new_output_replaces_every_old_form(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "emails.jsonl"
+            with JsonlWriter(output, max_bytes=50) as writer:
+                writer.write_many({"n": n, "pad": "y" * 30} for n in range(5))
+            with JsonlWriter(output) as writer:
+                writer.write({"n": "fresh"})
+
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["emails.jsonl"])
+            self.assertEqual(list(iter_jsonl(output)), [{"n": "fresh"}])
+
+            with JsonlWriter(output, compress=True):
+                pass  # Empty output still replaces the old file
+            self.assertEqual(sorted(p.name for p in Path(tmp).iterdir()), ["emails.jsonl.gz"])
+            self.assertEqual(list(iter_jsonl(output)), [])
+
+    def test_missing_output_raises(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(FileNotFoundError):
+                list(iter_jsonl(Path(tmp) / "none.jsonl"))
+
+
+@unittest.skipUnless(HAS_PARSER, "tqdm not installed")
+class TestParallelParser(unittest.TestCase):
+    """Test the process-pool parser produces the serial parser's documents"""
+
+    def test_matches_serial_parse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            maildir = make_maildir(Path(tmp))
+            parser = EnronParser(str(maildir))
+            serial = parser.parse_all_emails()
+
+            output = Path(tmp) / "out" / "enron_emails.jsonl"
+            stats = parser.parse_all_emails_parallel(
+                str(output), workers=2, shard_size=4, max_bytes=2000
+            )
+
+            parallel = list(iter_jsonl(output))
+            self.assertEqual(len(parallel), 36)  # 42 files, 6 with empty bodies
+            self.assertEqual(sorted(parallel, key=lambda d: d["doc_id"]),
+                             sorted(serial, key=lambda d: d["doc_id"]))
+            self.assertGreater(len(stats["output_files"]), 1)
+            self.assertEqual(stats["files_scanned"], 42)
+            self.assertEqual(stats["files_failed"], 0)
+            self.assertEqual(stats["emails_per_employee"],
+                             {"employee-0": 12, "employee-1": 12, "employee-2": 12})
+            self.assertEqual(stats["folders"], ["inbox", "sent"])
+
+    def test_limit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            maildir = make_maildir(Path(tmp), employees=1)
+            stats = EnronParser(str(maildir)).parse_all_emails_parallel(
+                str(Path(tmp) / "out.jsonl"), workers=1, limit=5, shard_size=2
+            )
+            self.assertEqual(stats["files_scanned"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+EXPIRING COUNTER STORE TESTS
+Tests the bounded in-process store behind the rate limiter and JWT
+blacklist fallbacks
+
+Run: python3 tests/test_expiring_counter_store.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import unittest
+from unittest import mock
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestExpiringCounterStore(unittest.TestCase):
+    """Test TTL expiry, sliding windows and the key cap"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('security.expiring_counter_store.time.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        from security.expiring_counter_store import ExpiringCounterStore
+        self.store = ExpiringCounterStore(max_keys=1000, wheel_slots=64)
+
+    def test_counter_expires(self):
+        """Test: counters reset after their TTL"""
+        self.assertEqual(self.store.incr('k', ttl=10), 1)
+        self.assertEqual(self.store.incr('k', ttl=10), 2)
+
+        self.clock.now += 11
+        self.assertEqual(self.store.get('k'), 0)
+
+    def test_time_wheel_reclaims_idle_keys(self):
+        """Test: expired keys are dropped without being accessed again"""
+        for i in range(500):
+            self.store.set(f'ip{i}', 1, ttl=5)
+        self.store.set('long', 1, ttl=200)  # Beyond one wheel rotation
+
+        self.clock.now += 6
+        self.store.get('other')  # Any operation advances the wheel
+
+        self.assertEqual(len(self.store), 1)
+        self.clock.now += 100
+        self.store.get('other')
+        self.assertTrue(self.store.contains('long'))
+
+    def test_key_cap_evicts_least_recently_used(self):
+        """Test: a flood of unique keys stays within max_keys"""
+        self.store.set('hot', 1, ttl=3600)
+        for i in range(5000):
+            self.store.incr(f'flood{i}', ttl=3600)
+            if i % 100 == 0:
+                self.store.get('hot')
+
+        self.assertEqual(len(self.store), 1000)
+        self.assertTrue(self.store.contains('hot'))
+        self.assertEqual(self.store.stats()['evictions'], 4001)
+
+    def test_sliding_window(self):
+        """Test: window total drops as buckets leave the window"""
+        for _ in range(10):
+            self.store.window_add('w', window=60)
+        self.clock.now += 30
+        for _ in range(5):
+            self.store.window_add('w', window=60)
+
+        self.assertEqual(self.store.window_total('w', window=60), 15)
+        self.clock.now += 35
+        self.assertEqual(self.store.window_total('w', window=60), 5)
+        self.clock.now += 60
+        self.assertEqual(self.store.window_total('w', window=60), 0)
+
+    def test_api_rate_limiter_bounded(self):
+        """Test: auth0 RateLimiter limits per key and caps tracked keys"""
+        from auth.auth0_handler import RateLimiter
+
+        limiter = RateLimiter(requests_per_minute=3, max_keys=100)
+        self.assertEqual([limiter.check_rate_limit('a') for _ in range(5)],
+                         [True, True, True, False, False])
+        for i in range(1000):
+            limiter.check_rate_limit(f'10.0.{i // 256}.{i % 256}')
+        self.assertEqual(len(limiter._requests), 100)
+
+        self.clock.now += 61
+        self.assertTrue(limiter.check_rate_limit('a'))
+
+    def test_blacklist_fallback_expires_with_token(self):
+        """Test: fallback blacklist entries expire instead of accumulating"""
+        from security.jwt_blacklist_manager import JWTBlacklistManager
+
+        with mock.patch.object(JWTBlacklistManager, '_initialize_redis'):
+            manager = JWTBlacklistManager()
+        with mock.patch.object(manager, '_get_ttl_for_token', return_value=120):
+            manager.blacklist_token('token-1', user_id='u1')
+
+        self.assertTrue(manager.is_blacklisted('token-1'))
+        self.clock.now += 121
+        self.assertFalse(manager.is_blacklisted('token-1'))
+
+    def test_blacklist_fallback_fails_closed_when_full(self):
+        """Test: evicting a revoked token rejects every token until it expires"""
+        from security.jwt_blacklist_manager import BlacklistConfig, JWTBlacklistManager
+
+        with mock.patch.object(JWTBlacklistManager, '_initialize_redis'):
+            manager = JWTBlacklistManager(BlacklistConfig(max_local_entries=2))
+        with mock.patch.object(manager, '_get_ttl_for_token', return_value=120), \
+                mock.patch('security.jwt_blacklist_manager.SecurityIncident.trigger') as incident:
+            for token in ('token-1', 'token-2'):
+                manager.blacklist_token(token, user_id='u1')
+            self.assertFalse(manager.is_blacklisted('valid-token'))
+
+            manager.blacklist_token('token-3', user_id='u1')  # Evicts token-1
+        self.assertEqual(incident.call_count, 1)
+
+        self.assertTrue(manager.is_blacklisted('token-1'))
+        self.assertTrue(manager.is_blacklisted('valid-token'))
+        self.clock.now += 121
+        self.assertFalse(manager.is_blacklisted('token-1'))
+        self.assertFalse(manager.is_blacklisted('valid-token'))
+
+    def test_eviction_callback(self):
+        """Test: on_evict sees each key the cap evicts"""
+        from security.expiring_counter_store import ExpiringCounterStore
+
+        evicted = []
+        store = ExpiringCounterStore(max_keys=2, on_evict=lambda *args: evicted.append(args))
+        for key in ('a', 'b', 'c'):
+            store.set(key, key.upper(), ttl=60)
+        self.assertEqual(evicted, [('a', 'A', self.clock.now + 60)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
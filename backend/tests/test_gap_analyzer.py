@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+GAP ANALYZER TESTS
+Tests concurrent analyze_all_projects: per-project checkpoints, skipping
+unchanged projects, resuming after failures, and streamed summaries
+
+Run: python3 tests/test_gap_analyzer.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import re
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.llm_batch import LLMBatchExecutor
+
+try:
+    from gap_analysis.gap_analyzer import GapAnalyzer
+    HAS_ANALYZER = True
+except ImportError:  # openai not installed
+    HAS_ANALYZER = False
+
+
+class FakeLLM:
+    """Returns a gap analysis naming the prompt's project; can fail per project"""
+
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.projects = []
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, prompt, max_tokens):
+        project = re.search(r'^Project: (.*)$', prompt, re.MULTILINE).group(1)
+        with self.lock:
+            self.projects.append(project)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if project in self.fail:
+            raise ValueError(f"model error for {project}")
+        answer = {
+            "missing_document_types": ["spec"],
+            "knowledge_gaps": [f"gap in {project}"],
+            "context_gaps": [],
+            "questions": [{"question": f"Why {project}?", "category": "context",
+                           "priority": "high", "reasoning": "r"}]
+        }
+        return json.dumps(answer), {}
+
+
+def write_project(employee_dir: Path, name: str, count: int, text="Status update"):
+    with open(employee_dir / f"{name}.jsonl", 'w', encoding='utf-8') as f:
+        for n in range(count):
+            f.write(json.dumps({
+                "content": f"{text} {n} from Jane Smith",
+                "metadata": {"subject": f"{name} {n}", "timestamp": f"2001-05-{n % 28 + 1:02d}"}
+            }) + "\n")
+
+
+@unittest.skipUnless(HAS_ANALYZER, "gap analyzer dependencies not installed")
+class TestAnalyzeAllProjects(unittest.TestCase):
+    """Test concurrent, checkpointed gap analysis"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.clusters = root / "project_clusters"
+        self.output = root / "gap_analysis"
+
+        for employee, projects in (("alice", ["billing", "trading", "empty"]), ("bob", ["audit", "ops"])):
+            employee_dir = self.clusters / employee
+            employee_dir.mkdir(parents=True)
+            for project in projects:
+                write_project(employee_dir, project, 0 if project == "empty" else 12)
+            (employee_dir / "metadata.json").write_text(
+                json.dumps({"projects": {p: {} for p in projects + ["missing_file"]}})
+            )
+        (self.clusters / "carol").mkdir()  # No metadata
+
+        self.llm = FakeLLM()
+        self.analyzer = self.make_analyzer(self.llm)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_analyzer(self, llm):
+        analyzer = GapAnalyzer(api_key="test", endpoint="https://example.invalid", deployment="gpt", use_cache=False)
+        analyzer.llm_executor = LLMBatchExecutor(llm, model="gpt", template_version="test", base_delay=0.01)
+        return analyzer
+
+    def run_analysis(self, **kwargs):
+        return self.analyzer.analyze_all_projects(str(self.clusters), str(self.output), **kwargs)
+
+    def test_concurrent_run_writes_checkpoints_and_outputs(self):
+        results = self.run_analysis(max_workers=4)
+
+        self.assertGreater(self.llm.peak, 1)
+        self.assertEqual(sorted(self.llm.projects), ["audit", "billing", "ops", "trading"])
+        self.assertEqual(list(results["alice"]), ["billing", "trading", "empty"])
+        self.assertEqual(results["alice"]["billing"]["knowledge_gaps"], ["gap in billing"])
+        self.assertEqual(results["alice"]["empty"]["questions"], [])
+        self.assertEqual(results["carol"], {})
+
+        saved = json.loads((self.output / "alice_gaps.json").read_text())
+        self.assertEqual(saved, results["alice"])
+        self.assertTrue((self.output / "carol_gaps.json").exists())
+        summary = json.loads((self.output / "gap_analysis_summary.json").read_text())
+        self.assertEqual(summary["total_projects_analyzed"], 5)
+
+        checkpoint = json.loads((self.output / "checkpoints" / "bob" / "ops.json").read_text())
+        self.assertEqual(checkpoint["result"], results["bob"]["ops"])
+        self.assertEqual(len(checkpoint["documents_hash"]), 64)
+
+    def test_unchanged_projects_are_skipped(self):
+        first = self.run_analysis()
+        write_project(self.clusters / "bob", "ops", 13)  # One more document
+
+        self.llm.projects.clear()
+        second = self.run_analysis()
+        self.assertEqual(self.llm.projects, ["ops"])
+        self.assertEqual(second["alice"], first["alice"])
+
+        self.llm.projects.clear()
+        self.run_analysis(force=True)
+        self.assertEqual(len(self.llm.projects), 4)
+
+    def test_failed_projects_are_retried_next_run(self):
+        self.analyzer = self.make_analyzer(FakeLLM(fail={"trading"}))
+        results = self.run_analysis()
+        self.assertNotIn("knowledge_gaps", results["alice"]["trading"])
+        self.assertFalse((self.output / "checkpoints" / "alice" / "trading.json").exists())
+
+        self.analyzer = self.make_analyzer(self.llm)
+        results = self.run_analysis()
+        self.assertEqual(self.llm.projects, ["trading"])
+        self.assertEqual(results["alice"]["trading"]["knowledge_gaps"], ["gap in trading"])
+
+    def test_streamed_prompt_matches_in_memory_prompt(self):
+        prompts = []
+        llm = FakeLLM(delay=0)
+        self.analyzer = self.make_analyzer(lambda prompt, tokens: (prompts.append(prompt), llm(prompt, tokens))[1])
+        self.run_analysis(max_workers=1)
+        streamed = next(p for p in prompts if "Project: billing" in p)
+
+        with open(self.clusters / "alice" / "billing.jsonl", encoding='utf-8') as f:
+            documents = [json.loads(line) for line in f]
+        prompts.clear()
+        self.analyzer.analyze_project_gaps({"project_name": "billing", "documents": documents})
+        self.assertEqual(prompts, [streamed])
+        self.assertIn("Total documents: 12", streamed)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+GMAIL SYNC TESTS
+Tests batched fetching, cross-label dedupe, historyId incremental sync and
+the connector end to end against a local fake Gmail API server
+
+Run: python3 tests/test_gmail_sync.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import base64
+import json
+import re
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from connectors.gmail_sync import GmailAPIClient, GmailSyncEngine, parse_batch_response
+
+
+class FakeGmail:
+    """In-memory mailbox served over HTTP (users/me endpoints + batch)"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.messages = {}  # id -> (labels, subject)
+        self.history = []  # (history_id, message_id, labels)
+        self.history_id = 1000
+        self.oldest_history_id = 1000
+        self.throttle_parts = set()  # Message ids answering 429 once
+        self.failing_parts = set()  # Message ids answering 503 until removed
+        self.token = "good-token"
+        self.requests = []  # (method, path)
+        self.lock = threading.Lock()
+
+    def add(self, message_id, labels, subject=None):
+        with self.lock:
+            self.history_id += 1
+            self.messages[message_id] = (labels, subject or f"Subject {message_id}")
+            self.history.append((self.history_id, message_id, labels))
+
+    def message_json(self, message_id):
+        labels, subject = self.messages[message_id]
+        body = base64.urlsafe_b64encode(f"Body of {message_id}".encode()).decode()
+        return {
+            "id": message_id, "threadId": f"t{message_id}", "labelIds": labels,
+            "snippet": subject, "internalDate": "1700000000000",
+            "payload": {
+                "mimeType": "text/plain",
+                "headers": [
+                    {"name": "Subject", "value": subject},
+                    {"name": "From", "value": "Alice <alice@example.com>"},
+                    {"name": "To", "value": "bob@example.com"},
+                    {"name": "Date", "value": "Tue, 14 Nov 2023 22:13:20 +0000"},
+                ],
+                "body": {"data": body},
+            },
+        }
+
+    def handle_get(self, path, params):
+        """(status, payload) for a users/me GET"""
+        path = path[len("/gmail/v1/users/me/"):]
+        if path == "profile":
+            return 200, {"emailAddress": "me@example.com", "historyId": str(self.history_id)}
+        if path == "messages":
+            label = params["labelIds"][0]
+            ids = sorted((m for m, (labels, _) in self.messages.items() if label in labels), reverse=True)
+            start = int(params.get("pageToken", ["0"])[0])
+            size = int(params.get("maxResults", ["100"])[0])
+            page = {"messages": [{"id": m} for m in ids[start:start + size]]}
+            if start + size < len(ids):
+                page["nextPageToken"] = str(start + size)
+            return 200, page
+        if path.startswith("messages/"):
+            message_id = path.split("/", 1)[1]
+            with self.lock:
+                if message_id in self.throttle_parts:
+                    self.throttle_parts.discard(message_id)
+                    return 429, {"error": "rate limited"}
+                if message_id in self.failing_parts:
+                    return 503, {"error": "backend error"}
+            if message_id not in self.messages:
+                return 404, {"error": "not found"}
+            return 200, self.message_json(message_id)
+        if path == "history":
+            start = int(params["startHistoryId"][0])
+            if start < self.oldest_history_id:
+                return 404, {"error": "history expired"}
+            records = [
+                {"id": str(h), "messagesAdded": [{"message": {"id": m, "labelIds": labels}}]}
+                for h, m, labels in self.history if h > start
+            ]
+            return 200, {"history": records, "historyId": str(self.history_id)}
+        return 404, {"error": "unknown path"}
+
+    def handle_batch(self, content_type, body):
+        """multipart/mixed of GETs -> multipart/mixed of responses"""
+        boundary = re.search(r'boundary=([^;]+)', content_type).group(1)
+        out = []
+        for part in body.split(f"--{boundary}".encode())[1:]:
+            if part.startswith(b"--"):
+                break
+            headers, _, request_line = part.strip().replace(b"\r\n", b"\n").partition(b"\n\n")
+            content_id = re.search(rb"Content-ID: <([^>]+)>", headers).group(1).decode()
+            method, url = request_line.decode().split()[:2]
+            parsed = urlparse(url)
+            status, payload = self.handle_get(parsed.path, parse_qs(parsed.query))
+            out.append(
+                f"--resp\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n{json.dumps(payload)}\r\n"
+            )
+        return ("".join(out) + "--resp--\r\n").encode()
+
+    def serve(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self):
+                if self.headers.get("Authorization") != f"Bearer {fake.token}":
+                    self._reply(401, b'{"error": "invalid token"}')
+                    return False
+                return True
+
+            def do_GET(self):
+                if fake.latency:
+                    threading.Event().wait(fake.latency)
+                parsed = urlparse(self.path)
+                with fake.lock:
+                    fake.requests.append(("GET", parsed.path))
+                if self._authorized():
+                    status, payload = fake.handle_get(parsed.path, parse_qs(parsed.query))
+                    self._reply(status, json.dumps(payload).encode())
+
+            def do_POST(self):
+                if fake.latency:
+                    threading.Event().wait(fake.latency)
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with fake.lock:
+                    fake.requests.append(("POST", self.path))
+                if self._authorized():
+                    self._reply(
+                        200, fake.handle_batch(self.headers["Content-Type"], body),
+                        "multipart/mixed; boundary=resp"
+                    )
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_mailbox(fake, inbox=60, sent=20, both=10):
+    for i in range(inbox):
+        fake.add(f"in{i:03d}", ["INBOX"])
+    for i in range(sent):
+        fake.add(f"se{i:03d}", ["SENT"])
+    for i in range(both):
+        fake.add(f"bo{i:03d}", ["INBOX", "SENT", "IMPORTANT"])
+
+
+class GmailFakeServerTest(unittest.TestCase):
+    def setUp(self):
+        self.fake = FakeGmail()
+        make_mailbox(self.fake)
+        self.base_url = self.fake.serve()
+        self.client = GmailAPIClient(lambda: self.fake.token, base_url=self.base_url, backoff=0)
+
+    def tearDown(self):
+        self.fake.shutdown()
+
+
+class TestGmailSyncEngine(GmailFakeServerTest):
+    """Test full / incremental runs"""
+
+    def test_full_sync_batches_and_dedupes(self):
+        engine = GmailSyncEngine(self.client, batch_size=25, max_workers=3)
+        result = engine.run(["INBOX", "SENT"], max_results=500)
+
+        self.assertEqual(result.mode, "full")
+        self.assertEqual(len(result.messages), 90)
+        labels = {m["id"]: l for m, l in result.messages}
+        self.assertEqual(labels["bo000"], ["INBOX", "SENT"])
+        self.assertEqual(result.stats["duplicates_skipped"], 10)
+        self.assertEqual(result.history_id, str(self.fake.history_id))
+
+        # 90 messages in 25-message batches: 4 POSTs, no per-message GETs
+        posts = [p for m, p in self.fake.requests if m == "POST"]
+        gets = [p for m, p in self.fake.requests if p.startswith("/gmail/v1/users/me/messages/")]
+        self.assertEqual(len(posts), 4)
+        self.assertEqual(gets, [])
+        self.assertGreater(result.stats["messages_per_second"], 0)
+
+    def test_incremental_sync_fetches_only_new_messages(self):
+        engine = GmailSyncEngine(self.client)
+        first = engine.run(["INBOX", "SENT"], max_results=500)
+
+        self.fake.add("new001", ["INBOX"])
+        self.fake.add("new002", ["SENT", "INBOX"])
+        self.fake.add("spam01", ["SPAM", "INBOX"])
+        self.fake.add("other1", ["CATEGORY_PROMOTIONS"])
+
+        second = engine.run(["INBOX", "SENT"], history_id=first.history_id)
+        self.assertEqual(second.mode, "incremental")
+        self.assertEqual([(m["id"], l) for m, l in second.messages], [
+            ("new001", ["INBOX"]), ("new002", ["INBOX", "SENT"])
+        ])
+        self.assertEqual(second.history_id, str(self.fake.history_id))
+
+        third = engine.run(["INBOX", "SENT"], history_id=second.history_id)
+        self.assertEqual(third.messages, [])
+        self.assertEqual(third.stats["http_requests"], 1)  # history.list only
+
+    def test_expired_history_falls_back_to_full_sync(self):
+        self.fake.oldest_history_id = 2000
+        result = GmailSyncEngine(self.client).run(["INBOX"], history_id="1500", max_results=500)
+        self.assertEqual(result.mode, "full")
+        self.assertEqual(len(result.messages), 70)
+
+    def test_throttled_parts_are_retried(self):
+        self.fake.throttle_parts = {"in001", "se005", "bo002"}
+        engine = GmailSyncEngine(self.client, batch_size=50)
+        result = engine.run(["INBOX", "SENT"], max_results=500)
+        self.assertEqual(len(result.messages), 90)
+        self.assertEqual(result.stats["messages_failed"], 0)
+
+    def test_concurrent_single_gets(self):
+        engine = GmailSyncEngine(self.client, use_batch=False, max_workers=8)
+        result = engine.run(["SENT"], max_results=500)
+        self.assertEqual(sorted(m["id"] for m, _ in result.messages),
+                         sorted([f"se{i:03d}" for i in range(20)] + [f"bo{i:03d}" for i in range(10)]))
+
+    def test_token_refreshed_once_on_401(self):
+        refreshed = []
+
+        def refresh():
+            refreshed.append(True)
+            self.token = "good-token"
+            return True
+
+        self.token = "stale-token"
+        client = GmailAPIClient(lambda: self.token, refresh_token=refresh, base_url=self.base_url)
+        self.assertEqual(client.get_profile()["emailAddress"], "me@example.com")
+        self.assertEqual(len(refreshed), 1)
+
+    def test_parse_batch_response(self):
+        body = (
+            b"--b\r\nContent-Type: application/http\r\nContent-ID: <response-item-1>\r\n\r\n"
+            b"HTTP/1.1 404 Not Found\r\n\r\n{}\r\n--b--\r\n"
+        )
+        self.assertEqual(list(parse_batch_response('multipart/mixed; boundary="b"', body)),
+                         [("response-item-1", 404, b"{}")])
+
+
+class TestGmailConnector(GmailFakeServerTest):
+    """Test the connector persists historyId between syncs"""
+
+    def test_sync_blocking_end_to_end(self):
+        from connectors.base_connector import ConnectorConfig
+        from connectors.gmail_connector import GmailConnector
+
+        config = ConnectorConfig(
+            connector_type="gmail", user_id="u1",
+            credentials={"access_token": "good-token"},
+            settings={"api_base_url": self.base_url, "max_results": 500}
+        )
+        connector = GmailConnector(config)
+        documents = connector.sync_blocking()
+
+        self.assertEqual(len(documents), 90, connector.last_error)
+        doc = next(d for d in documents if d.doc_id == "gmail_bo000")
+        self.assertEqual(doc.metadata["labels"], ["INBOX", "SENT"])
+        self.assertIn("Body of bo000", doc.content)
+        self.assertEqual(config.settings["history_id"], str(self.fake.history_id))
+        self.assertEqual(connector.sync_stats["mode"], "full")
+
+        self.fake.add("new001", ["INBOX"])
+        documents = connector.sync_blocking()
+        self.assertEqual([d.doc_id for d in documents], ["gmail_new001"])
+        self.assertEqual(connector.sync_stats["mode"], "incremental")
+
+    def test_failed_messages_are_fetched_next_sync(self):
+        from connectors.base_connector import ConnectorConfig
+        from connectors.gmail_connector import GmailConnector
+
+        config = ConnectorConfig(
+            connector_type="gmail", user_id="u1",
+            credentials={"access_token": "good-token"},
+            settings={"api_base_url": self.base_url, "max_results": 500}
+        )
+        connector = GmailConnector(config)
+        connector.connect_blocking()
+        connector.service.backoff = 0
+
+        self.fake.failing_parts = {"in003", "bo001"}
+        documents = connector.sync_blocking()
+        self.assertEqual(len(documents), 88, connector.last_error)
+        self.assertEqual(config.settings["pending_messages"], {"in003": ["INBOX"], "bo001": ["INBOX", "SENT"]})
+
+        # The historyId moved on, but the failed messages are retried
+        self.fake.failing_parts = set()
+        self.fake.add("new001", ["INBOX"])
+        documents = connector.sync_blocking()
+        self.assertEqual(sorted(d.doc_id for d in documents), ["gmail_bo001", "gmail_in003", "gmail_new001"])
+        self.assertEqual(next(d for d in documents if d.doc_id == "gmail_bo001").metadata["labels"],
+                         ["INBOX", "SENT"])
+        self.assertNotIn("pending_messages", config.settings)
+        self.assertEqual(connector.sync_stats["mode"], "incremental")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
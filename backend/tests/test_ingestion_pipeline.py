@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+INGESTION PIPELINE TESTS
+Tests connector streaming, the staged ingestion pipeline (sanitize,
+classify, chunk, embed, index) with bounded queues, and the live index writer
+
+Run: python3 tests/test_ingestion_pipeline.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncio
+import json
+import pickle
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from connectors.base_connector import ConnectorConfig, Document, MockConnector
+from connectors.connector_manager import ConnectorManager
+from connectors.ingestion_pipeline import (
+    ChunkStage, ClassifyStage, EmbedStage, IndexAppendStage, IngestionPipeline,
+    PipelineStage, SanitizeStage
+)
+from rag.index_writer import EmbeddingIndexWriter
+from tests.test_connector_sync import FakeSlackClient, slack_connector
+
+
+def fake_embed(texts):
+    return [[float(len(text)), 1.0, 0.0] for text in texts]
+
+
+class FakeClassifier:
+    """classify_document surface of WorkPersonalClassifier"""
+
+    def classify_document(self, document):
+        personal = "lunch" in document["content"]
+        return {
+            "category": "personal" if personal else "work",
+            "confidence": 0.9,
+            "action": "remove" if personal else "keep"
+        }
+
+
+class SlowStage(PipelineStage):
+    """Pass-through that blocks until released"""
+
+    name = "slow"
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def process(self, item):
+        self.release.wait(5)
+        return [item]
+
+
+class FailingCloseStage(PipelineStage):
+    """Pass-through whose final flush fails, so pipeline.run() raises"""
+
+    name = "failing_close"
+
+    def close(self):
+        raise OSError("index volume full")
+
+
+def document(n, content):
+    return Document(doc_id=f"d{n}", source="test", content=content, title=f"Doc {n}")
+
+
+async def aiter(items):
+    for item in items:
+        yield item
+
+
+class TestConnectorStream(unittest.TestCase):
+    """Test BaseConnector.stream()"""
+
+    def test_streams_slack_documents(self):
+        connector = slack_connector(FakeSlackClient(channels=4), max_concurrent_channels=2)
+
+        async def collect():
+            return [d async for d in connector.stream(max_buffered=3)]
+
+        documents = asyncio.run(collect())
+        self.assertEqual(len(documents), 20, connector.last_error)
+        self.assertEqual(len(connector.config.settings["sync_state"]["cursors"]), 4)
+
+    def test_default_streaming_sync_emits_batch_result(self):
+        connector = MockConnector(ConnectorConfig(connector_type="mock", user_id="u1"))
+        emitted = []
+        connector._sync_streaming(None, emitted.extend)
+        self.assertEqual([d.doc_id for d in emitted], ["mock_1"])
+
+    def test_falls_back_to_sync(self):
+        connector = MockConnector(ConnectorConfig(connector_type="mock", user_id="u1"))
+
+        async def collect():
+            return [d.doc_id async for d in connector.stream()]
+
+        self.assertEqual(asyncio.run(collect()), ["mock_1"])
+
+    def test_early_close_cancels_sync(self):
+        client = FakeSlackClient(channels=6, messages=10)
+        connector = slack_connector(client, max_concurrent_channels=1)
+
+        async def first_two():
+            stream = connector.stream(max_buffered=2)
+            taken = [await stream.__anext__(), await stream.__anext__()]
+            await stream.aclose()
+            await asyncio.sleep(0.2)  # Let the producer thread unwind
+            return taken
+
+        self.assertEqual(len(asyncio.run(first_two())), 2)
+        state = connector.config.settings["sync_state"]
+        self.assertEqual(state["cursors"], {})  # Undelivered channels never committed
+        self.assertIn("run", state)
+        self.assertIsNone(connector.last_error)
+
+
+class TestIngestionPipeline(unittest.TestCase):
+    """Test stages, batching, drops and backpressure"""
+
+    def test_end_to_end_into_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = EmbeddingIndexWriter({}, Path(tmp) / "index.pkl")
+            pipeline = IngestionPipeline([
+                SanitizeStage(),
+                ClassifyStage(FakeClassifier()),
+                ChunkStage(chunk_size=200, overlap=20),
+                EmbedStage(embed_fn=fake_embed, batch_size=4, max_wait=0.05),
+                IndexAppendStage(writer, batch_size=8, max_wait=0.05)
+            ], queue_size=4)
+
+            documents = [
+                document(n, f"Quarterly roadmap review {n}, contact jane@example.com. " * 10)
+                for n in range(10)
+            ] + [document(99, "Anyone up for lunch on Friday? " * 5)]
+            stats = asyncio.run(pipeline.run(aiter(documents)))
+
+            self.assertEqual(stats["items_read"], 11)
+            self.assertEqual(stats["stages"][1]["out"], 10)  # Personal document dropped
+            self.assertEqual(stats["items_output"], len(writer))
+            self.assertEqual(len(writer), stats["stages"][2]["out"])
+            self.assertGreater(len(writer), 10)  # Several chunks per document
+            self.assertIsNotNone(stats["first_output_seconds"])
+
+            chunks, embeddings = writer.snapshot()
+            self.assertEqual(embeddings.shape, (len(writer), 3))
+            self.assertNotIn("jane@example.com", chunks[0]["content"])
+            self.assertGreater(chunks[0]["metadata"]["pii_redactions"], 0)
+            self.assertEqual(chunks[0]["metadata"]["classification"]["category"], "work")
+            self.assertNotIn("d99", writer.index["doc_ids"])
+
+            with open(Path(tmp) / "index.pkl", "rb") as f:
+                self.assertEqual(len(pickle.load(f)["chunks"]), len(writer))
+
+    def test_failed_batch_is_counted_and_skipped(self):
+        calls = []
+
+        def flaky_embed(texts):
+            calls.append(len(texts))
+            if len(calls) == 1:
+                raise RuntimeError("rate limited")
+            return fake_embed(texts)
+
+        writer = EmbeddingIndexWriter({})
+        pipeline = IngestionPipeline([
+            ChunkStage(chunk_size=1000),
+            EmbedStage(embed_fn=flaky_embed, batch_size=2, max_wait=0.01, workers=1),
+            IndexAppendStage(writer)
+        ])
+        documents = [document(n, "x" * 100) for n in range(4)]
+        stats = asyncio.run(pipeline.run(aiter(documents)))
+
+        embed_stats = stats["stages"][1]
+        self.assertEqual(embed_stats["errors"], 2)
+        self.assertEqual(len(writer), 2)
+
+    def test_slow_stage_bounds_the_source(self):
+        slow = SlowStage()
+        read = []
+
+        async def source():
+            for n in range(100):
+                read.append(n)
+                yield n
+
+        async def run():
+            task = asyncio.create_task(IngestionPipeline([slow], queue_size=3).run(source()))
+            await asyncio.sleep(0.2)
+            buffered = len(read)
+            slow.release.set()
+            return buffered, await task
+
+        buffered, stats = asyncio.run(run())
+        self.assertLessEqual(buffered, 6)  # Queue + the item in the stage
+        self.assertEqual(stats["items_output"], 100)
+
+    def test_workers_share_a_stage(self):
+        writer = EmbeddingIndexWriter({})
+        pipeline = IngestionPipeline([
+            ChunkStage(chunk_size=1000),
+            EmbedStage(embed_fn=fake_embed, batch_size=3, max_wait=0.01, workers=3),
+            IndexAppendStage(writer, batch_size=5, max_wait=0.01)
+        ], queue_size=2)
+        stats = asyncio.run(pipeline.run(aiter([document(n, "y" * 80) for n in range(25)])))
+        self.assertEqual(len(writer), 25)
+        self.assertEqual(len(set(writer.index["doc_ids"])), 25)
+        self.assertEqual(stats["stages"][1]["in"], 25)
+
+
+class TestIngestConnector(unittest.TestCase):
+    """Test ConnectorManager.ingest_connector cursor handling"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = ConnectorManager(config_dir=Path(self.tmp.name))
+        self.connector = slack_connector(FakeSlackClient(channels=3), max_concurrent_channels=2)
+        self.manager._attach("u1_slack", self.connector)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ingest(self, embed_fn, *extra_stages):
+        pipeline = IngestionPipeline([
+            ChunkStage(chunk_size=1000, min_chars=5),
+            EmbedStage(embed_fn=embed_fn, batch_size=4, max_wait=0.01, workers=1),
+            IndexAppendStage(EmbeddingIndexWriter({})),
+            *extra_stages
+        ])
+        return asyncio.run(self.manager.ingest_connector("u1", "slack", pipeline))
+
+    def saved_settings(self):
+        with open(Path(self.tmp.name) / "u1_slack.json") as f:
+            return json.load(f)["settings"]
+
+    def test_failed_items_keep_the_cursor(self):
+        def failing_embed(texts):
+            raise RuntimeError("embedding service down")
+
+        result = self.ingest(failing_embed)
+
+        self.assertFalse(result["success"])
+        self.assertGreater(result["stats"]["items_failed"], 0)
+        self.assertIsNone(self.connector.config.last_sync)
+        self.assertNotIn("sync_state", self.connector.config.settings)
+        self.assertNotIn("sync_state", self.saved_settings())
+
+        result = self.ingest(fake_embed)
+        self.assertTrue(result["success"], result.get("error"))
+        self.assertEqual(result["stats"]["items_read"], 15)
+        self.assertEqual(len(self.saved_settings()["sync_state"]["cursors"]), 3)
+        self.assertIsNotNone(self.connector.config.last_sync)
+
+    def test_pipeline_error_keeps_the_cursor(self):
+        result = self.ingest(fake_embed, FailingCloseStage())
+
+        self.assertFalse(result["success"])
+        self.assertIsNone(self.connector.config.last_sync)
+        self.assertNotIn("sync_state", self.connector.config.settings)
+        self.assertNotIn("sync_state", self.saved_settings())
+
+        result = self.ingest(fake_embed)
+        self.assertTrue(result["success"], result.get("error"))
+        self.assertEqual(result["stats"]["items_read"], 15)
+
+    def test_clean_run_checkpoints_after_the_pipeline(self):
+        saves = []
+        hook = self.connector.checkpoint_hook
+        self.connector.checkpoint_hook = lambda: (saves.append(True), hook())
+
+        result = self.ingest(fake_embed)
+        self.assertTrue(result["success"], result.get("error"))
+        self.assertEqual(saves, [])  # No mid-sync saves while documents are in flight
+        self.assertEqual(len(self.saved_settings()["sync_state"]["cursors"]), 3)
+
+
+class TestEmbeddingIndexWriter(unittest.TestCase):
+    """Test appends into a loaded index"""
+
+    def test_append_grows_and_snapshots_stay_valid(self):
+        index = {"chunks": [{"doc_id": "a"}], "embeddings": np.ones((1, 3)), "doc_ids": ["a"]}
+        writer = EmbeddingIndexWriter(index)
+        chunks, before = writer.snapshot()
+
+        for n in range(5):
+            writer.append([{"doc_id": f"b{n}"}] * 300, np.full((300, 3), n))
+
+        self.assertEqual(len(writer), 1501)
+        self.assertEqual(index["embeddings"].shape, (1501, 3))
+        self.assertEqual(before.shape, (1, 3))
+        np.testing.assert_array_equal(index["embeddings"][0], [1, 1, 1])
+        self.assertEqual(index["doc_ids"], ["a", "b0", "b1", "b2", "b3", "b4"])
+
+    def test_rejects_mismatched_rows(self):
+        writer = EmbeddingIndexWriter({})
+        writer.append([{"doc_id": "a"}], [[1.0, 2.0]])
+        with self.assertRaises(ValueError):
+            writer.append([{"doc_id": "b"}], [[1.0, 2.0, 3.0]])
+        with self.assertRaises(ValueError):
+            writer.append([{"doc_id": "b"}, {"doc_id": "c"}], [[1.0, 2.0]])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
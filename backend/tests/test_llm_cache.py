@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+LLM RESPONSE CACHE TESTS
+Tests the shared SQLite-backed LLM cache used by the clusterers and classifiers
+
+Run: python3 tests/test_llm_cache.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import unittest
+import tempfile
+
+
+class TestLLMCache(unittest.TestCase):
+    """Test keying, batching, eviction and statistics"""
+
+    def setUp(self):
+        from utils.llm_cache import LLMCache
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = LLMCache(str(Path(self.tmpdir.name) / "cache.db"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test: stored response is returned for same model/version/content"""
+        self.cache.put('gpt-4o-mini', 'v1', 'some content', {'decision': 'YES'})
+        self.assertEqual(
+            self.cache.get('gpt-4o-mini', 'v1', 'some content'),
+            {'decision': 'YES'}
+        )
+
+    def test_key_includes_model_and_version(self):
+        """Test: different model or template version is a miss"""
+        self.cache.put('gpt-4o-mini', 'v1', 'content', {'a': 1})
+        self.assertIsNone(self.cache.get('gpt-4o', 'v1', 'content'))
+        self.assertIsNone(self.cache.get('gpt-4o-mini', 'v2', 'content'))
+
+    def test_shared_prefix_does_not_collide(self):
+        """Test: documents sharing a long prefix get separate entries"""
+        prefix = 'x' * 5000
+        self.cache.put('m', 'v1', prefix + 'A', {'doc': 'A'})
+        self.cache.put('m', 'v1', prefix + 'B', {'doc': 'B'})
+        self.assertEqual(self.cache.get('m', 'v1', prefix + 'A'), {'doc': 'A'})
+        self.assertEqual(self.cache.get('m', 'v1', prefix + 'B'), {'doc': 'B'})
+
+    def test_batch_get_put(self):
+        """Test: batch lookup returns hits keyed by content hash"""
+        self.cache.put_many('m', 'v1', [(f'doc{i}', {'i': i}) for i in range(10)])
+        found = self.cache.get_many('m', 'v1', [f'doc{i}' for i in range(15)])
+
+        self.assertEqual(len(found), 10)
+        self.assertEqual(found[self.cache.content_hash('doc3')], {'i': 3})
+
+    def test_hit_miss_statistics(self):
+        """Test: hits and misses are counted per lookup"""
+        self.cache.put('m', 'v1', 'present', {})
+        self.cache.get('m', 'v1', 'present')
+        self.cache.get('m', 'v1', 'absent')
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['entries'], 1)
+
+    def test_eviction_bounds_entries(self):
+        """Test: least recently used entries are evicted past max_entries"""
+        self.cache.max_entries = 20
+        self.cache.evict_check_interval = 1
+
+        self.cache.put_many('m', 'v1', [(f'doc{i}', {'i': i}) for i in range(20)])
+        self.cache.get('m', 'v1', 'doc0')  # Touch oldest entry
+        self.cache.put_many('m', 'v1', [(f'new{i}', {'i': i}) for i in range(5)])
+
+        self.assertEqual(self.cache.stats()['entries'], 20)
+        self.assertIsNotNone(self.cache.get('m', 'v1', 'doc0'))
+
+    def test_default_path_is_one_shared_instance(self):
+        """Test: stages using the default cache and its explicit path share one instance"""
+        from unittest import mock
+        from utils import llm_cache
+
+        default = Path(self.tmpdir.name) / "club_data" / "llm_cache.db"
+        with mock.patch.object(llm_cache, 'DEFAULT_DB_PATH', default), \
+                mock.patch.object(llm_cache, '_llm_cache_instances', {}):
+            shared = llm_cache.get_llm_cache()
+            self.assertIs(llm_cache.get_llm_cache(str(default)), shared)
+            self.assertEqual(shared.db_path, default)
+            shared.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
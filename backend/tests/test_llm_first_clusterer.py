@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+LLM-FIRST CLUSTERER TESTS
+Tests candidate-pair blocking, batched LLM comparison, centroid merge
+detection, cluster merging and incremental clustering from saved state with
+a stubbed embedder and OpenAI client
+
+Run: python3 tests/test_llm_first_clusterer.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import contextlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+try:
+    os.environ.setdefault('OPENAI_API_KEY', 'test-key')  # Client is built in __init__
+    from clustering.llm_first_clusterer import LLMFirstClusterer, ProjectCluster, ProjectSignature
+    HAS_CLUSTERER = True
+except ImportError:
+    HAS_CLUSTERER = False
+
+
+def quiet(fn, *args, **kwargs):
+    """Call fn with its progress output suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args, **kwargs)
+
+
+# Embedding axis per topic word; documents on the same topic embed close together
+TOPICS = ['pipeline', 'trading', 'broadband', 'retail']
+
+
+class StubEmbedder:
+    """SentenceTransformer surface: topic axis plus a small per-text offset"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.encoded.extend(texts)
+        vectors = np.zeros((len(texts), len(TOPICS) + 8), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for axis, topic in enumerate(TOPICS):
+                if topic in text.lower():
+                    vectors[row, axis] = 1.0
+            vectors[row, len(TOPICS) + sum(map(ord, text)) % 8] = 0.3
+        return vectors
+
+
+class StubLLM:
+    """OpenAI client surface; reply(prompt) returns the message content or raises"""
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        prompt = messages[-1]['content']
+        with self.lock:
+            self.prompts.append(prompt)
+        content = self.reply(prompt)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def same_topic_reply(prompt):
+    """Batch comparison answer: YES when both documents name the same topic"""
+    results = []
+    for n, doc_a, doc_b in re.findall(r'PAIR (\d+):\nDOCUMENT A: (.*)\nDOCUMENT B: (.*)', prompt):
+        same = any(topic in doc_a.lower() and topic in doc_b.lower() for topic in TOPICS)
+        results.append({'pair': int(n), 'decision': 'YES' if same else 'NO',
+                        'confidence': 0.9, 'reasoning': 'topic'})
+    return json.dumps({'results': results})
+
+
+def topics_in(text):
+    return {topic for topic in TOPICS if topic in text.lower()}
+
+
+def project_reply(prompt):
+    """Answers every clusterer prompt, treating documents on one topic as one project"""
+    if 'Analyze this document content' in prompt:
+        content = prompt.split('CONTENT:\n', 1)[1].split('\n\nExtract', 1)[0]
+        title = content.splitlines()[0]
+        return json.dumps({
+            'is_project_work': True, 'core_deliverable': title, 'project_goal': f"Deliver {title}",
+            'key_entities': sorted(topics_in(title)), 'technical_keywords': [],
+            'timeline_phase': 'development', 'unique_identifiers': [],
+            'content_summary': content, 'confidence': 0.9
+        })
+    if 'PAIR 1:' in prompt:
+        return same_topic_reply(prompt)
+    if 'DOCUMENT 1:' in prompt:
+        doc_a, doc_b = prompt.split('DOCUMENT 2:', 1)
+        same = bool(topics_in(doc_a.split('Consider:')[0]) & topics_in(doc_b.split('Consider:')[0]))
+        return json.dumps({'decision': 'YES' if same else 'NO', 'confidence': 0.9, 'reasoning': 'topic'})
+    if 'grouped as ONE project' in prompt:
+        name = ' '.join(sorted(topics_in(prompt))).title()
+        return json.dumps({'is_coherent': True, 'canonical_name': f"{name} project",
+                           'description': name, 'confidence': 0.9})
+    if 'detected projects' in prompt:
+        project_a, project_b = prompt.split('PROJECT B:', 1)
+        same = bool(topics_in(project_a) & topics_in(project_b.split('Respond in JSON')[0]))
+        return json.dumps({'should_merge': same, 'confidence': 0.9, 'reasoning': 'topic'})
+    raise ValueError("unexpected prompt")
+
+
+def make_signature(doc_id, deliverable, entities=()):
+    return ProjectSignature(
+        doc_id=doc_id,
+        core_deliverable=deliverable,
+        project_goal=f"Deliver {deliverable}",
+        key_entities=list(entities),
+        technical_keywords=[],
+        timeline_phase='development',
+        unique_identifiers=[],
+        content_summary=deliverable,
+        confidence=0.9
+    )
+
+
+def make_cluster(cluster_id, name, doc_ids):
+    signatures = [make_signature(doc_id, name) for doc_id in doc_ids]
+    return ProjectCluster(
+        id=cluster_id,
+        name=name,
+        description=f"{name} project",
+        document_ids=list(doc_ids),
+        signatures=signatures,
+        confidence=0.9,
+        validation_status='validated'
+    )
+
+
+@unittest.skipUnless(HAS_CLUSTERER, "clusterer dependencies not installed")
+class ClustererTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.clusterer = quiet(
+            LLMFirstClusterer,
+            openai_api_key='test-key',
+            cache_path=str(Path(self.tmpdir.name) / 'llm_cache.db')
+        )
+        self.clusterer.embedding_model = StubEmbedder()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+@unittest.skipUnless(HAS_CLUSTERER, "clusterer dependencies not installed")
+class TestCandidatePairs(unittest.TestCase):
+    """Test top-k blocking against a brute-force search"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(60, 12)).astype(np.float32)
+        self.embeddings = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.sims = self.embeddings @ self.embeddings.T
+
+    def test_full_recall_without_top_k_limit(self):
+        """Test: top_k >= N-1 returns every pair above the threshold"""
+        n = len(self.embeddings)
+        expected = [(i, j) for i in range(n) for j in range(i + 1, n) if self.sims[i, j] >= 0.3]
+
+        for block_size in (1024, 7):
+            pairs = LLMFirstClusterer.find_candidate_pairs(
+                self.embeddings, top_k=n, threshold=0.3, block_size=block_size
+            )
+            self.assertEqual([(i, j) for i, j, _ in pairs], expected)
+            for i, j, sim in pairs:
+                self.assertAlmostEqual(sim, float(self.sims[i, j]), places=5)
+
+    def test_top_k_neighbours_are_kept(self):
+        """Test: each row's k nearest neighbours above threshold are candidates"""
+        pairs = LLMFirstClusterer.find_candidate_pairs(
+            self.embeddings, top_k=3, threshold=0.0, block_size=16
+        )
+        found = {(i, j) for i, j, _ in pairs}
+
+        sims = self.sims.copy()
+        np.fill_diagonal(sims, -np.inf)
+        for i in range(len(sims)):
+            for j in np.argsort(-sims[i])[:3]:
+                if sims[i, j] >= 0.0:
+                    self.assertIn((min(i, j), max(i, j)), found)
+        self.assertLessEqual(len(found), 3 * len(sims))
+
+    def test_query_rows_and_degenerate_inputs(self):
+        """Test: query_rows limits pairs to those rows; fewer than 2 rows is empty"""
+        pairs = LLMFirstClusterer.find_candidate_pairs(
+            self.embeddings, top_k=5, threshold=0.0, query_rows=[4, 9]
+        )
+        self.assertTrue(pairs)
+        self.assertTrue(all(4 in (i, j) or 9 in (i, j) for i, j, _ in pairs))
+
+        self.assertEqual(LLMFirstClusterer.find_candidate_pairs(self.embeddings[:1]), [])
+        self.assertEqual(LLMFirstClusterer.find_candidate_pairs(self.embeddings[:0]), [])
+
+
+class TestCompareDocuments(ClustererTest):
+    """Test batched comparison parsing, caching and fallbacks"""
+
+    def setUp(self):
+        super().setUp()
+        self.pairs = [
+            (make_signature('a1', 'Pipeline expansion'), make_signature('a2', 'Pipeline permits')),
+            (make_signature('b1', 'Trading desk notes'), make_signature('b2', 'Broadband rollout')),
+            (make_signature('c1', 'Retail launch'), make_signature('c2', 'Retail pricing')),
+        ]
+
+    def test_batch_response_parsed_per_pair(self):
+        """Test: results matched by pair number; missing pairs fall back"""
+        self.clusterer.client = StubLLM(lambda prompt: json.dumps({'results': [
+            {'pair': '2', 'decision': 'NO', 'confidence': 0.95, 'reasoning': 'different'},
+            {'pair': 1, 'decision': 'YES', 'confidence': 0.9, 'reasoning': 'same deliverable'},
+            {'pair': 'three', 'decision': 'YES'},  # Unparseable pair number
+        ]}))
+
+        decisions = quiet(self.clusterer.compare_documents_batch, self.pairs)
+
+        self.assertEqual(decisions, [
+            ('YES', 0.9, 'same deliverable'),
+            ('NO', 0.95, 'different'),
+            ('MAYBE', 0.5, 'Comparison error'),
+        ])
+        self.assertEqual(len(self.clusterer.client.prompts), 1)
+        self.assertIn('PAIR 3:', self.clusterer.client.prompts[0])
+
+        # Answered pairs are cached (either order); the fallback is not
+        self.clusterer.client = StubLLM(lambda prompt: self.fail("LLM called for cached pair"))
+        self.assertEqual(
+            self.clusterer.compare_documents_llm(self.pairs[0][1], self.pairs[0][0]),
+            ('YES', 0.9, 'same deliverable')
+        )
+        self.assertIsNone(self.clusterer.llm_cache.get(
+            self.clusterer.COMPARISON_MODEL,
+            self.clusterer.COMPARISON_PROMPT_VERSION,
+            self.clusterer._pair_cache_content(*self.pairs[2])
+        ))
+
+    def test_malformed_or_failed_batch_falls_back(self):
+        """Test: invalid JSON, missing results or an API error give MAYBE for every pair"""
+        fallback = [('MAYBE', 0.5, 'Comparison error')] * 3
+
+        def api_error(prompt):
+            raise RuntimeError("503 from API")
+
+        for reply in (lambda prompt: 'not json {', lambda prompt: '{}', api_error):
+            self.clusterer.client = StubLLM(reply)
+            self.assertEqual(quiet(self.clusterer.compare_documents_batch, self.pairs), fallback)
+
+        self.assertEqual(self.clusterer.llm_cache.stats()['entries'], 0)
+
+    def test_single_pair_uses_single_comparison(self):
+        """Test: one pair goes through compare_documents_llm, with its fallback"""
+        self.clusterer.client = StubLLM(lambda prompt: json.dumps(
+            {'decision': 'YES', 'confidence': 0.8, 'reasoning': 'same'}
+        ))
+        self.assertEqual(
+            self.clusterer.compare_documents_batch(self.pairs[:1]), [('YES', 0.8, 'same')]
+        )
+        self.assertNotIn('PAIR 1:', self.clusterer.client.prompts[0])
+
+        self.clusterer.client = StubLLM(lambda prompt: 'not json {')
+        self.assertEqual(
+            quiet(self.clusterer.compare_documents_batch, self.pairs[1:2]),
+            [('MAYBE', 0.5, 'Comparison error')]
+        )
+
+    def test_similarity_graph_links_same_project(self):
+        """Test: only embedding candidates are compared, edges follow the LLM, reruns hit the cache"""
+        signatures = [
+            make_signature('p1', 'Pipeline compressor station'),
+            make_signature('p2', 'Pipeline right of way'),
+            make_signature('p3', 'Pipeline permitting'),
+            make_signature('t1', 'Trading desk hedges'),
+            make_signature('t2', 'Trading desk storage'),
+            make_signature('r1', 'Retail store launch'),
+        ]
+        self.clusterer.client = StubLLM(same_topic_reply)
+        self.clusterer.comparison_batch_size = 2
+
+        G = quiet(self.clusterer.build_similarity_graph, signatures, embedding_threshold=0.6)
+
+        edges = {tuple(sorted(edge)) for edge in G.edges()}
+        self.assertEqual(edges, {('p1', 'p2'), ('p1', 'p3'), ('p2', 'p3'), ('t1', 't2')})
+        report = self.clusterer.comparison_report
+        self.assertEqual(report['candidate_pairs'], 4)  # Cross-topic pairs never reach the LLM
+        self.assertEqual(report['llm_calls'], 2)
+
+        G = quiet(self.clusterer.build_similarity_graph, signatures, embedding_threshold=0.6)
+        self.assertEqual({tuple(sorted(edge)) for edge in G.edges()}, edges)
+        self.assertEqual(self.clusterer.comparison_report['pairs_sent_to_llm'], 0)
+        self.assertEqual(self.clusterer.comparison_report['cache_hits'], 4)
+
+
+class TestMergeCandidates(ClustererTest):
+    """Test centroid blocking and LLM confirmation of cluster merges"""
+
+    def setUp(self):
+        super().setUp()
+        self.clusters = {
+            'cluster_0': make_cluster('cluster_0', 'Pipeline expansion', ['p1', 'p2']),
+            'cluster_1': make_cluster('cluster_1', 'Trading desk', ['t1', 't2']),
+            'cluster_2': make_cluster('cluster_2', 'Pipeline compressor work', ['p3']),
+            'cluster_3': make_cluster('cluster_3', 'Retail launch', ['r1']),
+        }
+
+    def test_only_near_duplicate_clusters_are_candidates(self):
+        """Test: similar centroids pair up, unrelated clusters do not"""
+        candidates = self.clusterer.find_merge_candidates(self.clusters)
+        self.assertEqual([(c1, c2) for c1, c2, _ in candidates], [('cluster_0', 'cluster_2')])
+        self.assertGreater(candidates[0][2], 0.9)
+
+        # Incremental check: only pairs involving the new clusters
+        new_only = self.clusterer.find_merge_candidates(self.clusters, new_cluster_ids=['cluster_3'])
+        self.assertEqual(new_only, [])
+        new_only = self.clusterer.find_merge_candidates(self.clusters, new_cluster_ids=['cluster_2'])
+        self.assertEqual([(c1, c2) for c1, c2, _ in new_only], [('cluster_0', 'cluster_2')])
+
+    def test_profiles_reuse_embeddings(self):
+        """Test: documents are embedded once; a changed cluster gets a new centroid"""
+        self.clusterer.find_merge_candidates(self.clusters)
+        embedder = self.clusterer.embedding_model
+        self.assertEqual(len(embedder.encoded), 6)
+        centroid = self.clusterer.cluster_profiles['cluster_1']['centroid']
+
+        self.clusterer.find_merge_candidates(self.clusters)
+        self.assertEqual(len(embedder.encoded), 6)
+
+        extra = make_signature('x1', 'Broadband rollout')
+        self.clusters['cluster_1'].document_ids.append('x1')
+        self.clusters['cluster_1'].signatures.append(extra)
+        self.clusterer.find_merge_candidates(self.clusters)
+        self.assertEqual(len(embedder.encoded), 7)
+        self.assertFalse(np.allclose(self.clusterer.cluster_profiles['cluster_1']['centroid'], centroid))
+
+    def test_llm_confirms_merges_of_candidates(self):
+        """Test: near-duplicates merge, unrelated clusters never reach the LLM"""
+        self.clusterer.client = StubLLM(lambda prompt: json.dumps(
+            {'should_merge': True, 'confidence': 0.9, 'reasoning': 'same project'}
+        ))
+
+        merges = quiet(self.clusterer.detect_cluster_merges, self.clusters, merge_threshold=0.85)
+        self.assertEqual(merges, [('cluster_0', 'cluster_2', 0.9)])
+        self.assertEqual(len(self.clusterer.client.prompts), 1)
+
+        merged = quiet(self.clusterer.merge_clusters, self.clusters, merges)
+        self.assertEqual(list(merged), ['cluster_0', 'cluster_1', 'cluster_3'])
+        self.assertEqual(merged['cluster_0'].document_ids, ['p1', 'p2', 'p3'])
+
+    def test_low_confidence_or_failed_comparison_keeps_clusters_apart(self):
+        """Test: below merge_threshold or an LLM error is not a merge"""
+        self.clusterer.client = StubLLM(lambda prompt: json.dumps(
+            {'should_merge': True, 'confidence': 0.6, 'reasoning': 'maybe'}
+        ))
+        self.assertEqual(quiet(self.clusterer.detect_cluster_merges, self.clusters), [])
+
+        self.clusterer.client = StubLLM(lambda prompt: 'not json {')
+        self.assertEqual(quiet(self.clusterer.detect_cluster_merges, self.clusters), [])
+
+
+class TestIncrementalClustering(ClustererTest):
+    """Test saved state round-trips and new documents join existing projects"""
+
+    def setUp(self):
+        super().setUp()
+        self.clusterer.clusters = {
+            'cluster_0': make_cluster('cluster_0', 'Pipeline expansion', ['p1', 'p2']),
+            'cluster_1': make_cluster('cluster_1', 'Trading desk', ['t1', 't2']),
+        }
+        for cluster in self.clusterer.clusters.values():
+            for sig in cluster.signatures:
+                self.clusterer.signatures[sig.doc_id] = sig
+        self.state_dir = str(Path(self.tmpdir.name) / 'state')
+        Path(self.state_dir).mkdir()
+        quiet(self.clusterer.save_results, self.state_dir)
+
+    def load(self):
+        """Fresh clusterer (own embedder and LLM stub) loaded from the saved state"""
+        clusterer = quiet(
+            LLMFirstClusterer,
+            openai_api_key='test-key',
+            cache_path=str(Path(self.tmpdir.name) / 'llm_cache.db')
+        )
+        clusterer.embedding_model = StubEmbedder()
+        clusterer.client = StubLLM(project_reply)
+        self.assertTrue(quiet(clusterer.load_state, self.state_dir))
+        return clusterer
+
+    def test_state_round_trip(self):
+        """Test: clusters, signatures, embeddings and centroids survive save/load"""
+        loaded = self.load()
+
+        self.assertEqual(list(loaded.clusters), ['cluster_0', 'cluster_1'])
+        for cluster_id, cluster in self.clusterer.clusters.items():
+            self.assertEqual(loaded.clusters[cluster_id].name, cluster.name)
+            self.assertEqual(loaded.clusters[cluster_id].document_ids, cluster.document_ids)
+            self.assertEqual(loaded.clusters[cluster_id].signatures, cluster.signatures)
+            np.testing.assert_allclose(
+                loaded.cluster_profiles[cluster_id]['centroid'],
+                self.clusterer.cluster_profiles[cluster_id]['centroid']
+            )
+        self.assertEqual(set(loaded.embeddings), {'p1', 'p2', 't1', 't2'})
+
+        # Loaded embeddings and centroids are reused, not re-encoded
+        loaded.compute_cluster_profiles(loaded.clusters)
+        self.assertEqual(loaded.embedding_model.encoded, [])
+
+    def test_missing_or_corrupt_state(self):
+        """Test: nothing saved or unreadable JSON loads nothing"""
+        empty = Path(self.tmpdir.name) / 'empty'
+        empty.mkdir()
+        self.assertFalse(self.clusterer.load_state(str(empty)))
+
+        (Path(self.state_dir) / 'canonical_projects.json').write_text('{not json')
+        fresh = quiet(LLMFirstClusterer, openai_api_key='test-key',
+                      cache_path=str(Path(self.tmpdir.name) / 'llm_cache.db'))
+        self.assertFalse(quiet(fresh.load_state, self.state_dir))
+        self.assertEqual(fresh.clusters, {})
+
+    def test_assign_to_existing_clusters(self):
+        """Test: close documents auto-assign, borderline ones need LLM confirmation"""
+        loaded = self.load()
+        signatures = [
+            make_signature('n1', 'Pipeline compressor station'),  # Auto-assigned
+            make_signature('n2', 'Pipeline retail kiosk'),  # Confirmed by the LLM
+            make_signature('n3', 'Trading broadband resale'),  # Rejected by the LLM
+            make_signature('n4', 'Retail store launch'),  # Outlier
+        ]
+        # The LLM links the kiosk to the pipeline project but not the resale
+        loaded.client = StubLLM(lambda prompt: json.dumps({'results': [
+            {'pair': 1, 'decision': 'YES', 'confidence': 0.9, 'reasoning': 'same pipeline'},
+            {'pair': 2, 'decision': 'NO', 'confidence': 0.9, 'reasoning': 'different'},
+        ]}))
+
+        assignments, outliers = quiet(loaded.assign_to_clusters, signatures)
+
+        self.assertEqual({cid: [s.doc_id for s in sigs] for cid, sigs in assignments.items()},
+                         {'cluster_0': ['n1', 'n2']})
+        self.assertEqual(sorted(s.doc_id for s in outliers), ['n3', 'n4'])
+        self.assertEqual(loaded.incremental_report, {
+            'auto_assigned': 1,
+            'sent_for_confirmation': 2,
+            'confirmed': 1,
+            'confirmation_llm_calls': 1,
+            'outliers': 2
+        })
+
+    def test_new_documents_keep_existing_project_ids(self):
+        """Test: outliers merged into an existing project keep its id and are not new"""
+        loaded = self.load()
+        documents = [
+            {'doc_id': 'p1', 'content': 'Pipeline expansion\nAlready clustered'},
+            {'doc_id': 'n1', 'content': 'Pipeline compressor station\nBudget review'},
+            {'doc_id': 'n2', 'content': 'Pipeline right of way\nLand agents'},
+            {'doc_id': 'n3', 'content': 'Retail store launch\nOpening plan'},
+            {'doc_id': 'n4', 'content': 'Retail pricing review\nMargins'},
+        ]
+
+        # Thresholds above any similarity: every new document is an outlier,
+        # so the pipeline ones form a new cluster that merges into cluster_0
+        projects = quiet(
+            loaded.process_new_documents, documents,
+            auto_assign_threshold=1.1, confirm_threshold=1.1
+        )
+
+        new_ids = [cid for cid in projects if cid not in ('cluster_0', 'cluster_1')]
+        self.assertEqual(len(new_ids), 1)
+        self.assertIn(new_ids[0], ('cluster_2', 'cluster_3'))
+        self.assertEqual(list(projects)[:2], ['cluster_0', 'cluster_1'])
+        self.assertEqual(projects['cluster_0'].name, 'Pipeline expansion')
+        self.assertEqual(sorted(projects['cluster_0'].document_ids), ['n1', 'n2', 'p1', 'p2'])
+        self.assertEqual(projects['cluster_1'].document_ids, ['t1', 't2'])
+        self.assertEqual(sorted(projects[new_ids[0]].document_ids), ['n3', 'n4'])
+        self.assertEqual(loaded.incremental_report['documents_received'], 5)
+        self.assertEqual(loaded.incremental_report['already_clustered'], 1)
+        self.assertEqual(loaded.incremental_report['new_clusters'], 1)
+
+        # Default thresholds: new documents join existing projects directly
+        loaded = self.load()
+        projects = quiet(loaded.process_new_documents, documents[:3])
+        self.assertEqual(list(projects), ['cluster_0', 'cluster_1'])
+        self.assertEqual(sorted(projects['cluster_0'].document_ids), ['n1', 'n2', 'p1', 'p2'])
+        self.assertEqual(loaded.incremental_report['new_clusters'], 0)
+
+
+class TestMergeClusters(ClustererTest):
+    """Test merged clusters keep the id and name of the existing project"""
+
+    def test_existing_cluster_id_survives_merge(self):
+        """Test: a new cluster merged into an existing one takes its id"""
+        clusters = {
+            'cluster_9': make_cluster('cluster_9', 'Pipeline expansion', ['d1', 'd2']),
+            'cluster_10': make_cluster('cluster_10', 'Trading desk', ['d3']),
+            # New clusters from the latest sync
+            'cluster_11': make_cluster('cluster_11', 'Desk hedges', ['d4']),
+            'cluster_12': make_cluster('cluster_12', 'Desk notes', ['d5']),
+        }
+        # Sorted string ids put the new cluster first in some pairs
+        merges = [('cluster_10', 'cluster_12', 0.9), ('cluster_11', 'cluster_12', 0.9)]
+
+        merged = quiet(self.clusterer.merge_clusters, clusters, merges)
+
+        self.assertEqual(list(merged), ['cluster_9', 'cluster_10'])
+        self.assertIs(merged['cluster_9'], clusters['cluster_9'])
+        desk = merged['cluster_10']
+        self.assertEqual(desk.id, 'cluster_10')
+        self.assertEqual(desk.name, 'Trading desk')
+        self.assertEqual(desk.document_ids, ['d3', 'd4', 'd5'])
+
+    def test_no_merges_returns_clusters_unchanged(self):
+        """Test: empty merge list is a no-op"""
+        clusters = {'cluster_0': make_cluster('cluster_0', 'Pipeline expansion', ['d1'])}
+        self.assertIs(self.clusterer.merge_clusters(clusters, []), clusters)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
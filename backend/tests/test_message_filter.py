@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+MESSAGE FILTER V2 TESTS
+Tests the compiled rule scoring against the original per-pattern loop,
+and batch scoring across a process pool
+
+Run: python3 tests/test_message_filter.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import os
+import random
+import re
+import unittest
+
+try:
+    os.environ.setdefault('OPENAI_API_KEY', 'test-key')  # Module-level client needs a key
+    import message_filter_v2 as mf
+    HAS_FILTER = True
+except ImportError:
+    HAS_FILTER = False
+
+
+def reference_score(content):
+    """Original algorithm: one re.search per pattern per message"""
+    content_lower = content.lower().strip()
+    content_len = len(content_lower)
+    reasons = []
+
+    for pattern in mf.DEFINITE_PERSONAL:
+        if re.search(pattern, content_lower, re.IGNORECASE):
+            return (10, 'definite_personal', [f"Matched: {pattern[:30]}..."])
+    for pattern in mf.DEFINITE_PROFESSIONAL:
+        if re.search(pattern, content, re.IGNORECASE):
+            return (90, 'definite_professional', [f"Matched: {pattern[:30]}..."])
+
+    if content_len < 25:
+        if not any(re.search(p, content_lower) for p in mf.LIKELY_PROFESSIONAL):
+            return (20, 'likely_personal', ["Very short message without work context"])
+    if content_len > 200:
+        reasons.append("Long detailed message")
+        if sum(1 for p in mf.LIKELY_PERSONAL if re.search(p, content_lower)) == 0:
+            return (80, 'likely_professional', reasons)
+
+    score = 50
+    score -= sum(1 for p in mf.LIKELY_PERSONAL if re.search(p, content_lower)) * 12
+    score += sum(1 for p in mf.LIKELY_PROFESSIONAL if re.search(p, content_lower)) * 10
+    if content_len < 40:
+        score -= 10
+        reasons.append("Short message")
+    elif content_len > 100:
+        score += 10
+        reasons.append("Substantial length")
+    if re.search(r'\.\s+[A-Z]', content):
+        score += 10
+        reasons.append("Multiple sentences")
+    if re.search(r'^\d+\.|\n\d+\.', content):
+        score += 15
+        reasons.append("Numbered list")
+    if '?' in content:
+        if re.search(r'(when|what time|where|how)\s+(is|are|do|does|can|should|will)', content_lower):
+            pass
+        elif re.search(r'(you|u)\s+(good|ok|free|busy|hungry|tired)', content_lower):
+            score -= 15
+            reasons.append("Personal check-in question")
+    score = max(0, min(100, score))
+    if score < 30:
+        return (score, 'likely_personal', reasons)
+    elif score > 70:
+        return (score, 'likely_professional', reasons)
+    return (score, 'uncertain', reasons)
+
+
+FRAGMENTS = [
+    "ok", "lol", "hey Sam", "wanna grab lunch?", "Updated room membership.",
+    "The NICU market analysis shows a TAM of $812M", "Can you review the attached proposal?",
+    "Meeting rescheduled to 3pm tomorrow", "Bro my meeting is running late",
+    "So just keep us updated of what happened each week", "with the group so that we can watch it",
+    "you good? u free tonight", "1. intro\n2. next steps", "Sounds fine. Then We go.",
+    "im tired", "gym after?", "when is the sync", "heyyy", "see you soon dude",
+    "I finished the slides. Sending them to everyone now", "THANKS!!", "😀😀", "where are you guys",
+    # Case and non-ASCII text (compiled sets lowercase ASCII text only)
+    "OK!", "HEY", "q3 plan", "the tam is big", "Café sync at 3", "ſure", "\u212aK", "İstanbul trip",
+    "Naïve question: can you send the draft?",
+]
+
+
+def synthetic_messages(count, seed=7):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        parts = rng.sample(FRAGMENTS, rng.choice([1, 1, 1, 2, 3, 8]))
+        messages.append(rng.choice([" ", ". ", "\n"]).join(parts))
+    return messages
+
+
+@unittest.skipUnless(HAS_FILTER, "message_filter_v2 dependencies not installed")
+class TestRuleScoring(unittest.TestCase):
+    """Test compiled scoring matches the per-pattern loop"""
+
+    def test_matches_reference(self):
+        for content in FRAGMENTS + synthetic_messages(2000):
+            self.assertEqual(mf.calculate_professional_score_v2(content), reference_score(content), content)
+
+    def test_pool_scoring_preserves_order(self):
+        contents = synthetic_messages(900)
+        expected = [reference_score(content) for content in contents]
+        self.assertEqual(mf.score_messages_v2(contents, workers=2, chunk_size=100), expected)
+        self.assertEqual(mf.score_messages_v2(contents, workers=1), expected)
+
+    def test_filter_buckets(self):
+        messages = [{'content': c} for c in FRAGMENTS] + [{'content': '  '}, {'content': None}, {}]
+        result = mf.filter_messages_v2(messages, use_gpt_for_uncertain=False, workers=2)
+
+        self.assertEqual(result['stats']['total'], len(messages))
+        scored = [c for c in FRAGMENTS if len(c.strip()) >= 3]  # Shorter messages are skipped
+        self.assertEqual(sum(result['breakdown'].values()), len(scored))
+        self.assertIn('The NICU market analysis shows a TAM of $812M',
+                      [r['content'] for r in result['professional']])
+        self.assertIn('lol', [r['content'] for r in result['personal']])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
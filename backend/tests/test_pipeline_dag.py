@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+PIPELINE STEP GRAPH TESTS
+Tests dependency-ordered parallel execution, skipping steps whose inputs
+are unchanged, failure propagation and the run report
+
+Run: python3 tests/test_pipeline_dag.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.pipeline_dag import PipelineGraph, PipelineStep, fingerprint_paths
+
+
+class TestPipelineGraph(unittest.TestCase):
+    """Test the step graph runner"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.source = self.root / "source.txt"
+        self.source.write_text("v1")
+        self.state = self.root / "state.json"
+        self.calls = []
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def step_fn(self, name, delay=0.0, fail=False):
+        """Step that writes <name>.out from its dependencies' outputs"""
+        def run(deps):
+            with self.lock:
+                self.calls.append(name)
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(delay)
+            with self.lock:
+                self.active -= 1
+            if fail:
+                raise RuntimeError(f"{name} broke")
+            output = self.root / f"{name}.out"
+            output.write_text(name + "<" + ",".join(sorted(deps)))
+            return str(output)
+        return run
+
+    def make_graph(self, delay=0.0, fail=(), max_parallel=4):
+        def step(name, deps=(), **kwargs):
+            return PipelineStep(name=name, run=self.step_fn(name, delay, name in fail), deps=deps,
+                                outputs=[str(self.root / f"{name}.out")], **kwargs)
+
+        steps = [
+            step("parse", inputs=[str(self.source)], params={"limit": 10}),
+            step("cluster", deps=["parse"]),
+            step("gaps", deps=["cluster"]),
+            step("graph", deps=["cluster"]),
+            step("vectors", deps=["cluster"]),
+            step("questions", deps=["gaps"]),
+            step("rag", deps=["graph", "vectors"], cacheable=False),
+        ]
+        return PipelineGraph(steps, state_path=str(self.state), max_parallel=max_parallel,
+                             memory_sample_interval=0.01)
+
+    def test_independent_steps_run_in_parallel_after_dependencies(self):
+        graph = self.make_graph(delay=0.1)
+        report = graph.run()
+
+        self.assertEqual(self.calls[:2], ["parse", "cluster"])
+        self.assertEqual(self.peak, 3)  # gaps, graph, vectors
+        self.assertLess(self.calls.index("vectors"), self.calls.index("rag"))
+        self.assertLess(self.calls.index("gaps"), self.calls.index("questions"))
+        self.assertEqual(graph.results["rag"], str(self.root / "rag.out"))
+        self.assertEqual({e["status"] for e in report["steps"].values()}, {"ran"})
+        self.assertIn("gaps", report["steps"]["vectors"]["overlapped_with"])
+
+    def test_unchanged_steps_are_skipped(self):
+        self.make_graph().run()
+        self.calls.clear()
+
+        graph = self.make_graph()
+        report = graph.run()
+        self.assertEqual(self.calls, ["rag"])  # Not cacheable
+        self.assertEqual(report["steps"]["gaps"]["status"], "skipped")
+        self.assertEqual(graph.results["gaps"], str(self.root / "gaps.out"))
+
+        self.calls.clear()
+        self.make_graph().run(force=["graph"])
+        self.assertEqual(sorted(self.calls), ["graph", "rag"])
+
+        self.calls.clear()
+        self.make_graph().run(force_all=True)
+        self.assertEqual(len(self.calls), 7)
+
+    def test_changed_input_reruns_downstream(self):
+        self.make_graph().run()
+        self.source.write_text("v2, longer")
+        self.calls.clear()
+
+        self.make_graph().run()
+        self.assertEqual(sorted(self.calls), sorted(["parse", "cluster", "gaps", "graph", "vectors", "questions", "rag"]))
+
+    def test_changed_intermediate_output_reruns_dependents_only(self):
+        self.make_graph().run()
+        (self.root / "gaps.out").write_text("edited by hand, different size")
+        self.calls.clear()
+
+        self.make_graph().run(force=["gaps"])
+        self.assertEqual(sorted(self.calls), ["gaps", "questions", "rag"])
+
+        # Edited without forcing: the output no longer matches its fingerprint
+        self.calls.clear()
+        (self.root / "graph.out").write_text("edited")
+        self.make_graph().run()
+        self.assertEqual(sorted(self.calls), ["graph", "rag"])
+        self.assertEqual((self.root / "graph.out").read_text(), "graph<cluster")
+
+        self.calls.clear()
+        os.remove(self.root / "vectors.out")  # Missing output
+        self.make_graph().run()
+        self.assertEqual(sorted(self.calls), ["rag", "vectors"])
+
+    def test_failure_blocks_dependents_only_and_resumes(self):
+        report = self.make_graph(fail={"graph"}).run()
+
+        self.assertEqual(report["failed"], ["graph"])
+        self.assertEqual(report["steps"]["graph"]["error"], "graph broke")
+        self.assertEqual(report["steps"]["rag"], {"status": "blocked", "blocked_by": ["graph"]})
+        self.assertEqual(report["steps"]["questions"]["status"], "ran")
+        self.assertNotIn("graph", json.loads(self.state.read_text()))
+
+        self.calls.clear()
+        report = self.make_graph().run()
+        self.assertEqual(sorted(self.calls), ["graph", "rag"])
+        self.assertEqual(report["failed"], [])
+
+    def test_soft_failures_are_not_recorded(self):
+        steps = [PipelineStep(name="slides", run=lambda deps: None, succeeded=lambda r: r is not None)]
+        PipelineGraph(steps, state_path=str(self.state)).run()
+        self.assertFalse(self.state.exists())
+
+    def test_report_fields(self):
+        graph = self.make_graph(delay=0.05)
+        graph.run()
+        path = self.root / "report" / "run.json"
+        graph.save_report(str(path))
+
+        report = json.loads(path.read_text())
+        entry = report["steps"]["cluster"]
+        self.assertGreaterEqual(entry["wall_seconds"], 0.05)
+        self.assertGreater(entry["peak_rss_mb"], 0)
+        self.assertGreaterEqual(entry["peak_rss_mb"], entry["rss_start_mb"])
+        self.assertIn("total_seconds", report)
+
+    def test_invalid_graphs(self):
+        run = lambda deps: None
+        with self.assertRaises(ValueError):
+            PipelineGraph([PipelineStep("a", run, deps=["missing"])], state_path=str(self.state))
+        with self.assertRaises(ValueError):
+            PipelineGraph([PipelineStep("a", run, deps=["b"]), PipelineStep("b", run, deps=["a"])],
+                          state_path=str(self.state))
+
+    def test_fingerprint_paths(self):
+        folder = self.root / "dir"
+        (folder / "sub").mkdir(parents=True)
+        (folder / "sub" / "a.txt").write_text("a")
+        before = fingerprint_paths([str(folder)])
+        self.assertEqual(fingerprint_paths([str(folder)]), before)
+
+        (folder / "b.txt").write_text("b")
+        self.assertNotEqual(fingerprint_paths([str(folder)]), before)
+        self.assertNotEqual(fingerprint_paths([str(self.root / "nope")]), fingerprint_paths([str(folder)]))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+RATE LIMITER TESTS
+Tests the sliding-window Lua limiter, local token leases and the
+in-process fallback
+
+Run: python3 tests/test_rate_limiter.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis needs it for EVAL)
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+def make_limiter(use_redis, **overrides):
+    from security.enhanced_rate_limiter import EnhancedRateLimiter, RateLimitConfig
+
+    config = RateLimitConfig(**overrides)
+    if use_redis:
+        return EnhancedRateLimiter(config, redis_client=fakeredis.FakeRedis(decode_responses=True))
+
+    with mock.patch.object(EnhancedRateLimiter, '_init_redis'):
+        return EnhancedRateLimiter(config)
+
+
+class TestSlidingWindowLimiter(unittest.TestCase):
+    """Test decisions are consistent across the Redis script and the fallback"""
+
+    def backends(self):
+        yield False
+        if HAS_FAKEREDIS:
+            yield True
+
+    def run_sequence(self, limiter, now=1_000_000.0):
+        from security.enhanced_rate_limiter import RateLimitResult
+
+        results = []
+        with mock.patch('security.enhanced_rate_limiter.time.time', return_value=now):
+            for _ in range(8):
+                results.append(limiter.check_rate_limit('10.0.0.1', endpoint='/api/data')[0].value)
+            for _ in range(6):
+                result = limiter.check_rate_limit('10.0.0.2', endpoint='/api/login')[0]
+                results.append(result.value)
+                if result == RateLimitResult.ALLOWED:
+                    limiter.record_failed_login('10.0.0.2')
+        return results
+
+    def test_backends_agree(self):
+        """Test: Lua script and local fallback make the same decisions"""
+        settings = dict(requests_per_minute_ip=5, login_attempts_per_minute=3,
+                        captcha_threshold_failed_logins=2)
+        expected = self.run_sequence(make_limiter(False, **settings))
+
+        self.assertEqual(expected[:8], ['allowed'] * 5 + ['rate_limited'] * 3)
+        self.assertIn('captcha_required', expected[8:])
+        for use_redis in self.backends():
+            self.assertEqual(self.run_sequence(make_limiter(use_redis, **settings)), expected)
+
+    def test_no_burst_at_window_boundary(self):
+        """Test: a full window just before the boundary still counts just after it"""
+        for use_redis in self.backends():
+            limiter = make_limiter(use_redis, requests_per_minute_ip=10,
+                                   captcha_threshold_requests_per_minute=0, local_lease_size=1)
+            allowed = 0
+            for now in [1_000_019.9] * 10 + [1_000_020.1] * 10:  # boundary at 1_000_020
+                with mock.patch('security.enhanced_rate_limiter.time.time', return_value=now):
+                    result, _ = limiter.check_rate_limit('10.0.0.3')
+                    allowed += result.value == 'allowed'
+            self.assertEqual(allowed, 10)
+
+    @unittest.skipUnless(HAS_FAKEREDIS, "fakeredis[lua] not installed")
+    def test_local_lease_skips_round_trips(self):
+        """Test: clearly-allowed traffic is served from leased local tokens"""
+        limiter = make_limiter(True, requests_per_minute_ip=1000,
+                               captcha_threshold_requests_per_minute=500, local_lease_size=10)
+        calls = mock.Mock(wraps=limiter._script)
+        limiter._script = calls
+
+        for _ in range(30):
+            result, _ = limiter.check_rate_limit('10.0.0.4', user_id='alice', endpoint='/api/data')
+            self.assertEqual(result.value, 'allowed')
+
+        self.assertEqual(calls.call_count, 3)
+        self.assertEqual(limiter._peek_sliding_count('ratelimit:ip:{10.0.0.4}:minute', 60,
+                                                     __import__('time').time()), 30)
+
+    @unittest.skipUnless(HAS_FAKEREDIS, "fakeredis[lua] not installed")
+    def test_leases_stop_near_limits(self):
+        """Test: leases are not granted close to a limit, so limits stay exact"""
+        limiter = make_limiter(True, requests_per_minute_ip=40,
+                               captcha_threshold_requests_per_minute=0, local_lease_size=10)
+        results = [limiter.check_rate_limit('10.0.0.5')[0].value for _ in range(50)]
+
+        self.assertEqual(results.count('allowed'), 40)
+
+    def test_expired_leases_are_refunded(self):
+        """Test: unused leased tokens don't count once their lease expires"""
+        for use_redis in self.backends():
+            limiter = make_limiter(use_redis)  # 60/min, CAPTCHA above 50, leases of 10
+            results = []
+            for i in range(40):  # 40 requests in one minute bucket, each lease outlived
+                now = 1_000_020.0 + i * 1.5
+                with mock.patch('security.enhanced_rate_limiter.time.time', return_value=now):
+                    results.append(limiter.check_rate_limit('10.0.0.7', endpoint='/api/data')[0].value)
+            self.assertEqual(results, ['allowed'] * 40)
+
+    def test_block_revokes_leases(self):
+        """Test: blocking an IP drops its local tokens"""
+        limiter = make_limiter(False, local_lease_size=10)
+        limiter.check_rate_limit('10.0.0.6', endpoint='/api/data')
+        limiter._block_ip('10.0.0.6', duration=60)
+
+        result, retry_after = limiter.check_rate_limit('10.0.0.6', endpoint='/api/data')
+        self.assertEqual(result.value, 'blocked')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+REDIS HA MANAGER TESTS
+Tests pipelines and scripts under the retry / failure-mode handling, health
+metrics, and the rate limiter and blacklist manager running on the manager
+
+Run: python3 tests/test_redis_ha_manager.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import unittest
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis needs it for EVAL)
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+def make_manager(failure_mode=None, client=None, **overrides):
+    from security.redis_ha_manager import RedisHAManager, RedisHAConfig, RedisFailureMode
+
+    config = RedisHAConfig(
+        failure_mode=failure_mode or RedisFailureMode.FAIL_CLOSED,
+        retry_delay=0,
+        **overrides
+    )
+    if client is None:
+        client = fakeredis.FakeRedis(decode_responses=True)
+    return RedisHAManager(config, redis_client=client)
+
+
+class FlakyRedis(fakeredis.FakeRedis if HAS_FAKEREDIS else object):
+    """Fails the first `failures` pipeline executions"""
+
+    failures = 0
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def flaky_execute(*args, **kwargs):
+            if self.failures > 0:
+                self.failures -= 1
+                raise ConnectionError("connection reset")
+            return execute(*args, **kwargs)
+
+        pipe.execute = flaky_execute
+        return pipe
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis/lupa not installed")
+class TestRedisHAPipeline(unittest.TestCase):
+    """Test batched commands keep the single-command semantics"""
+
+    def test_pipeline_results_and_metrics(self):
+        manager = make_manager()
+
+        with manager.pipeline() as pipe:
+            pipe.incr('counter').expire('counter', 60)
+            pipe.incr('counter')
+            self.assertEqual(len(pipe), 3)
+            self.assertEqual(pipe.execute(), [1, True, 2])
+
+        self.assertEqual(manager.ttl('counter'), 60)
+        metrics = manager.get_metrics()
+        self.assertEqual(metrics['pipelines'], 1)
+        self.assertEqual(metrics['operations'], 2)  # Pipeline + ttl
+        self.assertEqual(metrics['commands'], 4)
+        self.assertIn('p99', metrics['latency_ms'])
+
+    def test_unknown_command_rejected_when_queued(self):
+        manager = make_manager()
+        with self.assertRaises(AttributeError):
+            manager.pipeline().not_a_command('x')
+
+    def test_pipeline_retried_as_a_whole(self):
+        client = FlakyRedis(decode_responses=True)
+        client.failures = 2
+        manager = make_manager(client=client)
+
+        pipe = manager.pipeline()
+        pipe.incr('counter')
+        self.assertEqual(pipe.execute(), [1])  # Transaction: failed attempts applied nothing
+        self.assertEqual(manager.get_metrics()['retries'], 2)
+
+    def test_fail_closed_and_fail_open(self):
+        from security.redis_ha_manager import RedisFailureMode
+
+        client = FlakyRedis(decode_responses=True)
+        client.failures = 10
+        manager = make_manager(client=client, max_retries=1)
+        with self.assertRaises(RuntimeError):
+            manager.pipeline().incr('counter').execute()
+
+        manager = make_manager(RedisFailureMode.FAIL_OPEN, client=client, max_retries=1)
+        self.assertIsNone(manager.pipeline().incr('counter').execute())
+        self.assertEqual(manager.get_metrics()['failures'], 1)
+
+    def test_circuit_breaker_opens_on_pipeline_failures(self):
+        from security.redis_ha_manager import RedisFailureMode
+
+        client = FlakyRedis(decode_responses=True)
+        client.failures = 10
+        manager = make_manager(
+            RedisFailureMode.CIRCUIT_BREAKER, client=client,
+            max_retries=0, circuit_breaker_threshold=2
+        )
+        self.assertIsNone(manager.pipeline().incr('counter').execute())
+        with self.assertRaises(RuntimeError):
+            manager.pipeline().incr('counter').execute()
+
+        client.failures = 0
+        with self.assertRaises(RuntimeError):  # Open: Redis not even tried
+            manager.pipeline().incr('counter').execute()
+        self.assertTrue(manager.get_health_status()['circuit_breaker_open'])
+
+    def test_script_and_scan(self):
+        manager = make_manager()
+        script = manager.register_script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+        self.assertEqual(script(keys=['counter'], args=[5]), 5)
+
+        for i in range(25):
+            manager.setex(f"jwt:blacklist:{i}", 60, "1")
+        self.assertEqual(len(set(manager.scan_iter(match="jwt:blacklist:*", count=10))), 25)
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis/lupa not installed")
+class TestClientsOnHAManager(unittest.TestCase):
+    """Test the limiter and blacklist hot paths through the manager"""
+
+    def test_rate_limiter(self):
+        from security.enhanced_rate_limiter import (
+            EnhancedRateLimiter, RateLimitConfig, RateLimitResult
+        )
+
+        manager = make_manager()
+        limiter = EnhancedRateLimiter(
+            RateLimitConfig(block_threshold_failed_logins=3), redis_client=manager
+        )
+        self.assertIsNotNone(limiter._script)
+        self.assertEqual(limiter.check_rate_limit('10.0.0.1')[0], RateLimitResult.ALLOWED)
+
+        for _ in range(3):
+            limiter.record_failed_login('10.0.0.2')
+        self.assertEqual(limiter.check_rate_limit('10.0.0.2')[0], RateLimitResult.BLOCKED)
+
+        limiter.record_failed_login('10.0.0.3', user_id='alice')
+        limiter.record_successful_login('10.0.0.3', 'alice')
+        self.assertIsNone(manager.get('ratelimit:login_failed:{alice}'))
+        self.assertGreater(manager.get_metrics()['pipelines'], 0)
+
+    def test_blacklist_manager(self):
+        from security.jwt_blacklist_manager import JWTBlacklistManager, BlacklistConfig
+
+        manager = make_manager()
+        blacklist = JWTBlacklistManager(
+            BlacklistConfig(enable_bloom_filter=False), redis_client=manager
+        )
+        tokens = [f"token-{i}" for i in range(4)]
+        for token in tokens[:3]:
+            blacklist._track_user_session('alice', blacklist._hash_token(token), 600)
+        self.assertEqual(blacklist.get_user_active_sessions('alice'), 3)
+
+        self.assertTrue(blacklist.blacklist_token(tokens[3], user_id='bob'))
+        self.assertTrue(blacklist.is_blacklisted(tokens[3]))
+
+        self.assertEqual(blacklist.blacklist_all_user_tokens('alice'), 3)
+        self.assertTrue(all(blacklist.is_blacklisted(token) for token in tokens[:3]))
+        self.assertEqual(blacklist.get_user_active_sessions('alice'), 0)
+
+    def test_blacklist_manager_failed_ttl_lookup(self):
+        from security.jwt_blacklist_manager import JWTBlacklistManager, BlacklistConfig
+        from security.redis_ha_manager import RedisFailureMode
+
+        client = FlakyRedis(decode_responses=True)
+        manager = make_manager(RedisFailureMode.FAIL_OPEN, client=client)
+        blacklist = JWTBlacklistManager(
+            BlacklistConfig(enable_bloom_filter=False), redis_client=manager
+        )
+        tokens = [f"token-{i}" for i in range(3)]
+        for token in tokens:
+            blacklist._track_user_session('alice', blacklist._hash_token(token), 600)
+
+        # Fail-open pipeline returns None: revocation fails, sessions are kept
+        client.failures = 100
+        with self.assertRaises(RuntimeError):
+            blacklist.blacklist_all_user_tokens('alice')
+        client.failures = 0
+        self.assertFalse(any(blacklist.is_blacklisted(token) for token in tokens))
+        self.assertEqual(blacklist.get_user_active_sessions('alice'), 3)
+
+        self.assertEqual(blacklist.blacklist_all_user_tokens('alice'), 3)
+        self.assertTrue(all(blacklist.is_blacklisted(token) for token in tokens))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
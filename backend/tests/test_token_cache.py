@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+VERIFIED TOKEN CACHE TESTS
+Tests the verified-claims cache in JWTValidator and the Bloom-filtered
+JWT blacklist
+
+Run: python3 tests/test_token_cache.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import unittest
+from unittest import mock
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401  (fakeredis needs it for EVAL)
+    HAS_FAKEREDIS = True
+except ImportError:
+    HAS_FAKEREDIS = False
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    """Test caching, expiry bounds, namespaces and invalidation"""
+
+    @classmethod
+    def setUpClass(cls):
+        import jwt
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        cls.jwt = jwt
+        cls.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def make_validator(self, audience="https://api.test", cache=None):
+        from security.jwt_validator import JWTValidator, JWTConfig
+        from security.verified_token_cache import VerifiedTokenCache
+
+        validator = JWTValidator(
+            JWTConfig(issuer="https://issuer.test/", audience=audience,
+                      jwks_uri="https://issuer.test/.well-known/jwks.json"),
+            token_cache=cache or VerifiedTokenCache()
+        )
+        signing_key = mock.Mock(key=self.private_key.public_key())
+        validator.jwks_client = mock.Mock()
+        validator.jwks_client.get_signing_key_from_jwt.return_value = signing_key
+        return validator
+
+    def make_token(self, audience="https://api.test", lifetime=3600):
+        now = int(time.time())
+        return self.jwt.encode(
+            {"sub": "user1", "iss": "https://issuer.test/", "aud": audience,
+             "iat": now, "exp": now + lifetime},
+            self.private_key, algorithm="RS256", headers={"kid": "k1"}
+        )
+
+    def test_repeat_token_skips_verification(self):
+        """Test: second validation of the same token is served from cache"""
+        validator = self.make_validator()
+        token = self.make_token()
+
+        first = validator.validate_token(token)
+        second = validator.validate_token(token)
+
+        self.assertEqual(first, second)
+        self.assertEqual(validator.jwks_client.get_signing_key_from_jwt.call_count, 1)
+        second["sub"] = "mutated"
+        self.assertEqual(validator.validate_token(token)["sub"], "user1")
+
+    def test_entry_bounded_by_token_exp(self):
+        """Test: cached claims are not served past the token's exp"""
+        validator = self.make_validator()
+        token = self.make_token(lifetime=2)
+        self.assertIsNotNone(validator.validate_token(token))
+
+        with mock.patch('security.verified_token_cache.time.time', return_value=time.time() + 3):
+            self.assertIsNone(validator.token_cache.get(validator._cache_namespace, token))
+
+    def test_namespace_isolation(self):
+        """Test: a token cached for one audience is not accepted for another"""
+        from security.verified_token_cache import VerifiedTokenCache
+
+        shared = VerifiedTokenCache()
+        token = self.make_token()
+        self.assertIsNotNone(self.make_validator(cache=shared).validate_token(token))
+        self.assertIsNone(self.make_validator("https://other.test", cache=shared).validate_token(token))
+
+    def test_invalidation_blocks_racing_put(self):
+        """Test: a verification that raced with a revocation is not cached"""
+        validator = self.make_validator()
+        token = self.make_token()
+        generation = validator.token_cache.generation
+
+        validator.token_cache.invalidate(validator.token_cache.hash_token(token))
+        validator.token_cache.put("ns", token, {"sub": "x"}, time.time() + 60, generation=generation)
+
+        self.assertIsNone(validator.token_cache.get("ns", token))
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis[lua] not installed")
+class TestBlacklistBloomFilter(unittest.TestCase):
+    """Test the Bloom fast path stays consistent across processes"""
+
+    def setUp(self):
+        from security.jwt_blacklist_manager import JWTBlacklistManager, BlacklistConfig
+
+        server = fakeredis.FakeServer()
+        config = BlacklistConfig(bloom_capacity=10_000)
+        self.a = JWTBlacklistManager(config, redis_client=fakeredis.FakeRedis(server=server, decode_responses=True))
+        self.b = JWTBlacklistManager(config, redis_client=fakeredis.FakeRedis(server=server, decode_responses=True))
+
+    def tearDown(self):
+        for manager in (self.a, self.b):
+            manager._pubsub_thread.stop()
+
+    def test_negative_check_skips_redis(self):
+        """Test: unknown tokens are answered locally"""
+        with mock.patch.object(self.b._redis_client, 'exists') as exists:
+            self.assertFalse(self.b.is_blacklisted("never-revoked"))
+        exists.assert_not_called()
+
+    def test_event_reaches_other_process(self):
+        """Test: a token revoked in one process is rejected by another"""
+        self.a.blacklist_token("revoked-token", user_id="u1")
+
+        self.assertTrue(self.a.is_blacklisted("revoked-token"))
+        self.assertTrue(wait_for(lambda: self.b.is_blacklisted("revoked-token")))
+        self.assertEqual(self.b._bloom_version, 1)
+
+    def test_missed_event_forces_resync(self):
+        """Test: a version gap makes the filter untrusted until rebuilt"""
+        import json
+        client = self.a._redis_client
+        client.setex(f"jwt:blacklist:{self.a._hash_token('silent-token')}", 600, json.dumps({}))
+        client.incr("jwt:blacklist:version")  # Event never published
+
+        self.b._version_checked_at = 0  # Next check polls the version
+        self.assertTrue(self.b.is_blacklisted("silent-token"))
+        self.assertEqual(self.b._bloom_version, 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+UPLOAD JOB TESTS
+Tests the background job queue (per-user concurrency, limits, status) and
+DocumentManager's asynchronous uploads with content-hash dedupe
+
+Run: python3 tests/test_upload_jobs.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import io
+import tempfile
+import threading
+import time
+import unittest
+
+from utils.job_queue import BackgroundJobQueue, JobQueueFull
+
+try:
+    from werkzeug.datastructures import FileStorage
+    from document_manager import DocumentManager
+    HAS_DOCUMENT_MANAGER = True
+except ImportError:  # Parser / classifier dependencies not installed
+    HAS_DOCUMENT_MANAGER = False
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestBackgroundJobQueue(unittest.TestCase):
+    """Test per-user scheduling and job records"""
+
+    def setUp(self):
+        self.queue = BackgroundJobQueue(max_workers=4, per_user_concurrency=2, max_pending_per_user=6)
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    def work(self, user, seconds=0.05):
+        with self.lock:
+            self.active[user] = self.active.get(user, 0) + 1
+            self.peak[user] = max(self.peak.get(user, 0), self.active[user])
+        time.sleep(seconds)
+        with self.lock:
+            self.active[user] -= 1
+        return user
+
+    def test_per_user_limit_does_not_starve_others(self):
+        alice = [self.queue.submit("alice", self.work, "alice")["job_id"] for _ in range(6)]
+        time.sleep(0.01)
+        bob = self.queue.submit("bob", self.work, "bob", 0.0)["job_id"]
+
+        self.assertEqual(wait_for(self.queue, bob)["result"], "bob")
+        self.assertEqual(self.queue.get(alice[-1])["status"], "queued")  # Bob did not wait for alice's backlog
+
+        for job_id in alice:
+            self.assertEqual(wait_for(self.queue, job_id)["status"], "completed")
+        self.assertEqual(self.peak["alice"], 2)
+
+    def test_pending_limit_and_queue_position(self):
+        release = threading.Event()
+        jobs = [self.queue.submit("alice", release.wait, 5)["job_id"] for _ in range(6)]
+        with self.assertRaises(JobQueueFull):
+            self.queue.submit("alice", release.wait, 5)
+
+        self.assertEqual(self.queue.get(jobs[2])["queue_position"], 0)
+        self.assertEqual(self.queue.get(jobs[5])["queue_position"], 3)
+        self.assertEqual(self.queue.stats()["queued_by_user"], {"alice": 4})
+        release.set()
+        wait_for(self.queue, jobs[5])
+
+    def test_failure_and_ownership(self):
+        def boom():
+            raise ValueError("bad pdf")
+
+        job_id = self.queue.submit("alice", boom, filename="a.pdf")["job_id"]
+        job = wait_for(self.queue, job_id)
+        self.assertEqual((job["status"], job["error"], job["filename"]), ("failed", "bad pdf", "a.pdf"))
+        self.assertIsNone(self.queue.get(job_id, user_id="bob"))
+
+    def test_finished_jobs_expire(self):
+        self.queue.retention_seconds = 0
+        job_id = self.queue.add_completed("alice", {"ok": True})["job_id"]
+        self.queue.submit("alice", lambda: None)
+        self.assertIsNone(self.queue.get(job_id))
+
+
+class FakeParser:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def parse(self, path):
+        self.calls.append(path)
+        time.sleep(self.delay)
+        return {"content": Path(path).read_text(), "metadata": {}}
+
+
+@unittest.skipUnless(HAS_DOCUMENT_MANAGER, "document_manager dependencies not installed")
+class TestDocumentManagerUploads(unittest.TestCase):
+    """Test submit_upload and content-hash dedupe"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        manager = DocumentManager.__new__(DocumentManager)  # Storage only, no API clients
+        manager.UPLOAD_FOLDER = root / "uploads"
+        manager.CLASSIFIED_FOLDER = root / "classified"
+        manager._init_storage()
+        manager._init_upload_jobs(upload_workers=2, uploads_per_user=1)
+        manager.parser = FakeParser(delay=0.1)
+        manager.classify_document_4way = lambda document: {
+            "category": "work", "confidence": 0.9, "needs_review": False, "action": "process"
+        }
+        self.manager = manager
+
+    def tearDown(self):
+        self.manager.upload_jobs.shutdown()
+        self.manager.index.close()
+        self.tmp.cleanup()
+
+    def upload(self, text, name="report.txt", user_id="alice"):
+        return self.manager.submit_upload(FileStorage(io.BytesIO(text.encode()), filename=name), user_id)
+
+    def test_upload_returns_job_then_completes(self):
+        result = self.upload("quarterly numbers")
+        job = result["job"]
+        self.assertIn(job["status"], ("queued", "running"))
+
+        job = wait_for(self.manager.upload_jobs, job["job_id"])
+        self.assertEqual(job["status"], "completed", job["error"])
+        doc_id = job["result"]["document"]["doc_id"]
+        self.assertEqual(self.manager.index.get(doc_id)["category"], "work")
+        self.assertIsNone(self.manager.get_upload_job(job["job_id"], "bob"))
+
+    def test_identical_upload_is_not_parsed_again(self):
+        first = self.upload("same bytes")["job"]
+        inflight = self.upload("same bytes", name="copy.txt")
+        self.assertTrue(inflight["duplicate"])
+        self.assertEqual(inflight["job"]["job_id"], first["job_id"])
+
+        done = wait_for(self.manager.upload_jobs, first["job_id"])
+        later = self.upload("same bytes", name="again.txt")
+        self.assertTrue(later["duplicate"])
+        self.assertEqual(later["job"]["status"], "completed")
+        self.assertEqual(later["job"]["result"]["document"]["doc_id"], done["result"]["document"]["doc_id"])
+
+        self.assertEqual(len(self.manager.parser.calls), 1)
+        self.assertEqual(len(list(self.manager.UPLOAD_FOLDER.iterdir())), 1)  # Copies removed
+
+        # Other users' files are never shared
+        other = self.upload("same bytes", user_id="bob")
+        self.assertNotIn("duplicate", other)
+        wait_for(self.manager.upload_jobs, other["job"]["job_id"])
+        self.assertEqual(len(self.manager.parser.calls), 2)
+
+    def test_parse_failure_marks_job_failed(self):
+        self.manager.parser.parse = lambda path: {}
+        job = wait_for(self.manager.upload_jobs, self.upload("unparseable")["job"]["job_id"])
+        self.assertEqual(job["status"], "failed")
+        self.assertEqual(job["error"], "Failed to parse document content")
+        self.assertEqual(self.manager._inflight_uploads, {})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,259 @@
+"""
+Document Metadata Index
+=======================
+SQLite table of classified-document metadata for DocumentManager.
+
+One row per document (doc_id, user_id, category, confidence, needs_review,
+timestamps); full content stays in the classified JSON files and is loaded
+only for the rows a caller asks for. Statistics are COUNT / GROUP BY
+queries and listings are paginated, so the review and stats endpoints no
+longer glob and parse every document on each request.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class DocumentIndex:
+    """SQLite-backed metadata index of classified documents"""
+
+    COLUMNS = (
+        'doc_id', 'user_id', 'filename', 'category', 'confidence',
+        'needs_review', 'file_size', 'content_hash', 'created_at', 'updated_at'
+    )
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the index
+
+        Args:
+            db_path: SQLite file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                filename TEXT,
+                category TEXT NOT NULL,
+                confidence REAL,
+                needs_review INTEGER NOT NULL DEFAULT 0,
+                file_size INTEGER,
+                content_hash TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_user_category "
+            "ON documents (user_id, category, needs_review)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_user_review "
+            "ON documents (user_id, needs_review)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(documents)")}
+        if 'content_hash' not in columns:  # Index created before upload dedupe
+            self._conn.execute("ALTER TABLE documents ADD COLUMN content_hash TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_user_hash "
+            "ON documents (user_id, content_hash)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def row_from_document(document: Dict) -> Dict:
+        """Index row for a classified document dict"""
+        classification = document.get('classification', {})
+        metadata = document.get('metadata', {})
+        created_at = metadata.get('upload_time') or datetime.now().isoformat()
+        return {
+            'doc_id': document['doc_id'],
+            'user_id': document.get('user_id', 'default'),
+            'filename': document.get('filename'),
+            'category': classification.get('category', 'uncertain'),
+            'confidence': classification.get('confidence'),
+            'needs_review': bool(classification.get('needs_review', False)),
+            'file_size': metadata.get('file_size'),
+            'content_hash': metadata.get('content_hash'),
+            'created_at': created_at,
+            'updated_at': datetime.now().isoformat()
+        }
+
+    def upsert(self, document: Dict):
+        """Add or update a document's row"""
+        self.upsert_many([document])
+
+    def upsert_many(self, documents: Iterable[Dict]):
+        """Add or update rows for several documents in one transaction"""
+        rows = [self.row_from_document(doc) for doc in documents]
+        if not rows:
+            return
+
+        placeholders = ','.join('?' * len(self.COLUMNS))
+        updates = ','.join(f"{col} = excluded.{col}" for col in self.COLUMNS[1:] if col != 'created_at')
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO documents ({','.join(self.COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(doc_id) DO UPDATE SET {updates}",
+                [tuple(int(row[col]) if col == 'needs_review' else row[col] for col in self.COLUMNS)
+                 for row in rows]
+            )
+            self._conn.commit()
+
+    def delete(self, doc_id: str):
+        """Remove a document's row"""
+        with self._lock:
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+
+    def get(self, doc_id: str) -> Optional[Dict]:
+        """Row for one document, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def find_by_hash(self, user_id: str, content_hash: str) -> Optional[Dict]:
+        """A user's document with this content hash (oldest first), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE user_id = ? AND content_hash = ? "
+                "ORDER BY created_at LIMIT 1",
+                (user_id, content_hash)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def query(
+        self,
+        user_id: str,
+        categories: Optional[List[str]] = None,
+        needs_review: Optional[bool] = None,
+        review_queue: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        List a user's documents, oldest first
+
+        Args:
+            user_id: User identifier
+            categories: Only these categories
+            needs_review: Only documents with (True) / without (False) the flag
+            review_queue: Documents awaiting review: uncertain, or flagged
+            limit: Page size (None for all)
+            offset: Rows to skip
+
+        Returns:
+            Index rows
+        """
+        where, params = self._filters(user_id, categories, needs_review, review_queue)
+        sql = f"SELECT * FROM documents WHERE {where} ORDER BY created_at, doc_id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(int(offset))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def count(
+        self,
+        user_id: str,
+        categories: Optional[List[str]] = None,
+        needs_review: Optional[bool] = None,
+        review_queue: bool = False
+    ) -> int:
+        """Number of rows query() would return without a limit"""
+        where, params = self._filters(user_id, categories, needs_review, review_queue)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM documents WHERE {where}", params
+            ).fetchone()[0]
+
+    def statistics(self, user_id: str) -> Dict:
+        """
+        Per-category totals for a user
+
+        Returns:
+            Dict of category -> {'total', 'needs_review'}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, COUNT(*), SUM(needs_review) FROM documents "
+                "WHERE user_id = ? GROUP BY category",
+                (user_id,)
+            ).fetchall()
+        return {category: {'total': total, 'needs_review': flagged or 0}
+                for category, total, flagged in rows}
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone() is None
+
+    def rebuild(self, classified_folder: Path, categories: Iterable[str]) -> int:
+        """
+        Re-index every classified JSON file (for existing data or after
+        files were changed outside DocumentManager)
+
+        Returns:
+            Number of documents indexed
+        """
+        documents = []
+        for category in categories:
+            for doc_file in (Path(classified_folder) / category).glob("*.json"):
+                try:
+                    with open(doc_file, 'r', encoding='utf-8') as f:
+                        document = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"⚠️  Skipping unreadable document {doc_file.name}: {e}")
+                    continue
+                document.setdefault('doc_id', doc_file.stem)
+                # The folder is authoritative for the category
+                document.setdefault('classification', {})['category'] = category
+                documents.append(document)
+
+        with self._lock:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.commit()
+        self.upsert_many(documents)
+        return len(documents)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _filters(user_id, categories, needs_review, review_queue):
+        clauses = ["user_id = ?"]
+        params: List = [user_id]
+        if categories:
+            clauses.append(f"category IN ({','.join('?' * len(categories))})")
+            params.extend(categories)
+        if needs_review is not None:
+            clauses.append("needs_review = ?")
+            params.append(int(needs_review))
+        if review_queue:
+            clauses.append("(category = 'uncertain' OR needs_review = 1)")
+        return ' AND '.join(clauses), params
+
+    @staticmethod
+    def _to_dict(row) -> Dict:
+        result = dict(row)
+        result['needs_review'] = bool(result['needs_review'])
+        return result
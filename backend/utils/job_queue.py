@@ -0,0 +1,181 @@
+"""
+Background Job Queue
+====================
+Runs slow request work (document parsing and classification) on a
+worker pool so the HTTP request can return a job id immediately.
+
+- Each user has at most `per_user_concurrency` jobs running; the rest
+  wait in that user's queue without holding a worker, so one user's bulk
+  upload cannot starve everyone else
+- `max_pending_per_user` bounds how much one user can queue
+- Finished jobs are kept for `retention_seconds` for status polling
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class JobQueueFull(Exception):
+    """Raised when a user already has the maximum number of pending jobs"""
+
+
+class BackgroundJobQueue:
+    """Worker pool with per-user concurrency limits and job status tracking"""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        per_user_concurrency: int = 2,
+        max_pending_per_user: int = 50,
+        retention_seconds: float = 3600
+    ):
+        """
+        Args:
+            max_workers: Jobs running at once across all users
+            per_user_concurrency: Jobs running at once for one user
+            max_pending_per_user: Queued + running jobs allowed per user
+            retention_seconds: How long finished jobs stay queryable
+        """
+        self.per_user_concurrency = max(1, per_user_concurrency)
+        self.max_pending_per_user = max(1, max_pending_per_user)
+        self.retention_seconds = retention_seconds
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._waiting: Dict[str, Deque[Tuple[str, Callable, tuple]]] = {}
+        self._running: Dict[str, int] = {}
+
+    def submit(self, user_id: str, fn: Callable[..., Any], *args, **info) -> Dict:
+        """
+        Queue fn(*args) for a user
+
+        Args:
+            user_id: Owner (concurrency limits and status access)
+            fn: Work to run; its return value becomes the job result
+            info: Extra fields copied into the job record (e.g. filename)
+
+        Returns:
+            Job record (status 'queued' or 'running')
+        """
+        with self._lock:
+            self._prune()
+            pending = len(self._waiting.get(user_id, ())) + self._running.get(user_id, 0)
+            if pending >= self.max_pending_per_user:
+                raise JobQueueFull(
+                    f"{pending} jobs already pending for this user (max {self.max_pending_per_user})"
+                )
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                **info,
+                'job_id': job_id,
+                'user_id': user_id,
+                'status': 'queued',
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+            self._waiting.setdefault(user_id, deque()).append((job_id, fn, args))
+            self._dispatch(user_id)
+            return dict(self._jobs[job_id])
+
+    def add_completed(self, user_id: str, result: Any, **info) -> Dict:
+        """Record a job that needed no work (e.g. a duplicate upload)"""
+        with self._lock:
+            self._prune()
+            job_id = uuid.uuid4().hex
+            now = datetime.now().isoformat()
+            self._jobs[job_id] = {
+                **info,
+                'job_id': job_id,
+                'user_id': user_id,
+                'status': 'completed',
+                'created_at': now,
+                'started_at': now,
+                'finished_at': now,
+                'result': result,
+                'error': None
+            }
+            self._finished_at[job_id] = time.monotonic()
+            return dict(self._jobs[job_id])
+
+    def get(self, job_id: str, user_id: Optional[str] = None) -> Optional[Dict]:
+        """Job record, or None if unknown, expired or owned by another user"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or (user_id is not None and job['user_id'] != user_id):
+                return None
+            record = dict(job)
+
+        if record['status'] == 'queued':
+            record['queue_position'] = self._queue_position(job_id, record['user_id'])
+        return record
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+            return {
+                'jobs': counts,
+                'running_by_user': {u: n for u, n in self._running.items() if n},
+                'queued_by_user': {u: len(q) for u, q in self._waiting.items() if q}
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _queue_position(self, job_id: str, user_id: str) -> Optional[int]:
+        with self._lock:
+            for position, (queued_id, _, _) in enumerate(self._waiting.get(user_id, ())):
+                if queued_id == job_id:
+                    return position
+        return None
+
+    def _dispatch(self, user_id: str):
+        """Start the user's next jobs up to their concurrency limit (lock held)"""
+        waiting = self._waiting.get(user_id)
+        while waiting and self._running.get(user_id, 0) < self.per_user_concurrency:
+            job_id, fn, args = waiting.popleft()
+            self._running[user_id] = self._running.get(user_id, 0) + 1
+            self._executor.submit(self._run, user_id, job_id, fn, args)
+        if not waiting:
+            self._waiting.pop(user_id, None)
+
+    def _run(self, user_id: str, job_id: str, fn: Callable, args: tuple):
+        with self._lock:
+            self._jobs[job_id]['status'] = 'running'
+            self._jobs[job_id]['started_at'] = datetime.now().isoformat()
+
+        try:
+            result, error, status = fn(*args), None, 'completed'
+        except Exception as e:
+            print(f"⚠️  Job {job_id} failed: {e}")
+            result, error, status = None, str(e), 'failed'
+
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(status=status, result=result, error=error,
+                       finished_at=datetime.now().isoformat())
+            self._finished_at[job_id] = time.monotonic()
+            self._running[user_id] -= 1
+            if not self._running[user_id]:
+                del self._running[user_id]
+            self._dispatch(user_id)
+
+    def _prune(self):
+        """Forget finished jobs past retention (lock held)"""
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [job_id for job_id, finished in self._finished_at.items() if finished < cutoff]
+        for job_id in expired:
+            del self._finished_at[job_id]
+            self._jobs.pop(job_id, None)
@@ -0,0 +1,390 @@
+"""
+Concurrent LLM Batch Executor
+=============================
+Shared by the work/personal classifier and the message filter.
+
+- Cache first: items are looked up in the shared LLM cache by content
+  hash, and identical items in one run are sent once
+- Packing: up to `items_per_request` items go into one prompt when the
+  caller's output format can carry several answers
+- Concurrency: a bounded thread pool keeps several requests in flight
+- Rate limiting: a requests/tokens-per-minute token bucket, corrected by
+  the x-ratelimit-* and retry-after headers of each response
+- Retries: 408/409/429/5xx and connection errors back off exponentially
+  with full jitter, honouring retry-after
+"""
+
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.llm_cache import LLMCache
+
+
+# call(prompt, max_tokens) -> (response text, response headers)
+LLMCall = Callable[[str, int], Tuple[str, Mapping[str, str]]]
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_SCALE = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+
+
+def parse_duration(value) -> Optional[float]:
+    """Seconds for '20', '1.5', '120ms', '6m0s' or '1h2m3s' (None if unparseable)"""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_SCALE[unit] for number, unit in parts)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+class TokenBucketLimiter:
+    """
+    Requests- and tokens-per-minute token bucket shared by worker threads
+
+    Buckets refill continuously at limit/60 per second. Limits passed in
+    are a starting point: x-ratelimit-limit-* headers replace them,
+    x-ratelimit-remaining-* lowers the local budget to the server's view
+    (the quota is shared with other clients), and a 429 or retry-after
+    pauses every caller until the server's reset time.
+    """
+
+    RESOURCES = ('requests', 'tokens')
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        """
+        Args:
+            requests_per_minute: Initial request limit (None: learn from headers)
+            tokens_per_minute: Initial token limit (None: learn from headers)
+        """
+        self.limits: Dict[str, Optional[float]] = {
+            'requests': requests_per_minute,
+            'tokens': tokens_per_minute
+        }
+        self.available: Dict[str, float] = {
+            resource: float(limit) for resource, limit in self.limits.items() if limit
+        }
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        self.waits = 0
+        self.waited_seconds = 0.0
+        self.throttled = 0
+
+    def acquire(self, tokens: int = 0):
+        """Block until one request using about `tokens` tokens is allowed"""
+        cost = {'requests': 1.0, 'tokens': float(tokens)}
+        waited = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_time(cost, now)
+                if wait <= 0:
+                    for resource, amount in cost.items():
+                        if resource in self.available:
+                            self.available[resource] -= min(amount, self.limits[resource])
+                    return
+                if not waited:
+                    self.waits += 1
+                    waited = True
+                self.waited_seconds += wait
+            time.sleep(wait)
+
+    def observe(self, headers: Optional[Mapping[str, str]], status: Optional[int] = None):
+        """Update the buckets from a response's (or error response's) headers"""
+        headers = {str(k).lower(): v for k, v in dict(headers or {}).items()}
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            for resource in self.RESOURCES:
+                limit = parse_duration(headers.get(f'x-ratelimit-limit-{resource}'))
+                if limit:
+                    self.limits[resource] = limit
+                    self.available.setdefault(resource, limit)
+
+                remaining = parse_duration(headers.get(f'x-ratelimit-remaining-{resource}'))
+                if remaining is not None:
+                    if resource in self.available:
+                        self.available[resource] = min(self.available[resource], remaining)
+                    if remaining < 1:
+                        reset = parse_duration(headers.get(f'x-ratelimit-reset-{resource}'))
+                        if reset:
+                            self._pause(now + reset)
+
+            retry_after_ms = parse_duration(headers.get('retry-after-ms'))
+            retry_after = retry_after_ms / 1000 if retry_after_ms is not None else \
+                parse_duration(headers.get('retry-after'))
+
+            if status == 429:
+                self.throttled += 1
+                for resource in self.available:
+                    self.available[resource] = 0.0
+                self._pause(now + (retry_after if retry_after is not None else 1.0))
+            elif retry_after:
+                self._pause(now + retry_after)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'limits': dict(self.limits),
+                'waits': self.waits,
+                'waited_seconds': round(self.waited_seconds, 3),
+                'throttled': self.throttled
+            }
+
+    def _pause(self, until: float):
+        self._paused_until = max(self._paused_until, until)
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        for resource in self.available:
+            limit = self.limits[resource]
+            self.available[resource] = min(limit, self.available[resource] + elapsed * limit / 60.0)
+
+    def _wait_time(self, cost: Dict[str, float], now: float) -> float:
+        wait = self._paused_until - now
+        for resource, amount in cost.items():
+            if resource not in self.available:
+                continue
+            limit = self.limits[resource]
+            # A request larger than the whole bucket waits for a full bucket
+            shortfall = min(amount, limit) - self.available[resource]
+            if shortfall > 0:
+                wait = max(wait, shortfall * 60.0 / limit)
+        return wait
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections"""
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return type(error).__name__ in ('APIConnectionError', 'APITimeoutError')
+
+
+def chat_completion_call(client, model: str, system_prompt: str, temperature: float = 0.0) -> LLMCall:
+    """
+    LLMCall for an OpenAI / AzureOpenAI client that also returns the
+    response headers (for rate limiting)
+    """
+    def call(prompt: str, max_tokens: int):
+        raw = client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        completion = raw.parse()
+        return (completion.choices[0].message.content or '').strip(), raw.headers
+
+    return call
+
+
+class LLMBatchExecutor:
+    """Runs many small LLM classifications as cached, packed, concurrent requests"""
+
+    def __init__(
+        self,
+        call: LLMCall,
+        model: str,
+        template_version: str,
+        max_concurrency: int = 8,
+        limiter: Optional[TokenBucketLimiter] = None,
+        cache: Optional[LLMCache] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0
+    ):
+        """
+        Args:
+            call: Sends one prompt, returns (text, headers)
+            model: Model or deployment name (cache key)
+            template_version: Prompt template version (cache key)
+            max_concurrency: Max requests in flight
+            limiter: Shared rate limiter (default: learn limits from headers)
+            cache: LLM cache (None disables caching)
+            max_retries: Retries per request for retryable errors
+            base_delay: First backoff ceiling in seconds
+            max_delay: Backoff ceiling in seconds
+        """
+        self.call = call
+        self.model = model
+        self.template_version = template_version
+        self.max_concurrency = max(1, max_concurrency)
+        self.limiter = limiter or TokenBucketLimiter()
+        self.cache = cache
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._retries = 0
+        self._stats_lock = threading.Lock()
+
+    def run(
+        self,
+        items: Sequence[Any],
+        build_prompt: Callable[[List[Any]], str],
+        parse: Callable[[str, int], List[Optional[Dict]]],
+        key: Callable[[Any], str] = str,
+        items_per_request: int = 1,
+        max_tokens: Callable[[int], int] = lambda count: 100 * count,
+        cacheable: Optional[Callable[[Dict], bool]] = None,
+        on_request: Optional[Callable[[int, Optional[Exception]], None]] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Dict:
+        """
+        Classify items
+
+        Args:
+            items: Items to classify
+            build_prompt: Prompt for a list of (1..items_per_request) items
+            parse: (response text, item count) -> one result dict per item,
+                None where the response had no usable answer
+            key: Cache content for an item (everything the answer depends on)
+            items_per_request: Max items packed into one prompt
+            max_tokens: Completion token budget for a pack of n items
+            cacheable: Only cache results for which this returns True
+            on_request: Called (main thread) after each request with
+                (item count, error or None)
+            progress: Called (main thread) with the number of items finished
+
+        Returns:
+            Dict with 'results' (aligned with items, None if unanswered),
+            'errors' (item index -> message for failed requests) and 'stats'
+        """
+        started = time.perf_counter()
+        self._retries = 0
+        keys = [key(item) for item in items]
+        results: List[Optional[Dict]] = [None] * len(items)
+        errors: Dict[int, str] = {}
+
+        cached = self.cache.get_many(self.model, self.template_version, keys) if self.cache else {}
+
+        # Identical items share one answer: content hash -> item indices
+        pending: Dict[str, List[int]] = {}
+        for index, content in enumerate(keys):
+            content_hash = LLMCache.content_hash(content)
+            if content_hash in cached:
+                results[index] = dict(cached[content_hash])
+            else:
+                pending.setdefault(content_hash, []).append(index)
+
+        groups = list(pending.values())
+        cache_hits = len(items) - sum(len(group) for group in groups)
+        if progress and cache_hits:
+            progress(cache_hits)
+
+        size = max(1, items_per_request)
+        packs = [groups[start:start + size] for start in range(0, len(groups), size)]
+
+        requests_failed = 0
+        unanswered = 0
+        if packs:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(packs))) as pool:
+                futures = {
+                    pool.submit(
+                        self._run_pack, [items[group[0]] for group in pack],
+                        build_prompt, parse, max_tokens
+                    ): pack
+                    for pack in packs
+                }
+                for future in as_completed(futures):
+                    pack = futures[future]
+                    error = None
+                    try:
+                        parsed = future.result()
+                    except Exception as e:
+                        error = e
+                        parsed = [None] * len(pack)
+                        requests_failed += 1
+
+                    to_cache = []
+                    for group, result in zip(pack, parsed):
+                        if result is None:
+                            unanswered += len(group)
+                        for index in group:
+                            results[index] = dict(result) if result is not None else None
+                            if error is not None:
+                                errors[index] = str(error)
+                        if result is not None and (cacheable is None or cacheable(result)):
+                            to_cache.append((keys[group[0]], result))
+
+                    if self.cache and to_cache:
+                        self.cache.put_many(self.model, self.template_version, to_cache)
+                    if on_request:
+                        on_request(len(pack), error)
+                    if progress:
+                        progress(sum(len(group) for group in pack))
+
+        elapsed = time.perf_counter() - started
+        return {
+            'results': results,
+            'errors': errors,
+            'stats': {
+                'items': len(items),
+                'cache_hits': cache_hits,
+                'unique_requested': len(groups),
+                'requests': len(packs),
+                'requests_failed': requests_failed,
+                'retries': self._retries,
+                'unanswered': unanswered,
+                'elapsed_seconds': round(elapsed, 3),
+                'items_per_second': round(len(items) / elapsed, 1) if elapsed > 0 else 0.0,
+                'rate_limiter': self.limiter.stats()
+            }
+        }
+
+    def _run_pack(self, pack: List[Any], build_prompt, parse, max_tokens) -> List[Optional[Dict]]:
+        prompt = build_prompt(pack)
+        completion_tokens = max_tokens(len(pack))
+        text = self.request(prompt, completion_tokens)
+        parsed = list(parse(text, len(pack)) or [])
+        return (parsed + [None] * len(pack))[:len(pack)]
+
+    def request(self, prompt: str, max_tokens: int) -> str:
+        """
+        One request with rate limiting and jittered exponential backoff
+        (no caching; for callers that schedule their own work)
+
+        Raises:
+            The last error once retries are exhausted, or a non-retryable error
+        """
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(estimate_tokens(prompt) + max_tokens)
+            try:
+                text, headers = self.call(prompt, max_tokens)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                response = getattr(e, 'response', None)
+                self.limiter.observe(getattr(response, 'headers', None), getattr(e, 'status_code', None))
+                with self._stats_lock:
+                    self._retries += 1
+                # Full jitter; a retry-after pause is enforced by the limiter
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                continue
+            self.limiter.observe(headers)
+            return text
@@ -0,0 +1,274 @@
+"""
+Shared LLM Response Cache
+=========================
+Single-file SQLite store for LLM responses, shared by the clusterers,
+gap analyzer and work/personal classifier.
+
+Entries are keyed on (model, prompt template version, SHA-256 of the full
+content), so bumping a template version invalidates old responses and two
+documents that only share a prefix never collide. The store is bounded by
+entry count and total size (checked every few hundred writes); least
+recently used entries are evicted first.
+"""
+
+import json
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "club_data" / "llm_cache.db"
+
+
+class LLMCache:
+    """SQLite-backed LLM response cache with LRU eviction and hit/miss stats"""
+
+    def __init__(
+        self,
+        db_path: str = None,
+        max_entries: int = 200_000,
+        max_bytes: int = 512 * 1024 * 1024
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: SQLite file (default: club_data/llm_cache.db)
+            max_entries: Max number of cached responses
+            max_bytes: Max total size of cached response payloads
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evict_check_interval = 256  # Writes between bound checks
+        self._writes_since_check = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                model TEXT NOT NULL,
+                template_version TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (model, template_version, content_hash)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """SHA-256 of the full content"""
+        return hashlib.sha256(content.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    def get(self, model: str, template_version: str, content: str) -> Optional[Dict]:
+        """
+        Look up a cached response
+
+        Args:
+            model: Model or deployment name
+            template_version: Prompt template version
+            content: Full content the prompt was built from
+
+        Returns:
+            Cached response, or None on miss
+        """
+        return self.get_many(model, template_version, [content]).get(
+            self.content_hash(content)
+        )
+
+    def put(self, model: str, template_version: str, content: str, value: Dict):
+        """Store a response"""
+        self.put_many(model, template_version, [(content, value)])
+
+    def get_many(
+        self,
+        model: str,
+        template_version: str,
+        contents: Iterable[str]
+    ) -> Dict[str, Dict]:
+        """
+        Batch lookup
+
+        Returns:
+            Dict of content_hash -> cached response, for hits only
+        """
+        model = model or ''
+        hashes = list(dict.fromkeys(self.content_hash(c) for c in contents))
+        if not hashes:
+            return {}
+
+        found: Dict[str, Dict] = {}
+        now = time.time()
+
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, value FROM llm_cache "
+                    f"WHERE model = ? AND template_version = ? AND content_hash IN ({placeholders})",
+                    (model, template_version, *chunk)
+                ).fetchall()
+
+                for content_hash, value in rows:
+                    try:
+                        found[content_hash] = json.loads(value)
+                    except json.JSONDecodeError:
+                        continue
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE llm_cache SET accessed_at = ? "
+                    "WHERE model = ? AND template_version = ? AND content_hash = ?",
+                    [(now, model, template_version, h) for h in found]
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+
+        return found
+
+    def put_many(
+        self,
+        model: str,
+        template_version: str,
+        items: Iterable[Tuple[str, Dict]]
+    ):
+        """
+        Batch store
+
+        Args:
+            items: Iterable of (content, response) pairs
+        """
+        model = model or ''
+        now = time.time()
+        rows = []
+        for content, value in items:
+            payload = json.dumps(value, ensure_ascii=False)
+            rows.append((
+                model,
+                template_version,
+                self.content_hash(content),
+                payload,
+                len(payload.encode('utf-8')),
+                now,
+                now
+            ))
+
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(model, template_version, content_hash, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._writes_since_check += len(rows)
+            if self._writes_since_check >= self.evict_check_interval:
+                self._evict()
+                self._writes_since_check = 0
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until within bounds (lock held)"""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        excess_entries = max(0, count - self.max_entries)
+        excess_bytes = max(0, total - self.max_bytes)
+
+        victims: List[Tuple[str, str, str]] = []
+        freed = 0
+        cursor = self._conn.execute(
+            "SELECT model, template_version, content_hash, size FROM llm_cache "
+            "ORDER BY accessed_at ASC"
+        )
+        for model, template_version, content_hash, size in cursor:
+            if len(victims) >= excess_entries and freed >= excess_bytes:
+                break
+            victims.append((model, template_version, content_hash))
+            freed += size
+
+        self._conn.executemany(
+            "DELETE FROM llm_cache WHERE model = ? AND template_version = ? AND content_hash = ?",
+            victims
+        )
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict:
+        """Hit/miss statistics and store size"""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': count,
+            'bytes': total,
+            'db_path': str(self.db_path)
+        }
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+
+# Shared cache instances, one per database file
+_llm_cache_instances: Dict[str, LLMCache] = {}
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache(db_path: str = None) -> LLMCache:
+    """
+    Get the shared LLM cache for a database file
+
+    Args:
+        db_path: SQLite file (default: club_data/llm_cache.db)
+
+    Returns:
+        LLMCache instance
+    """
+    path = Path(db_path) if db_path else DEFAULT_DB_PATH
+    key = str(path.resolve())
+
+    with _llm_cache_lock:
+        if key not in _llm_cache_instances:
+            _llm_cache_instances[key] = LLMCache(str(path))
+        return _llm_cache_instances[key]
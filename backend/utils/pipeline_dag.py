@@ -0,0 +1,346 @@
+"""
+Pipeline Step Graph
+===================
+Runs a batch pipeline as a dependency graph of steps.
+
+- A step starts as soon as every step it depends on has finished, so
+  independent steps (gap analysis, knowledge graph, vector DB, slides -
+  all downstream of project clustering only) run in parallel
+- Each step's inputs are fingerprinted: its parameters, the size and
+  mtime of its external input files, and the output fingerprints of the
+  steps it depends on. A step whose fingerprint matches its last
+  successful run, and whose outputs are unchanged since (same size and
+  mtime), is skipped and its recorded result reused
+- Per-step state is saved after every step, so a failed or interrupted
+  run resumes where it stopped
+- The run report records each step's status, wall time and the peak
+  process RSS while it ran (steps running in parallel share a process,
+  so overlapping steps see each other's memory; `overlapped_with` says
+  which)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+@dataclass
+class PipelineStep:
+    """
+    One node of a PipelineGraph
+
+    `run` receives a dict of dependency name -> result. Its result is
+    recorded (after `record`) in the state file, so it must be JSON
+    serializable; steps that produce live objects provide `record` and
+    `load` to turn them into a path or id and back.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Any]
+    deps: Sequence[str] = ()
+    inputs: Sequence[str] = ()      # External files / dirs fingerprinted by size + mtime
+    outputs: Sequence[str] = ()     # Must be unchanged since the last run for the step to be up to date
+    params: Dict[str, Any] = field(default_factory=dict)
+    cacheable: bool = True          # False: always run (cheap steps, live objects)
+    succeeded: Callable[[Any], bool] = lambda result: True  # Soft failures are not recorded
+    record: Callable[[Any], Any] = lambda result: result
+    load: Callable[[Any], Any] = lambda recorded: recorded
+
+
+def fingerprint_paths(paths: Sequence[str]) -> str:
+    """SHA-256 over (path, size, mtime) of every file under the given paths"""
+    hasher = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        hasher.update(str(path).encode('utf-8', errors='surrogatepass'))
+        if path.is_file():
+            stat = path.stat()
+            hasher.update(f"|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        elif path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = Path(root) / name
+                    try:
+                        stat = file_path.stat()
+                    except OSError:
+                        continue
+                    relative = file_path.relative_to(path)
+                    hasher.update(f"\n{relative}|{stat.st_size}|{stat.st_mtime_ns}".encode(
+                        'utf-8', errors='surrogatepass'))
+        else:
+            hasher.update(b"|missing")
+    return hasher.hexdigest()
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PipelineGraph:
+    """Dependency-graph runner with input fingerprints and a run report"""
+
+    def __init__(
+        self,
+        steps: List[PipelineStep],
+        state_path: str,
+        max_parallel: int = 4,
+        memory_sample_interval: float = 0.1
+    ):
+        """
+        Args:
+            steps: Pipeline steps (dependencies must be in the list)
+            state_path: JSON file with each step's last successful run
+            max_parallel: Steps running at once
+            memory_sample_interval: Seconds between RSS samples
+        """
+        self.steps = {step.name: step for step in steps}
+        if len(self.steps) != len(steps):
+            raise ValueError("Duplicate step names")
+        for step in steps:
+            missing = [dep for dep in step.deps if dep not in self.steps]
+            if missing:
+                raise ValueError(f"Step '{step.name}' depends on unknown steps: {missing}")
+        self._check_acyclic()
+
+        self.state_path = Path(state_path)
+        self.max_parallel = max(1, max_parallel)
+        self.memory_sample_interval = memory_sample_interval
+
+        self.results: Dict[str, Any] = {}
+        self.report: Dict[str, Any] = {}
+        self._state = self._load_state()
+        self._output_fingerprints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._running: Dict[str, Dict] = {}
+
+    def run(self, force: Sequence[str] = (), force_all: bool = False) -> Dict:
+        """
+        Run every step that is not up to date
+
+        Args:
+            force: Step names to run even if up to date
+            force_all: Run every step
+
+        Returns:
+            Run report: per-step status ('ran', 'skipped', 'failed',
+            'blocked'), wall time and peak RSS
+        """
+        started = time.perf_counter()
+        self.report = {
+            'started_at': datetime.now().isoformat(),
+            'max_parallel': self.max_parallel,
+            'steps': {}
+        }
+        force = set(force)
+
+        pending = dict(self.steps)
+        done: Dict[str, str] = {}  # name -> status
+        futures = {}
+
+        stop_sampling = threading.Event()
+        sampler = threading.Thread(target=self._sample_memory, args=(stop_sampling,), daemon=True)
+        sampler.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+                while pending or futures:
+                    for name in list(pending):
+                        step = pending[name]
+                        if any(dep not in done for dep in step.deps):
+                            continue
+                        del pending[name]
+
+                        blocked_by = [dep for dep in step.deps if done[dep] in ('failed', 'blocked')]
+                        if blocked_by:
+                            done[name] = 'blocked'
+                            with self._lock:
+                                self.report['steps'][name] = {'status': 'blocked', 'blocked_by': blocked_by}
+                            continue
+
+                        key = self._step_key(step)
+                        if not (force_all or name in force) and self._up_to_date(step, key):
+                            try:
+                                self._skip(step)
+                                done[name] = 'skipped'
+                                continue
+                            except Exception as e:
+                                print(f"⚠ {name}: could not reuse last run ({e}), re-running")
+
+                        futures[executor.submit(self._execute, step, key)] = name
+
+                    if not futures:
+                        continue
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = futures.pop(future)
+                        done[name] = future.result()
+        finally:
+            stop_sampling.set()
+            sampler.join()
+
+        self.report['finished_at'] = datetime.now().isoformat()
+        self.report['total_seconds'] = round(time.perf_counter() - started, 3)
+        self.report['failed'] = [name for name, status in done.items() if status == 'failed']
+        return self.report
+
+    def save_report(self, path: str):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report, f, indent=2, ensure_ascii=False)
+
+    def print_report(self):
+        print(f"\n{'step':<24} {'status':<8} {'seconds':>9} {'peak RSS MB':>12}")
+        for name in self.steps:
+            entry = self.report.get('steps', {}).get(name, {})
+            seconds = entry.get('wall_seconds')
+            peak = entry.get('peak_rss_mb')
+            print(f"{name:<24} {entry.get('status', '-'):<8} "
+                  f"{seconds if seconds is not None else '-':>9} {peak if peak is not None else '-':>12}")
+        print(f"Total: {self.report.get('total_seconds')}s")
+
+    # Execution
+
+    def _execute(self, step: PipelineStep, key: str) -> str:
+        """Run one step (worker thread); returns its status"""
+        entry = {
+            'status': 'running',
+            'started_at': datetime.now().isoformat(),
+            'overlapped_with': set()
+        }
+        rss = _rss_bytes()
+        entry['_peak'] = rss
+        entry['rss_start_mb'] = round(rss / 1024 / 1024, 1) if rss is not None else None
+
+        with self._lock:
+            for other_name, other in self._running.items():
+                other['overlapped_with'].add(step.name)
+                entry['overlapped_with'].add(other_name)
+            self._running[step.name] = entry
+
+        started = time.perf_counter()
+        try:
+            dep_results = {dep: self.results[dep] for dep in step.deps}
+            result = step.run(dep_results)
+            status = 'ran'
+        except Exception as e:
+            traceback.print_exc()
+            result = None
+            status = 'failed'
+            entry['error'] = str(e)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            del self._running[step.name]
+            self.results[step.name] = result
+
+            if status == 'ran':
+                self._output_fingerprints[step.name] = fingerprint_paths(step.outputs) if step.outputs else key
+                if step.cacheable and step.succeeded(result):
+                    self._state[step.name] = {
+                        'key': key,
+                        'outputs_fingerprint': self._output_fingerprints[step.name],
+                        'result': step.record(result),
+                        'completed_at': datetime.now().isoformat()
+                    }
+                    self._save_state()
+
+            peak = entry.pop('_peak')
+            entry.update({
+                'status': status,
+                'wall_seconds': round(elapsed, 3),
+                'peak_rss_mb': round(peak / 1024 / 1024, 1) if peak is not None else None,
+                'overlapped_with': sorted(entry['overlapped_with'])
+            })
+            self.report['steps'][step.name] = entry
+        return status
+
+    def _skip(self, step: PipelineStep):
+        saved = self._state[step.name]
+        result = step.load(saved['result'])
+        with self._lock:
+            self.results[step.name] = result
+            self._output_fingerprints[step.name] = saved['outputs_fingerprint']
+            self.report['steps'][step.name] = {'status': 'skipped', 'last_run': saved.get('completed_at')}
+        print(f"✓ {step.name}: up to date (last run {saved.get('completed_at')}), skipped")
+
+    def _sample_memory(self, stop: threading.Event):
+        while not stop.wait(self.memory_sample_interval):
+            rss = _rss_bytes()
+            if rss is None:
+                return
+            with self._lock:
+                for entry in self._running.values():
+                    if entry['_peak'] is None or rss > entry['_peak']:
+                        entry['_peak'] = rss
+
+    # Fingerprints and state
+
+    def _step_key(self, step: PipelineStep) -> str:
+        """Fingerprint of everything the step's output depends on"""
+        payload = {
+            'step': step.name,
+            'params': step.params,
+            'inputs': fingerprint_paths(step.inputs) if step.inputs else None,
+            'deps': {dep: self._output_fingerprints.get(dep) for dep in step.deps}
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _up_to_date(self, step: PipelineStep, key: str) -> bool:
+        saved = self._state.get(step.name)
+        if not (step.cacheable and saved and saved.get('key') == key):
+            return False
+        # Outputs edited or deleted since the last run make the step stale
+        return not step.outputs or fingerprint_paths(step.outputs) == saved.get('outputs_fingerprint')
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_state(self):
+        """Write atomically (lock held)"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def _check_acyclic(self):
+        visiting, visited = set(), set()
+
+        def visit(name, path):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dep in self.steps[name].deps:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.steps:
+            visit(name, [])